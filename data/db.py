@@ -7,17 +7,27 @@ Thread-safe SQLite database wrapper providing:
 - Thread-local connections with WAL mode
 - Foreign key constraint enforcement
 - CRUD operations for game entities (systems, locations, players, ships)
+- Read-through cache for static universe tables (systems, locations, gate links)
+- Write-behind buffer for hot player columns (fuel, hull, energy)
+- Versioned schema migrations (PRAGMA user_version, see data/migrations.py)
+- Opt-in SQL profiler (per-statement latency by thread and caller, slow-query plans)
 - Transaction management and connection lifecycle
 """
 
 from __future__ import annotations
 
+import atexit
 import sqlite3
+import sys
 import threading
+import time
+from collections import Counter, deque
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
+from data import migrations
 from game_controller.log_config import get_system_logger
+from settings import system_config as cfg
 
 logger = get_system_logger('database')
 
@@ -30,7 +40,6 @@ _active_db_path_override: Optional[Path] = None
 # --- Thread-local connections + one-time init ---
 _tls = threading.local()
 _init_lock = threading.Lock()
-_is_initialized = False
 
 DATA_DIR = ROOT / "data"
 SCHEMA_PATH = DATA_DIR / "schema.sql"
@@ -40,7 +49,10 @@ SEED_PY = DATA_DIR / "seed.py"   # will load universe_seed.json
 def set_active_db_path(p: Path | str) -> None:
     """Override the default database path (useful for tests or rebuilding)."""
     global _active_db_path_override
+    _player_buffer.release()
     _active_db_path_override = Path(p)
+    _universe_cache.invalidate()
+    _bump_save_epoch()
 
 
 def get_active_db_path() -> Path:
@@ -62,7 +74,11 @@ def _open_new_connection() -> sqlite3.Connection:
     ap.parent.mkdir(parents=True, exist_ok=True)
     # Default sqlite3 connections are NOT threadsafe across threads.
     # We keep one connection per thread via _tls below.
-    conn = sqlite3.connect(str(ap), detect_types=sqlite3.PARSE_DECLTYPES)
+    if _profiler.enabled:
+        conn = sqlite3.connect(str(ap), detect_types=sqlite3.PARSE_DECLTYPES, factory=_ProfiledConnection)
+        conn.set_trace_callback(_profiler.record_untimed)
+    else:
+        conn = sqlite3.connect(str(ap), detect_types=sqlite3.PARSE_DECLTYPES)
     conn.row_factory = sqlite3.Row
 
     # Pragmas tuned for UI + background sim concurrency
@@ -77,17 +93,19 @@ def _open_new_connection() -> sqlite3.Connection:
 
 def _ensure_schema_and_seed(conn: sqlite3.Connection) -> None:
     """
-    Ensure schema exists; if the DB is empty (no systems), run the seed script
-    which ingests data/universe_seed.json (or ..._v2.json).
-    Idempotent; guarded by _init_lock to avoid duplicate seeding.
+    Bring the database up to the current schema version (data/migrations.py)
+    and, for an empty DB (no systems), run the seed script which ingests
+    data/universe_seed.json.
+
+    An up-to-date database costs one PRAGMA user_version read. Migrations and
+    seeding are guarded by _init_lock so concurrent openers don't race.
     """
-    global _is_initialized
+    if not migrations.needs_migration(conn):
+        return
     with _init_lock:
-        if _is_initialized:
+        if not migrations.needs_migration(conn):
             return
-        with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
-            conn.executescript(f.read())
-        conn.commit()
+        migrations.migrate(conn)
 
         cur = conn.execute("SELECT COUNT(system_id) FROM systems")
         if cur.fetchone()[0] == 0:
@@ -97,89 +115,7 @@ def _ensure_schema_and_seed(conn: sqlite3.Connection) -> None:
             if callable(seed_fn):
                 seed_fn(conn)
                 conn.commit()
-
-        # Keep compatibility columns (idempotent checks)
-        _ensure_icon_column(conn)
-        _deprecated_ensure_system_star_column(conn)
-        _ensure_location_status_column(conn)
-        _ensure_custom_ship_name_column(conn)
-        _ensure_docked_bay_column(conn)
-
-        _is_initialized = True
-
-
-def _ensure_icon_column(conn: sqlite3.Connection) -> None:
-    """
-    Keep compatibility: a column to store per-location icon paths the UI
-    selects at runtime (no duplicates per system/type).
-    """
-    cur = conn.execute("PRAGMA table_info(locations)")
-    columns = [row[1] for row in cur.fetchall()]
-    if "icon_path" not in columns:
-        conn.execute("ALTER TABLE locations ADD COLUMN icon_path TEXT;")
-        conn.commit()
-
-
-def _deprecated_ensure_system_star_column(conn: sqlite3.Connection) -> None:
-    """Optional per-system star icon path assigned by UI/runtime."""
-    cur = conn.execute("PRAGMA table_info(systems)")
-    columns = [row[1] for row in cur.fetchall()]
-    if "icon_path" not in columns:
-        conn.execute("ALTER TABLE systems ADD COLUMN icon_path TEXT;")
-        conn.commit()
-
-
-def _ensure_location_status_column(conn: sqlite3.Connection) -> None:
-    """Add current_location_status column to player table for orbit/docked tracking."""
-    try:
-        cur = conn.execute("PRAGMA table_info(player)")
-        columns = [row[1] for row in cur.fetchall()]
-        if "current_location_status" not in columns:
-            conn.execute("ALTER TABLE player ADD COLUMN current_location_status TEXT NOT NULL DEFAULT 'orbiting';")
-            conn.commit()
-            print("Added current_location_status column to player table")
-    except Exception as e:
-        print(f"Warning: Could not add current_location_status column: {e}")
-
-
-def _ensure_custom_ship_name_column(conn: sqlite3.Connection) -> None:
-    """Add custom_ship_name column to player table for custom ship naming."""
-    try:
-        cur = conn.execute("PRAGMA table_info(player)")
-        columns = [row[1] for row in cur.fetchall()]
-        if "custom_ship_name" not in columns:
-            conn.execute("ALTER TABLE player ADD COLUMN custom_ship_name TEXT NULL;")
-            conn.commit()
-            print("Added custom_ship_name column to player table")
-    except Exception as e:
-        print(f"Warning: Could not add custom_ship_name column: {e}")
-
-
-def _ensure_docked_bay_column(conn: sqlite3.Connection) -> None:
-    """Add docked_bay column to player table for bay number tracking."""
-    from game_controller.log_config import get_system_logger
-    logger = get_system_logger("database")
-    
-    try:
-        cur = conn.execute("PRAGMA table_info(player)")
-        columns = [row[1] for row in cur.fetchall()]
-        logger.debug(f"Player table columns: {columns}")
-        
-        if "docked_bay" not in columns:
-            logger.info("Adding docked_bay column to player table")
-            conn.execute("ALTER TABLE player ADD COLUMN docked_bay INTEGER NULL;")
-            conn.commit()
-            logger.info("Successfully added docked_bay column to player table")
-            # Force a checkpoint to ensure the change is written to disk
-            conn.execute("PRAGMA wal_checkpoint(FULL);")
-            logger.debug("WAL checkpoint completed")
-        else:
-            logger.debug("docked_bay column already exists")
-            
-    except Exception as e:
-        logger.error(f"Error adding docked_bay column: {e}")
-        import traceback
-        traceback.print_exc()
+                _universe_cache.invalidate()
 
 
 def get_connection() -> sqlite3.Connection:
@@ -194,15 +130,27 @@ def get_connection() -> sqlite3.Connection:
     except sqlite3.ProgrammingError:
         conn = None
 
+    # Profiling was toggled since this thread connected: swap connection type
+    # at the next transaction boundary.
+    if conn is not None and getattr(_tls, "profile_gen", 0) != _profiler.generation and not conn.in_transaction:
+        try:
+            conn.close()
+        except Exception:
+            pass
+        conn = None
+
     if conn is None:
         conn = _open_new_connection()
         _tls.conn = conn
+        _tls.profile_gen = _profiler.generation
         _ensure_schema_and_seed(conn)
     return conn
 
 
 def close_active_connection() -> None:
     """Closes the current THREAD's database connection, if it's open."""
+    _player_buffer.release()
+    _bump_save_epoch()
     conn: Optional[sqlite3.Connection] = getattr(_tls, "conn", None)
     if conn is not None:
         try:
@@ -212,6 +160,248 @@ def close_active_connection() -> None:
     _tls.conn = None
 
 
+# ---------- Opt-in SQL profiler ----------
+# Enable with DB_PROFILE_ENABLED in settings/system_config.py or at runtime via
+# enable_sql_profiling(). Connections opened while enabled time every
+# execute/executemany through _ProfiledConnection; the sqlite3 trace callback
+# counts statements that bypass the wrappers (executescript bodies, statements
+# issued by sqlite3 itself).
+
+_PROFILE_SAMPLE_CAP = 2048
+_EXPLAIN_PREFIXES = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT", "REPLACE")
+
+
+def _normalize_sql(sql: str) -> str:
+    return " ".join(str(sql).split())
+
+
+def _percentile(sorted_samples: List[float], pct: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    k = max(0, min(len(sorted_samples) - 1, int(round(pct / 100.0 * len(sorted_samples) + 0.5)) - 1))
+    return sorted_samples[k]
+
+
+class _StatementStats:
+    __slots__ = ("count", "total_s", "max_s", "samples", "callers")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.samples: deque = deque(maxlen=_PROFILE_SAMPLE_CAP)
+        self.callers: Counter = Counter()
+
+
+class _SqlProfiler:
+    """Per-(thread, statement) counts and latencies with periodic summaries."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.enabled = False
+        self.generation = 0
+        self.slow_ms = float(getattr(cfg, "DB_PROFILE_SLOW_MS", 50.0))
+        self.report_interval_s = float(getattr(cfg, "DB_PROFILE_REPORT_S", 30.0))
+        self._stats: Dict[Tuple[str, str], _StatementStats] = {}
+        self._untimed: Counter = Counter()
+        self._explained: set = set()
+        self._last_report = time.monotonic()
+
+    def set_enabled(self, on: bool) -> None:
+        with self._lock:
+            if self.enabled != on:
+                self.enabled = on
+                self.generation += 1
+                self._last_report = time.monotonic()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._untimed.clear()
+            self._explained.clear()
+
+    def record(self, sql: str, elapsed_s: float, caller: str) -> bool:
+        """Record one timed statement; returns True the first time it crosses the slow threshold."""
+        key = (threading.current_thread().name, _normalize_sql(sql))
+        slow_first = False
+        with self._lock:
+            st = self._stats.get(key)
+            if st is None:
+                st = self._stats[key] = _StatementStats()
+            st.count += 1
+            st.total_s += elapsed_s
+            if elapsed_s > st.max_s:
+                st.max_s = elapsed_s
+            st.samples.append(elapsed_s)
+            st.callers[caller] += 1
+            if elapsed_s * 1000.0 >= self.slow_ms and key[1] not in self._explained:
+                self._explained.add(key[1])
+                slow_first = True
+            due = time.monotonic() - self._last_report >= self.report_interval_s
+            if due:
+                self._last_report = time.monotonic()
+        if due:
+            self.log_summary()
+        return slow_first
+
+    def record_untimed(self, sql: str) -> None:
+        if getattr(_tls, "profiling_busy", False):
+            return
+        with self._lock:
+            self._untimed[(threading.current_thread().name, _normalize_sql(sql))] += 1
+
+    def snapshot(self, top: Optional[int] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            items = [(k, st.count, st.total_s, st.max_s, sorted(st.samples), st.callers.most_common(3))
+                     for k, st in self._stats.items()]
+            untimed = list(self._untimed.items())
+        out: List[Dict[str, Any]] = []
+        for (thread, sql), count, total_s, max_s, samples, callers in items:
+            out.append({
+                "thread": thread,
+                "sql": sql,
+                "count": count,
+                "total_ms": total_s * 1000.0,
+                "mean_ms": total_s * 1000.0 / count,
+                "p50_ms": _percentile(samples, 50) * 1000.0,
+                "p95_ms": _percentile(samples, 95) * 1000.0,
+                "p99_ms": _percentile(samples, 99) * 1000.0,
+                "max_ms": max_s * 1000.0,
+                "callers": callers,
+                "timed": True,
+            })
+        out.sort(key=lambda r: r["total_ms"], reverse=True)
+        for (thread, sql), count in sorted(untimed, key=lambda kv: kv[1], reverse=True):
+            out.append({"thread": thread, "sql": sql, "count": count, "timed": False})
+        return out[:top] if top is not None else out
+
+    def log_summary(self, top: int = 10) -> None:
+        rows = [r for r in self.snapshot() if r["timed"]][:top]
+        if not rows:
+            return
+        lines = [f"SQL profile (top {len(rows)} by total time):"]
+        for r in rows:
+            caller = r["callers"][0][0] if r["callers"] else "?"
+            lines.append(
+                f"  [{r['thread']}] {r['count']}x total={r['total_ms']:.1f}ms "
+                f"p50={r['p50_ms']:.2f} p95={r['p95_ms']:.2f} p99={r['p99_ms']:.2f} max={r['max_ms']:.2f} "
+                f"caller={caller} :: {r['sql'][:160]}"
+            )
+        logger.info("\n".join(lines))
+
+
+_profiler = _SqlProfiler()
+_profiler.enabled = bool(getattr(cfg, "DB_PROFILE_ENABLED", False))
+
+
+def _profile_caller() -> str:
+    """module.function of the first frame outside the profiling wrappers."""
+    f = sys._getframe(1)
+    while f is not None and f.f_code in _PROFILE_WRAPPER_CODES:
+        f = f.f_back
+    if f is None:
+        return "?"
+    return f"{f.f_globals.get('__name__', '?')}.{f.f_code.co_name}"
+
+
+def _explain_slow(conn: sqlite3.Connection, sql: str, parameters: Any, elapsed_s: float) -> None:
+    text = _normalize_sql(sql)
+    if not text.upper().startswith(_EXPLAIN_PREFIXES):
+        logger.warning(f"Slow SQL ({elapsed_s * 1000.0:.1f} ms): {text[:300]}")
+        return
+    _tls.profiling_busy = True
+    try:
+        rows = sqlite3.Connection.execute(conn, "EXPLAIN QUERY PLAN " + sql, parameters).fetchall()
+        plan = "\n".join(f"    {r[3]}" for r in rows)
+    except Exception as e:
+        plan = f"    <plan unavailable: {e}>"
+    finally:
+        _tls.profiling_busy = False
+    logger.warning(f"Slow SQL ({elapsed_s * 1000.0:.1f} ms): {text[:300]}\n{plan}")
+
+
+class _ProfiledCursor(sqlite3.Cursor):
+    def execute(self, sql: str, parameters: Any = (), /) -> sqlite3.Cursor:  # type: ignore[override]
+        if getattr(_tls, "profiling_busy", False):
+            return super().execute(sql, parameters)
+        _tls.profiling_busy = True
+        t0 = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            elapsed = time.perf_counter() - t0
+            _tls.profiling_busy = False
+            if _profiler.record(sql, elapsed, _profile_caller()):
+                _explain_slow(self.connection, sql, parameters, elapsed)
+
+    def executemany(self, sql: str, seq_of_parameters: Iterable[Any], /) -> sqlite3.Cursor:  # type: ignore[override]
+        if getattr(_tls, "profiling_busy", False):
+            return super().executemany(sql, seq_of_parameters)
+        _tls.profiling_busy = True
+        t0 = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            elapsed = time.perf_counter() - t0
+            _tls.profiling_busy = False
+            if _profiler.record(sql, elapsed, _profile_caller()):
+                logger.warning(f"Slow SQL executemany ({elapsed * 1000.0:.1f} ms): {_normalize_sql(sql)[:300]}")
+
+
+class _ProfiledConnection(sqlite3.Connection):
+    def cursor(self, factory: Any = _ProfiledCursor) -> sqlite3.Cursor:  # type: ignore[override]
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters: Any = (), /) -> sqlite3.Cursor:  # type: ignore[override]
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Iterable[Any], /) -> sqlite3.Cursor:  # type: ignore[override]
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+_PROFILE_WRAPPER_CODES = {
+    _ProfiledCursor.execute.__code__,
+    _ProfiledCursor.executemany.__code__,
+    _ProfiledConnection.execute.__code__,
+    _ProfiledConnection.executemany.__code__,
+}
+
+
+def enable_sql_profiling(slow_ms: Optional[float] = None, report_interval_s: Optional[float] = None) -> None:
+    """Start profiling; each thread switches to a profiled connection at its next transaction boundary."""
+    if slow_ms is not None:
+        _profiler.slow_ms = float(slow_ms)
+    if report_interval_s is not None:
+        _profiler.report_interval_s = float(report_interval_s)
+    _profiler.set_enabled(True)
+    logger.info(f"SQL profiling enabled (slow >= {_profiler.slow_ms:.1f} ms, summary every {_profiler.report_interval_s:.0f} s)")
+
+
+def disable_sql_profiling() -> None:
+    _profiler.set_enabled(False)
+
+
+def is_sql_profiling_enabled() -> bool:
+    return _profiler.enabled
+
+
+def get_sql_profile(top: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Per-(thread, statement) rows sorted by total time. Timed rows carry count,
+    total/mean/p50/p95/p99/max in ms and the top callers; rows with timed=False
+    are statements only seen by the trace callback (count only).
+    """
+    return _profiler.snapshot(top)
+
+
+def reset_sql_profile() -> None:
+    _profiler.reset()
+
+
+def log_sql_profile_summary(top: int = 10) -> None:
+    _profiler.log_summary(top)
+
+
 # ---------- NEW: worker-friendly read-only connector ----------
 
 def connect_readonly(path: Optional[Union[Path, str]] = None, timeout: float = 1.0) -> sqlite3.Connection:
@@ -247,6 +437,274 @@ def connect_readonly(path: Optional[Union[Path, str]] = None, timeout: float = 1
     return conn
 
 
+# ---------- Universe cache (static tables) ----------
+
+class _UniverseCache:
+    """
+    Process-wide read-through cache for the (mostly) static universe tables.
+
+    Systems, locations and gate links are loaded once per table from the active
+    DB and served from dicts afterwards. Each table carries its own version
+    counter; writers bump only the table they touch, and a change of the active
+    DB path (save load / new game) drops everything.
+    """
+
+    TABLES = ("systems", "locations", "gate_links")
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._db_path: Optional[Path] = None
+        self._versions: Dict[str, int] = {t: 0 for t in self.TABLES}
+        self._loaded: Dict[str, bool] = {t: False for t in self.TABLES}
+        self._hits: Dict[str, int] = {t: 0 for t in self.TABLES}
+        self._misses: Dict[str, int] = {t: 0 for t in self.TABLES}
+
+        self._systems: Dict[int, Dict] = {}
+        self._locations: Dict[int, Dict] = {}
+        self._locations_by_system: Dict[int, List[int]] = {}
+        self._warp_gate_by_system: Dict[int, int] = {}
+        self._gate_links: Dict[int, List[Dict]] = {}
+
+    # ---- invalidation ----
+    def invalidate(self, *tables: str) -> None:
+        """Drop the given tables (all tables when called without arguments)."""
+        with self._lock:
+            targets = tables or self.TABLES
+            for t in targets:
+                if t not in self._versions:
+                    continue
+                self._versions[t] += 1
+                self._loaded[t] = False
+            logger.debug(f"Universe cache invalidated: {list(targets)}")
+
+    def patch_location_icons(self, pairs: List[tuple[int, Optional[str]]]) -> None:
+        """Apply (location_id, icon_path) writes to cached rows without reloading the table."""
+        with self._lock:
+            self._versions["locations"] += 1
+            if not self._loaded["locations"]:
+                return
+            for lid, path in pairs:
+                row = self._locations.get(int(lid))
+                if row is not None:
+                    row["icon_path"] = path
+
+    def patch_location_richness(self, rows: Iterable[tuple]) -> None:
+        """
+        Apply (richness, richness_max, richness_s, location_id) writes to cached
+        rows in place. No version bump: nothing keyed on the versions reads
+        richness, and the table stays loaded.
+        """
+        with self._lock:
+            if not self._loaded["locations"]:
+                return
+            for richness, richness_max, richness_s, lid in rows:
+                row = self._locations.get(int(lid))
+                if row is not None:
+                    row["richness"] = richness
+                    row["richness_max"] = richness_max
+                    row["richness_s"] = richness_s
+
+    def patch_system_icon(self, system_id: int, icon_path: Optional[str]) -> None:
+        """Mirror set_system_icon_path: the system row plus its star location rows."""
+        with self._lock:
+            self._versions["systems"] += 1
+            self._versions["locations"] += 1
+            if self._loaded["systems"]:
+                row = self._systems.get(int(system_id))
+                if row is not None:
+                    row["icon_path"] = icon_path
+            if self._loaded["locations"]:
+                for lid in self._locations_by_system.get(int(system_id), ()):
+                    loc = self._locations[lid]
+                    if loc.get("location_type") == "star":
+                        loc["icon_path"] = icon_path
+
+    def _check_db_path(self) -> None:
+        ap = get_active_db_path()
+        if self._db_path != ap:
+            self._db_path = ap
+            for t in self.TABLES:
+                self._versions[t] += 1
+                self._loaded[t] = False
+
+    # ---- loading ----
+    def _ensure(self, table: str) -> None:
+        if self._loaded[table] and self._db_path == get_active_db_path():
+            with self._lock:
+                self._hits[table] += 1
+            return
+        # Open the connection before taking the lock: first-time connection
+        # setup may seed the DB, which invalidates this cache under _init_lock.
+        conn = get_connection()
+        with self._lock:
+            self._check_db_path()
+            if self._loaded[table]:
+                self._hits[table] += 1
+                return
+            self._misses[table] += 1
+            if table == "systems":
+                self._load_systems(conn)
+            elif table == "locations":
+                self._load_locations(conn)
+            else:
+                self._load_gate_links(conn)
+            self._loaded[table] = True
+
+    def _load_systems(self, conn: sqlite3.Connection) -> None:
+        rows = conn.execute(
+            """
+            SELECT
+              * ,
+              system_id   AS id,
+              system_name AS name,
+              system_x    AS x,
+              system_y    AS y
+            FROM systems
+            """
+        ).fetchall()
+        self._systems = {int(r["system_id"]): dict(r) for r in rows}
+
+    def _load_locations(self, conn: sqlite3.Connection) -> None:
+        rows = conn.execute(
+            """
+            SELECT
+              * ,
+              location_id   AS id,
+              location_name AS name,
+              location_x    AS local_x_au,
+              location_y    AS local_y_au
+            FROM locations
+            ORDER BY system_id, location_name, location_id
+            """
+        ).fetchall()
+        locations: Dict[int, Dict] = {}
+        by_system: Dict[int, List[int]] = {}
+        gates: Dict[int, int] = {}
+        for r in rows:
+            d = dict(r)
+            lid = int(d["location_id"])
+            sid = int(d["system_id"])
+            locations[lid] = d
+            by_system.setdefault(sid, []).append(lid)
+            if d.get("location_type") == "warp_gate":
+                prev = gates.get(sid)
+                if prev is None or lid < prev:
+                    gates[sid] = lid
+        self._locations = locations
+        self._locations_by_system = by_system
+        self._warp_gate_by_system = gates
+
+    def _load_gate_links(self, conn: sqlite3.Connection) -> None:
+        rows = conn.execute(
+            "SELECT system_a_id, system_b_id, distance_pc FROM gate_links"
+        ).fetchall()
+        links: Dict[int, List[Dict]] = {}
+        for a, b, dist in rows:
+            links.setdefault(int(a), []).append({"neighbor_system_id": b, "distance_pc": dist})
+            if a != b:
+                links.setdefault(int(b), []).append({"neighbor_system_id": a, "distance_pc": dist})
+        self._gate_links = links
+
+    # ---- lookups (copies, so callers can't corrupt the cache) ----
+    def system(self, system_id: int) -> Optional[Dict]:
+        self._ensure("systems")
+        row = self._systems.get(int(system_id))
+        return dict(row) if row else None
+
+    def location(self, location_id: int) -> Optional[Dict]:
+        self._ensure("locations")
+        row = self._locations.get(int(location_id))
+        return dict(row) if row else None
+
+    def locations(self, system_id: int) -> List[Dict]:
+        self._ensure("locations")
+        out: List[Dict] = []
+        locations = self._locations
+        for lid in self._locations_by_system.get(int(system_id), ()):
+            row = locations.get(lid)
+            if row is None:
+                continue
+            d = dict(row)
+            d["kind"] = d.get("location_type")
+            out.append(d)
+        return out
+
+    def warp_gate(self, system_id: int) -> Optional[Dict]:
+        self._ensure("locations")
+        lid = self._warp_gate_by_system.get(int(system_id))
+        row = self._locations.get(lid) if lid is not None else None
+        return dict(row) if row else None
+
+    def systems_many(self, ids: List[int]) -> Dict[int, Dict]:
+        self._ensure("systems")
+        systems = self._systems
+        return {i: dict(systems[i]) for i in ids if i in systems}
+
+    def locations_many(self, ids: List[int]) -> Dict[int, Dict]:
+        self._ensure("locations")
+        locations = self._locations
+        return {i: dict(locations[i]) for i in ids if i in locations}
+
+    def is_warm(self, table: str) -> bool:
+        """True when a table is loaded for the active DB (lookups cost no query)."""
+        return bool(self._loaded.get(table)) and self._db_path == get_active_db_path()
+
+    def gate_links(self, system_id: int) -> List[Dict]:
+        self._ensure("gate_links")
+        return [dict(r) for r in self._gate_links.get(int(system_id), ())]
+
+    # ---- introspection ----
+    def versions(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._versions)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {
+                t: {
+                    "hits": self._hits[t],
+                    "misses": self._misses[t],
+                    "version": self._versions[t],
+                    "loaded": int(self._loaded[t]),
+                }
+                for t in self.TABLES
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for t in self.TABLES:
+                self._hits[t] = 0
+                self._misses[t] = 0
+
+
+_universe_cache = _UniverseCache()
+
+
+def invalidate_universe_cache(*tables: str) -> None:
+    """Drop cached universe tables ('systems', 'locations', 'gate_links'); all when none are given."""
+    _universe_cache.invalidate(*tables)
+
+
+def get_universe_cache_versions() -> Dict[str, int]:
+    """Per-table version counters; a counter increments whenever its table is invalidated."""
+    return _universe_cache.versions()
+
+
+def get_universe_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Per-table hit/miss counters for the universe cache (a miss is a table load)."""
+    return _universe_cache.stats()
+
+
+def reset_universe_cache_stats() -> None:
+    """Zero the universe cache hit/miss counters."""
+    _universe_cache.reset_stats()
+
+
+def patch_location_richness(rows: Iterable[tuple]) -> None:
+    """Mirror (richness, richness_max, richness_s, location_id) rows just written to locations into the cache."""
+    _universe_cache.patch_location_richness(rows)
+
+
 # ---------- Basic query helpers ----------
 
 def get_counts() -> Dict[str, int]:
@@ -278,63 +736,97 @@ def get_systems() -> List[Dict]:
 
 
 def get_system(system_id: int) -> Optional[Dict]:
-    row = get_connection().execute(
-        """
-        SELECT
-          * ,
-          system_id   AS id,
-          system_name AS name,
-          system_x    AS x,
-          system_y    AS y
-        FROM systems
-        WHERE system_id=?
-        """,
-        (system_id,),
-    ).fetchone()
-    return dict(row) if row else None
+    """Single system row with id/name/x/y aliases (served from the universe cache)."""
+    return _universe_cache.system(system_id)
 
 
 def get_locations(system_id: int) -> List[Dict]:
-    return [
-        dict(row)
-        for row in get_connection().execute(
-            """
-            SELECT
-              * ,
-              location_id   AS id,
-              location_name AS name,
-              location_type AS kind,
-              location_x    AS local_x_au,
-              location_y    AS local_y_au
-            FROM locations
-            WHERE system_id=?
-            ORDER BY location_name
-            """,
-            (system_id,),
-        )
-    ]
+    """Locations in a system ordered by name (served from the universe cache)."""
+    return _universe_cache.locations(system_id)
 
 
 def get_location(location_id: int) -> Optional[Dict]:
-    row = get_connection().execute(
+    """Single location row with friendly aliases (served from the universe cache)."""
+    return _universe_cache.location(location_id)
+
+
+def get_warp_gate(system_id: int) -> Optional[Dict]:
+    """Return the warp gate location in a system (type 'warp_gate')."""
+    return _universe_cache.warp_gate(system_id)
+
+
+# ---------- Batch lookups ----------
+
+# SQLite's default SQLITE_MAX_VARIABLE_NUMBER is 999 on older builds; stay below it.
+_IN_CHUNK_MAX = 900
+
+
+def _unique_ids(ids: Iterable[Any]) -> List[int]:
+    out: List[int] = []
+    seen: set[int] = set()
+    for v in ids:
+        try:
+            i = int(v)
+        except (TypeError, ValueError):
+            continue
+        if i not in seen:
+            seen.add(i)
+            out.append(i)
+    return out
+
+
+def _select_by_ids(select_sql: str, key: str, ids: List[int]) -> Dict[int, Dict]:
+    """Run `select_sql ... IN (...)` over ids in chunks; return rows keyed by `key`."""
+    conn = get_connection()
+    out: Dict[int, Dict] = {}
+    for i in range(0, len(ids), _IN_CHUNK_MAX):
+        chunk = ids[i:i + _IN_CHUNK_MAX]
+        qmarks = ",".join("?" * len(chunk))
+        for row in conn.execute(f"{select_sql} IN ({qmarks})", chunk):
+            d = dict(row)
+            out[int(d[key])] = d
+    return out
+
+
+def get_systems_by_ids(system_ids: Iterable[int]) -> Dict[int, Dict]:
+    """
+    Batch variant of get_system(): {system_id: row} for every id that exists.
+    Served from the universe cache when it is warm, otherwise one chunked
+    IN (...) query per 900 ids.
+    """
+    ids = _unique_ids(system_ids)
+    if not ids:
+        return {}
+    if _universe_cache.is_warm("systems"):
+        return _universe_cache.systems_many(ids)
+    return _select_by_ids(
         """
         SELECT
           * ,
-          location_id   AS id,
-          location_name AS name,
-          location_x    AS local_x_au,
-          location_y    AS local_y_au
-        FROM locations
-        WHERE location_id=?
+          system_id   AS id,
+          system_name AS name,
+          system_x    AS x,
+          system_y    AS y
+        FROM systems
+        WHERE system_id
         """,
-        (location_id,),
-    ).fetchone()
-    return dict(row) if row else None
+        "system_id",
+        ids,
+    )
 
 
-def get_warp_gate(system_id: int) -> Optional[Dict]:
-    """Return the warp gate location in a system (type 'warp_gate')."""
-    row = get_connection().execute(
+def get_locations_by_ids(location_ids: Iterable[int]) -> Dict[int, Dict]:
+    """
+    Batch variant of get_location(): {location_id: row} for every id that exists.
+    Served from the universe cache when it is warm, otherwise one chunked
+    IN (...) query per 900 ids.
+    """
+    ids = _unique_ids(location_ids)
+    if not ids:
+        return {}
+    if _universe_cache.is_warm("locations"):
+        return _universe_cache.locations_many(ids)
+    return _select_by_ids(
         """
         SELECT
           * ,
@@ -343,30 +835,18 @@ def get_warp_gate(system_id: int) -> Optional[Dict]:
           location_x    AS local_x_au,
           location_y    AS local_y_au
         FROM locations
-        WHERE system_id=? AND location_type='warp_gate'
-        LIMIT 1
+        WHERE location_id
         """,
-        (system_id,),
-    ).fetchone()
-    return dict(row) if row else None
+        "location_id",
+        ids,
+    )
 
 
 # ---------- New helpers for the v2 universe ----------
 
 def get_gate_links(system_id: int) -> List[Dict]:
     """Neighbor systems reachable via warp from this system."""
-    conn = get_connection()
-    rows = conn.execute(
-        """
-        SELECT
-          CASE WHEN gl.system_a_id=? THEN gl.system_b_id ELSE gl.system_a_id END AS neighbor_system_id,
-          gl.distance_pc
-        FROM gate_links gl
-        WHERE gl.system_a_id=? OR gl.system_b_id=?
-        """,
-        (system_id, system_id, system_id),
-    ).fetchall()
-    return [dict(r) for r in rows]
+    return _universe_cache.gate_links(system_id)
 
 
 def get_resource_nodes(system_id: int) -> List[Dict]:
@@ -473,12 +953,225 @@ def get_facility_io(facility_id: int) -> Dict[str, List[Dict]]:
     return {"inputs": [dict(r) for r in inputs], "outputs": [dict(r) for r in outputs]}
 
 
+def get_facility_inventory(facility_id: int) -> List[Dict]:
+    """Current stock held at a facility (as of the sim's last production flush)."""
+    rows = get_connection().execute(
+        """
+        SELECT fi.item_id, i.item_name, fi.qty
+        FROM facility_inventory fi
+        JOIN items i ON i.item_id = fi.item_id
+        WHERE fi.facility_id=?
+        ORDER BY fi.item_id
+        """,
+        (facility_id,),
+    ).fetchall()
+    return [dict(r) for r in rows]
+
+
+# ---------- Player state write-behind buffer ----------
+
+# Hot player columns mutated every travel tick; writes are buffered in memory
+PLAYER_BUFFERED_COLUMNS = (
+    "current_player_ship_fuel",
+    "current_player_ship_hull",
+    "current_player_ship_energy",
+)
+PLAYER_FLUSH_INTERVAL_S = 1.0
+
+
+class _PlayerStateBuffer:
+    """
+    In-memory authoritative values for PLAYER_BUFFERED_COLUMNS.
+
+    set() updates memory only; the dirty columns go back to SQLite in one
+    UPDATE + commit when the flush interval has elapsed, or when flush() is
+    called (travel phase boundaries, save, save switch, shutdown).
+    get_player_full() overlays the dirty values so readers never see stale
+    numbers. All writers of these columns must go through set_player_values().
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._db_path: Optional[Path] = None
+        self._values: Dict[str, float] = {}
+        self._dirty: set[str] = set()
+        self._last_flush = time.monotonic()
+        self.interval_s = PLAYER_FLUSH_INTERVAL_S
+        self._writes = 0
+        self._flushes = 0
+
+    def _check_db_path(self) -> None:
+        path = get_active_db_path()
+        if self._db_path != path:
+            if self._dirty:
+                self.flush()
+            self._db_path = path
+            self._values.clear()
+            self._dirty.clear()
+
+    def get(self, column: str) -> Optional[float]:
+        with self._lock:
+            self._check_db_path()
+            if column in self._values:
+                return self._values[column]
+        row = get_connection().execute(f"SELECT {column} FROM player WHERE id=1").fetchone()
+        if row is None:
+            return None
+        value = float(row[0] or 0.0)
+        with self._lock:
+            self._values.setdefault(column, value)
+            return self._values[column]
+
+    def set(self, values: Dict[str, float]) -> None:
+        with self._lock:
+            self._check_db_path()
+            for column, value in values.items():
+                self._values[column] = float(value)
+                self._dirty.add(column)
+            self._writes += 1
+            bump_player_version()
+            due = (time.monotonic() - self._last_flush) >= self.interval_s
+        if due:
+            self.flush()
+
+    def overlay(self, row: Dict) -> Dict:
+        with self._lock:
+            if self._dirty and self._db_path == get_active_db_path():
+                for column in self._dirty:
+                    row[column] = self._values[column]
+        return row
+
+    def flush(self) -> bool:
+        """Write dirty columns back; returns True when something was written."""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._dirty or self._db_path is None:
+                return False
+            columns = sorted(self._dirty)
+            params = [self._values[c] for c in columns]
+            sql = f"UPDATE player SET {', '.join(f'{c}=?' for c in columns)} WHERE id=1"
+            try:
+                if self._db_path == get_active_db_path():
+                    conn = get_connection()
+                    conn.execute(sql, params)
+                    conn.commit()
+                else:
+                    # Active save already switched: write to the save these values belong to
+                    conn = sqlite3.connect(str(self._db_path), timeout=5.0)
+                    try:
+                        conn.execute(sql, params)
+                        conn.commit()
+                    finally:
+                        conn.close()
+            except Exception as e:
+                logger.error(f"Player state flush failed ({', '.join(columns)}): {e}")
+                return False
+            self._dirty.clear()
+            self._flushes += 1
+            return True
+
+    def discard(self) -> None:
+        with self._lock:
+            self._db_path = None
+            self._values.clear()
+            self._dirty.clear()
+
+    def release(self) -> None:
+        """
+        Flush, then forget the cached values so the next read comes from the
+        DB: a save recreated or reopened at the same path must not see the
+        old one's numbers. Values a failed flush left dirty are kept.
+        """
+        with self._lock:
+            self.flush()
+            if not self._dirty:
+                self.discard()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "writes": self._writes,
+                "flushes": self._flushes,
+                "dirty": sorted(self._dirty),
+                "interval_s": self.interval_s,
+            }
+
+
+_player_buffer = _PlayerStateBuffer()
+
+
+def get_player_value(column: str) -> Optional[float]:
+    """Current value of a buffered player column (memory first, then the DB)."""
+    if column not in PLAYER_BUFFERED_COLUMNS:
+        raise ValueError(f"Not a buffered player column: {column}")
+    return _player_buffer.get(column)
+
+
+def set_player_values(**values: float) -> None:
+    """Buffer new values for fuel/hull/energy; flushed on interval, flush_player_state() or shutdown."""
+    bad = [c for c in values if c not in PLAYER_BUFFERED_COLUMNS]
+    if bad:
+        raise ValueError(f"Not buffered player columns: {', '.join(bad)}")
+    if values:
+        _player_buffer.set(values)
+
+
+def flush_player_state() -> bool:
+    """Write buffered player values to SQLite now."""
+    return _player_buffer.flush()
+
+
+def set_player_flush_interval(seconds: float) -> None:
+    """How long buffered player values may stay in memory before an automatic flush."""
+    _player_buffer.interval_s = max(0.0, float(seconds))
+
+
+def get_player_buffer_stats() -> Dict[str, Any]:
+    return _player_buffer.stats()
+
+
+atexit.register(flush_player_state)
+
+
+# Incremented by every player-row write made through this module; lets
+# game.player_status tell whether its memoized snapshot is still current.
+_player_version = 0
+_player_version_lock = threading.Lock()
+
+
+def bump_player_version() -> int:
+    """Mark the player row as changed (call after writing it with raw SQL)."""
+    global _player_version
+    with _player_version_lock:
+        _player_version += 1
+        return _player_version
+
+
+def get_player_version() -> int:
+    return _player_version
+
+
+# Incremented whenever the active save is switched or its connection closed,
+# including a save recreated at the same path; per-save caches key on it.
+_save_epoch = 0
+
+
+def _bump_save_epoch() -> None:
+    global _save_epoch
+    with _player_version_lock:
+        _save_epoch += 1
+
+
+def get_save_epoch() -> int:
+    return _save_epoch
+
+
 def get_player_full() -> Optional[Dict]:
     """Return the single player row (id=1) or None if not seeded yet."""
     row = get_connection().execute(
         "SELECT * FROM player WHERE id=1"
     ).fetchone()
-    return dict(row) if row else None
+    return _player_buffer.overlay(dict(row)) if row else None
 
 
 def get_player_summary() -> Dict:
@@ -533,6 +1226,7 @@ def set_location_icon_path(location_id: int, icon_path: Optional[str]) -> None:
     conn = get_connection()
     conn.execute("UPDATE locations SET icon_path=? WHERE location_id=?", (icon_path, location_id))
     conn.commit()
+    _universe_cache.patch_location_icons([(location_id, icon_path)])
 
 
 def set_system_icon_path(system_id: int, icon_path: Optional[str]) -> None:
@@ -546,6 +1240,7 @@ def set_system_icon_path(system_id: int, icon_path: Optional[str]) -> None:
         (icon_path, system_id),
     )
     conn.commit()
+    _universe_cache.patch_system_icon(system_id, icon_path)
 
 
 def set_icon_paths_bulk(pairs: List[tuple[int, Optional[str]]]) -> None:
@@ -558,6 +1253,7 @@ def set_icon_paths_bulk(pairs: List[tuple[int, Optional[str]]]) -> None:
         [(p, lid) for (lid, p) in pairs],
     )
     conn.commit()
+    _universe_cache.patch_location_icons(pairs)
 
 
 def clear_icon_paths_for_system(system_id: int, kinds: Optional[List[str]] = None) -> None:
@@ -571,6 +1267,7 @@ def clear_icon_paths_for_system(system_id: int, kinds: Optional[List[str]] = Non
     else:
         conn.execute("UPDATE locations SET icon_path=NULL WHERE system_id=?", (system_id,))
     conn.commit()
+    _universe_cache.invalidate("locations")
 
 
 def set_resource_node_icon_path(location_id: int, icon_path: Optional[str]) -> None:
@@ -582,6 +1279,7 @@ def set_resource_node_icon_path(location_id: int, icon_path: Optional[str]) -> N
     conn = get_connection()
     conn.execute("UPDATE locations SET icon_path=? WHERE location_id=?", (icon_path, location_id))
     conn.commit()
+    _universe_cache.patch_location_icons([(location_id, icon_path)])
 
 
 def set_resource_node_icons_bulk(pairs: List[tuple[int, Optional[str]]]) -> None:
@@ -594,6 +1292,7 @@ def set_resource_node_icons_bulk(pairs: List[tuple[int, Optional[str]]]) -> None
         [(p, lid) for (lid, p) in pairs],
     )
     conn.commit()
+    _universe_cache.patch_location_icons(pairs)
 
 
 def get_custom_ship_name() -> Optional[str]:
@@ -613,6 +1312,7 @@ def set_custom_ship_name(ship_name: str) -> None:
         conn = get_connection()
         conn.execute("UPDATE player SET custom_ship_name = ? WHERE id = 1", (ship_name,))
         conn.commit()
+        bump_player_version()
         logger.debug(f"Set custom ship name to: {ship_name}")
     except Exception as e:
         logger.error(f"Error setting custom ship name: {e}")
@@ -624,6 +1324,7 @@ def clear_custom_ship_name() -> None:
         conn = get_connection()
         conn.execute("UPDATE player SET custom_ship_name = NULL WHERE id = 1")
         conn.commit()
+        bump_player_version()
         logger.debug("Cleared custom ship name")
     except Exception as e:
         logger.error(f"Error clearing custom ship name: {e}")
@@ -638,13 +1339,6 @@ def set_docked_bay(bay_number: int) -> None:
         conn = get_connection()
         logger.debug(f"Setting docked bay to: {bay_number}")
         
-        # Verify column exists before trying to use it
-        cur = conn.execute("PRAGMA table_info(player)")
-        columns = [row[1] for row in cur.fetchall()]
-        if "docked_bay" not in columns:
-            logger.error(f"docked_bay column missing! Available columns: {columns}")
-            _ensure_docked_bay_column(conn)
-            
         conn.execute("UPDATE player SET docked_bay = ? WHERE id = 1", (bay_number,))
         conn.commit()
         logger.debug(f"Successfully set docked bay to: {bay_number}")
@@ -664,14 +1358,6 @@ def get_docked_bay() -> Optional[int]:
         conn = get_connection()
         logger.debug("Getting docked bay number")
         
-        # Verify column exists before trying to use it
-        cur = conn.execute("PRAGMA table_info(player)")
-        columns = [row[1] for row in cur.fetchall()]
-        if "docked_bay" not in columns:
-            logger.error(f"docked_bay column missing! Available columns: {columns}")
-            _ensure_docked_bay_column(conn)
-            return None
-            
         cur = conn.execute("SELECT docked_bay FROM player WHERE id = 1")
         result = cur.fetchone()
         bay_number = int(result[0]) if result and result[0] is not None else None
@@ -694,14 +1380,6 @@ def clear_docked_bay() -> None:
         conn = get_connection()
         logger.debug("Clearing docked bay")
         
-        # Verify column exists before trying to use it
-        cur = conn.execute("PRAGMA table_info(player)")
-        columns = [row[1] for row in cur.fetchall()]
-        if "docked_bay" not in columns:
-            logger.error(f"docked_bay column missing! Available columns: {columns}")
-            _ensure_docked_bay_column(conn)
-            return
-            
         conn.execute("UPDATE player SET docked_bay = NULL WHERE id = 1")
         conn.commit()
         logger.debug("Successfully cleared docked bay")
@@ -0,0 +1,226 @@
+# /data/migrations.py
+
+"""
+Victurus Schema Migrations
+
+Ordered, idempotent schema migrations tracked in PRAGMA user_version:
+- Each migration runs once per database file, then bumps user_version
+- An up-to-date database costs a single PRAGMA read to verify
+- Migrations are idempotent so pre-versioning saves (user_version 0) upgrade cleanly
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+from game_controller.log_config import get_system_logger
+
+logger = get_system_logger('database')
+
+SCHEMA_PATH = Path(__file__).resolve().parent / "schema.sql"
+
+
+# ---------- Helpers ----------
+
+def _columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+
+
+def _add_column(conn: sqlite3.Connection, table: str, column: str, decl: str) -> None:
+    if column not in _columns(conn, table):
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl};")
+        logger.info(f"Added {table}.{column}")
+
+
+# ---------- Migrations (append only; never renumber) ----------
+
+def _m001_baseline(conn: sqlite3.Connection) -> None:
+    """Create every table in schema.sql that doesn't exist yet."""
+    conn.executescript(SCHEMA_PATH.read_text(encoding="utf-8"))
+
+
+def _m002_locations_icon_path(conn: sqlite3.Connection) -> None:
+    """Per-location icon paths the UI selects at runtime."""
+    _add_column(conn, "locations", "icon_path", "TEXT")
+
+
+def _m003_systems_icon_path(conn: sqlite3.Connection) -> None:
+    """Per-system star icon path assigned by UI/runtime."""
+    _add_column(conn, "systems", "icon_path", "TEXT")
+
+
+def _m004_player_location_status(conn: sqlite3.Connection) -> None:
+    """Orbit/docked tracking on the player row."""
+    _add_column(conn, "player", "current_location_status", "TEXT NOT NULL DEFAULT 'orbiting'")
+
+
+def _m005_player_custom_ship_name(conn: sqlite3.Connection) -> None:
+    """Player's custom name for their current ship."""
+    _add_column(conn, "player", "custom_ship_name", "TEXT NULL")
+
+
+def _m006_player_docked_bay(conn: sqlite3.Connection) -> None:
+    """Bay number the player is docked in."""
+    _add_column(conn, "player", "docked_bay", "INTEGER NULL")
+
+
+def _m007_facility_inventory(conn: sqlite3.Connection) -> None:
+    """Per-facility item stock used by the production step."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS facility_inventory (
+          facility_id INTEGER NOT NULL,
+          item_id     INTEGER NOT NULL,
+          qty         REAL NOT NULL DEFAULT 0,
+          PRIMARY KEY (facility_id, item_id),
+          FOREIGN KEY(facility_id) REFERENCES facilities(facility_id) ON DELETE CASCADE,
+          FOREIGN KEY(item_id)     REFERENCES items(item_id) ON DELETE CASCADE
+        )
+        """
+    )
+
+
+def _m008_sim_events(conn: sqlite3.Connection) -> None:
+    """Persisted sim event queue and the sim clock it is measured against."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS sim_events (
+          event_id   INTEGER PRIMARY KEY,
+          due_s      REAL NOT NULL,
+          kind       TEXT NOT NULL,
+          entity_id  INTEGER,
+          payload    TEXT,
+          interval_s REAL NOT NULL DEFAULT 0
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS sim_clock (
+          id    INTEGER PRIMARY KEY CHECK (id = 1),
+          now_s REAL NOT NULL DEFAULT 0
+        )
+        """
+    )
+
+
+def _m009_price_rollups(conn: sqlite3.Connection) -> None:
+    """OHLC price buckets (1 min / 1 h / 1 day) on the sim clock."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS price_rollups (
+          res_s     INTEGER NOT NULL,
+          system_id INTEGER NOT NULL,
+          item_id   INTEGER NOT NULL,
+          bucket    INTEGER NOT NULL,
+          open      INTEGER NOT NULL,
+          high      INTEGER NOT NULL,
+          low       INTEGER NOT NULL,
+          close     INTEGER NOT NULL,
+          PRIMARY KEY (res_s, system_id, item_id, bucket)
+        ) WITHOUT ROWID
+        """
+    )
+
+
+def _m010_npc_ships(conn: sqlite3.Connection) -> None:
+    """Summary state of NPC ships simulated by game_controller/npc_fleet.py."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS npc_ships (
+          npc_id         INTEGER PRIMARY KEY,
+          ship_id        INTEGER NOT NULL,
+          system_id      INTEGER NOT NULL,
+          next_system_id INTEGER,
+          dest_system_id INTEGER,
+          state          INTEGER NOT NULL DEFAULT 0,
+          cargo_item_id  INTEGER,
+          cargo_qty      REAL NOT NULL DEFAULT 0,
+          depart_s       REAL NOT NULL DEFAULT 0,
+          arrive_s       REAL NOT NULL DEFAULT 0,
+          FOREIGN KEY(ship_id) REFERENCES ships(ship_id) ON DELETE CASCADE,
+          FOREIGN KEY(system_id) REFERENCES systems(system_id) ON DELETE CASCADE
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_npc_ships_system ON npc_ships(system_id)")
+
+
+def _m011_resource_depletion(conn: sqlite3.Connection) -> None:
+    """Node cap and the sim time richness was last settled at (game_controller/resource_engine.py)."""
+    _add_column(conn, "locations", "richness_max", "REAL")
+    _add_column(conn, "locations", "richness_s", "REAL")
+
+
+def _m012_market_baseline(conn: sqlite3.Connection) -> None:
+    """Persisted equilibrium stock for the market engine's mean reversion (game_controller/market_engine.py)."""
+    _add_column(conn, "markets", "local_market_baseline", "INTEGER")
+    # Older saves never stored one; their stock at upgrade is the best equilibrium left.
+    conn.execute("UPDATE markets SET local_market_baseline = local_market_stock WHERE local_market_baseline IS NULL")
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS markets_baseline AFTER INSERT ON markets
+        WHEN NEW.local_market_baseline IS NULL
+        BEGIN
+            UPDATE markets SET local_market_baseline = NEW.local_market_stock WHERE rowid = NEW.rowid;
+        END
+        """
+    )
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "baseline schema", _m001_baseline),
+    (2, "locations.icon_path", _m002_locations_icon_path),
+    (3, "systems.icon_path", _m003_systems_icon_path),
+    (4, "player.current_location_status", _m004_player_location_status),
+    (5, "player.custom_ship_name", _m005_player_custom_ship_name),
+    (6, "player.docked_bay", _m006_player_docked_bay),
+    (7, "facility_inventory", _m007_facility_inventory),
+    (8, "sim_events + sim_clock", _m008_sim_events),
+    (9, "price_rollups", _m009_price_rollups),
+    (10, "npc_ships", _m010_npc_ships),
+    (11, "locations.richness_max + richness_s", _m011_resource_depletion),
+    (12, "markets.local_market_baseline", _m012_market_baseline),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+# ---------- Runner ----------
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    return int(conn.execute("PRAGMA user_version").fetchone()[0])
+
+
+def set_schema_version(conn: sqlite3.Connection, version: int) -> None:
+    conn.execute(f"PRAGMA user_version = {int(version)}")
+
+
+def needs_migration(conn: sqlite3.Connection) -> bool:
+    return get_schema_version(conn) < SCHEMA_VERSION
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+    Apply every migration newer than the database's user_version, in order.
+    Each step commits together with its version bump. Returns the number of
+    migrations applied.
+    """
+    current = get_schema_version(conn)
+    applied = 0
+    for version, name, fn in MIGRATIONS:
+        if version <= current:
+            continue
+        try:
+            fn(conn)
+            set_schema_version(conn, version)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Schema migration {version} ({name}) failed: {e}")
+            raise
+        applied += 1
+        logger.debug(f"Applied schema migration {version}: {name}")
+    return applied
@@ -44,11 +44,19 @@ CREATE TABLE IF NOT EXISTS markets (
     item_id             INTEGER NOT NULL,
     local_market_price  INTEGER NOT NULL,
     local_market_stock  INTEGER NOT NULL,
+    local_market_baseline INTEGER,          -- equilibrium stock, fixed when the row is created
     PRIMARY KEY (system_id, item_id),
     FOREIGN KEY (system_id) REFERENCES systems(system_id) ON DELETE CASCADE,
     FOREIGN KEY (item_id) REFERENCES items(item_id) ON DELETE CASCADE
 );
 
+-- Rows inserted without a baseline take their opening stock as equilibrium
+CREATE TRIGGER IF NOT EXISTS markets_baseline AFTER INSERT ON markets
+WHEN NEW.local_market_baseline IS NULL
+BEGIN
+    UPDATE markets SET local_market_baseline = NEW.local_market_stock WHERE rowid = NEW.rowid;
+END;
+
 -- Locations inside a system (for system map), using HIERARCHICAL LOCAL AU COORDS
 CREATE TABLE IF NOT EXISTS locations (
     location_id          INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -63,6 +71,8 @@ CREATE TABLE IF NOT EXISTS locations (
   resource_type        TEXT,               -- resource-specific metadata (if this location is a resource)
   richness             INTEGER,
   regen_rate           REAL,
+  richness_max         REAL,               -- node cap; NULL until the resource engine first runs
+  richness_s           REAL,               -- sim clock (s) richness was last settled at
     FOREIGN KEY (system_id) REFERENCES systems(system_id) ON DELETE CASCADE,
     FOREIGN KEY (parent_location_id) REFERENCES locations(location_id) ON DELETE CASCADE
 );
@@ -82,6 +92,7 @@ CREATE TABLE IF NOT EXISTS player (
     current_player_location_id  INTEGER NULL,
     current_location_status     TEXT NOT NULL DEFAULT 'orbiting',  -- 'orbiting' | 'docked' | 'traveling'
     custom_ship_name            TEXT NULL,  -- Player's custom name for their current ship
+    docked_bay                  INTEGER NULL,  -- Bay number while docked at a station
     FOREIGN KEY (current_player_system_id) REFERENCES systems(system_id),
     FOREIGN KEY (current_player_ship_id) REFERENCES ships(ship_id),
     FOREIGN KEY (current_player_location_id) REFERENCES locations(location_id)
@@ -105,6 +116,37 @@ CREATE TABLE IF NOT EXISTS prices_history (
     FOREIGN KEY (item_id) REFERENCES items(item_id)
 );
 
+-- Price history rollups (game_controller/price_history.py): OHLC per bucket of
+-- res_s game seconds (60 / 3600 / 86400); bucket = sim-clock start second
+CREATE TABLE IF NOT EXISTS price_rollups (
+    res_s     INTEGER NOT NULL,
+    system_id INTEGER NOT NULL,
+    item_id   INTEGER NOT NULL,
+    bucket    INTEGER NOT NULL,
+    open      INTEGER NOT NULL,
+    high      INTEGER NOT NULL,
+    low       INTEGER NOT NULL,
+    close     INTEGER NOT NULL,
+    PRIMARY KEY (res_s, system_id, item_id, bucket)
+) WITHOUT ROWID;
+
+-- NPC ships (game_controller/npc_fleet.py): summary state only; next/dest are
+-- set while travelling, depart_s/arrive_s bound the current leg or dock stay
+CREATE TABLE IF NOT EXISTS npc_ships (
+    npc_id         INTEGER PRIMARY KEY,
+    ship_id        INTEGER NOT NULL,
+    system_id      INTEGER NOT NULL,
+    next_system_id INTEGER,
+    dest_system_id INTEGER,
+    state          INTEGER NOT NULL DEFAULT 0,
+    cargo_item_id  INTEGER,
+    cargo_qty      REAL NOT NULL DEFAULT 0,
+    depart_s       REAL NOT NULL DEFAULT 0,
+    arrive_s       REAL NOT NULL DEFAULT 0,
+    FOREIGN KEY(ship_id) REFERENCES ships(ship_id) ON DELETE CASCADE,
+    FOREIGN KEY(system_id) REFERENCES systems(system_id) ON DELETE CASCADE
+);
+
 -----------------------------------------------------------------
 -- New v2 tables for universe seed
 -----------------------------------------------------------------
@@ -184,6 +226,32 @@ CREATE TABLE IF NOT EXISTS facility_outputs (
   FOREIGN KEY(item_id)     REFERENCES items(item_id) ON DELETE CASCADE
 );
 
+-- Facility inventory (stock held at each facility; written by the sim production step)
+CREATE TABLE IF NOT EXISTS facility_inventory (
+  facility_id INTEGER NOT NULL,
+  item_id     INTEGER NOT NULL,
+  qty         REAL NOT NULL DEFAULT 0,
+  PRIMARY KEY (facility_id, item_id),
+  FOREIGN KEY(facility_id) REFERENCES facilities(facility_id) ON DELETE CASCADE,
+  FOREIGN KEY(item_id)     REFERENCES items(item_id) ON DELETE CASCADE
+);
+
+-- Scheduled simulation events (game_controller/sim_events.py); due_s is on the sim clock
+CREATE TABLE IF NOT EXISTS sim_events (
+  event_id   INTEGER PRIMARY KEY,
+  due_s      REAL NOT NULL,
+  kind       TEXT NOT NULL,
+  entity_id  INTEGER,
+  payload    TEXT,                      -- JSON, optional
+  interval_s REAL NOT NULL DEFAULT 0    -- > 0: repeats every interval_s
+);
+
+-- Simulation clock (single row): game seconds simulated in this save
+CREATE TABLE IF NOT EXISTS sim_clock (
+  id    INTEGER PRIMARY KEY CHECK (id = 1),
+  now_s REAL NOT NULL DEFAULT 0
+);
+
 -- Ship roles for AI/consumption hooks
 CREATE TABLE IF NOT EXISTS ship_roles (
   ship_id INTEGER NOT NULL,
@@ -212,5 +280,6 @@ CREATE INDEX IF NOT EXISTS idx_locations_sys_name ON locations(system_id, locati
 CREATE INDEX IF NOT EXISTS idx_prices_hist_ts     ON prices_history(ts);
 CREATE INDEX IF NOT EXISTS idx_gates_a            ON gate_links(system_a_id);
 CREATE INDEX IF NOT EXISTS idx_gates_b            ON gate_links(system_b_id);
+CREATE INDEX IF NOT EXISTS idx_npc_ships_system   ON npc_ships(system_id);
 CREATE INDEX IF NOT EXISTS idx_races_name         ON races(name);
 CREATE INDEX IF NOT EXISTS idx_sys_econ_tag       ON system_econ_tags(tag);
@@ -8,53 +8,190 @@ Handles database initialization and data seeding:
 - Seeds universe data from universe_seed.json
 - Provides database reset and migration functionality
 - Manages initial game world state
+- Streams the seed file: top-level arrays are parsed record by record and
+  inserted in chunks inside one transaction, so memory stays flat for
+  multi-hundred-MB synthetic universes (data/universe_gen.py)
+- Foreign keys are deferred to commit, so rows go in a single pass in file
+  order; dangling references are cleaned up set-wise before committing
 """
 
 from __future__ import annotations
 
 import json
+import os
+import re
 import sqlite3
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Any, Tuple, Iterable, Optional
+from typing import Dict, List, Any, Tuple, Iterable, Iterator, Optional, TextIO
 
 ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = ROOT / "data"
 SEED_PATHS = [DATA_DIR / "universe_seed.json", DATA_DIR / "universe_seed_v2.json"]
+# Overrides SEED_PATHS, e.g. with a synthetic universe from data/universe_gen.py (stress mode).
+SEED_PATH_ENV = "VICTURUS_SEED_PATH"
+
+# Rows per executemany batch, and characters per read from the seed file.
+SEED_CHUNK_ROWS = 5000
+STREAM_READ_CHARS = 1 << 16
+
+# Foreign keys that are cleared (rather than the row dropped) when they dangle.
+_NULLABLE_REFS = {("locations", "parent_location_id"), ("ownerships", "race_id")}
+# Seeded tables, parents first; checked for dangling references before commit.
+_SEEDED_TABLES = (
+    "items", "ships", "systems", "system_econ_tags", "markets", "locations", "races",
+    "ownerships", "diplomacy", "gate_links", "facilities", "facility_inputs",
+    "facility_outputs", "ship_roles", "consumption_profiles_ship",
+)
 
 
 # ----------------------------- helpers -----------------------------
 
+def _chunks(rows: Iterable[Any], size: int = SEED_CHUNK_ROWS) -> Iterator[List[Any]]:
+    it = iter(rows)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
 def _try_execmany(cur: sqlite3.Cursor, sql: str, rows: Iterable[tuple]) -> None:
-    """Execute a batch. On FK errors, retry row-by-row and skip offending rows."""
-    rows = list(rows)
-    if not rows:
-        return
-    try:
-        cur.executemany(sql, rows)
-        return
-    except sqlite3.IntegrityError:
-        pass  # fall back to row-by-row
-
-    for r in rows:
+    """Execute in chunks. On integrity errors, retry the chunk row-by-row and skip offending rows."""
+    for chunk in _chunks(rows):
         try:
-            cur.execute(sql, r)
-        except sqlite3.IntegrityError:
-            # Skip bad row silently
+            cur.executemany(sql, chunk)
             continue
+        except sqlite3.IntegrityError:
+            pass  # fall back to row-by-row
+
+        for r in chunk:
+            try:
+                cur.execute(sql, r)
+            except sqlite3.IntegrityError:
+                # Skip bad row silently
+                continue
 
 
 # ----------------------------- seed loading -----------------------------
 
-def _load_seed() -> Dict[str, Any]:
-    for p in SEED_PATHS:
+def seed_paths() -> List[Path]:
+    """Candidate seed files in priority order; VICTURUS_SEED_PATH, when set, is the only one."""
+    override = os.getenv(SEED_PATH_ENV, "").strip()
+    return [Path(override)] if override else list(SEED_PATHS)
+
+
+def _find_seed(seed_path: Optional[Path] = None) -> Path:
+    paths = [Path(seed_path)] if seed_path is not None else seed_paths()
+    for p in paths:
         if p.exists():
-            with open(p, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return p
     raise FileNotFoundError(
-        f"No universe seed found. Looked for: {', '.join(str(p) for p in SEED_PATHS)}"
+        f"No universe seed found. Looked for: {', '.join(str(p) for p in paths)}"
     )
 
 
+_WS = re.compile(r"[ \t\n\r]*")
+# Characters that can continue a JSON number cut off at the end of a read.
+_NUMBER_CHARS = frozenset("0123456789+-.eE")
+
+
+class SeedStream:
+    """
+    Incremental reader for a seed document: a top-level JSON object whose
+    large values are arrays. sections() yields (key, value) in file order;
+    array values are generators over their elements, so only one record is
+    decoded at a time. An array the consumer doesn't finish is skipped
+    before the next section is read.
+    """
+
+    def __init__(self, fp: TextIO, read_chars: int = STREAM_READ_CHARS) -> None:
+        self._fp = fp
+        self._read_chars = int(read_chars)
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _more(self) -> bool:
+        if self._eof:
+            return False
+        data = self._fp.read(self._read_chars)
+        if not data:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + data
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        buf, pos = self._buf, self._pos
+        if pos < len(buf) and buf[pos] not in " \t\n\r":
+            return buf[pos]
+        while True:
+            self._pos = _WS.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._more():
+                return ""
+
+    def _expect(self, ch: str) -> None:
+        got = self._peek()
+        if got != ch:
+            raise ValueError(f"Malformed seed JSON: expected {ch!r}, got {got or 'end of file'!r}")
+        self._pos += 1
+
+    def _value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                val, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._more():
+                    continue
+                raise
+            # A value touching the end of the buffer (e.g. a number) may continue in the next read.
+            if (end >= len(self._buf) or self._buf[end] in _NUMBER_CHARS) and self._more():
+                continue
+            self._pos = end
+            return val
+
+    def _items(self) -> Iterator[Any]:
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            sep = self._peek()
+            self._pos += 1
+            if sep == "]":
+                return
+            if sep != ",":
+                raise ValueError(f"Malformed seed JSON: expected ',' or ']' in array, got {sep or 'end of file'!r}")
+
+    def sections(self) -> Iterator[Tuple[str, Any]]:
+        self._expect("{")
+        if self._peek() == "}":
+            return
+        while True:
+            key = self._value()
+            self._expect(":")
+            if self._peek() == "[":
+                self._pos += 1
+                items = self._items()
+                yield key, items
+                for _ in items:
+                    pass
+            else:
+                yield key, self._value()
+            sep = self._peek()
+            self._pos += 1
+            if sep == "}":
+                return
+            if sep != ",":
+                raise ValueError(f"Malformed seed JSON: expected ',' or '}}', got {sep or 'end of file'!r}")
+
+
 # ----------------------------- normalization -----------------------------
 
 def _norm_loc_type(t: str) -> str:
@@ -85,400 +222,347 @@ def _prepare_location_row(loc: Dict[str, Any]) -> Tuple[int, int, str, str, floa
     )
 
 
-# ----------------------------- location insertion -----------------------------
+# ----------------------------- section loaders -----------------------------
+# Each takes the cursor and the section's records (a generator for arrays).
+
+def _load_items(cur: sqlite3.Cursor, items: Iterable[Dict[str, Any]]) -> None:
+    _try_execmany(
+        cur,
+        """        INSERT OR REPLACE INTO items
+          (item_id, item_name, item_base_price, item_description, item_category)
+        VALUES (?, ?, ?, ?, ?);
+        """,
+        (
+            (
+                it["item_id"],
+                it["item_name"],
+                it.get("item_base_price", 0),
+                it.get("item_description"),
+                it.get("item_category"),
+            )
+            for it in items
+        ),
+    )
 
-def _insert_locations_topologically(cur: sqlite3.Cursor, locs: List[Dict[str, Any]]) -> Tuple[set[int], List[Tuple]]:
-    """
-    Insert locations while respecting parent -> child dependencies.
-    Filters out locations whose system_id is not present.
-    If parent id not present among the seed's location ids, parent is set to NULL.
-    In cycles, remaining parents are set to NULL and inserted if possible.
-    Leaves all icon_path columns NULL; New Game creation assigns icons once.
-    Returns: (inserted_ids, forced_or_skipped_rows)
-    """
-    if not locs:
-        return set(), []
 
-    system_ids = {row[0] for row in cur.execute("SELECT system_id FROM systems").fetchall()}
-    rows = [_prepare_location_row(l) for l in locs]
-    rows = [r for r in rows if r[1] in system_ids]
+def _load_ships(cur: sqlite3.Cursor, ships: Iterable[Dict[str, Any]]) -> None:
+    _try_execmany(
+        cur,
+        """        INSERT OR REPLACE INTO ships
+          (ship_id, ship_name, base_ship_cargo, base_ship_fuel,
+           base_ship_jump_distance, base_ship_shield, base_ship_hull, base_ship_energy)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?);
+        """,
+        (
+            (
+                sh.get("ship_id"),
+                sh["ship_name"],
+                int(sh.get("base_ship_cargo", 0)),
+                int(sh.get("base_ship_fuel", 0)),
+                float(sh.get("base_ship_jump_distance", 0.0)),
+                int(sh.get("base_ship_shield", 0)),
+                int(sh.get("base_ship_hull", 0)),
+                int(sh.get("base_ship_energy", 0)),
+            )
+            for sh in ships
+        ),
+    )
+
+
+def _load_systems(cur: sqlite3.Cursor, systems: Iterable[Dict[str, Any]]) -> None:
+    for chunk in _chunks(systems):
+        _try_execmany(
+            cur,
+            """            INSERT OR REPLACE INTO systems
+              (system_id, system_name, system_x, system_y, icon_path)
+            VALUES (?, ?, ?, ?, ?);
+            """,
+            [(s["system_id"], s["system_name"], int(s["system_x"]), int(s["system_y"]), s.get("icon_path"))
+             for s in chunk],
+        )
+        # econ tags (optional)
+        _try_execmany(
+            cur,
+            "INSERT OR IGNORE INTO system_econ_tags (system_id, tag) VALUES (?, ?);",
+            [(s["system_id"], str(t)) for s in chunk for t in (s.get("econ_tags") or [])],
+        )
 
-    valid_loc_ids = {r[0] for r in rows}
 
-    sanitized: Dict[int, Tuple] = {}
-    forced: List[Tuple] = []  # rows we had to force parent=NULL or skip later
-    for r in rows:
-        lid, sid, name, lt, x, y, parent_id, desc = r
-        if parent_id is not None and parent_id not in valid_loc_ids:
-            parent_id = None
-            forced.append(r)
-        sanitized[lid] = (lid, sid, name, lt, x, y, parent_id, desc)
+def _load_markets(cur: sqlite3.Cursor, markets: Iterable[Dict[str, Any]]) -> None:
+    _try_execmany(
+        cur,
+        """        INSERT OR REPLACE INTO markets
+          (system_id, item_id, local_market_price, local_market_stock)
+        VALUES (?, ?, ?, ?);
+        """,
+        (
+            (m["system_id"], m["item_id"], int(m["local_market_price"]), int(m["local_market_stock"]))
+            for m in markets
+        ),
+    )
 
-    pending = dict(sanitized)  # lid -> row
-    inserted: set[int] = set()
 
-    sql = """        INSERT OR REPLACE INTO locations
+def _load_locations(cur: sqlite3.Cursor, locs: Iterable[Dict[str, Any]]) -> None:
+    """
+    Single pass in file order: foreign keys are deferred, so children may
+    precede their parents. Icons stay NULL here (stars get the system icon in
+    _finish_locations); New Game creation assigns the rest once.
+    """
+    _try_execmany(
+        cur,
+        """        INSERT OR REPLACE INTO locations
           (location_id, system_id, location_name, location_type,
            location_x, location_y, parent_location_id, location_description, icon_path)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);
-    """
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, NULL);
+        """,
+        (_prepare_location_row(l) for l in locs),
+    )
 
-    def _row_with_icon(base_row: Tuple[int, int, str, str, float, float, Optional[int], Optional[str]],
-                       parent_override: Optional[int] = None) -> Tuple:
-        """Return a row tuple including an icon_path value.
-    For stars, copy systems.icon_path into locations.icon_path. Otherwise NULL.
-        """
-        lid, sid, name, lt, x, y, parent_id, desc = base_row
-        if parent_override is not None:
-            parent_id = parent_override
-        icon_path: Optional[str] = None
-        if lt == "star":
-            # For stars, copy systems.icon_path into locations.icon_path when present.
-            row = cur.execute("SELECT icon_path FROM systems WHERE system_id=?;", (sid,)).fetchone()
-            if row:
-                icon_path = row[0]
-        return (lid, sid, name, lt, x, y, parent_id, desc, icon_path)
-
-    safety = 0
-    while pending and safety < 20000:
-        safety += 1
-        ready_ids = [lid for lid, r in pending.items() if (r[6] is None or r[6] in inserted)]
-        if not ready_ids:
-            # break the deadlock: force parent=NULL for all remaining
-            to_force = list(pending.items())
-            for lid, r in to_force:
-                _, sid, name, lt, x, y, _pid, desc = r
-                r2 = _row_with_icon((lid, sid, name, lt, x, y, None, desc))
-                try:
-                    cur.execute(sql, r2)
-                    inserted.add(lid)
-                    forced.append(r)
-                except sqlite3.IntegrityError:
-                    # skip if still not insertable
-                    pass
-                pending.pop(lid, None)
-            break
 
-        for lid in ready_ids:
-            r = pending.pop(lid)
-            try:
-                cur.execute(sql, _row_with_icon(r))
-                inserted.add(lid)
-            except sqlite3.IntegrityError:
-                # retry with parent=NULL
-                r2 = _row_with_icon(r, parent_override=None)
-                try:
-                    cur.execute(sql, r2)
-                    inserted.add(lid)
-                    forced.append(r)
-                except sqlite3.IntegrityError:
-                    # skip if still failing
-                    pass
+def _load_warpgates(cur: sqlite3.Cursor, gates: Iterable[Dict[str, Any]]) -> None:
+    # Staged: gate locations may appear later in the file; resolved in _finish_locations.
+    _try_execmany(
+        cur,
+        "INSERT OR REPLACE INTO temp.seed_warpgates (system_id, location_id) VALUES (?, ?);",
+        (
+            (wg["system_id"], wg["location_id"])
+            for wg in gates
+            if wg.get("system_id") is not None and wg.get("location_id") is not None
+        ),
+    )
 
-    return inserted, forced
 
+def _load_races(cur: sqlite3.Cursor, races: Iterable[Dict[str, Any]]) -> None:
+    _try_execmany(
+        cur,
+        """        INSERT OR REPLACE INTO races
+          (race_id, name, adjective, description, tech_theme, ship_doctrine,
+           government, color, home_system_id, home_planet_location_id, starting_world)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+        """,
+        (
+            (
+                r["race_id"],
+                r["name"],
+                r.get("adjective"),
+                r.get("description"),
+                r.get("tech_theme"),
+                r.get("ship_doctrine"),
+                r.get("government"),
+                r.get("color"),
+                r.get("home_system_id"),
+                r.get("home_planet_location_id"),
+                1 if r.get("starting_world", 1) else 0,
+            )
+            for r in races
+        ),
+    )
 
-# ----------------------------- main seed -----------------------------
 
-def seed(conn: sqlite3.Connection) -> None:
-    cur = conn.cursor()
-    seed = _load_seed()
+def _load_ownerships(cur: sqlite3.Cursor, owners: Iterable[Dict[str, Any]]) -> None:
+    _try_execmany(
+        cur,
+        "INSERT OR REPLACE INTO ownerships (system_id, race_id, status) VALUES (?, ?, ?);",
+        ((o["system_id"], o.get("race_id"), o.get("status", "unclaimed")) for o in owners),
+    )
 
-    # ----------------- items -----------------
-    if seed.get("items"):
-        _try_execmany(
-            cur,
-            """            INSERT OR REPLACE INTO items
-              (item_id, item_name, item_base_price, item_description, item_category)
-            VALUES (?, ?, ?, ?, ?);
-            """,
-            [
-                (
-                    it["item_id"],
-                    it["item_name"],
-                    it.get("item_base_price", 0),
-                    it.get("item_description"),
-                    it.get("item_category"),
-                )
-                for it in seed["items"]
-            ],
-        )
 
-    # ----------------- ships -----------------
-    if seed.get("ships"):
-        _try_execmany(
-            cur,
-            """            INSERT OR REPLACE INTO ships
-              (ship_id, ship_name, base_ship_cargo, base_ship_fuel,
-               base_ship_jump_distance, base_ship_shield, base_ship_hull, base_ship_energy)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?);
-            """,
-            [
-                (
-                    sh.get("ship_id"),
-                    sh["ship_name"],
-                    int(sh.get("base_ship_cargo", 0)),
-                    int(sh.get("base_ship_fuel", 0)),
-                    float(sh.get("base_ship_jump_distance", 0.0)),
-                    int(sh.get("base_ship_shield", 0)),
-                    int(sh.get("base_ship_hull", 0)),
-                    int(sh.get("base_ship_energy", 0)),
-                )
-                for sh in seed["ships"]
-            ],
-        )
+def _load_diplomacy(cur: sqlite3.Cursor, pairs: Iterable[Dict[str, Any]]) -> None:
+    _try_execmany(
+        cur,
+        "INSERT OR REPLACE INTO diplomacy (race_a_id, race_b_id, stance, status) VALUES (?, ?, ?, ?);",
+        (
+            (d["race_a_id"], d["race_b_id"], int(d.get("stance", 0)), d.get("status", "neutral"))
+            for d in pairs
+            if d["race_a_id"] != d["race_b_id"]
+        ),
+    )
 
-    # ----------------- systems -----------------
-    if seed.get("systems"):
-        sys_rows = [
-            (
-                s["system_id"],
-                s["system_name"],
-                int(s["system_x"]),
-                int(s["system_y"]),
-                s.get("icon_path"),
-            )
-            for s in seed["systems"]
-        ]
-        _try_execmany(
-            cur,
-            """            INSERT OR REPLACE INTO systems
-              (system_id, system_name, system_x, system_y, icon_path)
-            VALUES (?, ?, ?, ?, ?);
-            """ ,
-            sys_rows,
-        )
 
-        # econ tags (optional)
-        tag_rows = []
-        for s in seed["systems"]:
-            tags = s.get("econ_tags") or []
-            for t in tags:
-                tag_rows.append((s["system_id"], str(t)))
-        if tag_rows:
-            _try_execmany(
-                cur,
-                "INSERT OR IGNORE INTO system_econ_tags (system_id, tag) VALUES (?, ?);" ,
-                tag_rows,
-            )
+def _gate_link_rows(links: Iterable[Dict[str, Any]]) -> Iterator[Tuple[int, int, float]]:
+    for gl in links:
+        a = gl.get("a") or gl.get("system_a_id")
+        b = gl.get("b") or gl.get("system_b_id")
+        if a is None or b is None:
+            continue
+        a2, b2 = (a, b) if a <= b else (b, a)  # canonicalize undirected edges as (min,max)
+        dist = float(gl["distance_pc"]) if gl.get("distance_pc") is not None else 0.0
+        yield a2, b2, dist
 
-    # Precompute system_ids
-    system_ids = {row[0] for row in cur.execute("SELECT system_id FROM systems").fetchall()}
 
-    # ----------------- markets -----------------
-    if seed.get("markets"):
-        _try_execmany(
-            cur,
-            """            INSERT OR REPLACE INTO markets
-              (system_id, item_id, local_market_price, local_market_stock)
-            VALUES (?, ?, ?, ?);
-            """ ,
-            [
-                (
-                    m["system_id"],
-                    m["item_id"],
-                    int(m["local_market_price"]),
-                    int(m["local_market_stock"]),
-                )
-                for m in seed["markets"]
-                if m["system_id"] in system_ids
-            ],
-        )
+def _load_gate_links(cur: sqlite3.Cursor, links: Iterable[Dict[str, Any]]) -> None:
+    _try_execmany(
+        cur,
+        "INSERT OR REPLACE INTO gate_links (system_a_id, system_b_id, distance_pc) VALUES (?, ?, ?);",
+        _gate_link_rows(links),
+    )
 
-    # ----------------- locations (topological) -----------------
-    inserted_loc_ids: set[int] = set()
-    if seed.get("locations"):
-        inserted_loc_ids, _ = _insert_locations_topologically(cur, seed["locations"])
-
-    # ----------------- ensure warpgate location rows exist -----------------
-    if seed.get("warpgates"):
-        for wg in seed["warpgates"]:
-            sid = wg.get("system_id")
-            lid = wg.get("location_id")
-            if sid is None or lid is None:
-                continue
-            if sid not in system_ids:
-                continue
-            row = cur.execute("SELECT system_id, location_type FROM locations WHERE location_id=?;", (lid,)).fetchone()
-            if row is None:
-                # create a minimal warp gate location at (0,0) with name 'Warp Gate'
-                try:
-                    cur.execute(
-                        """                        INSERT OR REPLACE INTO locations
-                          (location_id, system_id, location_name, location_type, location_x, location_y, parent_location_id, location_description, icon_path)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);
-                        """ ,
-                        (lid, sid, "Warp Gate", "warp_gate", 0.0, 0.0, None, None, None),
-                    )
-                    inserted_loc_ids.add(int(lid))
-                except sqlite3.IntegrityError:
-                    pass
-            else:
-                if row[0] == sid and row[1] != "warp_gate":
-                    # normalize existing row to warp_gate type
-                    cur.execute("UPDATE locations SET location_type='warp_gate' WHERE location_id=?;", (lid,))
 
-    # ----------------- races / ownership / diplomacy -----------------
-    if seed.get("races"):
-        _try_execmany(
-            cur,
-            """            INSERT OR REPLACE INTO races
-              (race_id, name, adjective, description, tech_theme, ship_doctrine,
-               government, color, home_system_id, home_planet_location_id, starting_world)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
-            """ ,
-            [
-                (
-                    r["race_id"],
-                    r["name"],
-                    r.get("adjective"),
-                    r.get("description"),
-                    r.get("tech_theme"),
-                    r.get("ship_doctrine"),
-                    r.get("government"),
-                    r.get("color"),
-                    r.get("home_system_id"),
-                    r.get("home_planet_location_id"),
-                    1 if r.get("starting_world", 1) else 0,
-                )
-                for r in seed["races"]
-            ],
-        )
+def _load_resource_nodes(cur: sqlite3.Cursor, nodes: Iterable[Dict[str, Any]]) -> None:
+    # Staged: merged into the corresponding `locations` rows in _finish_locations.
+    _try_execmany(
+        cur,
+        "INSERT OR REPLACE INTO temp.seed_resource_nodes (location_id, resource_type, richness, regen_rate) "
+        "VALUES (?, ?, ?, ?);",
+        (
+            (rn["location_id"], _norm_resource_type(rn["resource_type"]),
+             int(rn.get("richness", 0)), float(rn.get("regen_rate", 0.0)))
+            for rn in nodes
+        ),
+    )
 
-    # Precompute race_ids (for ownership/diplomacy)
-    race_ids = {row[0] for row in cur.execute("SELECT race_id FROM races").fetchall()}
 
-    if seed.get("ownerships"):
-        own_rows = []
-        for o in seed["ownerships"]:
-            sid = o["system_id"]
-            rid = o.get("race_id")
-            if sid not in system_ids:
-                continue
-            if rid is not None and rid not in race_ids:
-                rid = None
-            own_rows.append((sid, rid, o.get("status", "unclaimed")))
+def _load_facilities(cur: sqlite3.Cursor, facilities: Iterable[Dict[str, Any]]) -> None:
+    for chunk in _chunks(facilities):
         _try_execmany(
             cur,
-            "INSERT OR REPLACE INTO ownerships (system_id, race_id, status) VALUES (?, ?, ?);" ,
-            own_rows,
+            "INSERT OR REPLACE INTO facilities (facility_id, location_id, facility_type, notes) VALUES (?, ?, ?, ?);",
+            [(f["facility_id"], f["location_id"], f["facility_type"], f.get("notes")) for f in chunk],
         )
-
-    if seed.get("diplomacy"):
-        dip_rows = []
-        for d in seed["diplomacy"]:
-            a = d["race_a_id"]
-            b = d["race_b_id"]
-            if a == b:
-                continue
-            if a in race_ids and b in race_ids:
-                dip_rows.append((a, b, int(d.get("stance", 0)), d.get("status", "neutral")))
         _try_execmany(
             cur,
-            "INSERT OR REPLACE INTO diplomacy (race_a_id, race_b_id, stance, status) VALUES (?, ?, ?, ?);" ,
-            dip_rows,
+            "INSERT OR REPLACE INTO facility_inputs (facility_id, item_id, rate) VALUES (?, ?, ?);",
+            [(f["facility_id"], ent["item_id"], float(ent["rate"])) for f in chunk for ent in f.get("inputs", [])],
         )
-
-    # ----------------- warp graph -----------------
-    if seed.get("gate_links"):
-        gl_set = set()  # canonicalize undirected edges as (min,max)
-        for gl in seed["gate_links"]:
-            a = gl.get("a") or gl.get("system_a_id")
-            b = gl.get("b") or gl.get("system_b_id")
-            if a is None or b is None:
-                continue
-            if a not in system_ids or b not in system_ids:
-                continue
-            a2, b2 = (a, b) if a <= b else (b, a)
-            dist = float(gl["distance_pc"]) if gl.get("distance_pc") is not None else 0.0
-            gl_set.add((a2, b2, dist))
-        gl_rows = list(gl_set)
         _try_execmany(
             cur,
-            "INSERT OR REPLACE INTO gate_links (system_a_id, system_b_id, distance_pc) VALUES (?, ?, ?);" ,
-            gl_rows,
+            "INSERT OR REPLACE INTO facility_outputs (facility_id, item_id, rate) VALUES (?, ?, ?);",
+            [(f["facility_id"], ent["item_id"], float(ent["rate"])) for f in chunk for ent in f.get("outputs", [])],
         )
 
-    # ----------------- resources & facilities -----------------
-    if seed.get("resource_nodes"):
-        # Merge resource node metadata into the corresponding `locations` rows.
-        for rn in seed["resource_nodes"]:
-            lid = rn["location_id"]
-            if lid not in inserted_loc_ids:
-                continue
-            rtype = _norm_resource_type(rn["resource_type"])
-            try:
-                cur.execute(
-                    "UPDATE locations SET resource_type=?, richness=?, regen_rate=? WHERE location_id=?",
-                    (rtype, int(rn.get("richness", 0)), float(rn.get("regen_rate", 0.0)), lid),
-                )
-            except Exception:
-                # ignore problematic resource rows during seed
-                continue
 
-    if seed.get("facilities"):
-        fac_rows = []
-        finputs = []
-        foutputs = []
+def _load_ship_roles(cur: sqlite3.Cursor, ship_roles: Iterable[Dict[str, Any]]) -> None:
+    _try_execmany(
+        cur,
+        "INSERT OR IGNORE INTO ship_roles (ship_id, role) VALUES (?, ?);",
+        ((sr["ship_id"], role) for sr in ship_roles for role in sr.get("roles", [])),
+    )
 
-        for f in seed["facilities"]:
-            lid = f["location_id"]
-            if lid not in inserted_loc_ids:
-                continue
-            fac_rows.append((f["facility_id"], lid, f["facility_type"], f.get("notes")))
-            for ent in f.get("inputs", []):
-                finputs.append((f["facility_id"], ent["item_id"], float(ent["rate"])))
-            for ent in f.get("outputs", []):
-                foutputs.append((f["facility_id"], ent["item_id"], float(ent["rate"])))
-
-        if fac_rows:
-            _try_execmany(
-                cur,
-                "INSERT OR REPLACE INTO facilities (facility_id, location_id, facility_type, notes) VALUES (?, ?, ?, ?);" ,
-                fac_rows,
-            )
-        if finputs:
-            _try_execmany(
-                cur,
-                "INSERT OR REPLACE INTO facility_inputs (facility_id, item_id, rate) VALUES (?, ?, ?);" ,
-                finputs,
-            )
-        if foutputs:
-            _try_execmany(
-                cur,
-                "INSERT OR REPLACE INTO facility_outputs (facility_id, item_id, rate) VALUES (?, ?, ?);" ,
-                foutputs,
-            )
 
-    # ----------------- ship roles -----------------
-    if seed.get("ship_roles"):
-        sr_rows = []
-        for sr in seed["ship_roles"]:
-            sid = sr["ship_id"]
-            for role in sr.get("roles", []):
-                sr_rows.append((sid, role))
-        if sr_rows:
-            _try_execmany(
-                cur,
-                "INSERT OR IGNORE INTO ship_roles (ship_id, role) VALUES (?, ?);" ,
-                sr_rows,
-            )
+def _load_consumption_profiles(cur: sqlite3.Cursor, cp: Dict[str, Any]) -> None:
+    # ship profiles only
+    _try_execmany(
+        cur,
+        "INSERT OR REPLACE INTO consumption_profiles_ship (role, item_id, rate) VALUES (?, ?, ?);",
+        (
+            (str(prof.get("role", "any")), ent["item_id"], float(ent["rate"]))
+            for prof in ((cp or {}).get("ship") or [])
+            for ent in prof.get("consumes", [])
+        ),
+    )
 
-    # ----------------- consumption profiles (ships) -----------------
-    cp = seed.get("consumption_profiles") or {}
-    ship_profiles = cp.get("ship") or []
-    if ship_profiles:
-        rows = []
-        for prof in ship_profiles:
-            role = str(prof.get("role", "any"))
-            for ent in prof.get("consumes", []):
-                rows.append((role, ent["item_id"], float(ent["rate"])))
-        if rows:
-            _try_execmany(
-                cur,
-                "INSERT OR REPLACE INTO consumption_profiles_ship (role, item_id, rate) VALUES (?, ?, ?);" ,
-                rows,
-            )
+
+_SECTION_LOADERS = {
+    "items": _load_items,
+    "ships": _load_ships,
+    "systems": _load_systems,
+    "markets": _load_markets,
+    "locations": _load_locations,
+    "warpgates": _load_warpgates,
+    "races": _load_races,
+    "ownerships": _load_ownerships,
+    "diplomacy": _load_diplomacy,
+    "gate_links": _load_gate_links,
+    "resource_nodes": _load_resource_nodes,
+    "facilities": _load_facilities,
+    "ship_roles": _load_ship_roles,
+    "consumption_profiles": _load_consumption_profiles,
+}
+
+
+# ----------------------------- post-load fixups -----------------------------
+
+def _drop_dangling_refs(cur: sqlite3.Cursor) -> int:
+    """
+    Resolve rows whose foreign keys point nowhere (deferred checks would fail
+    the commit): optional references in _NULLABLE_REFS are cleared, other
+    rows are dropped. Repeats until clean, since a dropped parent can orphan
+    its children. Returns the number of rows touched.
+    """
+    fk_cols: Dict[Tuple[str, int], List[str]] = {}
+    for table in _SEEDED_TABLES:
+        for row in cur.execute(f"PRAGMA foreign_key_list({table});").fetchall():
+            fk_cols.setdefault((table, row[0]), []).append(row[3])
+    touched = 0
+    while True:
+        bad = []
+        for table in _SEEDED_TABLES:
+            bad.extend(cur.execute(f"PRAGMA foreign_key_check({table});").fetchall())
+        if not bad:
+            return touched
+        for table, rowid, _parent, fkid in bad:
+            cols = fk_cols.get((table, fkid), [])
+            if len(cols) == 1 and (table, cols[0]) in _NULLABLE_REFS:
+                cur.execute(f"UPDATE {table} SET {cols[0]} = NULL WHERE rowid = ?;", (rowid,))
+            else:
+                cur.execute(f"DELETE FROM {table} WHERE rowid = ?;", (rowid,))
+            touched += 1
+
+
+def _finish_locations(cur: sqlite3.Cursor) -> None:
+    # Warp gates: create missing gate locations, normalize the type of existing ones.
+    cur.execute(
+        """        INSERT OR IGNORE INTO locations
+          (location_id, system_id, location_name, location_type, location_x, location_y,
+           parent_location_id, location_description, icon_path)
+        SELECT w.location_id, w.system_id, 'Warp Gate', 'warp_gate', 0.0, 0.0, NULL, NULL, NULL
+        FROM temp.seed_warpgates w
+        WHERE w.system_id IN (SELECT system_id FROM systems)
+          AND w.location_id NOT IN (SELECT location_id FROM locations);
+        """
+    )
+    cur.execute(
+        """        UPDATE locations SET location_type = 'warp_gate'
+        WHERE location_id IN (SELECT location_id FROM temp.seed_warpgates)
+          AND location_type <> 'warp_gate'
+          AND system_id = (SELECT w.system_id FROM temp.seed_warpgates w WHERE w.location_id = locations.location_id);
+        """
+    )
+    # Resource node metadata merges into the corresponding `locations` rows.
+    cur.execute(
+        """        UPDATE locations SET
+          resource_type = (SELECT r.resource_type FROM temp.seed_resource_nodes r WHERE r.location_id = locations.location_id),
+          richness      = (SELECT r.richness      FROM temp.seed_resource_nodes r WHERE r.location_id = locations.location_id),
+          regen_rate    = (SELECT r.regen_rate    FROM temp.seed_resource_nodes r WHERE r.location_id = locations.location_id)
+        WHERE location_id IN (SELECT location_id FROM temp.seed_resource_nodes);
+        """
+    )
+    # For stars, copy systems.icon_path into locations.icon_path when present.
+    cur.execute(
+        """        UPDATE locations SET icon_path = (SELECT s.icon_path FROM systems s WHERE s.system_id = locations.system_id)
+        WHERE location_type = 'star';
+        """
+    )
+
+
+# ----------------------------- main seed -----------------------------
+
+def seed(conn: sqlite3.Connection, seed_path: Optional[Path] = None) -> None:
+    cur = conn.cursor()
+    path = _find_seed(seed_path)
+
+    cur.execute("CREATE TEMP TABLE IF NOT EXISTS seed_warpgates (location_id INTEGER PRIMARY KEY, system_id INTEGER);")
+    cur.execute(
+        "CREATE TEMP TABLE IF NOT EXISTS seed_resource_nodes "
+        "(location_id INTEGER PRIMARY KEY, resource_type TEXT, richness INTEGER, regen_rate REAL);"
+    )
+    # One transaction for the whole load; foreign keys are checked at its
+    # COMMIT instead of per statement, so sections load in file order.
+    # (The pragma resets at every commit, so it must follow the DDL above.)
+    if not conn.in_transaction:
+        cur.execute("BEGIN;")
+    cur.execute("PRAGMA defer_foreign_keys = ON;")
+    cur.execute("DELETE FROM temp.seed_warpgates;")
+    cur.execute("DELETE FROM temp.seed_resource_nodes;")
+
+    with open(path, "r", encoding="utf-8") as f:
+        for key, value in SeedStream(f).sections():
+            loader = _SECTION_LOADERS.get(key)
+            if loader is not None and value:
+                loader(cur, value)
+
+    _drop_dangling_refs(cur)
+    _finish_locations(cur)
 
     # ----------------- player row -----------------
     # Provide a default player so the UI can load even before "New Game" places the commander.
@@ -523,3 +607,5 @@ def seed(conn: sqlite3.Connection) -> None:
             )
 
     conn.commit()
+    cur.execute("DROP TABLE IF EXISTS temp.seed_warpgates;")
+    cur.execute("DROP TABLE IF EXISTS temp.seed_resource_nodes;")
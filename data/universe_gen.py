@@ -0,0 +1,481 @@
+# /data/universe_gen.py
+
+"""
+Victurus Synthetic Universe Generator
+
+Procedural universes in the universe_seed.json format for scale testing:
+- Parameterised by system count (up to 100k), locations per system and gate
+  link density; the same seed always produces the same universe
+- Systems, a location hierarchy per system (star, planets, moons, stations,
+  resource pockets, warpgate), warpgates, gate_links, resource nodes,
+  facilities, races, ownerships and diplomacy
+- Catalogs (items, ships, ship roles, consumption profiles) and facility
+  recipes are taken from the base seed so the economy stays consistent
+- Written as a stream, so 100k-system seeds don't need the whole document in
+  memory; used by the benchmarks and the game's stress mode
+
+Usage:
+    python -m data.universe_gen --systems 100000 --out data/cache/universe_seed_100k.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = ROOT / "data"
+BASE_SEED_PATH = DATA_DIR / "universe_seed.json"
+STRESS_DIR = DATA_DIR / "cache"
+
+MAX_SYSTEMS = 100_000
+# Area per system matches the base seed (200 systems within +/-250 ly).
+BASE_SYSTEMS = 200
+BASE_HALF_EXTENT = 250.0
+DEFAULT_LOCATIONS_PER_SYSTEM = 9.0
+DEFAULT_LINK_DENSITY = 1.9  # gate links per system (base seed: 371 / 200)
+# Share of systems claimed by a race (base seed: 49 / 200).
+CLAIMED_FRACTION = 0.25
+
+_SYLLABLES = (
+    "ae", "ar", "ba", "ce", "da", "el", "eo", "fa", "gi", "ha", "ia", "is", "ka",
+    "lo", "ma", "ne", "on", "or", "pa", "qu", "ra", "se", "ta", "ul", "va", "xi",
+    "yo", "za", "zy", "thi", "phe", "kro", "vra", "sha",
+)
+_SYSTEM_SUFFIXES = ("", " Gate", " Rim", " Reach", " Spoke", " Periphery", " Drift", " Prime")
+_POP_CLASSES = ("small", "medium", "large")
+_RESOURCE_NAMES = {
+    "asteroid_field": "Asteroid Field",
+    "gas_cloud": "Gas Cloud",
+    "ice_field": "Ice Field",
+    "crystal_vein": "Crystal Vein",
+}
+
+
+def _name(rng: random.Random, parts: int) -> str:
+    return "".join(rng.choice(_SYLLABLES) for _ in range(parts)).capitalize()
+
+
+def _orbit(rng: random.Random, r_min: float, r_max: float) -> Tuple[float, float]:
+    r = rng.uniform(r_min, r_max)
+    a = rng.uniform(0.0, 2.0 * math.pi)
+    return round(r * math.cos(a), 3), round(r * math.sin(a), 3)
+
+
+def load_base_seed(path: Optional[Path] = None) -> Dict[str, Any]:
+    with open(path or BASE_SEED_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ---------- Spatial grid ----------
+
+class _Grid:
+    """Uniform bucket grid over integer system coordinates for neighbour searches."""
+
+    def __init__(self, xs: Sequence[int], ys: Sequence[int], cell: float) -> None:
+        self.xs = xs
+        self.ys = ys
+        self.cell = max(1.0, float(cell))
+        self.buckets: Dict[Tuple[int, int], List[int]] = {}
+        for i in range(len(xs)):
+            self.buckets.setdefault(self._key(xs[i], ys[i]), []).append(i)
+        keys = self.buckets.keys()
+        self.max_ring = max((max(abs(kx), abs(ky)) for kx, ky in keys), default=0) * 2 + 1
+
+    def _key(self, x: float, y: float) -> Tuple[int, int]:
+        return int(math.floor(x / self.cell)), int(math.floor(y / self.cell))
+
+    def _ring(self, cx: int, cy: int, r: int) -> Iterator[int]:
+        if r == 0:
+            yield from self.buckets.get((cx, cy), ())
+            return
+        for dx in range(-r, r + 1):
+            for dy in ((-r, r) if abs(dx) != r else range(-r, r + 1)):
+                yield from self.buckets.get((cx + dx, cy + dy), ())
+
+    def nearest(self, i: int, k: int, accept=None) -> List[Tuple[float, int]]:
+        """Up to k nearest (distance, index) pairs to i, optionally filtered by accept(j)."""
+        x, y = self.xs[i], self.ys[i]
+        cx, cy = self._key(x, y)
+        found: List[Tuple[float, int]] = []
+        r = 0
+        while r <= self.max_ring:
+            for j in self._ring(cx, cy, r):
+                if j != i and (accept is None or accept(j)):
+                    found.append((math.hypot(self.xs[j] - x, self.ys[j] - y), j))
+            # Anything in rings beyond r is at least r * cell away.
+            if len(found) >= k:
+                found.sort()
+                if found[k - 1][0] <= r * self.cell:
+                    break
+            r += 1
+        found.sort()
+        return found[:k]
+
+
+class _DisjointSet:
+    def __init__(self, n: int) -> None:
+        self.parent = list(range(n))
+
+    def find(self, a: int) -> int:
+        p = self.parent
+        while p[a] != a:
+            p[a] = p[p[a]]
+            a = p[a]
+        return a
+
+    def union(self, a: int, b: int) -> bool:
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        self.parent[rb] = ra
+        return True
+
+
+# ---------- Generator ----------
+
+class UniverseGenerator:
+    """
+    Deterministic universe for (n_systems, locations_per_system,
+    link_density, seed). Sections are produced in document order by
+    sections(); call write() to stream them into a seed file or
+    generate() for an in-memory dict.
+    """
+
+    def __init__(self, n_systems: int, locations_per_system: float = DEFAULT_LOCATIONS_PER_SYSTEM,
+                 link_density: float = DEFAULT_LINK_DENSITY, seed: int = 1,
+                 base: Optional[Dict[str, Any]] = None) -> None:
+        if not 1 <= int(n_systems) <= MAX_SYSTEMS:
+            raise ValueError(f"n_systems must be between 1 and {MAX_SYSTEMS}, got {n_systems}")
+        self.n = int(n_systems)
+        self.locations_per_system = max(3.0, float(locations_per_system))
+        self.link_density = max(0.0, float(link_density))
+        self.seed = int(seed)
+        self.base = base if base is not None else load_base_seed()
+        self.rng = random.Random(self.seed)
+        self._recipes = self._facility_recipes()
+        self._yields = self._resource_yields()
+
+        # Compact per-system state collected while streaming locations.
+        self.xs: List[int] = []
+        self.ys: List[int] = []
+        self.gate_loc: List[int] = []
+        self.first_planet: List[Optional[int]] = []
+        self.resources: List[Tuple[int, str]] = []   # (location_id, resource_type)
+        self.stations: List[int] = []
+        self._next_location_id = 1
+
+    # ---- catalogs from the base seed ----
+    def _facility_recipes(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Base seed facilities grouped by the kind of location they sit on."""
+        kinds = {l["location_id"]: l["location_type"] for l in self.base.get("locations", [])}
+        rtypes = {r["location_id"]: r["resource_type"] for r in self.base.get("resource_nodes", [])}
+        out: Dict[str, List[Dict[str, Any]]] = {}
+        for f in self.base.get("facilities", []):
+            lid = f["location_id"]
+            key = rtypes.get(lid) or kinds.get(lid, "station")
+            out.setdefault(key, []).append({
+                "facility_type": f["facility_type"],
+                "inputs": f.get("inputs", []),
+                "outputs": f.get("outputs", []),
+                "notes": f.get("notes"),
+            })
+        return out
+
+    def _resource_yields(self) -> Dict[str, List[List[Dict[str, Any]]]]:
+        out: Dict[str, List[List[Dict[str, Any]]]] = {}
+        for r in self.base.get("resource_nodes", []):
+            out.setdefault(r["resource_type"], []).append(r.get("yields", []))
+        return out or {"asteroid_field": [[]]}
+
+    # ---- sections ----
+    def sections(self) -> Iterator[Tuple[str, Any]]:
+        """(key, value) pairs in document order; list sections may be generators."""
+        yield "generated_at", datetime.now(timezone.utc).isoformat()
+        yield "meta", {
+            "note": "Synthetic universe (data/universe_gen.py)",
+            "systems": self.n,
+            "locations_per_system": self.locations_per_system,
+            "link_density": self.link_density,
+            "seed": self.seed,
+        }
+        yield "items", self.base.get("items", [])
+        yield "ships", self.base.get("ships", [])
+        yield "systems", self._systems()
+        yield "locations", self._locations()
+        yield "warpgates", ({"system_id": i + 1, "location_id": lid} for i, lid in enumerate(self.gate_loc))
+        yield "gate_links", self._gate_links()
+        races = self._races()
+        yield "races", races
+        yield "ownerships", self._ownerships(races)
+        race_ids = {r["race_id"] for r in races}
+        yield "diplomacy", [d for d in self.base.get("diplomacy", [])
+                            if d["race_a_id"] in race_ids and d["race_b_id"] in race_ids]
+        yield "markets", []
+        yield "resource_nodes", self._resource_nodes()
+        yield "facilities", self._facilities()
+        yield "ship_roles", self.base.get("ship_roles", [])
+        yield "consumption_profiles", self.base.get("consumption_profiles", {})
+        yield "art_rules", self.base.get("art_rules", {})
+
+    def _systems(self) -> Iterator[Dict[str, Any]]:
+        rng = self.rng
+        half = BASE_HALF_EXTENT * math.sqrt(self.n / BASE_SYSTEMS)
+        lim = max(1, int(half))
+        taken = set()
+        tags = sorted({t for s in self.base.get("systems", []) for t in s.get("econ_tags", [])}) or ["frontier"]
+        for sid in range(1, self.n + 1):
+            while True:
+                x, y = rng.randint(-lim, lim), rng.randint(-lim, lim)
+                if (x, y) not in taken:
+                    break
+            taken.add((x, y))
+            self.xs.append(x)
+            self.ys.append(y)
+            yield {
+                "system_id": sid,
+                "system_name": f"{_name(rng, 2)} {sid}{rng.choice(_SYSTEM_SUFFIXES)}",
+                "system_x": x,
+                "system_y": y,
+                "star_name": _name(rng, 3),
+                "econ_tags": rng.sample(tags, min(len(tags), rng.randint(1, 3))),
+            }
+
+    def _locations(self) -> Iterator[Dict[str, Any]]:
+        rng = self.rng
+        extra_mean = self.locations_per_system - 2.0  # star + warpgate are always present
+        lo = max(1, int(round(extra_mean)) - 2)
+        hi = max(lo, int(round(2 * extra_mean)) - lo)
+        rtypes = sorted(self._yields)
+        for idx in range(self.n):
+            sid = idx + 1
+
+            def new(kind: str, name: str, xy: Tuple[float, float], parent: Optional[int],
+                    desc: str, **extra: Any) -> Dict[str, Any]:
+                lid = self._next_location_id
+                self._next_location_id += 1
+                row = {"location_id": lid, "system_id": sid, "location_name": name, "location_type": kind,
+                       "location_x": xy[0], "location_y": xy[1], "parent_location_id": parent,
+                       "location_description": desc}
+                row.update(extra)
+                return row
+
+            star = new("star", _name(rng, 3), (0.0, 0.0), None, f"Primary of system {sid}.")
+            yield star
+            planets: List[Dict[str, Any]] = []
+            resources: List[int] = []
+            for k in range(rng.randint(lo, hi)):
+                roll = rng.random()
+                if k == 0 or roll < 0.35:
+                    p = new("planet", f"{_name(rng, 2)}-{k + 1}", _orbit(rng, 0.5, 6.0), None,
+                            f"Planet orbiting {star['location_name']}.", pop_class=rng.choice(_POP_CLASSES))
+                    planets.append(p)
+                    yield p
+                elif roll < 0.58:
+                    host = rng.choice(planets)
+                    hx, hy = host["location_x"], host["location_y"]
+                    ox, oy = _orbit(rng, 0.1, 0.4)
+                    yield new("moon", _name(rng, 2), (round(hx + ox, 3), round(hy + oy, 3)),
+                              host["location_id"], f"Moon of {host['location_name']}.")
+                elif roll < 0.74:
+                    rtype = rng.choice(rtypes)
+                    r = new("resource", _RESOURCE_NAMES.get(rtype, rtype.replace("_", " ").title()),
+                            _orbit(rng, 4.0, 10.0), None, f"Natural resource pocket: {rtype}.")
+                    resources.append(r["location_id"])
+                    self.resources.append((r["location_id"], rtype))
+                    yield r
+                else:
+                    parent = None
+                    p_roll = rng.random()
+                    if p_roll < 0.45:
+                        parent = rng.choice(planets)["location_id"]
+                    elif p_roll < 0.6 and resources:
+                        parent = rng.choice(resources)
+                    st = new("station", f"Orbital Exchange {rng.randint(100, 999)}", _orbit(rng, 0.2, 1.5),
+                             parent, "Traffic, trade and support operations.")
+                    self.stations.append(st["location_id"])
+                    yield st
+            gate = new("warpgate", f"System {sid} Warpgate", _orbit(rng, 1.5, 3.0), None,
+                       "Primary interstellar gate for this system.")
+            self.gate_loc.append(gate["location_id"])
+            self.first_planet.append(planets[0]["location_id"])
+            yield gate
+
+    def _gate_links(self) -> Iterator[Dict[str, Any]]:
+        """
+        Local gate network: a minimum spanning forest over each system's
+        nearest neighbours keeps every system reachable with short hops, then
+        the shortest remaining candidate edges top it up to link_density.
+        """
+        n = self.n
+        if n < 2:
+            return
+        spacing = 2.0 * BASE_HALF_EXTENT * math.sqrt(self.n / BASE_SYSTEMS) / math.sqrt(n)
+        grid = _Grid(self.xs, self.ys, spacing * 2.0)
+        k = max(3, int(math.ceil(2 * self.link_density)) + 1)
+        cand: Dict[Tuple[int, int], float] = {}
+        for i in range(n):
+            for d, j in grid.nearest(i, k):
+                cand[(i, j) if i < j else (j, i)] = d
+        edges = sorted(cand.items(), key=lambda kv: (kv[1], kv[0]))
+        ds = _DisjointSet(n)
+        chosen: Dict[Tuple[int, int], float] = {}
+        for e, d in edges:
+            if ds.union(*e):
+                chosen[e] = d
+        # Bridge any components the neighbour graph left apart, smallest first.
+        comps: Dict[int, List[int]] = {}
+        for i in range(n):
+            comps.setdefault(ds.find(i), []).append(i)
+        for members in sorted(comps.values(), key=len)[:-1]:
+            best: Optional[Tuple[float, int, int]] = None
+            ri = ds.find(members[0])
+            for i in members[:64]:
+                hit = grid.nearest(i, 1, accept=lambda j: ds.find(j) != ri)
+                if hit and (best is None or hit[0][0] < best[0]):
+                    best = (hit[0][0], i, hit[0][1])
+            if best is not None:
+                d, a, b = best
+                ds.union(a, b)
+                chosen[(a, b) if a < b else (b, a)] = d
+        target = int(round(self.link_density * n))
+        for e, d in edges:
+            if len(chosen) >= target:
+                break
+            if e not in chosen and self.rng.random() < 0.7:
+                chosen[e] = d
+        for (a, b), d in sorted(chosen.items()):
+            yield {"a": a + 1, "b": b + 1, "distance_pc": round(d, 3)}
+
+    def _races(self) -> List[Dict[str, Any]]:
+        rng = self.rng
+        homes = [i for i in range(self.n) if self.first_planet[i] is not None]
+        base_races = self.base.get("races", [])
+        count = min(len(base_races), max(1, len(homes) // 8)) if homes else 0
+        picked = rng.sample(homes, count) if count else []
+        races = []
+        for r, home in zip(base_races, picked):
+            row = dict(r)
+            row["home_system_id"] = home + 1
+            row["home_planet_location_id"] = self.first_planet[home]
+            races.append(row)
+        return races
+
+    def _ownerships(self, races: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not races:
+            return []
+        per_race = max(1, int(self.n * CLAIMED_FRACTION / len(races)))
+        grid = _Grid(self.xs, self.ys, 2.0 * BASE_HALF_EXTENT / math.sqrt(BASE_SYSTEMS))
+        owner: Dict[int, int] = {}
+        for r in races:
+            home = r["home_system_id"] - 1
+            owner.setdefault(home, r["race_id"])
+            for _, j in grid.nearest(home, per_race - 1, accept=lambda j: j not in owner):
+                owner[j] = r["race_id"]
+        return [{"system_id": i + 1, "race_id": rid, "status": "claimed"} for i, rid in sorted(owner.items())]
+
+    def _resource_nodes(self) -> Iterator[Dict[str, Any]]:
+        rng = self.rng
+        for lid, rtype in self.resources:
+            yield {
+                "location_id": lid,
+                "resource_type": rtype,
+                "yields": rng.choice(self._yields[rtype]),
+                "richness": rng.randint(20, 100),
+                "regen_rate": round(rng.uniform(0.1, 0.6), 3),
+            }
+
+    def _facilities(self) -> Iterator[Dict[str, Any]]:
+        rng = self.rng
+        fid = 0
+        station_recipes = self._recipes.get("station", [])
+        for lid, rtype in self.resources:
+            recipes = self._recipes.get(rtype)
+            if not recipes:
+                continue
+            fid += 1
+            yield dict(rng.choice(recipes), facility_id=fid, location_id=lid)
+        for lid in self.stations:
+            if station_recipes and rng.random() < 0.4:
+                fid += 1
+                yield dict(rng.choice(station_recipes), facility_id=fid, location_id=lid)
+
+    # ---- output ----
+    def generate(self) -> Dict[str, Any]:
+        """Whole universe as a dict (fine for small universes; prefer write() at scale)."""
+        return {key: (list(val) if not isinstance(val, (list, dict, str)) else val)
+                for key, val in self.sections()}
+
+    def write(self, path: Path) -> Path:
+        """Stream the universe to path as seed JSON (one record per line)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("{")
+            first = True
+            for key, val in self.sections():
+                f.write(("\n" if first else ",\n") + json.dumps(key) + ": ")
+                first = False
+                if isinstance(val, (dict, str)):
+                    f.write(json.dumps(val))
+                    continue
+                f.write("[")
+                sep = "\n"
+                for rec in val:
+                    f.write(sep + json.dumps(rec, separators=(",", ":")))
+                    sep = ",\n"
+                f.write("\n]")
+            f.write("\n}\n")
+        tmp.replace(path)
+        return path
+
+
+def generate_universe(n_systems: int, locations_per_system: float = DEFAULT_LOCATIONS_PER_SYSTEM,
+                      link_density: float = DEFAULT_LINK_DENSITY, seed: int = 1) -> Dict[str, Any]:
+    return UniverseGenerator(n_systems, locations_per_system, link_density, seed).generate()
+
+
+def write_universe(path: Path, n_systems: int, locations_per_system: float = DEFAULT_LOCATIONS_PER_SYSTEM,
+                   link_density: float = DEFAULT_LINK_DENSITY, seed: int = 1) -> Path:
+    return UniverseGenerator(n_systems, locations_per_system, link_density, seed).write(path)
+
+
+def stress_seed_path(n_systems: int, locations_per_system: float = DEFAULT_LOCATIONS_PER_SYSTEM,
+                     link_density: float = DEFAULT_LINK_DENSITY, seed: int = 1) -> Path:
+    return STRESS_DIR / (f"universe_seed_stress_{n_systems}_{locations_per_system:g}"
+                         f"_{link_density:g}_{seed}.json")
+
+
+def ensure_stress_seed(n_systems: int, locations_per_system: float = DEFAULT_LOCATIONS_PER_SYSTEM,
+                       link_density: float = DEFAULT_LINK_DENSITY, seed: int = 1) -> Path:
+    """Cached synthetic seed for the game's stress mode; generated on first use."""
+    path = stress_seed_path(n_systems, locations_per_system, link_density, seed)
+    if not path.exists():
+        write_universe(path, n_systems, locations_per_system, link_density, seed)
+    return path
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m data.universe_gen",
+                                 description="Write a synthetic universe seed JSON.")
+    ap.add_argument("--systems", type=int, default=5000, help=f"system count (1..{MAX_SYSTEMS})")
+    ap.add_argument("--locations", type=float, default=DEFAULT_LOCATIONS_PER_SYSTEM,
+                    help="average locations per system (>= 3)")
+    ap.add_argument("--links", type=float, default=DEFAULT_LINK_DENSITY, help="gate links per system")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--out", type=Path, required=True)
+    args = ap.parse_args(argv)
+    write_universe(args.out, args.systems, args.locations, args.links, args.seed)
+    print(f"wrote {args.out}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
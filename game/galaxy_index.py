@@ -0,0 +1,317 @@
+# /game/galaxy_index.py
+
+"""
+Victurus Galaxy Spatial Index
+
+Static 2D KD-tree over system coordinates (systems.system_x / system_y, ly):
+- Range queries ("all systems within R ly of X") and k-nearest queries
+- Built at save load / new game, persisted next to game.db (galaxy_index.bin)
+- Fingerprinted against the systems table so stale files are rebuilt
+- Module-level accessors that follow the active save like data.db does
+"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import math
+import struct
+import threading
+from array import array
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from data import db
+from game_controller.log_config import get_system_logger
+
+logger = get_system_logger('galaxy_index')
+
+INDEX_FILENAME = "galaxy_index.bin"
+
+_MAGIC = b"VICGIDX1"
+_HEADER = struct.Struct("<8sII20s")  # magic, format version, count, sha1(systems)
+_FORMAT_VERSION = 1
+
+# Segments at or below this size are scanned linearly instead of split further
+_LEAF_SIZE = 16
+
+
+def _fingerprint(ids: Sequence[int], xs: Sequence[float], ys: Sequence[float]) -> bytes:
+    """sha1 over (id, x, y) in id order; identifies the systems table contents."""
+    order = sorted(range(len(ids)), key=ids.__getitem__)
+    h = hashlib.sha1()
+    h.update(array("q", (ids[i] for i in order)).tobytes())
+    h.update(array("d", (xs[i] for i in order)).tobytes())
+    h.update(array("d", (ys[i] for i in order)).tobytes())
+    return h.digest()
+
+
+def read_system_coords(conn=None) -> Tuple[List[int], List[float], List[float]]:
+    """Return (ids, xs, ys) for every system in the given (or active) database."""
+    c = conn if conn is not None else db.get_connection()
+    rows = c.execute("SELECT system_id, system_x, system_y FROM systems ORDER BY system_id").fetchall()
+    ids = [int(r[0]) for r in rows]
+    xs = [float(r[1] or 0.0) for r in rows]
+    ys = [float(r[2] or 0.0) for r in rows]
+    return ids, xs, ys
+
+
+class GalaxyIndex:
+    """
+    Implicit, balanced KD-tree stored as three flat arrays in tree order.
+
+    The segment [lo, hi) is split at mid = (lo + hi) // 2 on axis depth % 2;
+    the node point sits at `mid`, left child covers [lo, mid), right child
+    (mid, hi). No per-node objects, so the arrays persist and load as-is.
+    """
+
+    def __init__(self, ids: array, xs: array, ys: array, fingerprint: bytes) -> None:
+        self._ids = ids
+        self._xs = xs
+        self._ys = ys
+        self.fingerprint = fingerprint
+        self._slot = {sid: i for i, sid in enumerate(ids)}
+
+    # ---------- Construction ----------
+
+    @classmethod
+    def build(cls, ids: Sequence[int], xs: Sequence[float], ys: Sequence[float]) -> "GalaxyIndex":
+        pts = [(float(xs[i]), float(ys[i]), int(ids[i])) for i in range(len(ids))]
+        out: List[Tuple[float, float, int]] = [(0.0, 0.0, 0)] * len(pts)
+
+        # Iterative build: (lo, hi, depth, points for this segment)
+        stack = [(0, len(pts), 0, pts)]
+        while stack:
+            lo, hi, depth, seg = stack.pop()
+            if not seg:
+                continue
+            seg.sort(key=lambda p: p[depth & 1])
+            mid_local = len(seg) // 2
+            mid = lo + mid_local
+            out[mid] = seg[mid_local]
+            stack.append((lo, mid, depth + 1, seg[:mid_local]))
+            stack.append((mid + 1, hi, depth + 1, seg[mid_local + 1:]))
+
+        return cls(
+            array("q", (p[2] for p in out)),
+            array("d", (p[0] for p in out)),
+            array("d", (p[1] for p in out)),
+            _fingerprint(ids, xs, ys),
+        )
+
+    @classmethod
+    def from_db(cls, conn=None) -> "GalaxyIndex":
+        return cls.build(*read_system_coords(conn))
+
+    # ---------- Persistence ----------
+
+    def save(self, path: Path) -> None:
+        tmp = Path(path).with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, len(self._ids), self.fingerprint))
+            self._ids.tofile(f)
+            self._xs.tofile(f)
+            self._ys.tofile(f)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["GalaxyIndex"]:
+        """Read a persisted index; None if missing, truncated or a different format."""
+        try:
+            with open(path, "rb") as f:
+                magic, version, count, fp = _HEADER.unpack(f.read(_HEADER.size))
+                if magic != _MAGIC or version != _FORMAT_VERSION:
+                    return None
+                ids, xs, ys = array("q"), array("d"), array("d")
+                ids.fromfile(f, count)
+                xs.fromfile(f, count)
+                ys.fromfile(f, count)
+        except (OSError, EOFError, struct.error):
+            return None
+        return cls(ids, xs, ys, fp)
+
+    # ---------- Lookups ----------
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, system_id: object) -> bool:
+        return system_id in self._slot
+
+    def position(self, system_id: int) -> Optional[Tuple[float, float]]:
+        i = self._slot.get(system_id)
+        if i is None:
+            return None
+        return (self._xs[i], self._ys[i])
+
+    def distance(self, a: int, b: int) -> Optional[float]:
+        """Euclidean distance in ly between two systems (None if either is unknown)."""
+        pa = self.position(a)
+        pb = self.position(b)
+        if pa is None or pb is None:
+            return None
+        return math.hypot(pa[0] - pb[0], pa[1] - pb[1])
+
+    def _origin(self, origin) -> Optional[Tuple[float, float]]:
+        if isinstance(origin, tuple):
+            return (float(origin[0]), float(origin[1]))
+        return self.position(int(origin))
+
+    def within(self, origin, radius_ly: float, include_origin: bool = False) -> List[Tuple[int, float]]:
+        """
+        All systems within radius_ly of origin (a system id or an (x, y) tuple),
+        as (system_id, distance_ly) sorted by distance then id.
+        """
+        o = self._origin(origin)
+        if o is None or radius_ly < 0:
+            return []
+        ox, oy = o
+        r = float(radius_ly)
+        r2 = r * r
+        ids, xs, ys = self._ids, self._xs, self._ys
+        skip = origin if (not include_origin and not isinstance(origin, tuple)) else None
+
+        found: List[Tuple[float, int]] = []
+        stack = [(0, len(ids), 0)]
+        while stack:
+            lo, hi, depth = stack.pop()
+            if hi - lo <= _LEAF_SIZE:
+                for i in range(lo, hi):
+                    dx = xs[i] - ox
+                    dy = ys[i] - oy
+                    d2 = dx * dx + dy * dy
+                    if d2 <= r2 and ids[i] != skip:
+                        found.append((d2, ids[i]))
+                continue
+            mid = (lo + hi) >> 1
+            dx = xs[mid] - ox
+            dy = ys[mid] - oy
+            d2 = dx * dx + dy * dy
+            if d2 <= r2 and ids[mid] != skip:
+                found.append((d2, ids[mid]))
+            delta = dx if not (depth & 1) else dy  # node - origin along the split axis
+            if delta >= -r:
+                stack.append((lo, mid, depth + 1))
+            if delta <= r:
+                stack.append((mid + 1, hi, depth + 1))
+
+        found.sort()
+        return [(sid, math.sqrt(d2)) for d2, sid in found]
+
+    def nearest(self, origin, k: int, include_origin: bool = False) -> List[Tuple[int, float]]:
+        """The k systems closest to origin, as (system_id, distance_ly) sorted by distance then id."""
+        o = self._origin(origin)
+        if o is None or k <= 0:
+            return []
+        ox, oy = o
+        ids, xs, ys = self._ids, self._xs, self._ys
+        skip = origin if (not include_origin and not isinstance(origin, tuple)) else None
+
+        # Max-heap of the best k so far as (-d2, -id) so ties keep the lowest ids
+        best: List[Tuple[float, int]] = []
+
+        def offer(i: int) -> None:
+            sid = ids[i]
+            if sid == skip:
+                return
+            dx = xs[i] - ox
+            dy = ys[i] - oy
+            item = (-(dx * dx + dy * dy), -sid)
+            if len(best) < k:
+                heapq.heappush(best, item)
+            elif item > best[0]:
+                heapq.heapreplace(best, item)
+
+        stack: List[Tuple[int, int, int, float]] = [(0, len(ids), 0, 0.0)]
+        while stack:
+            lo, hi, depth, plane_d2 = stack.pop()
+            if len(best) == k and plane_d2 > -best[0][0]:
+                continue
+            if hi - lo <= _LEAF_SIZE:
+                for i in range(lo, hi):
+                    offer(i)
+                continue
+            mid = (lo + hi) >> 1
+            offer(mid)
+            delta = (ox - xs[mid]) if not (depth & 1) else (oy - ys[mid])
+            near = (lo, mid) if delta < 0 else (mid + 1, hi)
+            far = (mid + 1, hi) if delta < 0 else (lo, mid)
+            # Far side first so the near side is popped (and tightens the bound) first
+            stack.append((far[0], far[1], depth + 1, max(plane_d2, delta * delta)))
+            stack.append((near[0], near[1], depth + 1, plane_d2))
+
+        out = sorted((-nd2, -nsid) for nd2, nsid in best)
+        return [(sid, math.sqrt(d2)) for d2, sid in out]
+
+
+# ---------- Active-save index ----------
+
+_lock = threading.RLock()
+_active: Optional[GalaxyIndex] = None
+_active_db: Optional[Path] = None
+_active_systems_version: Optional[int] = None
+
+
+def index_path_for(db_path: Path) -> Path:
+    return Path(db_path).parent / INDEX_FILENAME
+
+
+def build_for_active_save() -> GalaxyIndex:
+    """
+    Load (or build and persist) the index for the active game.db.
+
+    The in-memory index, then the persisted file, is reused when its coordinate
+    fingerprint matches the current systems table; otherwise it is rebuilt and
+    rewritten. Writes that leave coordinates alone (icons) cost one read.
+    """
+    global _active, _active_db, _active_systems_version
+    db_path = db.get_active_db_path()
+    path = index_path_for(db_path)
+    ids, xs, ys = read_system_coords()
+    fp = _fingerprint(ids, xs, ys)
+
+    with _lock:
+        idx = _active if _active_db == db_path else None
+    if idx is None or idx.fingerprint != fp:
+        idx = GalaxyIndex.load(path)
+    if idx is None or idx.fingerprint != fp or len(idx) != len(ids):
+        idx = GalaxyIndex.build(ids, xs, ys)
+        try:
+            idx.save(path)
+            logger.debug(f"Galaxy index built for {len(idx)} systems -> {path}")
+        except OSError as e:
+            logger.warning(f"Could not persist galaxy index to {path}: {e}")
+
+    with _lock:
+        _active = idx
+        _active_db = db_path
+        _active_systems_version = db.get_universe_cache_versions().get("systems")
+    return idx
+
+
+def get_index() -> GalaxyIndex:
+    """Index for the active save; rechecked lazily after a save switch or systems invalidation."""
+    with _lock:
+        if (
+            _active is not None
+            and _active_db == db.get_active_db_path()
+            and _active_systems_version == db.get_universe_cache_versions().get("systems")
+        ):
+            return _active
+    return build_for_active_save()
+
+
+def systems_within(system_id: int, radius_ly: float) -> List[Tuple[int, float]]:
+    """(system_id, ly) for every other system within radius_ly of system_id, nearest first."""
+    return get_index().within(system_id, radius_ly)
+
+
+def nearest_systems(system_id: int, k: int) -> List[Tuple[int, float]]:
+    """(system_id, ly) for the k systems nearest to system_id (excluding itself)."""
+    return get_index().nearest(system_id, k)
+
+
+def distances_from(system_id: int, targets: Iterable[int]) -> List[Optional[float]]:
+    """ly from system_id to each target (None where either id is unknown)."""
+    idx = get_index()
+    return [idx.distance(system_id, t) for t in targets]
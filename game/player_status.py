@@ -12,7 +12,8 @@ Provides consolidated player and ship status information:
 
 from __future__ import annotations
 
-from typing import Dict, Any, Optional, cast, Iterable
+import threading
+from typing import Callable, Dict, Any, List, Optional, Tuple, cast, Iterable
 
 from data import db
 from game import ship_state
@@ -20,10 +21,70 @@ from game_controller.log_config import get_game_logger
 
 logger = get_game_logger('player_status')
 
+# statusChanged is emitted at most once per this many ms (fuel drips every ~10 ms)
+STATUS_NOTIFY_INTERVAL_MS = 200
+
+# Qt is optional here: headless callers (sim, tests) use plain callbacks
+try:
+    from PySide6.QtCore import QObject, QTimer, Signal
+
+    class _StatusNotifier(QObject):
+        """
+        Emits statusChanged(version) when the status snapshot changes, at most
+        once per STATUS_NOTIFY_INTERVAL_MS: the first change goes out at once,
+        later ones within the interval are coalesced into one trailing emit of
+        the latest version. request() may be called from any thread.
+        """
+        statusChanged = Signal(int)
+        _requested = Signal(int)
+
+        def __init__(self) -> None:
+            super().__init__()
+            self._latest = 0
+            self._pending = False
+            self._timer = QTimer(self)
+            self._timer.setSingleShot(True)
+            self._timer.setInterval(STATUS_NOTIFY_INTERVAL_MS)
+            self._timer.timeout.connect(self._on_timeout)
+            self._requested.connect(self._on_requested)  # queued onto the notifier's thread
+
+        def request(self, version: int) -> None:
+            self._requested.emit(version)
+
+        def _on_requested(self, version: int) -> None:
+            self._latest = version
+            if self._timer.isActive():
+                self._pending = True
+                return
+            self.statusChanged.emit(version)
+            self._timer.start()
+
+        def _on_timeout(self) -> None:
+            if self._pending:
+                self._pending = False
+                self.statusChanged.emit(self._latest)
+                self._timer.start()
+
+    status_notifier: Optional[Any] = _StatusNotifier()
+except Exception:
+    status_notifier = None
+
 # In-memory UI hints controlled by travel_flow
 _TRANSIENT_LOCATION: Optional[str] = None
 # Optional local fallback if ship_state module doesn't provide setters
 _LOCAL_TEMP_STATE: Optional[str] = None
+# (db save epoch, base_ship_fuel) for adjust_fuel's clamp
+_FUEL_MAX_CACHE: Optional[Tuple[int, float]] = None
+
+# Memoized status snapshot. The key covers everything the snapshot depends on
+# that can change: active save (path and db's save epoch, so a save recreated
+# at the same path counts as a switch), our version stamp (bumped by the
+# mutators below), db's player-row version, and the transient phase/location labels.
+_STATUS_LOCK = threading.RLock()
+_STATUS_VERSION = 0
+_SNAPSHOT: Optional[Dict[str, Any]] = None
+_SNAPSHOT_KEY: Optional[Tuple[Any, ...]] = None
+_STATUS_LISTENERS: List[Callable[[int], None]] = []
 
 
 # ---------- Helpers ----------
@@ -96,6 +157,87 @@ def _first_numeric(d: Dict[str, Any] | None, keys: Iterable[str]) -> Optional[fl
     return None
 
 
+# ---------- Snapshot versioning / change notifications ----------
+
+def _snapshot_key(player_version: Optional[int] = None) -> Tuple[Any, ...]:
+    return (
+        db.get_active_db_path(),
+        db.get_save_epoch(),
+        _STATUS_VERSION,
+        db.get_player_version() if player_version is None else player_version,
+        _get_temp_state(),
+        _TRANSIENT_LOCATION,
+    )
+
+
+def get_status_version() -> int:
+    """Version stamp of the status snapshot; changes whenever a mutator runs."""
+    return _STATUS_VERSION
+
+
+def add_status_listener(callback: Callable[[int], None]) -> None:
+    """Call callback(version) after every status change (Qt users can connect to status_notifier)."""
+    with _STATUS_LOCK:
+        if callback not in _STATUS_LISTENERS:
+            _STATUS_LISTENERS.append(callback)
+
+
+def remove_status_listener(callback: Callable[[int], None]) -> None:
+    with _STATUS_LOCK:
+        try:
+            _STATUS_LISTENERS.remove(callback)
+        except ValueError:
+            pass
+
+
+def _notify(version: int) -> None:
+    with _STATUS_LOCK:
+        listeners = list(_STATUS_LISTENERS)
+    for cb in listeners:
+        try:
+            cb(version)
+        except Exception as e:
+            logger.error(f"Status listener failed: {e}")
+    if status_notifier is not None:
+        try:
+            status_notifier.request(version)
+        except Exception:
+            pass
+
+
+def invalidate_status() -> None:
+    """Drop the memoized snapshot and notify listeners (call after changing player state)."""
+    global _STATUS_VERSION, _SNAPSHOT, _SNAPSHOT_KEY
+    with _STATUS_LOCK:
+        _STATUS_VERSION += 1
+        _SNAPSHOT = None
+        _SNAPSHOT_KEY = None
+        version = _STATUS_VERSION
+    _notify(version)
+
+
+def _patch_snapshot(player_version_before: int, **fields: Any) -> None:
+    """
+    Update fields of a still-valid snapshot in place instead of dropping it
+    (adjust_fuel runs every travel tick; rebuilding would cost 4 DB reads).
+    """
+    global _STATUS_VERSION, _SNAPSHOT_KEY
+    with _STATUS_LOCK:
+        if _SNAPSHOT is None or _SNAPSHOT_KEY != _snapshot_key(player_version_before):
+            patched = False
+        else:
+            _SNAPSHOT.update(fields)
+            patched = True
+    if not patched:
+        invalidate_status()
+        return
+    with _STATUS_LOCK:
+        _STATUS_VERSION += 1
+        _SNAPSHOT_KEY = _snapshot_key()
+        version = _STATUS_VERSION
+    _notify(version)
+
+
 # ---------- Public setters used by travel/travel_flow ----------
 
 def set_ship_state(state: Optional[str]) -> None:
@@ -113,6 +255,7 @@ def set_ship_state(state: Optional[str]) -> None:
             _LOCAL_TEMP_STATE = state
     except Exception:
         _LOCAL_TEMP_STATE = state
+    invalidate_status()
 
 
 def clear_temporary_state() -> None:
@@ -132,6 +275,7 @@ def set_transient_location(label: Optional[str]) -> None:
     """
     global _TRANSIENT_LOCATION
     _TRANSIENT_LOCATION = str(label) if label else None
+    invalidate_status()
 
 
 def clear_transient_location() -> None:
@@ -139,17 +283,25 @@ def clear_transient_location() -> None:
     set_transient_location(None)
 
 
+def _fuel_max() -> float:
+    """base_ship_fuel of the player's ship, cached until the save is switched or reopened."""
+    global _FUEL_MAX_CACHE
+    epoch = db.get_save_epoch()
+    if _FUEL_MAX_CACHE is None or _FUEL_MAX_CACHE[0] != epoch:
+        ship = cast(Dict[str, Any], db.get_player_ship() or {})
+        _FUEL_MAX_CACHE = (epoch, float(ship.get("base_ship_fuel") or 0.0))
+    return _FUEL_MAX_CACHE[1]
+
+
 def adjust_fuel(delta: float) -> None:
     """
-    Add 'delta' (can be negative) to current fuel; clamp to [0, fuel_max];
-    write back to DB as a float. Used each tick by travel_flow for smooth drip.
+    Add 'delta' (can be negative) to current fuel; clamp to [0, fuel_max].
+    Used each tick by travel_flow for smooth drip, so the new value goes into
+    the db write-behind buffer instead of an UPDATE + commit per call.
     """
     try:
-        player = cast(Dict[str, Any], db.get_player_full() or {})
-        ship = cast(Dict[str, Any], db.get_player_ship() or {})
-
-        cur = float(player.get("current_player_ship_fuel") or 0.0)
-        fmax = float(ship.get("base_ship_fuel") or 0.0)
+        cur = float(db.get_player_value("current_player_ship_fuel") or 0.0)
+        fmax = _fuel_max()
         new_val = cur + float(delta)
         if fmax <= 0:
             new_val = 0.0
@@ -159,17 +311,22 @@ def adjust_fuel(delta: float) -> None:
             elif new_val > fmax:
                 new_val = fmax
 
-        con = db.get_connection()
-        con.execute(
-            "UPDATE player SET current_player_ship_fuel=? WHERE id=1",
-            (new_val,),
-        )
-        con.commit()
+        before = db.get_player_version()
+        db.set_player_values(current_player_ship_fuel=new_val)
+        _patch_snapshot(before, fuel=new_val)
     except Exception:
         # Never let UI drips crash the app
         pass
 
 
+def flush_player_state() -> None:
+    """Push buffered fuel/hull/energy to the DB (travel phase boundaries, save)."""
+    try:
+        db.flush_player_state()
+    except Exception as e:
+        logger.error(f"Error flushing player state: {e}")
+
+
 # ---------- Status getters ----------
 
 def get_ship_status(player: Dict[str, Any]) -> str:
@@ -188,6 +345,10 @@ def get_status_snapshot() -> Dict[str, Any]:
     Collect a UI-friendly snapshot of player + ship status.
     Numeric fields are numbers; labels are friendly fallbacks.
 
+    Memoized: the snapshot is rebuilt only after a mutator (adjust_fuel,
+    set_ship_state, set_location_status, enter_orbit, dock_at_location,
+    travel.perform_travel, ...) or a save switch. Callers get a copy.
+
     Keys provided (not exhaustive):
       - player_name: string (derived from common player-name fields)
       - ship_name:   string (from ships.name/ship_name)
@@ -201,6 +362,21 @@ def get_status_snapshot() -> Dict[str, Any]:
       - fuel/fuel_max, energy/energy_max
       - cargo/cargo_max
     """
+    global _SNAPSHOT, _SNAPSHOT_KEY
+    with _STATUS_LOCK:
+        key = _snapshot_key()
+        if _SNAPSHOT is not None and _SNAPSHOT_KEY == key:
+            return dict(_SNAPSHOT)
+    snap = _build_status_snapshot()
+    with _STATUS_LOCK:
+        # Only memoize if nothing changed while we were reading
+        if _snapshot_key() == key:
+            _SNAPSHOT = snap
+            _SNAPSHOT_KEY = key
+    return dict(snap)
+
+
+def _build_status_snapshot() -> Dict[str, Any]:
     player = cast(Dict[str, Any], db.get_player_full() or {})
     ship = cast(Dict[str, Any], db.get_player_ship() or {})
 
@@ -364,6 +540,7 @@ def set_location_status(status: str) -> None:
             conn.execute("UPDATE player SET current_location_status = ? WHERE id = 1", (status.lower(),))
             conn.commit()
             logger.debug(f"Set location status to: {status}")
+            invalidate_status()
         except Exception:
             # Column doesn't exist yet - skip silently
             logger.debug(f"Could not set location status (column may not exist): {status}")
@@ -405,6 +582,7 @@ def enter_orbit(location_id: int) -> None:
             """, (location_id,))
         conn.commit()
         logger.debug(f"Entered orbit around location {location_id}")
+        invalidate_status()
     except Exception as e:
         logger.error(f"Error entering orbit: {e}")
 
@@ -430,5 +608,6 @@ def dock_at_location(location_id: int) -> None:
             """, (location_id,))
         conn.commit()
         logger.debug(f"Docked at location {location_id}")
+        invalidate_status()
     except Exception as e:
         logger.error(f"Error docking: {e}")
@@ -0,0 +1,260 @@
+# /game/routing.py
+
+"""
+Victurus Gate-Network Routing
+
+Multi-hop routes over the warp gate network (gate_links):
+- Adjacency built once per gate_links version from the active save
+- A* with a Euclidean heuristic over system coordinates (galaxy index)
+- Shortest-distance, fewest-jumps and fuel-feasible (jump range + fuel budget) routes
+- LRU route cache invalidated when the gate_links table changes
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from data import db
+from game import galaxy_index, travel
+from game_controller.log_config import get_game_logger
+
+logger = get_game_logger('routing')
+
+METRIC_DISTANCE = "distance"
+METRIC_JUMPS = "jumps"
+METRIC_FUEL = "fuel"
+METRICS = (METRIC_DISTANCE, METRIC_JUMPS, METRIC_FUEL)
+
+ROUTE_CACHE_SIZE = 512
+
+# gate_links.distance_pc is the coordinate distance rounded to 3 decimals, so
+# it can undershoot the Euclidean value by ~1e-4 relative; shrink the
+# heuristic slightly to keep it admissible.
+_HEURISTIC_SCALE = 0.999
+
+
+@dataclass(frozen=True)
+class Route:
+    """A route through the gate network; systems[0] is the origin, systems[-1] the destination."""
+    systems: Tuple[int, ...]
+    distance_ly: float
+    jumps: int
+    fuel: float
+
+
+def jump_fuel(dist_ly: float) -> float:
+    """Fuel drip for one warp jump of dist_ly (same model as travel.estimate_total_fuel)."""
+    return travel.estimate_total_fuel(dist_ly, 0.0, 0.0, same_system=False)
+
+
+class GateNetwork:
+    """Undirected weighted graph of gate links with A* search."""
+
+    def __init__(self, edges: Iterable[Tuple[int, int, float]], coords: Dict[int, Tuple[float, float]]) -> None:
+        adj: Dict[int, List[Tuple[int, float]]] = {}
+        max_edge = 0.0
+        for a, b, dist in edges:
+            a = int(a)
+            b = int(b)
+            d = float(dist)
+            adj.setdefault(a, []).append((b, d))
+            if a != b:
+                adj.setdefault(b, []).append((a, d))
+            if d > max_edge:
+                max_edge = d
+        self.adj = adj
+        self.coords = coords
+        self.max_edge_ly = max_edge
+
+    @classmethod
+    def from_db(cls) -> "GateNetwork":
+        rows = db.get_connection().execute(
+            "SELECT system_a_id, system_b_id, distance_pc FROM gate_links"
+        ).fetchall()
+        idx = galaxy_index.get_index()
+        coords: Dict[int, Tuple[float, float]] = {}
+        for a, b, _ in rows:
+            for sid in (int(a), int(b)):
+                if sid not in coords:
+                    p = idx.position(sid)
+                    if p is not None:
+                        coords[sid] = p
+        return cls(((a, b, d) for a, b, d in rows), coords)
+
+    def neighbors(self, system_id: int) -> List[Tuple[int, float]]:
+        return list(self.adj.get(int(system_id), ()))
+
+    def _euclid(self, a: int, goal_xy: Optional[Tuple[float, float]]) -> float:
+        if goal_xy is None:
+            return 0.0
+        p = self.coords.get(a)
+        if p is None:
+            return 0.0
+        return math.hypot(p[0] - goal_xy[0], p[1] - goal_xy[1]) * _HEURISTIC_SCALE
+
+    def find_route(self, src: int, dst: int, metric: str = METRIC_DISTANCE,
+                   max_jump_ly: Optional[float] = None) -> Optional[Route]:
+        """
+        A* from src to dst. Costs are compared as (primary, secondary) tuples:
+          distance / fuel: (ly, jumps)
+          jumps:           (jumps, ly)
+        Edges longer than max_jump_ly are skipped. Returns None when unreachable.
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown route metric: {metric!r}")
+        src = int(src)
+        dst = int(dst)
+        if src == dst:
+            return Route((src,), 0.0, 0, 0.0)
+        adj = self.adj
+        if src not in adj or dst not in adj:
+            return None
+
+        by_jumps = (metric == METRIC_JUMPS)
+        limit = float(max_jump_ly) if max_jump_ly is not None else math.inf
+        goal_xy = self.coords.get(dst)
+        max_edge = min(self.max_edge_ly, limit) or 1.0
+
+        def heuristic(n: int) -> Tuple[float, float]:
+            h = self._euclid(n, goal_xy)
+            hj = float(math.ceil(h / max_edge - 1e-9)) if h > 0.0 else 0.0
+            return (hj, h) if by_jumps else (h, hj)
+
+        # g[n] = (primary, secondary); parent links rebuild the path
+        g: Dict[int, Tuple[float, float]] = {src: (0.0, 0.0)}
+        parent: Dict[int, int] = {}
+        h0 = heuristic(src)
+        open_heap: List[Tuple[float, float, int]] = [(h0[0], h0[1], src)]
+        closed = set()
+
+        while open_heap:
+            _f0, _f1, node = heapq.heappop(open_heap)
+            if node == dst:
+                break
+            if node in closed:
+                continue
+            closed.add(node)
+            g0, g1 = g[node]
+            for nb, d in adj.get(node, ()):
+                if d > limit:
+                    continue
+                cand = (g0 + 1.0, g1 + d) if by_jumps else (g0 + d, g1 + 1.0)
+                old = g.get(nb)
+                if old is not None and old <= cand:
+                    continue
+                g[nb] = cand
+                parent[nb] = node
+                closed.discard(nb)  # reopen: the heuristic is admissible but not guaranteed consistent
+                hn = heuristic(nb)
+                heapq.heappush(open_heap, (cand[0] + hn[0], cand[1] + hn[1], nb))
+        else:
+            return None
+
+        path = [dst]
+        while path[-1] != src:
+            path.append(parent[path[-1]])
+        path.reverse()
+        dist_ly, jumps = (g[dst][1], int(g[dst][0])) if by_jumps else (g[dst][0], int(g[dst][1]))
+        fuel = sum(jump_fuel(d) for d in self._leg_lengths(path))
+        return Route(tuple(path), dist_ly, jumps, fuel)
+
+    def _leg_lengths(self, path: List[int]) -> List[float]:
+        out: List[float] = []
+        for a, b in zip(path, path[1:]):
+            out.append(min(d for n, d in self.adj[a] if n == b))
+        return out
+
+
+# ---------- Active-save network + LRU route cache ----------
+
+_lock = threading.RLock()
+_network: Optional[GateNetwork] = None
+_network_key: Optional[Tuple[Path, int]] = None
+_routes: "OrderedDict[Tuple[Any, ...], Optional[Route]]" = OrderedDict()
+_hits = 0
+_misses = 0
+
+
+def _current_key() -> Tuple[Path, int]:
+    return (db.get_active_db_path(), int(db.get_universe_cache_versions().get("gate_links", 0)))
+
+
+def get_network() -> GateNetwork:
+    """Gate network for the active save; rebuilt (and the route cache cleared) when gate_links changes."""
+    global _network, _network_key
+    key = _current_key()
+    with _lock:
+        if _network is not None and _network_key == key:
+            return _network
+    net = GateNetwork.from_db()
+    with _lock:
+        if _network_key != key:
+            _routes.clear()
+        _network = net
+        _network_key = key
+    logger.debug(f"Gate network built: {len(net.adj)} systems, max edge {net.max_edge_ly:.2f} ly")
+    return net
+
+
+def find_route(src: int, dst: int, metric: str = METRIC_DISTANCE,
+               max_jump_ly: Optional[float] = None) -> Optional[Route]:
+    """Cached GateNetwork.find_route() on the active save."""
+    global _hits, _misses
+    net = get_network()
+    key = (int(src), int(dst), metric, None if max_jump_ly is None else float(max_jump_ly))
+    with _lock:
+        if key in _routes:
+            _routes.move_to_end(key)
+            _hits += 1
+            return _routes[key]
+    route = net.find_route(src, dst, metric, max_jump_ly)
+    with _lock:
+        _misses += 1
+        _routes[key] = route
+        if len(_routes) > ROUTE_CACHE_SIZE:
+            _routes.popitem(last=False)
+    return route
+
+
+def shortest_route(src: int, dst: int) -> Optional[Route]:
+    return find_route(src, dst, METRIC_DISTANCE)
+
+
+def fewest_jumps_route(src: int, dst: int) -> Optional[Route]:
+    return find_route(src, dst, METRIC_JUMPS)
+
+
+def fuel_feasible_route(src: int, dst: int, jump_range_ly: Optional[float] = None,
+                        fuel_budget: Optional[float] = None) -> Optional[Route]:
+    """
+    Lowest-fuel route that only uses jumps within range and fits the fuel budget.
+    Defaults: the player ship's base_ship_jump_distance and current fuel.
+    Jump fuel is linear in ly, so this is the shortest route over in-range edges.
+    """
+    if jump_range_ly is None or fuel_budget is None:
+        ship = db.get_player_ship() or {}
+        player = db.get_player_full() or {}
+        if jump_range_ly is None:
+            jump_range_ly = float(ship.get("base_ship_jump_distance") or 0.0)
+        if fuel_budget is None:
+            fuel_budget = float(player.get("current_player_ship_fuel") or 0.0)
+    route = find_route(src, dst, METRIC_FUEL, jump_range_ly)
+    if route is None or route.fuel > float(fuel_budget):
+        return None
+    return route
+
+
+def clear_route_cache() -> None:
+    with _lock:
+        _routes.clear()
+
+
+def route_cache_stats() -> Dict[str, int]:
+    with _lock:
+        return {"size": len(_routes), "capacity": ROUTE_CACHE_SIZE, "hits": _hits, "misses": _misses}
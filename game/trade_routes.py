@@ -0,0 +1,301 @@
+# /game/trade_routes.py
+
+"""
+Victurus Trade Route Optimizer
+
+Best buy-here / sell-there opportunities over live market prices:
+- Per-item cheapest-source and best-sink indexes over the sim's in-memory
+  market engine (market_engine.MarketArrays), updated incrementally from the
+  rows the sim touched instead of rescanning systems x items
+- Reachability within N gate jumps, limited by jump range and fuel
+  (routing.GateNetwork, routing.jump_fuel)
+- Candidates from the top of each item's indexes inside the reachable set,
+  verified for the full origin -> buy -> sell trip; cargo space, stock and
+  credits bound the quantity
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import threading
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from data import db
+from game import routing
+from game_controller.log_config import get_game_logger
+from game_controller.market_engine import MarketArrays
+
+logger = get_game_logger('trade_routes')
+
+# Index entries examined per item and side before falling back to scanning the reachable set.
+TOP_K = 8
+# Candidate (buy, sell) pairs whose full trip is checked per query.
+MAX_VERIFY = 64
+# A lazy heap is rebuilt once it holds this many entries per market system.
+_COMPACT_RATIO = 3
+
+
+@dataclass(frozen=True)
+class TradeRoute:
+    """Buy item_id at buy_system_id, sell at sell_system_id; path starts at the origin."""
+    item_id: int
+    buy_system_id: int
+    sell_system_id: int
+    buy_price: int
+    sell_price: int
+    qty: int
+    profit: int
+    jumps: int
+    fuel: float
+    path: Tuple[int, ...]
+
+
+class TradeIndex:
+    """
+    Per-item lazy heaps over the cells of a MarketArrays: sources keyed by
+    price (cells with stock), sinks by -price. A cell's heap entries carry
+    the cell's version; update_rows() bumps the version of every changed
+    cell and pushes fresh entries, and readers skip entries whose version is
+    stale. Thread-safe; the sim updates while the UI queries.
+    """
+
+    def __init__(self, markets: MarketArrays) -> None:
+        self.markets = markets
+        n = len(markets.present)
+        self.version = array("q", bytes(8 * n))
+        self.indexed_price = array("d", [math.nan]) * n
+        self.indexed_stock = array("d", bytes(8 * n))
+        self._src: List[List[Tuple[float, int, int]]] = [[] for _ in range(markets.n_items)]
+        self._snk: List[List[Tuple[float, int, int]]] = [[] for _ in range(markets.n_items)]
+        self._lock = threading.Lock()
+        self.update_rows(range(len(markets.system_ids)))
+
+    def update_rows(self, rows: Iterable[int]) -> int:
+        """Re-index the cells of the given market rows whose price or stock changed. Returns cells updated."""
+        m = self.markets
+        n_items = m.n_items
+        price, stock, present = m.price, m.stock, m.present
+        ip, ist, ver = self.indexed_price, self.indexed_stock, self.version
+        changed = 0
+        with self._lock:
+            for s in list(rows):
+                o = s * n_items
+                for i in range(n_items):
+                    c = o + i
+                    if not present[c]:
+                        continue
+                    p = price[c]
+                    st = stock[c]
+                    if p == ip[c] and (st >= 1.0) == (ist[c] >= 1.0):
+                        ist[c] = st
+                        continue
+                    v = ver[c] + 1
+                    ver[c] = v
+                    ip[c] = p
+                    ist[c] = st
+                    if st >= 1.0:
+                        heapq.heappush(self._src[i], (p, c, v))
+                    heapq.heappush(self._snk[i], (-p, c, v))
+                    changed += 1
+            if changed:
+                self._compact()
+        return changed
+
+    def _compact(self) -> None:
+        """Drop stale entries from heaps that outgrew their item's cells."""
+        limit = _COMPACT_RATIO * len(self.markets.system_ids) + 64
+        ver = self.version
+        for heaps in (self._src, self._snk):
+            for i, h in enumerate(heaps):
+                if len(h) > limit:
+                    h = [e for e in h if e[2] == ver[e[1]]]
+                    heapq.heapify(h)
+                    heaps[i] = h
+
+    def _valid(self, entry: Tuple[float, int, int], sinks: bool) -> bool:
+        c = entry[1]
+        if entry[2] != self.version[c]:
+            return False
+        return sinks or self.indexed_stock[c] >= 1.0
+
+    def top(self, item_index: int, k: int = TOP_K, sinks: bool = False,
+            allowed: Optional[Dict[int, object]] = None) -> List[int]:
+        """
+        Up to k best cells of an item (cheapest with stock, or highest-priced
+        sinks), restricted to system ids in `allowed` when given. Stale
+        entries met on the way are dropped for good. When the head of the
+        index holds fewer than k allowed cells the allowed systems are scanned.
+        """
+        m = self.markets
+        n_items = m.n_items
+        with self._lock:
+            heap = (self._snk if sinks else self._src)[item_index]
+            out: List[int] = []
+            popped: List[Tuple[float, int, int]] = []
+            budget = 4 * k + 64
+            while heap and len(out) < k and len(popped) < budget:
+                e = heapq.heappop(heap)
+                if not self._valid(e, sinks):
+                    continue
+                popped.append(e)
+                if allowed is None or m.system_ids[e[1] // n_items] in allowed:
+                    out.append(e[1])
+            for e in popped:
+                heapq.heappush(heap, e)
+            if len(out) >= k or allowed is None or (not heap and len(popped) < budget):
+                return out
+            # Dense reachable set, sparse head: scan the reachable systems directly.
+            cells = []
+            for sid in allowed:
+                s = m.sys_index.get(sid)
+                if s is None:
+                    continue
+                c = s * n_items + item_index
+                if m.present[c] and (sinks or self.indexed_stock[c] >= 1.0):
+                    cells.append(c)
+            key = (lambda c: -self.indexed_price[c]) if sinks else (lambda c: self.indexed_price[c])
+            return heapq.nsmallest(k, cells, key=key)
+
+
+# ---------- Reachability ----------
+
+def reachable(network: "routing.GateNetwork", origin: int, max_jumps: int,
+              jump_range_ly: Optional[float] = None, fuel_budget: Optional[float] = None
+              ) -> Dict[int, Tuple[int, float, Tuple[int, ...]]]:
+    """
+    {system_id: (jumps, fuel, path)} for systems reachable from origin in
+    at most max_jumps in-range jumps within the fuel budget: per system the
+    lowest-fuel way found within the jump limit. Relaxation is layered by
+    jump count and keeps each layer's parents, so a system reached more
+    cheaply in more jumps does not rewrite the paths already built on it.
+    """
+    origin = int(origin)
+    limit = math.inf if jump_range_ly is None else float(jump_range_ly)
+    budget = math.inf if fuel_budget is None else float(fuel_budget)
+    fuel: Dict[int, float] = {origin: 0.0}   # lowest fuel over the layers so far
+    layers: List[Dict[int, Tuple[float, int]]] = [{origin: (0.0, -1)}]
+    adj = network.adj
+    for _ in range(max(0, int(max_jumps))):
+        nxt: Dict[int, Tuple[float, int]] = {}
+        for a, (fa, _) in layers[-1].items():
+            for b, d in adj.get(a, ()):
+                if d > limit:
+                    continue
+                fb = fa + routing.jump_fuel(d)
+                if fb > budget + 1e-9:
+                    continue
+                old = nxt.get(b)
+                if (old is None or fb < old[0] - 1e-12) and fb < fuel.get(b, math.inf) - 1e-12:
+                    nxt[b] = (fb, a)
+        if not nxt:
+            break
+        for b, (fb, _) in nxt.items():
+            fuel[b] = fb   # only entries that beat every earlier layer were kept
+        layers.append(nxt)
+
+    best: Dict[int, Tuple[int, float, Tuple[int, ...]]] = {}
+    for j in range(len(layers) - 1, -1, -1):
+        for sid, (f, _) in layers[j].items():
+            if sid in best:
+                continue   # a later layer already reached it on less fuel
+            path = [sid]
+            for k in range(j, 0, -1):
+                path.append(layers[k][path[-1]][1])
+            path.reverse()
+            best[sid] = (j, f, tuple(path))
+    return best
+
+
+def best_routes(index: TradeIndex, network: "routing.GateNetwork", origin: int, max_jumps: int,
+                cargo: int, jump_range_ly: Optional[float] = None, fuel_budget: Optional[float] = None,
+                credits: Optional[int] = None, top: int = 5, buy_here: bool = False,
+                k: int = TOP_K) -> List[TradeRoute]:
+    """
+    Most profitable trades for a ship at origin: buy at a reachable system
+    (only origin when buy_here) and sell at another, the whole trip
+    origin -> buy -> sell within max_jumps jumps and the fuel budget. The
+    quantity is bounded by cargo, source stock and credits. Sorted by profit,
+    then fewer jumps.
+    """
+    m = index.markets
+    n_items = m.n_items
+    origin = int(origin)
+    reach = reachable(network, origin, max_jumps, jump_range_ly, fuel_budget)
+    if buy_here and origin not in m.sys_index:
+        return []
+    budget = math.inf if fuel_budget is None else float(fuel_budget)
+
+    cands: List[Tuple[int, int, int, int, int, int]] = []  # (-profit, item, src cell, dst cell, qty, sell)
+    price, stock = index.indexed_price, index.indexed_stock
+    for i in range(n_items):
+        if buy_here:
+            c = m.sys_index[origin] * n_items + i
+            srcs = [c] if m.present[c] and stock[c] >= 1.0 else []
+        else:
+            srcs = index.top(i, k, sinks=False, allowed=reach)
+        if not srcs:
+            continue
+        sinks = index.top(i, k, sinks=True, allowed=reach)
+        for sc in srcs:
+            buy = int(round(price[sc]))
+            qty = min(int(cargo), int(stock[sc]))
+            if credits is not None and buy > 0:
+                qty = min(qty, int(credits) // buy)
+            if qty <= 0:
+                continue
+            for dc in sinks:
+                if dc // n_items == sc // n_items:
+                    continue
+                sell = int(round(price[dc]))
+                if sell <= buy:
+                    break  # sinks are best-first
+                cands.append((-(sell - buy) * qty, i, sc, dc, qty, sell))
+    cands.sort()
+
+    out: List[TradeRoute] = []
+    for neg_profit, i, sc, dc, qty, sell in cands[:MAX_VERIFY]:
+        a = m.system_ids[sc // n_items]
+        b = m.system_ids[dc // n_items]
+        j0, f0, p0 = reach[a]
+        if a == origin:
+            leg = reach
+        else:
+            leg = reachable(network, a, max_jumps - j0, jump_range_ly, budget - f0)
+        if b not in leg:
+            continue
+        j1, f1, p1 = leg[b]
+        path = p0 + p1[1:]
+        out.append(TradeRoute(m.item_ids[i], a, b, int(round(price[sc])), sell, qty, -neg_profit,
+                              j0 + j1, f0 + f1, path))
+        if len(out) >= top:
+            break
+    out.sort(key=lambda r: (-r.profit, r.jumps))
+    return out
+
+
+# ---------- Active save ----------
+
+def get_index() -> TradeIndex:
+    """Trade index over the simulator's market engine for the active save."""
+    from game_controller.sim_loop import universe_sim  # lazy: sim_loop imports game modules lazily too
+    return universe_sim.trade_index()
+
+
+def best_routes_for_player(max_jumps: int = 5, top: int = 5, buy_here: bool = False) -> List[TradeRoute]:
+    """best_routes() from the player's system with their ship's free cargo, jump range, fuel and credits."""
+    player = db.get_player_full() or {}
+    ship = db.get_player_ship() or {}
+    origin = int(player.get("current_player_system_id") or 0)
+    if not origin:
+        return []
+    cargo = int(ship.get("base_ship_cargo") or 0) - int(player.get("current_player_ship_cargo") or 0)
+    return best_routes(
+        get_index(), routing.get_network(), origin, max_jumps, max(0, cargo),
+        jump_range_ly=float(ship.get("base_ship_jump_distance") or 0.0) or None,
+        fuel_budget=float(player.get("current_player_ship_fuel") or 0.0),
+        credits=int(player.get("current_wallet_credits") or 0),
+        top=top, buy_here=buy_here,
+    )
@@ -9,13 +9,17 @@ fuel consumption, and travel state management.
 
 from __future__ import annotations
 
-from typing import Dict, Any, Optional, Tuple, cast
+from typing import Dict, Any, Iterable, List, Optional, Tuple, cast
 import math
+import sqlite3
 
 from data import db
-from game import player_status
+from game import galaxy_index, player_status
+from game_controller.log_config import get_game_logger
 from settings import system_config as cfg
 
+logger = get_game_logger('travel')
+
 # ------------------------------------------------------------------
 # Shared fuel model (single source of truth for display + flow)
 # Read from central config with safe fallbacks
@@ -33,6 +37,10 @@ try:
 except Exception:
     WARP_FUEL_WEIGHT = 1.40
 
+# Relative/absolute slack on the galaxy index's jump-range query: its squared-distance
+# test and math.hypot can land on different sides of the exact range boundary.
+_JUMP_RANGE_PAD = 1e-9
+
 # ---------------------------
 # Safe helpers
 # ---------------------------
@@ -317,6 +325,189 @@ def get_travel_display_data(kind: str, ident: int) -> Dict[str, Any]:
     return out
 
 
+def compute_reachability(targets: Iterable[Tuple[str, int]]) -> List[Dict[str, Any]]:
+    """
+    Bulk variant of get_travel_display_data() for list views.
+
+    `targets` is an iterable of (kind, ident) pairs ("loc"/"star", same as the
+    per-target call). Returns one dict per target, in order, with exactly the
+    same keys and values get_travel_display_data() would return for it.
+
+    The player row, status snapshot, current location and source gate are
+    loaded once; target systems/locations come from the batch db lookups, and
+    the distance/fuel/reachability math runs in a single pass over the targets.
+    """
+    pairs = [(str(k), i) for k, i in targets]
+    if not pairs:
+        return []
+
+    # ---- Player context (once) ----
+    player = cast(Dict[str, Any], db.get_player_full() or {})
+    cur_sys_id = _safe_int(player.get("current_player_system_id") or player.get("system_id"), 0)
+    cur_loc_id_raw = player.get("current_player_location_id") or player.get("location_id")
+    cur_loc_id = _safe_int(cur_loc_id_raw, 0) or None
+
+    try:
+        status = player_status.get_status_snapshot()
+        player_fuel = float(status.get("fuel", 0))
+        jump_range_ly = float(status.get("current_jump_distance", status.get("base_jump_distance", 0.0)) or 0.0)
+    except Exception:
+        player_fuel = 0.0
+        jump_range_ly = 0.0
+
+    cur_loc = cast(Optional[Dict[str, Any]], db.get_location(cur_loc_id)) if cur_loc_id is not None else None
+    if cur_loc_id is not None:
+        source_kind = _loc_kind(cur_loc)
+    elif cur_sys_id:
+        source_kind = "star"
+    else:
+        source_kind = ""
+    cur_xy = _loc_xy_au(cur_loc) if cur_loc_id is not None else (0.0, 0.0)
+
+    src_xy_ly = _sys_xy(cast(Optional[Dict[str, Any]], db.get_system(cur_sys_id)))
+    intra_current_au = float(_dist(cur_xy, _loc_xy_au(cast(Optional[Dict[str, Any]], db.get_warp_gate(cur_sys_id)))))
+
+    # ---- Target rows (batched) ----
+    idents: List[Optional[int]] = []
+    for _kind, ident in pairs:
+        try:
+            idents.append(int(ident))
+        except (TypeError, ValueError):
+            idents.append(None)
+
+    loc_rows = db.get_locations_by_ids(i for (k, _), i in zip(pairs, idents) if k == "loc" and i is not None)
+    sys_ids = [i for (k, _), i in zip(pairs, idents) if k == "star" and i is not None]
+    sys_ids.extend(_safe_int(r.get("system_id"), 0) for r in loc_rows.values())
+    sys_rows = db.get_systems_by_ids(sys_ids)
+
+    gate_xy_by_sys: Dict[int, Tuple[float, float]] = {}
+
+    # Systems within jump range: one KD-tree range query instead of a range test per target
+    in_range = _jump_range_map(cur_sys_id, jump_range_ly)
+
+    # ---- Single pass over targets ----
+    results: List[Dict[str, Any]] = []
+    for (kind, _), ident in zip(pairs, idents):
+        target_loc: Optional[Dict[str, Any]] = None
+        target_sys: Optional[Dict[str, Any]] = None
+        if ident is None or kind not in ("loc", "star"):
+            results.append({"ok": False})
+            continue
+        if kind == "loc":
+            target_loc = loc_rows.get(ident)
+            if not target_loc:
+                results.append({"ok": False})
+                continue
+            target_sys = sys_rows.get(_safe_int(target_loc.get("system_id"), 0))
+        else:
+            target_sys = sys_rows.get(ident)
+        if not target_sys:
+            results.append({"ok": False})
+            continue
+
+        target_sys_id = _safe_int(target_sys.get("system_id") or target_sys.get("id"), 0)
+        same_system = (cur_sys_id == target_sys_id)
+        target_xy = _loc_xy_au(target_loc) if target_loc else (0.0, 0.0)
+
+        out: Dict[str, Any] = {
+            "ok": True,
+            "same_system": bool(same_system),
+            "source_kind": source_kind,
+            "target_kind": _loc_kind(target_loc) if target_loc else "star",
+            "target_system_id": target_sys_id,
+            "target_location_id": _safe_int(target_loc.get("location_id") or target_loc.get("id"), 0) if target_loc else None,
+        }
+
+        if same_system:
+            dist_au = float(_dist(cur_xy, target_xy))
+            fuel_cost = int(math.ceil(estimate_total_fuel(0.0, dist_au, 0.0, same_system=True)))
+            can_reach_fuel = (player_fuel >= fuel_cost)
+            out.update({
+                "dist_au": dist_au,
+                "dist_ly": 0.0,
+                "intra_current_au": 0.0,
+                "intra_target_au": 0.0,
+                "fuel_cost": fuel_cost,
+                "jump_dist": 0.0,
+                "distance": f"{0.0:.2f} ly, {dist_au:.2f} AU",
+                "can_reach": can_reach_fuel,
+                "can_reach_jump": True,
+                "can_reach_fuel": can_reach_fuel,
+            })
+            results.append(out)
+            continue
+
+        dist_ly = float(_dist(src_xy_ly, _sys_xy(target_sys)))
+        dest_gate_xy = gate_xy_by_sys.get(target_sys_id)
+        if dest_gate_xy is None:
+            dest_gate_xy = _loc_xy_au(cast(Optional[Dict[str, Any]], db.get_warp_gate(target_sys_id)))
+            gate_xy_by_sys[target_sys_id] = dest_gate_xy
+        intra_target_au = float(_dist(dest_gate_xy, target_xy))
+
+        fuel_cost = int(math.ceil(estimate_total_fuel(dist_ly, intra_current_au, intra_target_au, same_system=False)))
+        total_au = intra_current_au + intra_target_au
+        # Same test as the per-target path; the index only rules out systems well beyond range
+        can_reach_jump = (in_range is None or target_sys_id in in_range) and (jump_range_ly >= dist_ly)
+        can_reach_fuel = (player_fuel >= float(fuel_cost))
+        out.update({
+            "dist_ly": dist_ly,
+            "dist_au": 0.0,
+            "intra_current_au": intra_current_au,
+            "intra_target_au": intra_target_au,
+            "fuel_cost": fuel_cost,
+            "jump_dist": dist_ly,
+            "distance": f"{dist_ly:.2f} ly, {total_au:.2f} AU",
+            "can_reach": can_reach_jump and can_reach_fuel,
+            "can_reach_jump": can_reach_jump,
+            "can_reach_fuel": can_reach_fuel,
+        })
+        results.append(out)
+
+    return results
+
+
+def systems_in_jump_range(jump_range_ly: Optional[float] = None,
+                          system_id: Optional[int] = None) -> List[Tuple[int, float]]:
+    """
+    (system_id, ly) for every system within jump range of system_id (default:
+    the player's current system), nearest first. Uses the ship's current jump
+    distance unless jump_range_ly is given. Served by the galaxy spatial index.
+    """
+    cur_sys_id = _safe_int(system_id, 0)
+    if not cur_sys_id:
+        player = cast(Dict[str, Any], db.get_player_full() or {})
+        cur_sys_id = _safe_int(player.get("current_player_system_id") or player.get("system_id"), 0)
+    if not cur_sys_id:
+        return []
+    if jump_range_ly is None:
+        try:
+            status = player_status.get_status_snapshot()
+            jump_range_ly = float(status.get("current_jump_distance", status.get("base_jump_distance", 0.0)) or 0.0)
+        except Exception:
+            jump_range_ly = 0.0
+    return galaxy_index.systems_within(cur_sys_id, float(jump_range_ly))
+
+
+def _jump_range_map(cur_sys_id: int, jump_range_ly: float) -> Optional[Dict[int, float]]:
+    """
+    {system_id: ly} within jump range of cur_sys_id, padded so every system the
+    per-target `jump_range_ly >= dist_ly` test accepts is included; callers still
+    apply that test. None when there is no index to ask (it could not be built,
+    or cur_sys_id is not in it).
+    """
+    if not cur_sys_id:
+        return None
+    try:
+        idx = galaxy_index.get_index()
+    except sqlite3.Error as e:
+        logger.warning(f"Galaxy index unavailable, testing jump range per target: {e}")
+        return None
+    if cur_sys_id not in idx:
+        return None
+    radius = float(jump_range_ly)
+    return dict(idx.within(cur_sys_id, radius + radius * _JUMP_RANGE_PAD + _JUMP_RANGE_PAD))
+
+
 # ---------------------------
 # Fuel mutation helpers (used by TravelFlow)
 # ---------------------------
@@ -354,9 +545,7 @@ def consume_fuel(amount: float) -> float:
         return 0.0
 
     new_val = float(max(0.0, fuel - take))
-    conn = db.get_connection()
-    conn.execute("UPDATE player SET current_player_ship_fuel=? WHERE id=1", (new_val,))
-    conn.commit()
+    db.set_player_values(current_player_ship_fuel=new_val)
     return take
 
 
@@ -396,6 +585,7 @@ def perform_travel(kind: str, ident: int) -> str:
                 (dest_sys_id, dest_loc_id),
             )
         conn.commit()
+        player_status.invalidate_status()
         
         sys_row = cast(Optional[Dict[str, Any]], db.get_system(dest_sys_id))
         return f"Arrived in {_sys_name(sys_row)}, now orbiting {_loc_name(dest_loc)}."
@@ -418,6 +608,7 @@ def perform_travel(kind: str, ident: int) -> str:
                 (dest_sys_id,),
             )
         conn.commit()
+        player_status.invalidate_status()
         return f"Arrived in {_sys_name(dest_sys)}, orbiting the star."
     else:
         return "Unsupported travel target."
@@ -19,6 +19,7 @@ from PySide6.QtCore import QObject, QTimer, Signal, QElapsedTimer
 from game import travel
 from game import player_status
 from data import db  # for system-name fallbacks
+from game_controller.sim_loop import universe_sim
 from settings import system_config as cfg
 
 # Read travel tunables from central config
@@ -38,6 +39,11 @@ try:
     DRIP_STEP_MS = int(getattr(cfg, "TRAVEL_DRIP_STEP_MS", 10))
 except Exception:
     DRIP_STEP_MS = 10
+try:
+    PLAYER_FLUSH_MS = int(getattr(cfg, "TRAVEL_PLAYER_FLUSH_MS", 1000))
+except Exception:
+    PLAYER_FLUSH_MS = 1000
+db.set_player_flush_interval(PLAYER_FLUSH_MS / 1000.0)
 
 try:
     WRAP_FUEL_WEIGHT = float(getattr(cfg, "TRAVEL_WRAP_FUEL_WEIGHT", 2.00))
@@ -202,6 +208,9 @@ class TravelFlow(QObject):
         if not self._seq:
             self._log("Nothing to do.")
             return
+        # Simulate the corridor we are flying through at full detail
+        if self._origin_system_id and self._dest_system_id and self._origin_system_id != self._dest_system_id:
+            universe_sim.set_travel_route([int(self._origin_system_id), int(self._dest_system_id)])
         self._start_next_phase()
 
     def get_travel_route(self) -> Dict[str, Any]:
@@ -401,6 +410,8 @@ class TravelFlow(QObject):
         return name
 
     def _start_next_phase(self) -> None:
+        # Phase boundary: persist the fuel dripped so far
+        player_status.flush_player_state()
         if self._seq_index >= len(self._seq):
             return
         phase = self._seq[self._seq_index]
@@ -431,6 +442,7 @@ class TravelFlow(QObject):
             except Exception:
                 pass
             player_status.clear_transient_location()
+            universe_sim.on_player_arrival(self._dest_system_id)
 
             if callable(self._on_arrival):
                 self._on_arrival()
@@ -0,0 +1,313 @@
+# /game_controller/bench_sim.py
+
+"""
+Victurus Headless Simulation Benchmark
+
+Runs UniverseSimulator ticks without Qt and reports machine-readable results:
+- Builds synthetic universes of N systems (data/universe_gen.py) or uses a
+  copy of an existing game.db
+- Sweeps process pool on/off, tick budget fractions and universe sizes
+- Per-tick latency percentiles, sim-thread CPU time and DB rows written
+- NPC fleet sweeps (10k / 100k ships): per-tick fleet step, position
+  interpolation and summary write-back cost
+- JSON output (stdout or --json FILE) for tracking regressions over time
+
+Usage:
+    python -m game_controller.bench_sim --sizes 200,5000 --ticks 100 --pool off,on
+    python -m game_controller.bench_sim --sizes 5000 --ticks 100 --fleet 10000,100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from data import db
+from data import migrations
+from data import seed as seed_module
+from data import universe_gen
+from game_controller.market_engine import MarketArrays
+from game_controller.npc_fleet import NpcFleet
+from game_controller.sim_loop import UniverseSimulator
+
+# Starting stock of every market row in a synthetic universe.
+SYNTHETIC_STOCK = 500
+
+
+# ---------- Synthetic universes ----------
+
+def build_synthetic_db(path: Path, n_systems: int, seed: int = 1,
+                       locations_per_system: float = universe_gen.DEFAULT_LOCATIONS_PER_SYSTEM,
+                       link_density: float = universe_gen.DEFAULT_LINK_DENSITY) -> Path:
+    """
+    game.db seeded from a data/universe_gen.py universe of n_systems. Every
+    system gets a market row per item so the market step has real work.
+    """
+    path = Path(path)
+    if path.exists():
+        path.unlink()
+    seed_json = path.with_suffix(".seed.json")
+    universe_gen.write_universe(seed_json, n_systems, locations_per_system, link_density, seed)
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("PRAGMA foreign_keys=ON;")
+        migrations.migrate(conn)
+        seed_module.seed(conn, seed_json)
+        conn.execute(
+            "INSERT OR IGNORE INTO markets(system_id, item_id, local_market_price, local_market_stock) "
+            "SELECT s.system_id, i.item_id, i.item_base_price, ? FROM systems s, items i",
+            (SYNTHETIC_STOCK,),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+        seed_json.unlink(missing_ok=True)
+    return path
+
+
+# ---------- Measurement ----------
+
+def percentile(sorted_vals: Sequence[float], q: float) -> float:
+    """Linear-interpolated percentile (q in 0..100) of an ascending sequence."""
+    if not sorted_vals:
+        return 0.0
+    pos = (len(sorted_vals) - 1) * q / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_vals) - 1)
+    return sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (pos - lo)
+
+
+def copy_db(src: Path, dest: Path) -> None:
+    """
+    Consistent copy of src into dest via the SQLite online backup API, so a
+    WAL-mode source with un-checkpointed pages in its -wal is copied whole.
+    """
+    source = sqlite3.connect(src)
+    try:
+        target = sqlite3.connect(dest)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+    finally:
+        source.close()
+
+
+def run_config(db_path: Path, ticks: int, use_pool: bool, budget: float,
+               tick_hz: float = 2.0, workers: Optional[int] = None, warmup: int = 2) -> Dict[str, Any]:
+    """Run `ticks` sim ticks against db_path (modified in place) and summarize them."""
+    previous = db.get_active_db_path()
+    db.close_active_connection()
+    db.set_active_db_path(db_path)
+    sim = UniverseSimulator()
+    sim.set_tick_rate(tick_hz)
+    sim.set_tick_budget(budget)
+    if workers:
+        sim.set_max_workers(workers)
+    sim.set_use_process_pool(use_pool)
+    target_dt = 1.0 / sim._tick_rate_hz
+    try:
+        for _ in range(warmup):
+            sim._tick_once(target_dt)
+        sim.flush_all()
+        lat: List[float] = []
+        cpu0 = time.thread_time()
+        rows0 = sim.rows_written()
+        for _ in range(ticks):
+            t0 = time.perf_counter()
+            sim._tick_once(target_dt)
+            lat.append(time.perf_counter() - t0)
+        sim.flush_all()
+        cpu = time.thread_time() - cpu0
+        # Summed engine flush results: flush_all() writes on its own connections
+        rows = sim.rows_written() - rows0
+        counts = sim._lod.counts() if sim._lod is not None else {}
+    finally:
+        sim.stop()
+        db.close_active_connection()
+        db.set_active_db_path(previous)
+    lat_sorted = sorted(lat)
+    ms = 1000.0
+    return {
+        "ticks": ticks,
+        "pool": use_pool,
+        "budget_fraction": budget,
+        "tick_hz": tick_hz,
+        "lod": counts,
+        "latency_ms": {
+            "mean": sum(lat) / len(lat) * ms if lat else 0.0,
+            "p50": percentile(lat_sorted, 50) * ms,
+            "p90": percentile(lat_sorted, 90) * ms,
+            "p99": percentile(lat_sorted, 99) * ms,
+            "max": (lat_sorted[-1] if lat_sorted else 0.0) * ms,
+        },
+        "cpu_s": cpu,
+        "cpu_ms_per_tick": cpu / max(1, ticks) * ms,
+        "rows_written": rows,
+    }
+
+
+def run_fleet(db_path: Path, n_ships: int, ticks: int, tick_hz: float = 2.0,
+              settle_s: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Step an NPC fleet of n_ships over db_path's universe and markets (in
+    memory; the file is only read), first for settle_s game seconds so ships
+    are spread over docks and legs, then `ticks` measured ticks.
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        markets = MarketArrays.from_connection(conn, db_path)
+        fleet = NpcFleet.from_connection(conn, markets, 0.0, db_path, spawn_per_system=0)
+    finally:
+        conn.close()
+    fleet.spawn(n_ships)
+    dt = 1.0 / tick_hz
+    warm = float(settle_s if settle_s is not None else 2.0 * fleet.dock_s)
+    t = 0.0
+    while t < warm:
+        t = min(warm, t + 10.0)
+        fleet.advance(t)
+    fleet.dirty.clear()
+    lat: List[float] = []
+    moves = 0
+    for _ in range(ticks):
+        t += dt
+        t0 = time.perf_counter()
+        moves += fleet.advance(t)
+        lat.append(time.perf_counter() - t0)
+    t0 = time.perf_counter()
+    fleet.settle_all(t)
+    settle = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    fleet.positions(t)
+    positions = time.perf_counter() - t0
+    changed = len(fleet.dirty)
+    lat_sorted = sorted(lat)
+    ms = 1000.0
+    return {
+        "ships": fleet.n_ships,
+        "ticks": ticks,
+        "tick_hz": tick_hz,
+        "moves_per_tick": moves / max(1, ticks),
+        "tick_ms": {
+            "mean": sum(lat) / len(lat) * ms if lat else 0.0,
+            "p50": percentile(lat_sorted, 50) * ms,
+            "p99": percentile(lat_sorted, 99) * ms,
+            "max": (lat_sorted[-1] if lat_sorted else 0.0) * ms,
+        },
+        "settle_ms": settle * ms,
+        "positions_ms": positions * ms,
+        "rows_pending": changed,
+        **{k: v for k, v in fleet.summary().items() if k in ("travelling", "docked")},
+    }
+
+
+def _csv(text: str, cast) -> List[Any]:
+    return [cast(x.strip()) for x in text.split(",") if x.strip()]
+
+
+def _on_off(text: str) -> bool:
+    return text.lower() in ("1", "on", "true", "yes")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m game_controller.bench_sim",
+                                 description="Headless UniverseSimulator benchmark (JSON output).")
+    ap.add_argument("--db", type=Path, help="existing game.db to benchmark (copied; --sizes ignored)")
+    ap.add_argument("--sizes", default="200,5000", help="synthetic universe sizes (systems), comma-separated")
+    ap.add_argument("--ticks", type=int, default=100, help="measured ticks per configuration")
+    ap.add_argument("--warmup", type=int, default=2, help="unmeasured ticks before each run")
+    ap.add_argument("--pool", default="off", help="process pool settings to sweep, e.g. off,on")
+    ap.add_argument("--budgets", default="0.5", help="tick budget fractions to sweep, e.g. 0.1,0.5,1.0")
+    ap.add_argument("--tick-hz", type=float, default=2.0)
+    ap.add_argument("--workers", type=int, default=0, help="pool workers (0 = cpu_count - 1)")
+    ap.add_argument("--seed", type=int, default=1, help="synthetic universe seed")
+    ap.add_argument("--locations", type=float, default=universe_gen.DEFAULT_LOCATIONS_PER_SYSTEM,
+                    help="synthetic locations per system")
+    ap.add_argument("--links", type=float, default=universe_gen.DEFAULT_LINK_DENSITY,
+                    help="synthetic gate links per system")
+    ap.add_argument("--fleet", default="", help="NPC fleet sizes to benchmark per universe, e.g. 10000,100000")
+    ap.add_argument("--json", type=Path, help="write results here instead of stdout")
+    ap.add_argument("--quiet", action="store_true", help="no progress lines on stderr")
+    args = ap.parse_args(argv)
+
+    pools = [_on_off(p) for p in _csv(args.pool, str)]
+    budgets = _csv(args.budgets, float)
+    runs: List[Dict[str, Any]] = []
+    fleet_runs: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="victurus_bench_") as tmp:
+        tmp_dir = Path(tmp)
+        sources: List[tuple] = []
+        if args.db:
+            sources.append(("db", str(args.db), Path(args.db)))
+        else:
+            for n in _csv(args.sizes, int):
+                t0 = time.perf_counter()
+                src = build_synthetic_db(tmp_dir / f"synthetic_{n}.db", n, args.seed,
+                                         args.locations, args.links)
+                if not args.quiet:
+                    print(f"built {n}-system universe in {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+                sources.append(("synthetic", n, src))
+        for kind, label, src in sources:
+            with sqlite3.connect(src) as c:
+                n_systems = c.execute("SELECT COUNT(*) FROM systems").fetchone()[0]
+            for use_pool in pools:
+                for budget in budgets:
+                    work = tmp_dir / "run" / "game.db"
+                    if work.parent.exists():
+                        shutil.rmtree(work.parent)
+                    work.parent.mkdir(parents=True)
+                    copy_db(src, work)
+                    res = run_config(work, args.ticks, use_pool, budget, args.tick_hz,
+                                     args.workers or None, args.warmup)
+                    res.update({"source": kind, "label": label, "systems": n_systems})
+                    runs.append(res)
+                    if not args.quiet:
+                        lm = res["latency_ms"]
+                        print(f"{n_systems:>7} systems pool={'on ' if use_pool else 'off'} budget={budget:<4} "
+                              f"p50={lm['p50']:7.2f} p99={lm['p99']:7.2f} max={lm['max']:7.2f} ms "
+                              f"cpu={res['cpu_ms_per_tick']:6.2f} ms/tick rows={res['rows_written']}",
+                              file=sys.stderr)
+            for n_ships in _csv(args.fleet, int):
+                res = run_fleet(src, n_ships, args.ticks, args.tick_hz)
+                res.update({"source": kind, "label": label, "systems": n_systems})
+                fleet_runs.append(res)
+                if not args.quiet:
+                    tm = res["tick_ms"]
+                    print(f"{n_systems:>7} systems fleet={n_ships:<7} p50={tm['p50']:7.2f} p99={tm['p99']:7.2f} "
+                          f"max={tm['max']:7.2f} ms moves/tick={res['moves_per_tick']:.0f} "
+                          f"positions={res['positions_ms']:.1f} ms", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "ticks": args.ticks,
+            "tick_hz": args.tick_hz,
+        },
+        "runs": runs,
+    }
+    if fleet_runs:
+        report["fleet_runs"] = fleet_runs
+    text = json.dumps(report, indent=2)
+    if args.json:
+        args.json.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,10 +15,14 @@ Centralized configuration for Victurus game controller system:
 #   VICTURUS_USE_POOL=1
 #   VICTURUS_POOL_WORKERS=6
 #   VICTURUS_MARKET_DRIFT=0.005
-#   VICTURUS_MARKET_SUBSET=0.25
+#   VICTURUS_TICK_BUDGET=0.5
 #   VICTURUS_IDS_REFRESH=300
 #   VICTURUS_APPLY_CHUNK_MAX=250
 #   VICTURUS_DB_PATH=/abs/path/to/game.db
+#   VICTURUS_STRESS_SYSTEMS=20000   (new games use a synthetic universe)
+#   VICTURUS_STRESS_LOCATIONS=9
+#   VICTURUS_STRESS_LINKS=1.9
+#   VICTURUS_STRESS_SEED=1
 #   VICTURUS_LOG_LEVEL=INFO
 #   VICTURUS_LOG_FILE=victurus.log
 #   VICTURUS_LOG_JSON=0
@@ -31,7 +35,7 @@ from pathlib import Path
 from typing import Optional
 
 
-__all__ = ["Config", "load", "apply_to_sim"]
+__all__ = ["Config", "load", "apply_to_sim", "apply_stress_universe"]
 
 
 def _parse_bool(val: str | None, default: bool = False) -> bool:
@@ -62,13 +66,19 @@ class Config:
     use_process_pool: bool = False
     pool_workers: int = 0  # 0 means derive from cpu_count()-1 at runtime
     market_drift: float = 0.005
-    market_subset_fraction: float = 0.25
+    tick_budget_fraction: float = 0.5  # share of each tick the sim thread may spend working
     ids_refresh_every: int = 300
     apply_chunk_max: int = 250
 
     # Paths
     db_path: Optional[Path] = None
 
+    # Stress mode: seed new games from data/universe_gen.py instead of universe_seed.json
+    stress_systems: int = 0  # 0 = off
+    stress_locations: float = 9.0
+    stress_links: float = 1.9
+    stress_seed: int = 1
+
     # Logging
     log_level: str = "INFO"
     log_file: Optional[str] = None
@@ -90,16 +100,39 @@ def load() -> Config:
         use_process_pool=_parse_bool(os.getenv("VICTURUS_USE_POOL"), False),
         pool_workers=_parse_int("VICTURUS_POOL_WORKERS", default_workers),
         market_drift=_parse_float("VICTURUS_MARKET_DRIFT", 0.005),
-        market_subset_fraction=_parse_float("VICTURUS_MARKET_SUBSET", 0.25),
+        tick_budget_fraction=_parse_float("VICTURUS_TICK_BUDGET", 0.5),
         ids_refresh_every=_parse_int("VICTURUS_IDS_REFRESH", 300),
         apply_chunk_max=_parse_int("VICTURUS_APPLY_CHUNK_MAX", 250),
         db_path=db_path,
+        stress_systems=max(0, _parse_int("VICTURUS_STRESS_SYSTEMS", 0)),
+        stress_locations=_parse_float("VICTURUS_STRESS_LOCATIONS", 9.0),
+        stress_links=_parse_float("VICTURUS_STRESS_LINKS", 1.9),
+        stress_seed=_parse_int("VICTURUS_STRESS_SEED", 1),
         log_level=os.getenv("VICTURUS_LOG_LEVEL", "INFO").upper(),
         log_file=os.getenv("VICTURUS_LOG_FILE", "").strip() or None,
         log_json=_parse_bool(os.getenv("VICTURUS_LOG_JSON"), False),
     )
 
 
+def apply_stress_universe() -> Optional[Path]:
+    """
+    Stress mode: point the seeder at a cached synthetic universe of
+    VICTURUS_STRESS_SYSTEMS systems (generated on first use). Returns the
+    seed path, or None when stress mode is off.
+    """
+    cfg = load()
+    if cfg.stress_systems <= 0:
+        return None
+    from data import seed as seed_module
+    from data import universe_gen
+
+    path = universe_gen.ensure_stress_seed(
+        min(cfg.stress_systems, universe_gen.MAX_SYSTEMS), cfg.stress_locations, cfg.stress_links, cfg.stress_seed
+    )
+    os.environ[seed_module.SEED_PATH_ENV] = str(path)
+    return path
+
+
 # Optional helper to apply core settings to the running simulator
 def apply_to_sim(sim) -> None:
     """
@@ -122,6 +155,10 @@ def apply_to_sim(sim) -> None:
             sim.set_use_process_pool(bool(cfg.use_process_pool))
     except Exception:
         pass
-    # The simulator currently keeps its own defaults for drift/subset/chunk sizes.
-    # If you expose setters later (e.g., set_market_drift / set_subset_fraction),
-    # you can wire them here similarly.
+    try:
+        if hasattr(sim, "set_tick_budget"):
+            sim.set_tick_budget(float(cfg.tick_budget_fraction))
+    except Exception:
+        pass
+    # The simulator currently keeps its own defaults for drift/chunk sizes.
+    # If you expose setters later (e.g., set_market_drift), you can wire them here similarly.
@@ -0,0 +1,337 @@
+# /game_controller/facility_engine.py
+
+"""
+Victurus Facility Production Engine
+
+Production step for facilities owned by the simulation thread:
+- Rate matrices (facility_inputs / facility_outputs) precomputed once per save
+- Inventory mirrored from facility_inventory into a flat array of (facility, item) slots
+- Leontief-style step: output is limited by the scarcest input and by storage space
+- Inputs bought from the system's market cells (market_engine) before each step,
+  imported from outside the system where it has no market for them
+- Outputs sold into the system's market cells after each step (exported where
+  there is none), so storage never stalls production
+- Changed slots written back with one executemany in a single transaction
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from array import array
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from game_controller.market_engine import MarketArrays
+
+# facility_inputs/outputs rates are units per production tick of this many seconds.
+RATE_TICK_S = 1.0
+# Maximum stock a facility holds of any single item; producers idle when full
+# (the sim sells outputs every step, so only a bare step_systems() reaches it).
+STORAGE_CAP = 1000.0
+# Longest interval a single step will integrate (protects against long pauses).
+MAX_STEP_S = 10.0
+
+_UPSERT_SQL = (
+    "INSERT INTO facility_inventory(facility_id, item_id, qty) VALUES (?, ?, ?) "
+    "ON CONFLICT(facility_id, item_id) DO UPDATE SET qty=excluded.qty"
+)
+
+
+def step_systems(qty, in_ptr, in_slots, in_rates, out_ptr, out_slots, out_rates,
+                 sys_ptr, fac_list, rows: Iterable[Tuple[int, float]], dirty: Set[int],
+                 max_step_s: float = MAX_STEP_S, storage_cap: float = STORAGE_CAP) -> int:
+    """
+    Core production step over flat buffers (array.array or memoryview, so
+    worker processes can run it directly on shared memory). For each
+    (system row, dt_s) every facility in the system runs at the largest
+    fraction (0..1) of its nominal rate that its input stock and output
+    storage allow. Touched slots are added to `dirty`. Returns the number of
+    facilities that produced anything.
+
+    The fraction is fixed over the whole interval, so a long dt (coarse LOD
+    steps, raised max_step_s) is one closed-form step: it never consumes
+    more than is in stock or overfills storage_cap.
+    """
+    cap = storage_cap
+    active = 0
+    for r, dt_s in rows:
+        ticks = min(float(dt_s), max_step_s) / RATE_TICK_S
+        if ticks <= 0.0:
+            continue
+        for j in range(sys_ptr[r], sys_ptr[r + 1]):
+            f = fac_list[j]
+            i0, i1 = in_ptr[f], in_ptr[f + 1]
+            o0, o1 = out_ptr[f], out_ptr[f + 1]
+            if o0 == o1:
+                continue
+            frac = 1.0
+            for k in range(i0, i1):
+                need = in_rates[k] * ticks
+                have = qty[in_slots[k]]
+                if have < need * frac:
+                    frac = have / need
+            for k in range(o0, o1):
+                make = out_rates[k] * ticks
+                room = cap - qty[out_slots[k]]
+                if room < make * frac:
+                    frac = room / make if room > 0.0 else 0.0
+            if frac <= 1e-12:
+                continue
+            for k in range(i0, i1):
+                sl = in_slots[k]
+                left = qty[sl] - in_rates[k] * ticks * frac
+                qty[sl] = left if left > 1e-9 else 0.0
+                dirty.add(sl)
+            for k in range(o0, o1):
+                sl = out_slots[k]
+                qty[sl] += out_rates[k] * ticks * frac
+                dirty.add(sl)
+            active += 1
+    return active
+
+
+class FacilityProduction:
+    """
+    Slot-indexed inventory plus per-facility input/output rate vectors.
+
+    Facility f consumes in_rates[k] of slot in_slots[k] for k in
+    in_ptr[f]:in_ptr[f+1] (CSR layout) and produces likewise from the out_*
+    arrays. Each (facility, item) pair that appears as an input, an output or
+    an inventory row owns one slot. Systems are CSR too: system row r (see
+    sys_row) owns facilities fac_list[sys_ptr[r]:sys_ptr[r+1]].
+    """
+
+    def __init__(self, db_path: Optional[Path] = None) -> None:
+        self.db_path = db_path
+        self.facility_ids: List[int] = []
+        self.sys_row: Dict[int, int] = {}
+        self.sys_ptr = array("q", [0])
+        self.fac_list = array("q")
+        self.slot_key: List[Tuple[int, int]] = []
+        self.slot_index: Dict[Tuple[int, int], int] = {}
+        self.qty = array("d")
+        self.stored = array("d")
+        self.in_ptr = array("q", [0])
+        self.in_slots = array("q")
+        self.in_rates = array("d")
+        self.out_ptr = array("q", [0])
+        self.out_slots = array("q")
+        self.out_rates = array("d")
+        self.dirty: Set[int] = set()
+        self.units_imported = 0.0  # inputs supplied from outside systems without a market for them
+        self.units_sold = 0.0      # outputs sold to market cells or exported
+
+    def _slot(self, facility_id: int, item_id: int) -> int:
+        key = (facility_id, item_id)
+        s = self.slot_index.get(key)
+        if s is None:
+            s = len(self.slot_key)
+            self.slot_index[key] = s
+            self.slot_key.append(key)
+            self.qty.append(0.0)
+            self.stored.append(0.0)
+        return s
+
+    # ---- load ----
+    @classmethod
+    def from_connection(cls, conn: sqlite3.Connection, db_path: Optional[Path] = None) -> "FacilityProduction":
+        fp = cls(db_path)
+        facs = conn.execute(
+            """
+            SELECT f.facility_id, l.system_id
+            FROM facilities f
+            JOIN locations l ON l.location_id = f.location_id
+            ORDER BY f.facility_id
+            """
+        ).fetchall()
+        inputs: Dict[int, List[Tuple[int, float]]] = {}
+        outputs: Dict[int, List[Tuple[int, float]]] = {}
+        for fid, iid, rate in conn.execute("SELECT facility_id, item_id, rate FROM facility_inputs"):
+            if rate and rate > 0:
+                inputs.setdefault(int(fid), []).append((int(iid), float(rate)))
+        for fid, iid, rate in conn.execute("SELECT facility_id, item_id, rate FROM facility_outputs"):
+            if rate and rate > 0:
+                outputs.setdefault(int(fid), []).append((int(iid), float(rate)))
+
+        by_system: Dict[int, List[int]] = {}
+        for f_idx, (fid, sid) in enumerate(facs):
+            fid = int(fid)
+            fp.facility_ids.append(fid)
+            by_system.setdefault(int(sid), []).append(f_idx)
+            for iid, rate in sorted(inputs.get(fid, ())):
+                fp.in_slots.append(fp._slot(fid, iid))
+                fp.in_rates.append(rate)
+            fp.in_ptr.append(len(fp.in_slots))
+            for iid, rate in sorted(outputs.get(fid, ())):
+                fp.out_slots.append(fp._slot(fid, iid))
+                fp.out_rates.append(rate)
+            fp.out_ptr.append(len(fp.out_slots))
+
+        for sid in sorted(by_system):
+            fp.sys_row[sid] = len(fp.sys_ptr) - 1
+            fp.fac_list.extend(by_system[sid])
+            fp.sys_ptr.append(len(fp.fac_list))
+
+        for fid, iid, qty in conn.execute("SELECT facility_id, item_id, qty FROM facility_inventory"):
+            s = fp._slot(int(fid), int(iid))
+            fp.qty[s] = float(qty)
+            fp.stored[s] = float(qty)
+        return fp
+
+    # ---- simulation ----
+    def step(self, system_ids: Iterable[int], dt_s: float) -> int:
+        """Run dt_s seconds of production in every facility of the given systems."""
+        return self.step_many((sid, dt_s) for sid in system_ids)
+
+    def step_many(self, system_dts: Iterable[Tuple[int, float]], max_step_s: float = MAX_STEP_S,
+                  storage_cap: float = STORAGE_CAP) -> int:
+        """
+        Per-system (system_id, dt_s) variant of step(). Returns facilities
+        that produced. Callers that sell outputs after every step pass
+        storage_cap=math.inf: what a long step makes never sits in storage.
+        """
+        return step_systems(self.qty, self.in_ptr, self.in_slots, self.in_rates,
+                            self.out_ptr, self.out_slots, self.out_rates,
+                            self.sys_ptr, self.fac_list, self.step_rows_for(system_dts), self.dirty,
+                            max_step_s, storage_cap)
+
+    def step_rows_for(self, system_dts: Iterable[Tuple[int, float]]) -> List[Tuple[int, float]]:
+        """(system row, dt_s) pairs for step_systems(); unknown system ids are skipped."""
+        sys_row = self.sys_row
+        return [(sys_row[int(sid)], dt) for sid, dt in system_dts if int(sid) in sys_row]
+
+    def draw_inputs(self, markets: Optional["MarketArrays"], system_dts: Iterable[Tuple[int, float]],
+                    max_step_s: float = MAX_STEP_S) -> float:
+        """
+        Buy inputs before a step: every input slot is topped up to the
+        interval's nominal consumption. Where the system has a market cell
+        for the item the top-up comes from its stock, as far as that goes;
+        market stock falls by what was taken and recovers through the market
+        step's reversion. Items the system has no market for (or every item,
+        with markets=None) are imported in full. Returns the units moved.
+        """
+        sys_index = markets.sys_index if markets is not None else {}
+        item_index = markets.item_index if markets is not None else {}
+        n_items = markets.n_items if markets is not None else 0
+        present = markets.present if markets is not None else b""
+        stock = markets.stock if markets is not None else None
+        qty = self.qty
+        in_ptr, in_slots, in_rates = self.in_ptr, self.in_slots, self.in_rates
+        sys_ptr, fac_list = self.sys_ptr, self.fac_list
+        keys = self.slot_key
+        moved = 0.0
+        for sid, dt_s in system_dts:
+            r = self.sys_row.get(int(sid))
+            ticks = min(float(dt_s), max_step_s) / RATE_TICK_S
+            if r is None or ticks <= 0.0:
+                continue
+            s = sys_index.get(int(sid))
+            o = s * n_items if s is not None else -1
+            for j in range(sys_ptr[r], sys_ptr[r + 1]):
+                f = fac_list[j]
+                for k in range(in_ptr[f], in_ptr[f + 1]):
+                    sl = in_slots[k]
+                    short = in_rates[k] * ticks - qty[sl]
+                    if short <= 0.0:
+                        continue
+                    i = item_index.get(keys[sl][1]) if o >= 0 else None
+                    if i is not None and present[o + i]:
+                        take = min(short, stock[o + i])
+                        if take <= 0.0:
+                            continue
+                        stock[o + i] -= take
+                        markets.dirty.add(s)
+                    else:
+                        take = short  # no market for it here: imported
+                        self.units_imported += take
+                    qty[sl] += take
+                    self.dirty.add(sl)
+                    moved += take
+        return moved
+
+    def sell_outputs(self, markets: Optional["MarketArrays"], system_ids: Iterable[int]) -> float:
+        """
+        Sell everything in the output slots of the given systems' facilities
+        after a step: into the system's market cell for the item where there
+        is one (its stock rises and reverts through the market step), else
+        exported out of the system. Returns the units sold.
+        """
+        sys_index = markets.sys_index if markets is not None else {}
+        item_index = markets.item_index if markets is not None else {}
+        n_items = markets.n_items if markets is not None else 0
+        present = markets.present if markets is not None else b""
+        stock = markets.stock if markets is not None else None
+        qty = self.qty
+        out_ptr, out_slots = self.out_ptr, self.out_slots
+        sys_ptr, fac_list = self.sys_ptr, self.fac_list
+        keys = self.slot_key
+        sold = 0.0
+        for sid in system_ids:
+            r = self.sys_row.get(int(sid))
+            if r is None:
+                continue
+            s = sys_index.get(int(sid))
+            o = s * n_items if s is not None else -1
+            for j in range(sys_ptr[r], sys_ptr[r + 1]):
+                f = fac_list[j]
+                for k in range(out_ptr[f], out_ptr[f + 1]):
+                    sl = out_slots[k]
+                    have = qty[sl]
+                    if have <= 0.0:
+                        continue
+                    i = item_index.get(keys[sl][1]) if o >= 0 else None
+                    if i is not None and present[o + i]:
+                        stock[o + i] += have
+                        markets.dirty.add(s)
+                    qty[sl] = 0.0
+                    self.dirty.add(sl)
+                    sold += have
+        self.units_sold += sold
+        return sold
+
+    # ---- write-back ----
+    def pending_rows(self) -> List[Tuple[int, int, float]]:
+        qty = self.qty
+        stored = self.stored
+        keys = self.slot_key
+        return [(keys[s][0], keys[s][1], qty[s]) for s in sorted(self.dirty) if qty[s] != stored[s]]
+
+    def flush(self, conn: Optional[sqlite3.Connection] = None) -> int:
+        """
+        Upsert changed slots with one executemany in a single transaction.
+        Without conn a direct connection to db_path is opened. Returns rows written.
+        """
+        rows = self.pending_rows()
+        if not rows:
+            self.dirty.clear()
+            return 0
+        own = conn is None
+        if own:
+            if self.db_path is None:
+                return 0
+            conn = sqlite3.connect(str(self.db_path), timeout=1.0)
+        try:
+            conn.executemany(_UPSERT_SQL, rows)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            if own:
+                conn.close()
+        for s in self.dirty:
+            self.stored[s] = self.qty[s]
+        self.dirty.clear()
+        return len(rows)
+
+    # ---- reads ----
+    def get(self, facility_id: int, item_id: int) -> float:
+        s = self.slot_index.get((int(facility_id), int(item_id)))
+        return self.qty[s] if s is not None else 0.0
+
+    def add(self, facility_id: int, item_id: int, qty: float) -> None:
+        """Deliver (or with negative qty, remove) stock at a facility."""
+        s = self._slot(int(facility_id), int(item_id))
+        self.qty[s] = max(0.0, self.qty[s] + float(qty))
+        self.dirty.add(s)
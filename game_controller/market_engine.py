@@ -0,0 +1,336 @@
+# /game_controller/market_engine.py
+
+"""
+Victurus Dense Market Engine
+
+In-memory mirror of the markets table owned by the simulation thread:
+- Dense system x item arrays for prices and stocks (stdlib array, row-major)
+- Per-tick drift, stock mean-reversion toward the row's stored baseline, scarcity
+  pricing and clamping done in memory
+- Closed-form multi-tick advance for systems simulated at coarse cadence (LOD)
+- Dirty-row tracking; only cells whose stored integer values changed are written
+- Write-back with executemany at a caller-chosen flush cadence
+"""
+
+from __future__ import annotations
+
+import math
+import sqlite3
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Stock drifts this fraction of the way back to its baseline each step.
+STOCK_REVERSION = 0.02
+# Stock within this many units of baseline snaps to it (stored stock is whole units).
+STOCK_SNAP = 0.5
+# Price response to scarcity: +ELASTICITY * (baseline - stock) / baseline per step.
+PRICE_ELASTICITY = 0.01
+# Prices stay within [MIN, MAX] x item_base_price (and never below 1).
+PRICE_MIN_MULT = 0.25
+PRICE_MAX_MULT = 4.0
+# Aggregate drift over many ticks is capped at this fraction.
+MAX_ADVANCE_DRIFT = 0.5
+
+_UPDATE_SQL = "UPDATE markets SET local_market_price=?, local_market_stock=? WHERE rowid=?"
+
+_MASK64 = (1 << 64) - 1
+_INV_2_53 = 1.0 / float(1 << 53)
+
+
+def drift_factor(system_id: int, frame: int, drift: float) -> float:
+    """
+    Deterministic per-(system, frame) price factor: 1 - drift, 1 + drift or a
+    small jitter within +/- drift/4, each with probability 1/3. Same
+    distribution as sim_tasks._system_factor, but a splitmix64 hash replaces
+    the per-call random.Random() so a tick over thousands of systems stays cheap.
+    """
+    h = ((frame * 0x9E3779B97F4A7C15) ^ (system_id * 0xBF58476D1CE4E5B9)) & _MASK64
+    h ^= h >> 31
+    h = (h * 0x94D049BB133111EB) & _MASK64
+    h ^= h >> 29
+    roll = (h >> 11) * _INV_2_53
+    if roll < 1 / 3:
+        return 1.0 - drift
+    if roll > 2 / 3:
+        return 1.0 + drift
+    return 1.0 + (roll - 0.5) * 1.5 * drift
+
+
+def advance_params(n_steps: int) -> Tuple[float, float]:
+    """
+    (reversion, elasticity) that make one step_rows() call stand in for
+    n_steps ticks: reversion compounds to 1 - (1 - r)^n, and elasticity is
+    scaled by the summed (geometrically shrinking) stock gap over those ticks
+    relative to the gap left after the final tick.
+    """
+    if n_steps <= 1:
+        return STOCK_REVERSION, PRICE_ELASTICITY
+    keep = (1.0 - STOCK_REVERSION) ** n_steps
+    rev_n = 1.0 - keep
+    if keep <= 1e-12:
+        return 1.0, PRICE_ELASTICITY
+    el_n = PRICE_ELASTICITY * (1.0 - STOCK_REVERSION) * rev_n / (STOCK_REVERSION * keep)
+    return rev_n, el_n
+
+
+def step_rows(price, stock, baseline, present, lo, hi, n_items: int,
+              rows: Iterable[Tuple[int, float]], dirty: Set[int],
+              rev: float = STOCK_REVERSION, el: float = PRICE_ELASTICITY) -> int:
+    """
+    Core market step over flat row-major buffers (array.array or memoryview,
+    so worker processes can run it directly on shared memory). For each
+    (row, factor): stock reverts toward baseline, price moves by the factor
+    plus scarcity pressure and is clamped to the item's [lo, hi] band; stock
+    within STOCK_SNAP of baseline snaps to it, so recovered rows take the
+    at-baseline fast path again. Rows with market cells are added to `dirty`.
+    Returns the number of cells touched.
+    """
+    if not n_items:
+        return 0
+    full = b"\x01" * n_items
+    touched = 0
+    for s, f in rows:
+        o = s * n_items
+        e = o + n_items
+        mask = present[o:e]
+        if mask != full and not any(mask):
+            continue
+        row_s = stock[o:e]
+        row_b = baseline[o:e]
+        off = None if row_s == row_b else [i for i, (st, b) in enumerate(zip(row_s, row_b)) if st != b]
+        if off is None or 2 * len(off) < n_items:
+            # Stock at baseline: no reversion or scarcity pressure, and a
+            # pure factor can only cross one side of the band. The few cells
+            # off baseline (e.g. drawn down by NPC ships) are redone in full.
+            row_p = price[o:e]
+            scaled = map(f.__mul__, row_p)
+            if f >= 1.0:
+                new_p = [q if q < h else h for q, h in zip(scaled, hi)]
+            else:
+                new_p = [q if q > l else l for q, l in zip(scaled, lo)]
+            new_s = None
+            if off:
+                new_s = row_s
+                for i in off:
+                    b = row_b[i]
+                    st = row_s[i] + (b - row_s[i]) * rev
+                    if -STOCK_SNAP < b - st < STOCK_SNAP:
+                        st = b
+                    new_s[i] = st
+                    new_p[i] = min(hi[i], max(lo[i], row_p[i] * f * (1.0 + el * (b - st) / (b if b > 1.0 else 1.0))))
+        else:
+            new_s = array("d", [st + (b - st) * rev for st, b in zip(row_s, row_b)])
+            for i, (st, b) in enumerate(zip(new_s, row_b)):
+                if st != b and -STOCK_SNAP < b - st < STOCK_SNAP:
+                    new_s[i] = b
+            new_p = [
+                min(h, max(l, p * f * (1.0 + el * (b - st) / (b if b > 1.0 else 1.0))))
+                for p, st, b, l, h in zip(price[o:e], new_s, row_b, lo, hi)
+            ]
+        if mask == full:
+            price[o:e] = array("d", new_p)
+            if new_s is not None:
+                stock[o:e] = new_s
+            touched += n_items
+        else:
+            for i in range(n_items):
+                if mask[i]:
+                    price[o + i] = new_p[i]
+                    if new_s is not None:
+                        stock[o + i] = new_s[i]
+                    touched += 1
+        dirty.add(s)
+    return touched
+
+
+class MarketArrays:
+    """
+    Dense mirror of markets. Cell (s, i) lives at s * n_items + i; cells with
+    no markets row have present[cell] == 0 and are never touched.
+    """
+
+    def __init__(self, system_ids: List[int], item_ids: List[int], base_prices: Iterable[float],
+                 db_path: Optional[Path] = None) -> None:
+        self.db_path = db_path
+        self.system_ids = list(system_ids)
+        self.item_ids = list(item_ids)
+        self.sys_index: Dict[int, int] = {sid: i for i, sid in enumerate(self.system_ids)}
+        self.item_index: Dict[int, int] = {iid: i for i, iid in enumerate(self.item_ids)}
+        self.n_items = len(self.item_ids)
+        n = len(self.system_ids) * self.n_items
+        base = array("d", base_prices)
+        self.price_lo = array("d", (max(1.0, b * PRICE_MIN_MULT) for b in base))
+        self.price_hi = array("d", (max(1.0, b * PRICE_MAX_MULT) for b in base))
+        self.price = array("d", bytes(8 * n))
+        self.stock = array("d", bytes(8 * n))
+        self.baseline = array("d", bytes(8 * n))
+        self.stored_price = array("q", bytes(8 * n))
+        self.stored_stock = array("q", bytes(8 * n))
+        self.rowid = array("q", bytes(8 * n))
+        self.present = bytearray(n)
+        self.dirty: Set[int] = set()
+        self.cells_written = 0
+
+    # ---- load ----
+    @classmethod
+    def from_connection(cls, conn: sqlite3.Connection, db_path: Optional[Path] = None) -> "MarketArrays":
+        system_ids = [int(r[0]) for r in conn.execute("SELECT system_id FROM systems ORDER BY system_id")]
+        items = conn.execute("SELECT item_id, item_base_price FROM items ORDER BY item_id").fetchall()
+        m = cls(system_ids, [int(r[0]) for r in items], [float(r[1] or 0) for r in items], db_path)
+        m.load(conn)
+        return m
+
+    def load(self, conn: sqlite3.Connection) -> None:
+        """
+        (Re)read every markets row into the arrays; clears dirty state. The
+        baseline comes from local_market_baseline, never from live stock, so a
+        drawn-down market still reverts to its original equilibrium after a reload.
+        """
+        n_items = self.n_items
+        sys_index = self.sys_index
+        item_index = self.item_index
+        rows = conn.execute(
+            "SELECT rowid, system_id, item_id, local_market_price, local_market_stock, local_market_baseline"
+            " FROM markets"
+        ).fetchall()
+        for rid, sid, iid, price, stock, baseline in rows:
+            s = sys_index.get(int(sid))
+            i = item_index.get(int(iid))
+            if s is None or i is None:
+                continue
+            c = s * n_items + i
+            self.present[c] = 1
+            self.rowid[c] = int(rid)
+            self.price[c] = float(price)
+            self.stock[c] = float(stock)
+            self.baseline[c] = float(stock if baseline is None else baseline)
+            self.stored_price[c] = int(price)
+            self.stored_stock[c] = int(stock)
+        self.dirty.clear()
+
+    # ---- simulation ----
+    def step(self, system_ids: Iterable[int], frame: int, drift: float,
+             factors: Optional[Dict[int, float]] = None) -> int:
+        """
+        Advance the given systems one tick. Each system row gets one drift
+        factor (precomputed in `factors`, else drift_factor()), then
+        step_rows() applies it. Returns the number of market cells touched.
+        """
+        return step_rows(self.price, self.stock, self.baseline, self.present,
+                         self.price_lo, self.price_hi, self.n_items,
+                         self.step_rows_for(system_ids, frame, drift, factors), self.dirty)
+
+    def advance(self, system_steps: Iterable[Tuple[int, int]], frame: int, drift: float) -> int:
+        """
+        Bring systems forward by (system_id, n_ticks) in one closed-form step
+        each: compounded reversion/scarcity (advance_params) and a drift factor
+        widened by sqrt(n). Systems due exactly one tick take the normal step.
+        Returns the number of market cells touched.
+        """
+        groups: Dict[int, List[Tuple[int, float]]] = {}
+        sys_index = self.sys_index
+        for sid, n in system_steps:
+            sid = int(sid)
+            s = sys_index.get(sid)
+            if s is None or n <= 0:
+                continue
+            d = min(MAX_ADVANCE_DRIFT, drift * math.sqrt(n))
+            groups.setdefault(int(n), []).append((s, drift_factor(sid, frame, d)))
+        touched = 0
+        for n, rows in groups.items():
+            rev, el = advance_params(n)
+            touched += step_rows(self.price, self.stock, self.baseline, self.present,
+                                 self.price_lo, self.price_hi, self.n_items, rows, self.dirty, rev, el)
+        return touched
+
+    def step_rows_for(self, system_ids: Iterable[int], frame: int, drift: float,
+                      factors: Optional[Dict[int, float]] = None) -> List[Tuple[int, float]]:
+        """(row, factor) pairs for step_rows(); unknown system ids are skipped."""
+        sys_index = self.sys_index
+        rows: List[Tuple[int, float]] = []
+        for sid in system_ids:
+            sid = int(sid)
+            s = sys_index.get(sid)
+            if s is None:
+                continue
+            f = factors.get(sid, 1.0) if factors is not None else drift_factor(sid, frame, drift)
+            rows.append((s, f))
+        return rows
+
+    # ---- write-back ----
+    def _collect(self) -> Tuple[List[Tuple[int, int, int]], Dict[int, Tuple[array, array]]]:
+        """Changed (price, stock, rowid) rows plus each dirty row's rounded values."""
+        n_items = self.n_items
+        out: List[Tuple[int, int, int]] = []
+        rounded: Dict[int, Tuple[array, array]] = {}
+        price = self.price
+        stock = self.stock
+        sp = self.stored_price
+        ss = self.stored_stock
+        present = self.present
+        rowid = self.rowid
+        for s in self.dirty:
+            o = s * n_items
+            e = o + n_items
+            rp = array("q", [round(x) for x in price[o:e]])
+            rs = array("q", [round(x) for x in stock[o:e]])
+            old_p = sp[o:e]
+            old_s = ss[o:e]
+            if rp == old_p and rs == old_s:
+                continue
+            rounded[s] = (rp, rs)
+            out.extend(
+                (p, st, r)
+                for p, st, op, ost, r, m in zip(rp, rs, old_p, old_s, rowid[o:e], present[o:e])
+                if m and (p != op or st != ost)
+            )
+        return out, rounded
+
+    def pending_rows(self) -> List[Tuple[int, int, int]]:
+        """(price, stock, rowid) for cells whose stored integer values changed."""
+        return self._collect()[0]
+
+    def flush(self, conn: Optional[sqlite3.Connection] = None) -> int:
+        """
+        Write changed cells with one executemany and commit. Without conn a
+        direct connection to db_path is opened (e.g. the save was switched
+        while rows were pending). Returns the number of rows written.
+        """
+        rows, rounded = self._collect()
+        if not rows:
+            self.dirty.clear()
+            return 0
+        own = conn is None
+        if own:
+            if self.db_path is None:
+                return 0
+            conn = sqlite3.connect(str(self.db_path), timeout=1.0)
+        try:
+            conn.executemany(_UPDATE_SQL, rows)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            if own:
+                conn.close()
+        n_items = self.n_items
+        for s, (rp, rs) in rounded.items():
+            o = s * n_items
+            self.stored_price[o:o + n_items] = rp
+            self.stored_stock[o:o + n_items] = rs
+        self.dirty.clear()
+        self.cells_written += len(rows)
+        return len(rows)
+
+    # ---- reads ----
+    def get(self, system_id: int, item_id: int) -> Optional[Tuple[float, float]]:
+        s = self.sys_index.get(int(system_id))
+        i = self.item_index.get(int(item_id))
+        if s is None or i is None:
+            return None
+        c = s * self.n_items + i
+        if not self.present[c]:
+            return None
+        return self.price[c], self.stock[c]
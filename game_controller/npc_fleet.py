@@ -0,0 +1,504 @@
+# /game_controller/npc_fleet.py
+
+"""
+Victurus NPC Fleet
+
+NPC ships owned by the simulation thread, stored struct-of-arrays:
+- Parallel arrays per ship (design, system, destination, next hop, state,
+  leg start/end times, cargo) instead of one object per ship
+- Trips follow gate_links hop by hop; each leg's arrival time is computed
+  once at departure and positions are interpolated on demand, so a tick only
+  touches the ships whose leg or dock time ended (wake-up heap)
+- Role consumption (consumption_profiles_ship) summed per system from the
+  ships present and drawn from market stock in closed form between arrivals
+- Haulers carry surplus stock from origin to destination markets
+- Only per-ship summary state (npc_ships) is written back, for changed ships
+"""
+
+from __future__ import annotations
+
+import heapq
+import random
+import sqlite3
+from array import array
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from game_controller.facility_engine import RATE_TICK_S
+from game_controller.market_engine import MarketArrays
+from settings import system_config as cfg
+
+# Ship states (npc_ships.state)
+STATE_DOCKED = 0
+STATE_TRAVEL = 1
+
+# Roles that carry market goods between systems.
+CARGO_ROLES = ("hauler", "logistics")
+# consumption_profiles_ship role applied to every ship on top of its own roles.
+ANY_ROLE = "any"
+
+_UPSERT_SQL = (
+    "INSERT INTO npc_ships(npc_id, ship_id, system_id, next_system_id, dest_system_id, state, "
+    "cargo_item_id, cargo_qty, depart_s, arrive_s) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(npc_id) DO UPDATE SET system_id=excluded.system_id, "
+    "next_system_id=excluded.next_system_id, dest_system_id=excluded.dest_system_id, "
+    "state=excluded.state, cargo_item_id=excluded.cargo_item_id, cargo_qty=excluded.cargo_qty, "
+    "depart_s=excluded.depart_s, arrive_s=excluded.arrive_s"
+)
+
+
+class NpcFleet:
+    """
+    Ship k has design[k] (ships.ship_id), sits at or last left system row
+    sys[k], heads for next_sys[k] on the current leg and dest[k] overall.
+    Docked ships wake at t1[k] to plan a trip; travelling ships wake at t1[k]
+    on reaching next_sys[k]. route[k] holds the rows still to visit after
+    next_sys[k]. A ship counts as present (and consumes) in sys[k] until it
+    arrives somewhere else.
+    """
+
+    def __init__(self, system_ids: List[int], coords: List[Tuple[float, float]],
+                 edges: Iterable[Tuple[int, int, float]], db_path: Optional[Path] = None,
+                 seed: int = 1) -> None:
+        self.db_path = db_path
+        self.system_ids = list(system_ids)
+        self.sys_index: Dict[int, int] = {sid: r for r, sid in enumerate(self.system_ids)}
+        self.x = array("d", (c[0] for c in coords))
+        self.y = array("d", (c[1] for c in coords))
+        self.adj: List[List[Tuple[int, float]]] = [[] for _ in self.system_ids]
+        for a, b, d in edges:
+            ra, rb = self.sys_index.get(int(a)), self.sys_index.get(int(b))
+            if ra is None or rb is None or ra == rb:
+                continue
+            self.adj[ra].append((rb, float(d)))
+            self.adj[rb].append((ra, float(d)))
+        n_sys = len(self.system_ids)
+
+        self.warp_s_per_ly = float(getattr(cfg, "NPC_WARP_S_PER_LY", 2.0))
+        self.dock_s = float(getattr(cfg, "NPC_DOCK_S", 300.0))
+        lo = max(1, int(getattr(cfg, "NPC_TRIP_MIN_JUMPS", 1)))
+        self.trip_jumps = (lo, max(lo, int(getattr(cfg, "NPC_TRIP_MAX_JUMPS", 4))))
+        self.rng = random.Random(seed)
+
+        # Designs: cargo capacity, hauler flag and consumption per second (market item col, rate)
+        self.design_ids: List[int] = []
+        self.design_index: Dict[int, int] = {}
+        self.design_cargo = array("d")
+        self.design_hauls = bytearray()
+        self.design_rates: List[List[Tuple[int, float]]] = []
+
+        # Ships (parallel arrays)
+        self.npc_id = array("q")
+        self.design = array("i")
+        self.sys = array("i")
+        self.next_sys = array("i")
+        self.dest = array("i")
+        self.state = bytearray()
+        self.t0 = array("d")
+        self.t1 = array("d")
+        self.cargo_item = array("i")   # market item column, -1 when empty
+        self.cargo_qty = array("d")
+        self.route: List[Tuple[int, ...]] = []
+        self._wake: List[Tuple[float, int]] = []
+
+        # Per-system presence and consumption
+        self.present = array("i", bytes(4 * n_sys))
+        self.markets: Optional[MarketArrays] = None
+        self._item_col: List[int] = []          # market item column -> own consumption column
+        self.rate = array("d")                  # n_sys x consumed items, units per second
+        self.consumed_items: List[int] = []     # market item columns consumed by any design
+        self.settled_s = array("d", bytes(8 * n_sys))
+        self.consumed_total = 0.0
+
+        self.now_s = 0.0
+        self.dirty: Set[int] = set()
+        self.arrivals = 0
+        self.departures = 0
+
+    # ---- designs ----
+    def add_design(self, ship_id: int, cargo: float, roles: Iterable[str],
+                   profiles: Dict[str, List[Tuple[int, float]]], markets: Optional[MarketArrays]) -> int:
+        """Register a ship design; its consumption is the sum of its roles' profiles plus ANY_ROLE."""
+        roles = list(roles)
+        merged: Dict[int, float] = {}
+        for role in roles + [ANY_ROLE]:
+            for item_id, rate in profiles.get(role, ()):
+                i = markets.item_index.get(item_id) if markets is not None else None
+                if i is not None and rate > 0:
+                    merged[i] = merged.get(i, 0.0) + rate / RATE_TICK_S
+        d = len(self.design_ids)
+        self.design_ids.append(int(ship_id))
+        self.design_index[int(ship_id)] = d
+        self.design_cargo.append(float(cargo))
+        self.design_hauls.append(1 if any(r in CARGO_ROLES for r in roles) else 0)
+        self.design_rates.append(sorted(merged.items()))
+        return d
+
+    def _bind_markets(self, markets: Optional[MarketArrays]) -> None:
+        self.markets = markets
+        cols = sorted({i for rates in self.design_rates for i, _ in rates})
+        self.consumed_items = cols
+        self._item_col = [-1] * (markets.n_items if markets is not None else 0)
+        for k, i in enumerate(cols):
+            self._item_col[i] = k
+        self.rate = array("d", bytes(8 * len(self.system_ids) * len(cols)))
+
+    # ---- load / spawn ----
+    @classmethod
+    def from_connection(cls, conn: sqlite3.Connection, markets: Optional[MarketArrays] = None,
+                        now_s: float = 0.0, db_path: Optional[Path] = None,
+                        spawn_per_system: Optional[float] = None, seed: int = 1) -> "NpcFleet":
+        """
+        Fleet of a save: designs from ships/ship_roles, ships from npc_ships.
+        A save without NPC ships is populated with spawn_per_system ships per
+        gate-connected system (NPC_SHIPS_PER_SYSTEM by default).
+        """
+        rows = conn.execute("SELECT system_id, system_x, system_y FROM systems ORDER BY system_id").fetchall()
+        edges = conn.execute("SELECT system_a_id, system_b_id, distance_pc FROM gate_links").fetchall()
+        fleet = cls([int(r[0]) for r in rows], [(float(r[1] or 0.0), float(r[2] or 0.0)) for r in rows],
+                    edges, db_path, seed)
+        fleet.now_s = float(now_s)
+        fleet.settled_s = array("d", [fleet.now_s]) * len(fleet.system_ids)
+
+        roles: Dict[int, List[str]] = {}
+        for sid, role in conn.execute("SELECT ship_id, role FROM ship_roles"):
+            roles.setdefault(int(sid), []).append(str(role))
+        profiles: Dict[str, List[Tuple[int, float]]] = {}
+        for role, iid, rate in conn.execute("SELECT role, item_id, rate FROM consumption_profiles_ship"):
+            profiles.setdefault(str(role), []).append((int(iid), float(rate or 0.0)))
+        for ship_id, cargo in conn.execute("SELECT ship_id, base_ship_cargo FROM ships ORDER BY ship_id"):
+            if not roles or int(ship_id) in roles:
+                fleet.add_design(int(ship_id), float(cargo or 0), roles.get(int(ship_id), ()), profiles, markets)
+        fleet._bind_markets(markets)
+
+        loaded = fleet._load(conn)
+        if not loaded:
+            per = float(getattr(cfg, "NPC_SHIPS_PER_SYSTEM", 2.0) if spawn_per_system is None else spawn_per_system)
+            hubs = sum(1 for a in fleet.adj if a)
+            if per > 0 and hubs and fleet.design_ids:
+                fleet.spawn(int(round(per * hubs)))
+        return fleet
+
+    def _load(self, conn: sqlite3.Connection) -> int:
+        n = 0
+        for (npc_id, ship_id, sid, nxt, dst, state, item_id, qty, t0, t1) in conn.execute(
+            "SELECT npc_id, ship_id, system_id, next_system_id, dest_system_id, state, "
+            "cargo_item_id, cargo_qty, depart_s, arrive_s FROM npc_ships ORDER BY npc_id"
+        ):
+            d = self.design_index.get(int(ship_id))
+            r = self.sys_index.get(int(sid))
+            if d is None or r is None:
+                continue
+            k = self._append(int(npc_id), d, r)
+            nr = self.sys_index.get(int(nxt)) if nxt is not None else None
+            dr = self.sys_index.get(int(dst)) if dst is not None else None
+            if int(state) == STATE_TRAVEL and nr is not None:
+                self.state[k] = STATE_TRAVEL
+                self.next_sys[k] = nr
+                self.dest[k] = dr if dr is not None else nr
+                self.route[k] = self._path(nr, self.dest[k])
+            i = self.markets.item_index.get(int(item_id)) if self.markets is not None and item_id is not None else None
+            if i is not None and qty:
+                self.cargo_item[k] = i
+                self.cargo_qty[k] = float(qty)
+            self.t0[k] = float(t0 or 0.0)
+            self.t1[k] = float(t1 or 0.0)
+            heapq.heappush(self._wake, (self.t1[k], k))
+            n += 1
+        return n
+
+    def _append(self, npc_id: int, d: int, r: int) -> int:
+        k = len(self.npc_id)
+        self.npc_id.append(npc_id)
+        self.design.append(d)
+        self.sys.append(r)
+        self.next_sys.append(r)
+        self.dest.append(r)
+        self.state.append(STATE_DOCKED)
+        self.t0.append(self.now_s)
+        self.t1.append(self.now_s)
+        self.cargo_item.append(-1)
+        self.cargo_qty.append(0.0)
+        self.route.append(())
+        self._arrive_rates(k, r, +1)
+        return k
+
+    def spawn(self, n: int) -> None:
+        """Add n docked ships on gate-connected systems, undocking at staggered times."""
+        hubs = [r for r, a in enumerate(self.adj) if a]
+        if not hubs or not self.design_ids:
+            return
+        rng = self.rng
+        start = max(self.npc_id) + 1 if self.npc_id else 1
+        for j in range(int(n)):
+            k = self._append(start + j, rng.randrange(len(self.design_ids)), rng.choice(hubs))
+            self.t1[k] = self.now_s + rng.random() * self.dock_s
+            heapq.heappush(self._wake, (self.t1[k], k))
+            self.dirty.add(k)
+
+    @property
+    def n_ships(self) -> int:
+        return len(self.npc_id)
+
+    # ---- consumption ----
+    def _settle(self, r: int, now_s: float) -> None:
+        """Draw system row r's fleet consumption since it was last settled from its market stock."""
+        dt = now_s - self.settled_s[r]
+        if dt <= 0:
+            return   # an earlier time (a late wake-up) must not move the clock back
+        self.settled_s[r] = now_s
+        m = self.markets
+        if m is None or not self.present[r]:
+            return
+        n_c = len(self.consumed_items)
+        o = r * n_c
+        base = r * m.n_items
+        touched = False
+        for k, i in enumerate(self.consumed_items):
+            use = self.rate[o + k] * dt
+            c = base + i
+            if use > 0 and m.present[c]:
+                st = m.stock[c]
+                take = use if use < st else st
+                m.stock[c] = st - take
+                self.consumed_total += take
+                touched = True
+        if touched:
+            m.dirty.add(r)
+
+    def _arrive_rates(self, k: int, r: int, sign: int) -> None:
+        """Add (sign=+1) or remove (-1) ship k's consumption at system row r."""
+        self.present[r] += sign
+        rates = self.design_rates[self.design[k]]
+        if not rates or not self._item_col:
+            return
+        o = r * len(self.consumed_items)
+        col = self._item_col
+        for i, v in rates:
+            self.rate[o + col[i]] += sign * v
+
+    def settle_all(self, now_s: Optional[float] = None) -> None:
+        """Bring every system's consumption up to now_s (before a market flush)."""
+        t = self.now_s if now_s is None else float(now_s)
+        present = self.present
+        for r in range(len(self.system_ids)):
+            if present[r]:
+                self._settle(r, t)
+            else:
+                self.settled_s[r] = t
+
+    # ---- movement ----
+    def _walk(self, r: int) -> Tuple[int, ...]:
+        """Random gate walk of NPC_TRIP_MIN..MAX_JUMPS hops from row r, avoiding immediate backtracking."""
+        rng = self.rng
+        hops = rng.randint(*self.trip_jumps)
+        path: List[int] = []
+        prev, cur = -1, r
+        for _ in range(hops):
+            nbrs = self.adj[cur]
+            if not nbrs:
+                break
+            b = nbrs[rng.randrange(len(nbrs))][0]
+            if b == prev and len(nbrs) > 1:
+                b = nbrs[rng.randrange(len(nbrs))][0]
+            path.append(b)
+            prev, cur = cur, b
+        return tuple(path)
+
+    def _path(self, a: int, b: int) -> Tuple[int, ...]:
+        """Fewest-jump rows after a up to b (BFS); () when unreachable or a == b."""
+        if a == b:
+            return ()
+        parent = {a: -1}
+        q = deque([a])
+        while q:
+            u = q.popleft()
+            for v, _ in self.adj[u]:
+                if v not in parent:
+                    parent[v] = u
+                    if v == b:
+                        out = [b]
+                        while parent[out[-1]] != a:
+                            out.append(parent[out[-1]])
+                        out.reverse()
+                        return tuple(out[1:])
+                    q.append(v)
+        return ()
+
+    def _leg_s(self, a: int, b: int) -> float:
+        for nb, d in self.adj[a]:
+            if nb == b:
+                return max(1.0, d * self.warp_s_per_ly)
+        return max(1.0, ((self.x[a] - self.x[b]) ** 2 + (self.y[a] - self.y[b]) ** 2) ** 0.5 * self.warp_s_per_ly)
+
+    def _depart(self, k: int, now_s: float) -> None:
+        r = self.sys[k]
+        if self.state[k] == STATE_DOCKED:
+            path = self._walk(r)
+            if not path:
+                self.t1[k] = now_s + self.dock_s
+                heapq.heappush(self._wake, (self.t1[k], k))
+                return
+            self.dest[k] = path[-1]
+            self.route[k] = path[1:]
+            self.next_sys[k] = path[0]
+            self.state[k] = STATE_TRAVEL
+            self._load_cargo(k, r)
+            self.departures += 1
+        self.t0[k] = now_s
+        self.t1[k] = now_s + self._leg_s(r, self.next_sys[k])
+        heapq.heappush(self._wake, (self.t1[k], k))
+        self.dirty.add(k)
+
+    def _arrive(self, k: int, now_s: float) -> None:
+        a, b = self.sys[k], self.next_sys[k]
+        self._settle(a, now_s)
+        self._settle(b, now_s)
+        self._arrive_rates(k, a, -1)
+        self._arrive_rates(k, b, +1)
+        self.sys[k] = b
+        self.arrivals += 1
+        route = self.route[k]
+        if route:
+            self.next_sys[k] = route[0]
+            self.route[k] = route[1:]
+            self._depart(k, now_s)
+            return
+        self.state[k] = STATE_DOCKED
+        self._unload_cargo(k, b)
+        self.t0[k] = now_s
+        self.t1[k] = now_s + self.dock_s
+        heapq.heappush(self._wake, (self.t1[k], k))
+        self.dirty.add(k)
+
+    def _load_cargo(self, k: int, r: int) -> None:
+        """Haulers take the item with the largest surplus over baseline at r, up to their cargo space."""
+        m = self.markets
+        d = self.design[k]
+        if m is None or not self.design_hauls[d]:
+            return
+        o = r * m.n_items
+        best, best_i = 0.0, -1
+        for i in range(m.n_items):
+            c = o + i
+            if m.present[c]:
+                surplus = m.stock[c] - m.baseline[c]
+                if surplus > best:
+                    best, best_i = surplus, i
+        qty = min(self.design_cargo[d], int(best))
+        if best_i < 0 or qty < 1:
+            return
+        m.stock[o + best_i] -= qty
+        m.dirty.add(r)
+        self.cargo_item[k] = best_i
+        self.cargo_qty[k] = qty
+
+    def _unload_cargo(self, k: int, r: int) -> None:
+        m = self.markets
+        i = self.cargo_item[k]
+        if m is None or i < 0:
+            return
+        c = r * m.n_items + i
+        if m.present[c]:
+            m.stock[c] += self.cargo_qty[k]
+            m.dirty.add(r)
+        self.cargo_item[k] = -1
+        self.cargo_qty[k] = 0.0
+
+    def advance(self, now_s: float, limit: Optional[int] = None) -> int:
+        """
+        Move the fleet to game time now_s: every ship whose leg or dock time
+        ended arrives, departs or continues, in time order. With limit, at
+        most that many wake-ups are handled (the rest stay due for the next
+        call). Returns wake-ups handled.
+        """
+        now_s = float(now_s)
+        if now_s > self.now_s:
+            self.now_s = now_s
+        wake = self._wake
+        done = 0
+        while wake and wake[0][0] <= now_s and (limit is None or done < limit):
+            t, k = heapq.heappop(wake)
+            if t != self.t1[k]:
+                continue  # superseded
+            if self.state[k] == STATE_TRAVEL:
+                self._arrive(k, t)
+            else:
+                self._depart(k, t)
+            done += 1
+        return done
+
+    # ---- reads ----
+    def positions(self, now_s: Optional[float] = None) -> Tuple[array, array]:
+        """Galaxy (x, y) of every ship at now_s, interpolated along its current leg."""
+        t = self.now_s if now_s is None else float(now_s)
+        x, y = self.x, self.y
+        fr = [
+            (0.0 if s == STATE_DOCKED or b <= a else min(1.0, max(0.0, (t - a) / (b - a))))
+            for s, a, b in zip(self.state, self.t0, self.t1)
+        ]
+        xs = array("d", [x[p] + (x[q] - x[p]) * f for p, q, f in zip(self.sys, self.next_sys, fr)])
+        ys = array("d", [y[p] + (y[q] - y[p]) * f for p, q, f in zip(self.sys, self.next_sys, fr)])
+        return xs, ys
+
+    def ships_in(self, system_id: int) -> List[int]:
+        """npc_ids present in a system (docked there or on a leg that left it)."""
+        r = self.sys_index.get(int(system_id))
+        if r is None or not self.present[r]:
+            return []
+        ids = self.npc_id
+        return [ids[k] for k, s in enumerate(self.sys) if s == r]
+
+    def summary(self) -> Dict[str, float]:
+        travelling = self.state.count(STATE_TRAVEL)
+        return {
+            "ships": self.n_ships,
+            "travelling": travelling,
+            "docked": self.n_ships - travelling,
+            "arrivals": self.arrivals,
+            "departures": self.departures,
+            "consumed": self.consumed_total,
+        }
+
+    # ---- write-back ----
+    def pending_rows(self) -> List[Tuple]:
+        sids = self.system_ids
+        m = self.markets
+        rows = []
+        for k in sorted(self.dirty):
+            i = self.cargo_item[k]
+            travel = self.state[k] == STATE_TRAVEL
+            rows.append((
+                self.npc_id[k], self.design_ids[self.design[k]], sids[self.sys[k]],
+                sids[self.next_sys[k]] if travel else None, sids[self.dest[k]] if travel else None,
+                self.state[k], m.item_ids[i] if i >= 0 and m is not None else None, self.cargo_qty[k],
+                self.t0[k], self.t1[k],
+            ))
+        return rows
+
+    def flush(self, conn: Optional[sqlite3.Connection] = None) -> int:
+        """
+        Upsert the summary row of every ship that changed since the last
+        flush with one executemany. Without conn a direct connection to
+        db_path is opened. Returns rows written.
+        """
+        rows = self.pending_rows()
+        if not rows:
+            return 0
+        own = conn is None
+        if own:
+            if self.db_path is None:
+                return 0
+            conn = sqlite3.connect(str(self.db_path), timeout=1.0)
+        try:
+            conn.executemany(_UPSERT_SQL, rows)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            if own:
+                conn.close()
+        self.dirty.clear()
+        return len(rows)
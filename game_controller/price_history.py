@@ -0,0 +1,302 @@
+# /game_controller/price_history.py
+
+"""
+Victurus Price History
+
+Market price history recorded by the simulation thread:
+- Fixed-width ring buffers (int32 time, int32 price) per market cell of a
+  MarketArrays engine; a sample is stored only when the price changed
+- Samples taken every PRICE_HISTORY_SAMPLE_S game seconds, scanning only
+  market rows touched since the last sample
+- Unflushed samples rolled up into 1 min / 1 h / 1 day OHLC buckets and
+  upserted into price_rollups in one transaction; old buckets pruned
+- Chart queries pick the resolution that fits the requested window and
+  merge in samples not yet written
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from game_controller.market_engine import MarketArrays
+from settings import system_config as cfg
+
+# Rollup bucket widths (game seconds), finest first.
+ROLLUP_RESOLUTIONS = (60, 3600, 86400)
+# Raw ring samples are reported with this resolution.
+RAW_RES = 0
+# Default number of points a chart asks for.
+DEFAULT_MAX_POINTS = 300
+
+_UPSERT_SQL = (
+    "INSERT INTO price_rollups(res_s, system_id, item_id, bucket, open, high, low, close) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(res_s, system_id, item_id, bucket) DO UPDATE SET "
+    "high=MAX(high, excluded.high), low=MIN(low, excluded.low), close=excluded.close"
+)
+
+# (bucket start, open, high, low, close)
+Bar = Tuple[int, int, int, int, int]
+
+
+def retention_s(res_s: int) -> float:
+    """How long buckets of res_s are kept (0 = forever)."""
+    name = {60: "PRICE_HISTORY_KEEP_MINUTES_S", 3600: "PRICE_HISTORY_KEEP_HOURS_S",
+            86400: "PRICE_HISTORY_KEEP_DAYS_S"}.get(res_s)
+    return float(getattr(cfg, name, 0)) if name else 0.0
+
+
+def rollup(samples: Iterable[Tuple[int, int]], res_s: int) -> Dict[int, List[int]]:
+    """{bucket start: [open, high, low, close]} of chronological (t, price) samples."""
+    out: Dict[int, List[int]] = {}
+    for t, p in samples:
+        b = t - t % res_s
+        bar = out.get(b)
+        if bar is None:
+            out[b] = [p, p, p, p]
+        else:
+            if p > bar[1]:
+                bar[1] = p
+            if p < bar[2]:
+                bar[2] = p
+            bar[3] = p
+    return out
+
+
+def choose_resolution(t0: float, t1: float, max_points: int, now_s: float) -> int:
+    """Finest rollup giving at most max_points buckets over [t0, t1] that is still retained at t0."""
+    span = max(0.0, t1 - t0)
+    for res in ROLLUP_RESOLUTIONS:
+        keep = retention_s(res)
+        if span / res <= max_points and (keep <= 0 or now_s - t0 <= keep):
+            return res
+    return ROLLUP_RESOLUTIONS[-1]
+
+
+def query_rollups(conn: sqlite3.Connection, system_id: int, item_id: int, t0: float, t1: float,
+                  max_points: int = DEFAULT_MAX_POINTS, now_s: Optional[float] = None,
+                  pending: Iterable[Tuple[int, int]] = ()) -> Tuple[int, List[Bar]]:
+    """
+    (resolution, bars) from price_rollups at the finest resolution that
+    fits [t0, t1], with not-yet-flushed (t, price) samples merged in.
+    """
+    now = t1 if now_s is None else now_s
+    res = choose_resolution(t0, t1, max_points, now)
+    lo = int(t0) - int(t0) % res
+    bars: Dict[int, List[int]] = {
+        int(b): [o, h, l, c] for b, o, h, l, c in conn.execute(
+            "SELECT bucket, open, high, low, close FROM price_rollups "
+            "WHERE res_s = ? AND system_id = ? AND item_id = ? AND bucket BETWEEN ? AND ? "
+            "ORDER BY bucket",
+            (res, int(system_id), int(item_id), lo, int(t1)),
+        )
+    }
+    for b, (o, h, l, c) in rollup(pending, res).items():
+        if not lo <= b <= t1:
+            continue
+        bar = bars.get(b)
+        if bar is None:
+            bars[b] = [o, h, l, c]
+        else:
+            bar[1] = max(bar[1], h)
+            bar[2] = min(bar[2], l)
+            bar[3] = c
+    return res, [(b, *bars[b]) for b in sorted(bars)]
+
+
+class PriceHistory:
+    """
+    Ring buffers over the cells of one MarketArrays. Series slots are
+    allocated on a cell's first sample; slot k owns ts/px[k*capacity:
+    (k+1)*capacity], with head (next write), count (valid) and pending
+    (not yet rolled up) per slot. If more than `capacity` samples pile up
+    between flushes the oldest are dropped (counted in `dropped`).
+    """
+
+    def __init__(self, markets: MarketArrays, capacity: Optional[int] = None,
+                 sample_s: Optional[float] = None) -> None:
+        self.markets = markets
+        self.db_path = markets.db_path
+        self.capacity = max(2, int(capacity or getattr(cfg, "PRICE_HISTORY_RING_SAMPLES", 64)))
+        self.sample_s = float(sample_s if sample_s is not None else getattr(cfg, "PRICE_HISTORY_SAMPLE_S", 60.0))
+        self.slot = array("i", [-1]) * len(markets.present)
+        self.cell_of = array("i")
+        self.ts = array("i")
+        self.px = array("i")
+        self.head = array("i")
+        self.count = array("i")
+        self.pending = array("i")
+        self.last_sample_s: Optional[float] = None
+        self.max_pending = 0
+        self.samples_since_flush = 0
+        self.flush_samples = max(1, int(getattr(cfg, "PRICE_HISTORY_FLUSH_SAMPLES", 10)))
+        self.dropped = 0
+        self._rows: Set[int] = set()         # market rows touched since the last sample
+        self._dirty_slots: Set[int] = set()  # slots with pending samples
+        self._pruned_at: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    # ---- recording ----
+    def _record(self, cell: int, t: int, p: int, pending: bool = True) -> None:
+        cap = self.capacity
+        sl = self.slot[cell]
+        if sl < 0:
+            sl = len(self.cell_of)
+            self.slot[cell] = sl
+            self.cell_of.append(cell)
+            self.ts.extend(array("i", bytes(4 * cap)))
+            self.px.extend(array("i", bytes(4 * cap)))
+            self.head.append(0)
+            self.count.append(0)
+            self.pending.append(0)
+        base = sl * cap
+        h = self.head[sl]
+        if self.count[sl] and self.px[base + (h - 1) % cap] == p:
+            return
+        self.ts[base + h] = t
+        self.px[base + h] = p
+        self.head[sl] = (h + 1) % cap
+        if self.count[sl] < cap:
+            self.count[sl] += 1
+        if not pending:
+            return
+        n = self.pending[sl] + 1
+        if n > cap:
+            n = cap
+            self.dropped += 1
+        self.pending[sl] = n
+        if n > self.max_pending:
+            self.max_pending = n
+        self._dirty_slots.add(sl)
+
+    def note_rows(self, rows: Iterable[int]) -> None:
+        """Remember touched market rows (call before MarketArrays.flush() clears its dirty set)."""
+        self._rows.update(rows)
+
+    def due(self, now_s: float) -> bool:
+        return self.last_sample_s is None or now_s - self.last_sample_s >= self.sample_s
+
+    def sample(self, now_s: float, full: bool = False) -> int:
+        """
+        Record the current price of every market cell in rows touched since
+        the last sample. full=True records every cell as the ring's baseline
+        (already in the markets table, so not written as rollups).
+        Returns the number of cells scanned.
+        """
+        m = self.markets
+        n_items = m.n_items
+        t = int(now_s)
+        with self._lock:
+            rows = range(len(m.system_ids)) if full else (self._rows | m.dirty)
+            scanned = 0
+            present = m.present
+            price = m.price
+            for s in rows:
+                o = s * n_items
+                for c in range(o, o + n_items):
+                    if present[c]:
+                        self._record(c, t, round(price[c]), not full)
+                        scanned += 1
+            self._rows.clear()
+            self.last_sample_s = now_s
+            if not full:
+                self.samples_since_flush += 1
+            return scanned
+
+    def needs_flush(self) -> bool:
+        """True every flush_samples samples, or once some series has half its ring waiting."""
+        return self.samples_since_flush >= self.flush_samples or self.max_pending * 2 >= self.capacity
+
+    def _pending_samples(self, sl: int) -> List[Tuple[int, int]]:
+        return self._samples(sl, self.pending[sl])
+
+    def _samples(self, sl: int, n: int) -> List[Tuple[int, int]]:
+        """Last n samples of slot sl, oldest first."""
+        cap = self.capacity
+        base = sl * cap
+        h = self.head[sl]
+        idx = [base + (h - n + k) % cap for k in range(n)]
+        return [(self.ts[i], self.px[i]) for i in idx]
+
+    def _key(self, sl: int) -> Tuple[int, int]:
+        cell = self.cell_of[sl]
+        n_items = self.markets.n_items
+        return self.markets.system_ids[cell // n_items], self.markets.item_ids[cell % n_items]
+
+    # ---- write-back ----
+    def flush(self, conn: Optional[sqlite3.Connection] = None, now_s: Optional[float] = None) -> int:
+        """
+        Roll pending samples into every resolution and upsert them in one
+        transaction; prune expired buckets at most once per bucket width.
+        Without conn a direct connection to db_path is opened. Returns rows upserted.
+        """
+        with self._lock:
+            slots = sorted(self._dirty_slots)
+            rows: List[Tuple[int, ...]] = []
+            for sl in slots:
+                sid, iid = self._key(sl)
+                samples = self._pending_samples(sl)
+                for res in ROLLUP_RESOLUTIONS:
+                    for b, (o, h, l, c) in rollup(samples, res).items():
+                        rows.append((res, sid, iid, b, o, h, l, c))
+            prune = []
+            if now_s is not None:
+                for res in ROLLUP_RESOLUTIONS:
+                    keep = retention_s(res)
+                    if keep > 0 and now_s - self._pruned_at.get(res, -1e18) >= res:
+                        prune.append((res, int(now_s - keep)))
+            if not rows and not prune:
+                self.samples_since_flush = 0
+                return 0
+            own = conn is None
+            if own:
+                if self.db_path is None:
+                    return 0
+                conn = sqlite3.connect(str(self.db_path), timeout=1.0)
+            try:
+                if rows:
+                    conn.executemany(_UPSERT_SQL, rows)
+                for res, cutoff in prune:
+                    conn.execute("DELETE FROM price_rollups WHERE res_s = ? AND bucket < ?", (res, cutoff))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                if own:
+                    conn.close()
+            for res, _ in prune:
+                self._pruned_at[res] = float(now_s)
+            for sl in slots:
+                self.pending[sl] = 0
+            self._dirty_slots.clear()
+            self.max_pending = 0
+            self.samples_since_flush = 0
+            return len(rows)
+
+    # ---- queries ----
+    def query(self, conn: sqlite3.Connection, system_id: int, item_id: int, t0: float, t1: float,
+              max_points: int = DEFAULT_MAX_POINTS, now_s: Optional[float] = None) -> Tuple[int, List[Bar]]:
+        """
+        Price bars for one market over [t0, t1] (sim clock seconds) as
+        (resolution, [(t, open, high, low, close), ...]). Raw ring samples
+        (resolution 0) are used while the ring still reaches back to t0 and
+        fits in max_points; otherwise the finest fitting rollup, with samples
+        not yet flushed merged into its latest buckets.
+        """
+        now = t1 if now_s is None else now_s
+        m = self.markets
+        s = m.sys_index.get(int(system_id))
+        i = m.item_index.get(int(item_id))
+        sl = self.slot[s * m.n_items + i] if s is not None and i is not None else -1
+        with self._lock:
+            ring = self._samples(sl, self.count[sl]) if sl >= 0 else []
+            pending = self._pending_samples(sl) if sl >= 0 else []
+        if ring and ring[0][0] <= t0:
+            raw = [(t, p, p, p, p) for t, p in ring if t0 <= t <= t1]
+            if len(raw) <= max_points:
+                return RAW_RES, raw
+        return query_rollups(conn, system_id, item_id, t0, t1, max_points, now, pending)
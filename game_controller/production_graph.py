@@ -0,0 +1,344 @@
+# /game_controller/production_graph.py
+
+"""
+Victurus Production Graph
+
+Compiled commodity production chains for galaxy-wide economy queries:
+- Recipes (inputs -> outputs per run) from data/initial_commodity_tree.json
+  or from the facility designs of a save (facility_inputs/outputs)
+- Topological order over commodities (inputs before outputs) with chain depth
+- Sparse CSR input/output matrices plus their transposes (stdlib array)
+- Net flow, gross requirements, supply/demand balance and bottleneck queries
+  in O(nnz) sparse passes instead of per-facility loops
+
+Read-only: per-tick facility production stays in facility_engine, which
+already steps every facility slot in flat arrays.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from game_controller.facility_engine import RATE_TICK_S
+
+COMMODITY_TREE_PATH = Path(__file__).resolve().parents[1] / "data" / "initial_commodity_tree.json"
+
+# Fixed-point passes for gross_requirements() with co-products or cycles.
+MAX_CYCLE_PASSES = 200
+CYCLE_TOLERANCE = 1e-9
+
+# (outputs, inputs, facility_type, time_s); outputs/inputs are (commodity, qty per run) pairs.
+RecipeSpec = Tuple[Sequence[Tuple[Hashable, float]], Sequence[Tuple[Hashable, float]], str, float]
+
+
+def _csr(rows: List[List[Tuple[int, float]]]) -> Tuple[array, array, array]:
+    ptr, cols, vals = array("q", [0]), array("q"), array("d")
+    for row in rows:
+        for c, v in row:
+            cols.append(c)
+            vals.append(v)
+        ptr.append(len(cols))
+    return ptr, cols, vals
+
+
+def _transpose(ptr: array, cols: array, vals: array, n_cols: int) -> Tuple[array, array, array]:
+    rows: List[List[Tuple[int, float]]] = [[] for _ in range(n_cols)]
+    for r in range(len(ptr) - 1):
+        for k in range(ptr[r], ptr[r + 1]):
+            rows[cols[k]].append((r, vals[k]))
+    return _csr(rows)
+
+
+class ProductionGraph:
+    """
+    Commodities 0..n-1 (keys in `keys`) and recipes 0..m-1. Recipe r consumes
+    in_vals[k] of commodity in_cols[k] for k in in_ptr[r]:in_ptr[r+1] per run
+    and produces the out_* entries likewise. The transposes map a commodity
+    to the recipes that consume it (use_*) and produce it (make_*).
+    Activity vectors are runs per second per recipe.
+    """
+
+    def __init__(self, keys: Sequence[Hashable], recipes: Sequence[RecipeSpec],
+                 info: Optional[Dict[Hashable, Dict[str, Any]]] = None) -> None:
+        self.keys: List[Hashable] = list(keys)
+        self.index: Dict[Hashable, int] = {k: i for i, k in enumerate(self.keys)}
+        self.info = info or {}
+        self.facility_types: List[str] = []
+        self.time_s = array("d")
+        ins: List[List[Tuple[int, float]]] = []
+        outs: List[List[Tuple[int, float]]] = []
+        for outputs, inputs, ftype, time_s in recipes:
+            outs.append(sorted(self._entries(outputs)))
+            ins.append(sorted(self._entries(inputs)))
+            self.facility_types.append(str(ftype))
+            self.time_s.append(float(time_s) if time_s and time_s > 0 else 1.0)
+        n = len(self.keys)
+        self.in_ptr, self.in_cols, self.in_vals = _csr(ins)
+        self.out_ptr, self.out_cols, self.out_vals = _csr(outs)
+        self.use_ptr, self.use_rows, self.use_vals = _transpose(self.in_ptr, self.in_cols, self.in_vals, n)
+        self.make_ptr, self.make_rows, self.make_vals = _transpose(self.out_ptr, self.out_cols, self.out_vals, n)
+        self.order, self.cyclic = self._toposort()
+        self.depth = self._depths()
+
+    def _entries(self, pairs: Iterable[Tuple[Hashable, float]]) -> List[Tuple[int, float]]:
+        merged: Dict[int, float] = {}
+        for key, qty in pairs:
+            if qty and qty > 0:
+                if key not in self.index:
+                    self.index[key] = len(self.keys)
+                    self.keys.append(key)
+                c = self.index[key]
+                merged[c] = merged.get(c, 0.0) + float(qty)
+        return list(merged.items())
+
+    @property
+    def n_commodities(self) -> int:
+        return len(self.keys)
+
+    @property
+    def n_recipes(self) -> int:
+        return len(self.time_s)
+
+    @property
+    def nnz(self) -> int:
+        return len(self.in_cols) + len(self.out_cols)
+
+    # ---- structure ----
+    def _toposort(self) -> Tuple[List[int], bool]:
+        """Kahn order over commodity edges input -> output; cycle members go last in key order."""
+        n = self.n_commodities
+        indeg = [0] * n
+        succ: List[List[int]] = [[] for _ in range(n)]
+        for r in range(self.n_recipes):
+            outs = self.out_cols[self.out_ptr[r]:self.out_ptr[r + 1]]
+            for k in range(self.in_ptr[r], self.in_ptr[r + 1]):
+                c = self.in_cols[k]
+                for o in outs:
+                    succ[c].append(o)
+                    indeg[o] += 1
+        order = [c for c in range(n) if indeg[c] == 0]
+        head = 0
+        while head < len(order):
+            c = order[head]
+            head += 1
+            for o in succ[c]:
+                indeg[o] -= 1
+                if indeg[o] == 0:
+                    order.append(o)
+        if len(order) == n:
+            return order, False
+        placed = set(order)
+        return order + [c for c in range(n) if c not in placed], True
+
+    def _depths(self) -> List[int]:
+        """Longest producing chain below each commodity (raw commodities are 0; one pass if cyclic)."""
+        depth = [0] * self.n_commodities
+        for c in self.order:
+            for k in range(self.make_ptr[c], self.make_ptr[c + 1]):
+                r = self.make_rows[k]
+                for j in range(self.in_ptr[r], self.in_ptr[r + 1]):
+                    d = depth[self.in_cols[j]] + 1
+                    if d > depth[c]:
+                        depth[c] = d
+        return depth
+
+    def is_raw(self, c: int) -> bool:
+        """No recipe produces commodity index c (mined/harvested or imported)."""
+        return self.make_ptr[c] == self.make_ptr[c + 1]
+
+    def vector(self, values: Optional[Dict[Hashable, float]] = None) -> array:
+        """Dense commodity vector from {key: value} (unknown keys ignored)."""
+        v = array("d", bytes(8 * self.n_commodities))
+        for key, val in (values or {}).items():
+            c = self.index.get(key)
+            if c is not None:
+                v[c] = float(val)
+        return v
+
+    def as_dict(self, v: Sequence[float], skip_zero: bool = True) -> Dict[Hashable, float]:
+        return {self.keys[c]: v[c] for c in range(self.n_commodities) if v[c] or not skip_zero}
+
+    # ---- queries ----
+    def net_flow(self, activity: Sequence[float]) -> array:
+        """Per-commodity rate produced minus consumed at the given recipe activity (runs/s)."""
+        flow = array("d", bytes(8 * self.n_commodities))
+        for r in range(self.n_recipes):
+            x = activity[r]
+            if not x:
+                continue
+            for k in range(self.out_ptr[r], self.out_ptr[r + 1]):
+                flow[self.out_cols[k]] += self.out_vals[k] * x
+            for k in range(self.in_ptr[r], self.in_ptr[r + 1]):
+                flow[self.in_cols[k]] -= self.in_vals[k] * x
+        return flow
+
+    def gross_requirements(self, demand: Sequence[float]) -> Tuple[array, array]:
+        """
+        Gross amount of every commodity needed to deliver `demand` (a
+        commodity vector), and the recipe runs doing it. Each produced
+        commodity is made by its first recipe, less what co-products of other
+        recipes already cover. Gauss-Seidel passes in reverse topological
+        order: exact after one pass without co-products or cycles, otherwise
+        repeated until the runs settle.
+        """
+        runs = array("d", bytes(8 * self.n_recipes))
+        use_ptr, use_rows, use_vals = self.use_ptr, self.use_rows, self.use_vals
+        make_ptr, make_rows, make_vals = self.make_ptr, self.make_rows, self.make_vals
+        for _ in range(MAX_CYCLE_PASSES):
+            change = 0.0
+            seen = set()
+            for c in reversed(self.order):
+                m0 = make_ptr[c]
+                if m0 == make_ptr[c + 1]:
+                    continue  # raw
+                r0 = make_rows[m0]
+                need = demand[c]
+                for k in range(use_ptr[c], use_ptr[c + 1]):
+                    need += use_vals[k] * runs[use_rows[k]]
+                for k in range(m0 + 1, make_ptr[c + 1]):
+                    need -= make_vals[k] * runs[make_rows[k]]
+                x = need / make_vals[m0] if need > 0 else 0.0
+                if r0 in seen:
+                    x = max(x, runs[r0])  # co-product: the recipe runs for its neediest output
+                seen.add(r0)
+                change = max(change, abs(x - runs[r0]))
+                runs[r0] = x
+            if change <= CYCLE_TOLERANCE:
+                break
+        total = array("d", demand)
+        for r in range(self.n_recipes):
+            if runs[r]:
+                for k in range(self.in_ptr[r], self.in_ptr[r + 1]):
+                    total[self.in_cols[k]] += self.in_vals[k] * runs[r]
+        return total, runs
+
+    def balance(self, supply: Sequence[float], demand: Sequence[float]) -> Dict[str, array]:
+        """
+        Galaxy-wide balance for final `demand` given `supply` of each
+        commodity (rates or stock, same unit as demand): required gross
+        amounts, surplus (supply - required for raw commodities, supply -
+        demand elsewhere) and the shortfall of raw inputs.
+        """
+        required, runs = self.gross_requirements(demand)
+        n = self.n_commodities
+        surplus = array("d", bytes(8 * n))
+        shortfall = array("d", bytes(8 * n))
+        for c in range(n):
+            surplus[c] = supply[c] - (required[c] if self.is_raw(c) else demand[c])
+            if self.is_raw(c) and surplus[c] < 0:
+                shortfall[c] = -surplus[c]
+        return {"required": required, "runs": runs, "surplus": surplus, "shortfall": shortfall}
+
+    def bottlenecks(self, supply: Sequence[float], demand: Sequence[float],
+                    capacity: Optional[Sequence[float]] = None,
+                    top: int = 5) -> List[Tuple[Hashable, float]]:
+        """
+        Commodities covering the smallest fraction of their gross requirement
+        for `demand`, as (key, coverage) pairs, lowest first. Raw commodities
+        are covered by supply; produced ones by supply plus what the recipe
+        `capacity` (max activity) makes, and are skipped without capacity.
+        Only coverage below 1 is listed.
+        """
+        required, _ = self.gross_requirements(demand)
+        out: List[Tuple[float, int]] = []
+        for c in range(self.n_commodities):
+            if required[c] <= 0:
+                continue
+            if self.is_raw(c):
+                have = supply[c]
+            elif capacity is not None:
+                have = supply[c] + sum(self.make_vals[k] * capacity[self.make_rows[k]]
+                                       for k in range(self.make_ptr[c], self.make_ptr[c + 1]))
+            else:
+                continue
+            if have < required[c]:
+                out.append((have / required[c], c))
+        out.sort()
+        return [(self.keys[c], cov) for cov, c in out[:max(0, top)]]
+
+
+# ---------- Builders ----------
+
+_tree_cache: Dict[Path, ProductionGraph] = {}
+
+
+def load_commodity_tree(path: Optional[Path] = None) -> ProductionGraph:
+    """
+    Graph of the commodity tree JSON (cached per path). Connections sharing
+    (output_id, facility_type) form one recipe making one unit of the output
+    from quantity_ratio of each input per run, taking the longest
+    processing_time of the group.
+    """
+    path = Path(path) if path is not None else COMMODITY_TREE_PATH
+    graph = _tree_cache.get(path)
+    if graph is None:
+        with open(path, "r", encoding="utf-8") as fh:
+            tree = json.load(fh)
+        commodities = tree.get("commodities", {})
+        groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for conn in tree.get("connections", []):
+            groups.setdefault((conn["output_id"], conn.get("facility_type", "")), []).append(conn)
+        recipes: List[RecipeSpec] = [
+            ([(out_id, 1.0)],
+             [(c["input_id"], float(c.get("quantity_ratio", 1.0))) for c in conns],
+             ftype,
+             max(float(c.get("processing_time", 1.0)) for c in conns))
+            for (out_id, ftype), conns in groups.items()
+        ]
+        graph = ProductionGraph(list(commodities), recipes, info=commodities)
+        _tree_cache[path] = graph
+    return graph
+
+
+def from_facilities(conn: sqlite3.Connection) -> Tuple[ProductionGraph, array]:
+    """
+    Graph over a save's items whose recipes are its distinct facility
+    designs (type + input/output rates), with the nominal activity of each
+    design (facilities of that design, in runs per second).
+    """
+    rates: Dict[int, Tuple[List[Tuple[int, float]], List[Tuple[int, float]]]] = {}
+    ftype: Dict[int, str] = {}
+    for fid, t in conn.execute("SELECT facility_id, facility_type FROM facilities"):
+        rates[int(fid)] = ([], [])
+        ftype[int(fid)] = str(t)
+    for col, table in ((1, "facility_inputs"), (0, "facility_outputs")):
+        for fid, iid, rate in conn.execute(f"SELECT facility_id, item_id, rate FROM {table}"):
+            if int(fid) in rates and rate and rate > 0:
+                rates[int(fid)][col].append((int(iid), float(rate)))
+    designs: Dict[Tuple, int] = {}
+    recipes: List[RecipeSpec] = []
+    counts: List[int] = []
+    for fid in sorted(rates):
+        outs, ins = rates[fid]
+        key = (ftype[fid], tuple(sorted(ins)), tuple(sorted(outs)))
+        r = designs.get(key)
+        if r is None:
+            r = designs[key] = len(recipes)
+            recipes.append((key[2], key[1], key[0], RATE_TICK_S))
+            counts.append(0)
+        counts[r] += 1
+    items = [int(r[0]) for r in conn.execute("SELECT item_id FROM items ORDER BY item_id")]
+    graph = ProductionGraph(items, recipes)
+    activity = array("d", (n / RATE_TICK_S for n in counts))
+    return graph, activity
+
+
+def fleet_demand(conn: sqlite3.Connection, graph: ProductionGraph) -> array:
+    """Item vector of what the save's ships consume per second (ship_roles x consumption_profiles_ship)."""
+    demand = graph.vector()
+    for iid, rate in conn.execute(
+        """
+        SELECT cp.item_id, SUM(cp.rate)
+        FROM ship_roles sr
+        JOIN consumption_profiles_ship cp ON cp.role = sr.role
+        GROUP BY cp.item_id
+        """
+    ):
+        c = graph.index.get(int(iid))
+        if c is not None and rate:
+            demand[c] += float(rate) / RATE_TICK_S
+    return demand
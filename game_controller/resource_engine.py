@@ -0,0 +1,322 @@
+# /game_controller/resource_engine.py
+
+"""
+Victurus Resource Field
+
+Depletion and regeneration of resource nodes (locations with a resource_type):
+- Node richness, cap and regen rate in flat arrays, grouped per system (CSR)
+- Regeneration is closed-form and lazy: a system's nodes are brought up to
+  date only when the system is mined or read, so untouched systems cost nothing
+- Mines (facilities at a node) draw richness for what they actually
+  produced; output an exhausted node cannot back is taken out again
+- Depleted systems get a refill event (sim_events) at the time they are
+  full again, so they are settled (and written back) once instead of every tick
+- Changed nodes written back to locations in one executemany per flush
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from game_controller.sim_events import SimEvent, SimEventScheduler
+from settings import system_config as cfg
+
+# Event kind of a depleted system's refill; entity_id is the system id.
+REFILL_EVENT = "resource_refill"
+
+_UPDATE_SQL = "UPDATE locations SET richness=?, richness_max=?, richness_s=? WHERE location_id=?"
+
+
+class ResourceField:
+    """
+    Node n (location_ids[n]) has richness stock[n] as of its system's
+    settled time, regenerating at regen[n] per second up to cap[n]. System
+    row r (see sys_row) owns nodes sys_ptr[r]:sys_ptr[r+1] and was settled
+    at sys_t[r]. Mine entries (node, facility output slot) of system row r
+    are mine_node/mine_slot[mine_ptr[r]:mine_ptr[r+1]]. System rows below
+    their cap have a REFILL_EVENT pending at their full_at time.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None) -> None:
+        self.db_path = db_path
+        self.location_ids: List[int] = []
+        self.node_index: Dict[int, int] = {}
+        self.stock = array("d")
+        self.cap = array("d")
+        self.regen = array("d")
+        self.system_ids: List[int] = []
+        self.sys_row: Dict[int, int] = {}
+        self.sys_ptr = array("q", [0])
+        self.sys_t = array("d")
+        self.node_sys = array("q")
+        self.mine_ptr = array("q", [0])
+        self.mine_node = array("q")
+        self.mine_slot = array("q")
+        self.facilities = None   # FacilityProduction the mine entries index into
+        self.depletion_per_unit = float(getattr(cfg, "RESOURCE_DEPLETION_PER_UNIT", 0.001))
+        self.dirty: Set[int] = set()
+        self.events: Optional[SimEventScheduler] = None
+        self._own_events = False
+        self.refill_pending: Set[int] = set()   # system rows with a refill event scheduled
+        self.refilled = 0
+        self.extracted = 0.0
+
+    # ---- load ----
+    @classmethod
+    def from_connection(cls, conn: sqlite3.Connection, now_s: float = 0.0, db_path: Optional[Path] = None,
+                        facilities=None, events: Optional[SimEventScheduler] = None) -> "ResourceField":
+        """
+        Nodes of a save caught up to now_s from their stored richness and
+        richness_s. With a FacilityProduction, its facilities at resource
+        locations become the mines that deplete them.
+
+        Refills are scheduled on `events` (the sim's scheduler, whose clock is
+        at now_s; the caller routes REFILL_EVENT to on_refill()) after its
+        stale refill events are cancelled. Without one the field keeps a
+        private scheduler that settle_due() advances.
+        """
+        rf = cls(db_path)
+        if events is None:
+            events = SimEventScheduler()
+            events.advance(now_s)
+            events.register(REFILL_EVENT, rf.on_refill)
+            rf._own_events = True
+        else:
+            events.cancel_for(REFILL_EVENT)
+        rf.events = events
+        period = max(1e-9, float(getattr(cfg, "RESOURCE_REGEN_PERIOD_S", 60.0)))
+        rows = conn.execute(
+            """
+            SELECT location_id, system_id, richness, richness_max, regen_rate, richness_s
+            FROM locations
+            WHERE COALESCE(resource_type, '') != ''
+            ORDER BY system_id, location_id
+            """
+        ).fetchall()
+        for lid, sid, rich, rmax, regen, rs in rows:
+            sid = int(sid)
+            if sid not in rf.sys_row:
+                rf.sys_row[sid] = len(rf.system_ids)
+                rf.system_ids.append(sid)
+                rf.sys_t.append(float(now_s))
+                if len(rf.location_ids):
+                    rf.sys_ptr.append(len(rf.location_ids))
+            n = len(rf.location_ids)
+            rf.node_index[int(lid)] = n
+            rf.location_ids.append(int(lid))
+            rf.node_sys.append(rf.sys_row[sid])
+            cap = float(rmax if rmax is not None else (rich or 0.0))
+            rate = max(0.0, float(regen or 0.0)) / period
+            stock = float(rich if rich is not None else cap)
+            if rs is not None and now_s > rs:
+                stock = min(cap, stock + rate * (now_s - float(rs)))
+            rf.cap.append(cap)
+            rf.regen.append(rate)
+            rf.stock.append(stock)
+            if rmax is None or rs is None:
+                rf.dirty.add(n)   # first run on this save: record cap and clock
+        if rf.location_ids:
+            rf.sys_ptr.append(len(rf.location_ids))
+        for r in range(len(rf.system_ids)):
+            rf._note_depleted(r)
+        if facilities is not None:
+            rf.bind_mines(conn, facilities)
+        return rf
+
+    def bind_mines(self, conn: sqlite3.Connection, facilities) -> None:
+        """(Re)build the per-system mine entries from a FacilityProduction's output slots."""
+        f_index = {fid: f for f, fid in enumerate(facilities.facility_ids)}
+        per_row: Dict[int, List[Tuple[int, int]]] = {}
+        for fid, lid in conn.execute("SELECT facility_id, location_id FROM facilities"):
+            n = self.node_index.get(int(lid))
+            f = f_index.get(int(fid))
+            if n is None or f is None:
+                continue
+            for k in range(facilities.out_ptr[f], facilities.out_ptr[f + 1]):
+                per_row.setdefault(self.node_sys[n], []).append((n, facilities.out_slots[k]))
+        self.mine_ptr = array("q", [0])
+        self.mine_node = array("q")
+        self.mine_slot = array("q")
+        for r in range(len(self.system_ids)):
+            for n, slot in per_row.get(r, ()):
+                self.mine_node.append(n)
+                self.mine_slot.append(slot)
+            self.mine_ptr.append(len(self.mine_node))
+        self.facilities = facilities
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.location_ids)
+
+    # ---- regeneration ----
+    def _settle(self, r: int, now_s: float) -> None:
+        """Regenerate system row r's nodes up to now_s (closed form)."""
+        dt = now_s - self.sys_t[r]
+        if dt <= 0.0:
+            return
+        self.sys_t[r] = now_s
+        stock, cap, regen = self.stock, self.cap, self.regen
+        for n in range(self.sys_ptr[r], self.sys_ptr[r + 1]):
+            s = stock[n]
+            if s < cap[n]:
+                s += regen[n] * dt
+                stock[n] = s if s < cap[n] else cap[n]
+                self.dirty.add(n)
+
+    def full_at(self, r: int) -> Optional[float]:
+        """Sim time at which the regenerating nodes of (settled) system row r are back at their cap; None if they are."""
+        t = self.sys_t[r]
+        due = None
+        for n in range(self.sys_ptr[r], self.sys_ptr[r + 1]):
+            gap = self.cap[n] - self.stock[n]
+            if gap > 1e-9 and self.regen[n] > 0.0:
+                d = t + gap / self.regen[n]
+                due = d if due is None or d > due else due
+        return due
+
+    def _note_depleted(self, r: int) -> None:
+        if r in self.refill_pending or self.events is None:
+            return
+        due = self.full_at(r)
+        if due is not None:
+            self.refill_pending.add(r)
+            self.events.schedule(REFILL_EVENT, due, entity_id=self.system_ids[r])
+
+    def on_refill(self, evs: List[SimEvent], now_s: float) -> None:
+        """
+        REFILL_EVENT handler: settle each system at now_s, marking its nodes
+        for write-back; systems mined since they were scheduled get a new
+        refill event.
+        """
+        sys_row = self.sys_row
+        for ev in evs:
+            r = sys_row.get(ev.entity_id)
+            if r is None or r not in self.refill_pending:
+                continue
+            self.refill_pending.discard(r)
+            self._settle(r, now_s)
+            self._note_depleted(r)
+            self.refilled += 1
+
+    def settle_due(self, now_s: float) -> int:
+        """
+        Advance a private scheduler to now_s, settling the depleted systems
+        that are full again by then. Returns systems settled. With the sim's
+        scheduler refills fire as its clock advances and this is a no-op.
+        """
+        ev = self.events
+        if not self._own_events or ev is None or now_s <= ev.now_s:
+            return 0
+        before = self.refilled
+        ev.advance(now_s - ev.now_s)
+        return self.refilled - before
+
+    def next_refill_s(self) -> Optional[float]:
+        """Earliest scheduled refill (O(depleted systems); for diagnostics and tests)."""
+        if self.events is None:
+            return None
+        ids = self.system_ids
+        return min((e.due_s for r in self.refill_pending
+                    for e in self.events.events_for(REFILL_EVENT, ids[r])), default=None)
+
+    # ---- extraction ----
+    def extract(self, location_id: int, amount: float, now_s: float) -> float:
+        """Remove up to `amount` richness from a node at now_s. Returns what was taken."""
+        n = self.node_index.get(int(location_id))
+        if n is None or amount <= 0.0:
+            return 0.0
+        return self._take(n, float(amount), now_s)
+
+    def _take(self, n: int, amount: float, now_s: float) -> float:
+        r = self.node_sys[n]
+        self._settle(r, now_s)
+        s = self.stock[n]
+        take = amount if amount < s else s
+        if take <= 0.0:
+            return 0.0
+        self.stock[n] = s - take
+        self.extracted += take
+        self.dirty.add(n)
+        self._note_depleted(r)
+        return take
+
+    def mine_snapshot(self, system_ids: Iterable[int], qty) -> List[Tuple[int, float]]:
+        """(mine entry, output stock) for the mines of the given systems, taken before a production step."""
+        out: List[Tuple[int, float]] = []
+        sys_row = self.sys_row
+        for sid in system_ids:
+            r = sys_row.get(int(sid))
+            if r is None:
+                continue
+            for k in range(self.mine_ptr[r], self.mine_ptr[r + 1]):
+                out.append((k, qty[self.mine_slot[k]]))
+        return out
+
+    def deplete_from_output(self, snapshot: List[Tuple[int, float]], facilities, now_s: float) -> float:
+        """
+        Draw richness for what each mine produced since `snapshot`; output a
+        node could not back is removed from the facility again. Returns
+        richness extracted.
+        """
+        qty = facilities.qty
+        per_unit = self.depletion_per_unit
+        total = 0.0
+        if per_unit <= 0.0:
+            return 0.0
+        for k, before in snapshot:
+            slot = self.mine_slot[k]
+            made = qty[slot] - before
+            if made <= 1e-12:
+                continue
+            need = made * per_unit
+            got = self._take(self.mine_node[k], need, now_s)
+            total += got
+            if got < need - 1e-12:
+                left = qty[slot] - (need - got) / per_unit
+                qty[slot] = left if left > 1e-9 else 0.0
+                facilities.dirty.add(slot)
+        return total
+
+    # ---- reads ----
+    def richness(self, location_id: int, now_s: float) -> Optional[float]:
+        """Current richness of a node without settling its system."""
+        n = self.node_index.get(int(location_id))
+        if n is None:
+            return None
+        dt = now_s - self.sys_t[self.node_sys[n]]
+        s = self.stock[n] + (self.regen[n] * dt if dt > 0.0 else 0.0)
+        return s if s < self.cap[n] else self.cap[n]
+
+    # ---- write-back ----
+    def pending_rows(self) -> List[Tuple[float, float, float, int]]:
+        return [(self.stock[n], self.cap[n], self.sys_t[self.node_sys[n]], self.location_ids[n])
+                for n in sorted(self.dirty)]
+
+    def flush(self, conn: Optional[sqlite3.Connection] = None) -> int:
+        """
+        Write changed nodes (richness as of their system's settled time)
+        with one executemany in a single transaction. Without conn a direct
+        connection to db_path is opened. Returns rows written.
+        """
+        rows = self.pending_rows()
+        if not rows:
+            return 0
+        own = conn is None
+        if own:
+            if self.db_path is None:
+                return 0
+            conn = sqlite3.connect(str(self.db_path), timeout=1.0)
+        try:
+            conn.executemany(_UPDATE_SQL, rows)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            if own:
+                conn.close()
+        self.dirty.clear()
+        return len(rows)
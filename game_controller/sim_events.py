@@ -0,0 +1,431 @@
+# /game_controller/sim_events.py
+
+"""
+Victurus Simulation Events
+
+Scheduled one-shot and repeating events for the simulation thread:
+- Features (facility cycles, resource regen, ship arrivals, contract
+  deadlines, ...) schedule events instead of polling entities every tick
+- Hierarchical timing wheel: scheduling and cancelling are O(1) and a tick
+  costs O(due events) plus occasional cascades, however many entities exist
+- Events persist in the save's sim_events table next to the sim_clock;
+  changes are buffered and written back in one transaction per flush
+- Handlers are registered per kind and receive all of that kind's due events
+  as one batch
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+from game_controller.log_config import get_system_logger
+from settings import system_config as cfg
+
+logger = get_system_logger('sim_events')
+
+# Wheel geometry: level 0 has 2**ROOT_BITS one-tick slots, each higher level
+# 2**LEVEL_BITS slots spanning a full turn of the level below. With 1 s ticks
+# the wheel covers ~2 years; anything further out waits in an overflow heap.
+ROOT_BITS = 8
+LEVEL_BITS = 6
+LEVELS = 4
+_ROOT_MASK = (1 << ROOT_BITS) - 1
+_LEVEL_MASK = (1 << LEVEL_BITS) - 1
+_SPAN_BITS = tuple(ROOT_BITS + LEVEL_BITS * k for k in range(LEVELS))  # ticks covered up to each level
+
+_UPSERT_SQL = (
+    "INSERT OR REPLACE INTO sim_events(event_id, due_s, kind, entity_id, payload, interval_s) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+# Handler for one kind: called with that kind's due events (ordered by due_s) and the clock.
+EventHandler = Callable[[List["SimEvent"], float], None]
+
+
+@dataclass(slots=True)
+class SimEvent:
+    event_id: int
+    due_s: float                  # sim clock seconds
+    kind: str
+    entity_id: Optional[int] = None
+    payload: Any = None           # JSON-serialisable
+    interval_s: float = 0.0       # > 0: repeats
+    occurrences: int = 1          # set on firing: repeats that fell due since the last firing
+    seq: int = field(default=0, repr=False, compare=False)  # matches the live wheel entry
+
+
+class TimingWheel:
+    """
+    Hierarchical timing wheel over integer ticks holding (tick, seq, item)
+    entries. advance_to() returns every entry whose tick has been reached,
+    in tick order, and skips straight over rounds in which the lower levels
+    hold nothing, so idle time costs nothing per tick.
+    """
+
+    def __init__(self, start_tick: int = 0) -> None:
+        self.cur = int(start_tick)
+        self._slots: List[List[List[tuple]]] = [[[] for _ in range(1 << ROOT_BITS)]]
+        self._slots += [[[] for _ in range(1 << LEVEL_BITS)] for _ in range(LEVELS - 1)]
+        self._counts = [0] * LEVELS
+        self._far: List[tuple] = []    # heap of entries beyond the top level
+        self._ready: List[tuple] = []  # due, not yet returned
+
+    def __len__(self) -> int:
+        return sum(self._counts) + len(self._far) + len(self._ready)
+
+    def add(self, entry: tuple) -> None:
+        tick = entry[0]
+        delta = tick - self.cur
+        if delta <= 0:
+            self._ready.append(entry)
+            return
+        for lvl in range(LEVELS):
+            if delta < (1 << _SPAN_BITS[lvl]):
+                if lvl == 0:
+                    idx = tick & _ROOT_MASK
+                else:
+                    idx = (tick >> _SPAN_BITS[lvl - 1]) & _LEVEL_MASK
+                self._slots[lvl][idx].append(entry)
+                self._counts[lvl] += 1
+                return
+        heapq.heappush(self._far, entry)
+
+    def _pull_far(self) -> None:
+        far = self._far
+        horizon = self.cur + (1 << _SPAN_BITS[-1])
+        while far and far[0][0] < horizon:
+            self.add(heapq.heappop(far))
+
+    def _step(self) -> None:
+        self.cur += 1
+        t = self.cur
+        if t & _ROOT_MASK == 0:
+            # Level 0 wrapped: pull the next bucket down from each level that wrapped, top first.
+            top = 1
+            while top < LEVELS - 1 and ((t >> _SPAN_BITS[top - 1]) & _LEVEL_MASK) == 0:
+                top += 1
+            for lvl in range(top, 0, -1):
+                idx = (t >> _SPAN_BITS[lvl - 1]) & _LEVEL_MASK
+                slot = self._slots[lvl][idx]
+                if slot:
+                    self._slots[lvl][idx] = []
+                    self._counts[lvl] -= len(slot)
+                    for entry in slot:
+                        self.add(entry)
+        idx = t & _ROOT_MASK
+        slot = self._slots[0][idx]
+        if slot:
+            self._slots[0][idx] = []
+            self._counts[0] -= len(slot)
+            self._ready.extend(slot)
+
+    def advance_to(self, target: int) -> List[tuple]:
+        out, self._ready = self._ready, []
+        while self.cur < target:
+            self._pull_far()
+            lvl = next((l for l in range(LEVELS) if self._counts[l]), None)
+            if lvl is None:
+                if not self._far:
+                    self.cur = target
+                    break
+                # Empty wheel: jump to where the nearest far entry enters the top level.
+                self.cur = min(target, max(self.cur, self._far[0][0] - (1 << _SPAN_BITS[-1]) + 1))
+                continue
+            if lvl > 0:
+                # Nothing below lvl: skip to the end of the current lower-level round.
+                nxt = min(target, self.cur | ((1 << _SPAN_BITS[lvl - 1]) - 1))
+                if nxt > self.cur:
+                    self.cur = nxt
+                    continue
+            self._step()
+            if self._ready:
+                out.extend(self._ready)
+                self._ready = []
+        return out
+
+
+class SimEventScheduler:
+    """
+    Event queue of one save. Holds every pending event in memory (loaded at
+    bind) in a TimingWheel keyed by ceil(due_s / resolution_s); advance()
+    moves the sim clock and dispatches only what fell due. Thread-safe:
+    the UI may schedule/cancel while the sim thread advances.
+    """
+
+    def __init__(self, resolution_s: Optional[float] = None) -> None:
+        res = resolution_s if resolution_s is not None else getattr(cfg, "SIM_EVENT_RESOLUTION_S", 1.0)
+        self.resolution_s = max(1e-3, float(res))
+        self.db_path: Optional[Path] = None
+        self.now_s = 0.0
+        self._lock = threading.RLock()
+        self._handlers: Dict[str, EventHandler] = {}
+        self._reset()
+
+    def _reset(self) -> None:
+        self._wheel = TimingWheel(self._tick_floor(self.now_s))
+        self._events: Dict[int, SimEvent] = {}
+        self._by_kind: Dict[str, Dict[Optional[int], Set[int]]] = {}
+        self._parked: Dict[str, List[SimEvent]] = {}  # due, but no handler registered yet
+        self._next_id = 1
+        self._seq = 0
+        self._dirty: Set[int] = set()
+        self._deleted: Set[int] = set()
+        self._clock_dirty = False
+        self.fired_total = 0
+
+    # ---- ticks ----
+    def _tick_floor(self, t_s: float) -> int:
+        return int(math.floor(t_s / self.resolution_s + 1e-9))
+
+    def _tick_ceil(self, t_s: float) -> int:
+        return int(math.ceil(t_s / self.resolution_s - 1e-9))
+
+    # ---- persistence ----
+    @classmethod
+    def from_connection(cls, conn: sqlite3.Connection, db_path: Optional[Path],
+                        resolution_s: Optional[float] = None) -> "SimEventScheduler":
+        s = cls(resolution_s)
+        s.bind(conn, db_path)
+        return s
+
+    def bind(self, conn: sqlite3.Connection, db_path: Optional[Path]) -> None:
+        """Load the clock and pending events of the save at db_path (no-op if already bound to it)."""
+        with self._lock:
+            if self.db_path is not None and db_path == self.db_path:
+                return
+            if self.db_path is not None and (self._dirty or self._deleted or self._clock_dirty):
+                try:
+                    self.flush(None)
+                except Exception as e:
+                    logger.error(f"Flushing events for {self.db_path} failed: {e}")
+            row = conn.execute("SELECT now_s FROM sim_clock WHERE id = 1").fetchone()
+            self.now_s = float(row[0]) if row else 0.0
+            self.db_path = db_path
+            self._reset()
+            max_id = 0
+            for eid, due, kind, ent, payload, interval in conn.execute(
+                "SELECT event_id, due_s, kind, entity_id, payload, interval_s FROM sim_events"
+            ):
+                ev = SimEvent(int(eid), float(due), str(kind), ent,
+                              json.loads(payload) if payload else None, float(interval or 0.0))
+                self._insert(ev)
+                max_id = max(max_id, ev.event_id)
+            self._next_id = max_id + 1
+            self._dirty.clear()
+
+    def flush(self, conn: Optional[sqlite3.Connection] = None) -> int:
+        """
+        Write scheduled/changed/removed events and the clock in one
+        transaction. Without conn a direct connection to db_path is opened.
+        Returns the number of event rows written or deleted.
+        """
+        with self._lock:
+            if not (self._dirty or self._deleted or self._clock_dirty):
+                return 0
+            rows = [(ev.event_id, ev.due_s, ev.kind, ev.entity_id,
+                     json.dumps(ev.payload) if ev.payload is not None else None, ev.interval_s)
+                    for ev in (self._events.get(i) for i in self._dirty) if ev is not None]
+            deleted = [(i,) for i in self._deleted]
+            own = conn is None
+            if own:
+                if self.db_path is None:
+                    return 0
+                conn = sqlite3.connect(str(self.db_path), timeout=1.0)
+            try:
+                if rows:
+                    conn.executemany(_UPSERT_SQL, rows)
+                if deleted:
+                    conn.executemany("DELETE FROM sim_events WHERE event_id = ?", deleted)
+                conn.execute("INSERT OR REPLACE INTO sim_clock(id, now_s) VALUES (1, ?)", (self.now_s,))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                if own:
+                    conn.close()
+            self._dirty.clear()
+            self._deleted.clear()
+            self._clock_dirty = False
+            return len(rows) + len(deleted)
+
+    # ---- internal bookkeeping ----
+    def _insert(self, ev: SimEvent) -> None:
+        self._events[ev.event_id] = ev
+        self._by_kind.setdefault(ev.kind, {}).setdefault(ev.entity_id, set()).add(ev.event_id)
+        self._place(ev)
+        self._dirty.add(ev.event_id)
+        self._deleted.discard(ev.event_id)
+
+    def _place(self, ev: SimEvent) -> None:
+        self._seq += 1
+        ev.seq = self._seq
+        self._wheel.add((self._tick_ceil(ev.due_s), ev.seq, ev))
+
+    def _remove(self, ev: SimEvent) -> None:
+        self._events.pop(ev.event_id, None)
+        ents = self._by_kind.get(ev.kind)
+        if ents is not None:
+            ids = ents.get(ev.entity_id)
+            if ids is not None:
+                ids.discard(ev.event_id)
+                if not ids:
+                    del ents[ev.entity_id]
+        ev.seq = -1  # wheel entry becomes stale
+        self._dirty.discard(ev.event_id)
+        self._deleted.add(ev.event_id)
+
+    # ---- scheduling ----
+    def schedule(self, kind: str, due_s: Optional[float] = None, *, delay_s: Optional[float] = None,
+                 entity_id: Optional[int] = None, payload: Any = None, interval_s: float = 0.0) -> int:
+        """Schedule one event at due_s (sim clock) or delay_s from now. Returns its id."""
+        with self._lock:
+            due = self.now_s + float(delay_s or 0.0) if due_s is None else float(due_s)
+            ev = SimEvent(self._next_id, due, str(kind), entity_id, payload, max(0.0, float(interval_s)))
+            self._next_id += 1
+            self._insert(ev)
+            return ev.event_id
+
+    def schedule_many(self, kind: str, items: Iterable[Sequence[Any]], interval_s: float = 0.0,
+                      relative: bool = False) -> List[int]:
+        """
+        Bulk schedule events of one kind from (due_s, entity_id[, payload])
+        tuples; with relative=True the first element is a delay from now.
+        Returns the new ids in input order.
+        """
+        interval = max(0.0, float(interval_s))
+        ids: List[int] = []
+        with self._lock:
+            base = self.now_s if relative else 0.0
+            for item in items:
+                payload = item[2] if len(item) > 2 else None
+                ev = SimEvent(self._next_id, base + float(item[0]), str(kind), item[1], payload, interval)
+                self._next_id += 1
+                self._insert(ev)
+                ids.append(ev.event_id)
+        return ids
+
+    def reschedule(self, event_id: int, due_s: float) -> bool:
+        with self._lock:
+            ev = self._events.get(int(event_id))
+            if ev is None:
+                return False
+            ev.due_s = float(due_s)
+            self._place(ev)
+            self._dirty.add(ev.event_id)
+            return True
+
+    def cancel(self, event_id: int) -> bool:
+        return self.cancel_many((event_id,)) == 1
+
+    def cancel_many(self, event_ids: Iterable[int]) -> int:
+        n = 0
+        with self._lock:
+            for eid in event_ids:
+                ev = self._events.get(int(eid))
+                if ev is not None:
+                    self._remove(ev)
+                    n += 1
+        return n
+
+    def cancel_for(self, kind: str, entity_ids: Optional[Iterable[Optional[int]]] = None) -> int:
+        """Cancel a kind's events for the given entities (all of the kind when entity_ids is None)."""
+        with self._lock:
+            ents = self._by_kind.get(kind)
+            if not ents:
+                return 0
+            keys = list(ents) if entity_ids is None else [e for e in entity_ids if e in ents]
+            ids = [eid for key in keys for eid in ents.get(key, ())]
+            parked = self._parked.get(kind)
+            if parked:
+                gone = set(ids)
+                self._parked[kind] = [ev for ev in parked if ev.event_id not in gone]
+            return self.cancel_many(ids)
+
+    # ---- queries ----
+    def get(self, event_id: int) -> Optional[SimEvent]:
+        return self._events.get(int(event_id))
+
+    def pending(self, kind: Optional[str] = None) -> int:
+        with self._lock:
+            if kind is None:
+                return len(self._events)
+            return sum(len(ids) for ids in self._by_kind.get(kind, {}).values())
+
+    def events_for(self, kind: str, entity_id: Optional[int]) -> List[SimEvent]:
+        with self._lock:
+            return [self._events[i] for i in sorted(self._by_kind.get(kind, {}).get(entity_id, ()))]
+
+    # ---- dispatch ----
+    def register(self, kind: str, handler: EventHandler) -> None:
+        """Route `kind` events to handler; events of that kind parked while unhandled fire next advance."""
+        with self._lock:
+            self._handlers[kind] = handler
+            for ev in self._parked.pop(kind, []):
+                if self._events.get(ev.event_id) is ev:
+                    self._place(ev)
+
+    def unregister(self, kind: str) -> None:
+        with self._lock:
+            self._handlers.pop(kind, None)
+
+    def advance(self, dt_s: float) -> int:
+        """
+        Move the clock by dt_s and fire everything now due, one handler call
+        per kind. One-shot events are removed; repeating events fire once
+        with `occurrences` set to how many periods elapsed, then move to
+        their next due time. Returns the number of events fired.
+        """
+        with self._lock:
+            if dt_s > 0:
+                self.now_s += float(dt_s)
+                self._clock_dirty = True
+            now = self.now_s
+            batches: Dict[str, List[SimEvent]] = {}
+            for _, seq, ev in self._wheel.advance_to(self._tick_floor(now)):
+                if ev.seq != seq or self._events.get(ev.event_id) is not ev:
+                    continue  # cancelled or rescheduled since this entry was placed
+                if ev.kind not in self._handlers:
+                    self._parked.setdefault(ev.kind, []).append(ev)
+                    continue
+                ev.occurrences = 1
+                if ev.interval_s > 0 and now > ev.due_s:
+                    ev.occurrences = int((now - ev.due_s) // ev.interval_s) + 1
+                batches.setdefault(ev.kind, []).append(ev)
+            handlers = [(self._handlers[kind], evs) for kind, evs in batches.items()]
+
+        fired = 0
+        for handler, evs in handlers:
+            evs.sort(key=lambda e: (e.due_s, e.event_id))
+            try:
+                handler(evs, now)
+            except Exception as e:
+                logger.error(f"Event handler for {evs[0].kind!r} failed on {len(evs)} events: {e}")
+            fired += len(evs)
+
+        with self._lock:
+            for _, evs in handlers:
+                for ev in evs:
+                    if self._events.get(ev.event_id) is not ev or ev.seq < 0:
+                        continue  # cancelled by a handler
+                    if ev.interval_s > 0:
+                        ev.due_s += ev.interval_s * ev.occurrences
+                        self._place(ev)
+                        self._dirty.add(ev.event_id)
+                    elif self._tick_ceil(ev.due_s) <= self._tick_floor(self.now_s):
+                        self._remove(ev)
+                    # else: the handler rescheduled it into the future; keep it
+            self.fired_total += fired
+        return fired
+
+    def next_due_s(self) -> Optional[float]:
+        """Earliest pending due time (O(pending); for diagnostics and tests)."""
+        with self._lock:
+            return min((ev.due_s for ev in self._events.values()), default=None)
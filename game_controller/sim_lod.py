@@ -0,0 +1,106 @@
+# /game_controller/sim_lod.py
+
+"""
+Victurus Simulation Level of Detail
+
+Distance-based fidelity tiers for off-screen systems:
+- Near: within SIM_LOD_NEAR_LY of the player/visible system or close to the
+  current travel route; simulated every tick
+- Mid: within SIM_LOD_MID_LY; coarser steps, each system revisited within
+  SIM_LOD_MID_CYCLE_TICKS ticks
+- Far: everything else; advanced in large closed-form steps at a low cadence
+  (SIM_LOD_FAR_CYCLE_TICKS) or when the system is queried
+- Tiers come from galaxy distances (game.galaxy_index) and are recomputed
+  when the visible system changes, on arrival and when a route is set
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from settings import system_config as cfg
+
+TIER_NEAR = 0
+TIER_MID = 1
+TIER_FAR = 2
+TIER_NAMES = ("near", "mid", "far")
+
+
+def near_radius_ly() -> float:
+    return float(getattr(cfg, "SIM_LOD_NEAR_LY", 60.0))
+
+
+def mid_radius_ly() -> float:
+    return float(getattr(cfg, "SIM_LOD_MID_LY", 150.0))
+
+
+def route_radius_ly() -> float:
+    return float(getattr(cfg, "SIM_LOD_ROUTE_LY", 30.0))
+
+
+class LodTiers:
+    """Tier per system plus the sorted id list of each tier."""
+
+    def __init__(self, tier: Dict[int, int]) -> None:
+        self.tier = tier
+        self.ids: List[List[int]] = [[], [], []]
+        for sid in sorted(tier):
+            self.ids[tier[sid]].append(sid)
+
+    @classmethod
+    def all_near(cls, system_ids: Iterable[int]) -> "LodTiers":
+        """Full fidelity everywhere (no anchor or no coordinates to measure from)."""
+        return cls({int(sid): TIER_NEAR for sid in system_ids})
+
+    @classmethod
+    def compute(cls, index, system_ids: Sequence[int], anchors: Iterable[Optional[int]],
+                route: Iterable[int] = (), near_ly: Optional[float] = None,
+                mid_ly: Optional[float] = None, route_ly: Optional[float] = None) -> "LodTiers":
+        """
+        Tiers for system_ids from a GalaxyIndex: anchors (player system,
+        visible system) and route systems are near themselves; systems within
+        near_ly of an anchor or route_ly of the route (each leg between
+        consecutive route systems, sampled every route_ly) are near, within
+        mid_ly of an anchor mid, and everything else far.
+        """
+        near_ly = near_radius_ly() if near_ly is None else float(near_ly)
+        mid_ly = mid_radius_ly() if mid_ly is None else float(mid_ly)
+        route_ly = route_radius_ly() if route_ly is None else float(route_ly)
+        points = [int(a) for a in anchors if a is not None and int(a) in index]
+        hops = [int(r) for r in route if int(r) in index]
+        if not points and not hops:
+            return cls.all_near(system_ids)
+
+        tier = {int(sid): TIER_FAR for sid in system_ids}
+
+        def mark(sid: int, t: int) -> None:
+            if sid in tier and t < tier[sid]:
+                tier[sid] = t
+
+        for a in points:
+            for sid, d in index.within(a, mid_ly, include_origin=True):
+                mark(sid, TIER_NEAR if d <= near_ly else TIER_MID)
+        for point in _route_points(index, hops, route_ly):
+            for sid, _ in index.within(point, route_ly):
+                mark(sid, TIER_NEAR)
+        return cls(tier)
+
+    def tier_of(self, system_id: int) -> int:
+        return self.tier.get(int(system_id), TIER_FAR)
+
+    def counts(self) -> Dict[str, int]:
+        return {name: len(ids) for name, ids in zip(TIER_NAMES, self.ids)}
+
+
+def _route_points(index, hops: Sequence[int], step_ly: float) -> List[Tuple[float, float]]:
+    """Points along the route's straight legs, at most step_ly apart."""
+    pts = [index.position(h) for h in hops]
+    if len(pts) <= 1:
+        return pts
+    out: List[Tuple[float, float]] = []
+    for (ax, ay), (bx, by) in zip(pts, pts[1:]):
+        n = max(1, math.ceil(math.hypot(bx - ax, by - ay) / max(step_ly, 1e-6)))
+        out.extend((ax + (bx - ax) * k / n, ay + (by - ay) * k / n) for k in range(n))
+    out.append(pts[-1])
+    return out
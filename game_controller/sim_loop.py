@@ -8,6 +8,19 @@ Background simulation system that runs off the UI thread:
 - Manages orbital mechanics and universe state
 - Provides publish_tick() hook for UI rendering coordination
 - Handles system visibility and update optimization
+- Splits a per-tick CPU budget across subsystems (sim_scheduler), round-robin
+- Distance-based LOD tiers (sim_lod): near systems every tick, mid/far coarser
+- Bulk fast-forward over long elapsed times (save load / headless), with
+  progress and cancel hooks
+- Keeps market prices/stocks in memory (market_engine) with batched write-back
+- Runs facility production (facility_engine) against facility_inventory on the
+  sim clock, buying inputs from and selling outputs to the system's market cells
+- Fires scheduled sim events (sim_events) on the save's sim clock
+- Records market price history (price_history) with rollups for charts
+- Galaxy-wide production balance from the compiled facility graph (production_graph)
+- Keeps the trade route index (game.trade_routes) current from touched market rows
+- Moves NPC ships (npc_fleet) along gate routes; their consumption draws market stock
+- Depletes resource nodes under mining and regenerates them lazily (resource_engine)
 """
 
 from __future__ import annotations
@@ -16,21 +29,34 @@ import os
 import math
 import threading
 import time
-import random
 import queue
-from typing import Callable, Optional, Dict, Any, List, Sequence, Iterable, Tuple, TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable, Optional, Dict, Any, List, Sequence, Iterable, Tuple
 
 from data import db
+from game_controller.facility_engine import MAX_STEP_S, FacilityProduction
+from game_controller.market_engine import MarketArrays
+from game_controller.npc_fleet import NpcFleet
+from game_controller import price_history, production_graph
+from game_controller.price_history import PriceHistory
+from game_controller.resource_engine import REFILL_EVENT, ResourceField
+from game_controller.sim_events import EventHandler, SimEvent, SimEventScheduler
+from game_controller.sim_lod import TIER_FAR, TIER_MID, TIER_NEAR, LodTiers
+from game_controller.sim_scheduler import TickScheduler
+from settings import system_config as cfg
 
-# Optional multi-core compute
+if TYPE_CHECKING:
+    from game_controller import trade_routes
+
+# Optional multi-core compute (shared-memory worker pool)
 try:
-    from concurrent.futures import ProcessPoolExecutor  # runtime use
+    from game_controller.sim_pool import MIN_CPUS_FOR_POOL, MIN_ROWS_FOR_POOL, SimWorkerPool, usable_cpus
 except Exception:  # pragma: no cover
-    ProcessPoolExecutor = None  # type: ignore[assignment]
+    SimWorkerPool = None  # type: ignore[assignment,misc]
+    MIN_ROWS_FOR_POOL = 0
+    MIN_CPUS_FOR_POOL = 2
 
-# For type checking only (prevents "Variable not allowed in type expression")
-if TYPE_CHECKING:
-    from concurrent.futures import ProcessPoolExecutor as _PPE
+    def usable_cpus() -> int:
+        return os.cpu_count() or 1
 
 
 def _make_in_clause(values: Sequence[int]) -> str:
@@ -38,32 +64,6 @@ def _make_in_clause(values: Sequence[int]) -> str:
     return "(" + ",".join("?" for _ in values) + ")" if values else "(NULL)"
 
 
-# -------- Worker-side pure functions (must be top-level / importable) --------
-
-def _plan_market_drift_task(args: Tuple[int, Sequence[int], float]) -> Dict[int, float]:
-    """
-    Compute tiny multiplicative price nudges per system_id, read-only planning.
-    Returns {system_id: factor}, where factor ~ 1.0 +/- drift.
-    """
-    frame, sys_ids, drift = args
-    out: Dict[int, float] = {}
-    # Keep it deterministic per (frame, system) and process-safe
-    for sid in sys_ids:
-        # stable-ish seed per (frame, sid) but different across frames
-        r = random.Random((frame * 1_000_003) ^ (sid * 7_654_321))
-        roll = r.random()
-        if roll < 1 / 3:
-            factor = 1.0 - drift
-        elif roll > 2 / 3:
-            factor = 1.0 + drift
-        else:
-            # slight jitter around 1.0 to avoid totally static prices
-            factor = 1.0 + (r.uniform(-drift * 0.25, drift * 0.25))
-        # clamp factor a bit just in case
-        out[int(sid)] = max(0.50, min(1.50, factor))
-    return out
-
-
 # -------- Simulator --------
 
 class UniverseSimulator:
@@ -77,12 +77,16 @@ class UniverseSimulator:
     Performance notes:
     - Reuses a thread-local DB connection (from data.db).
     - Caches system IDs and refreshes periodically.
-    - Updates off-screen systems in subsets each tick to reduce contention.
+    - Updates off-screen systems in round-robin slices sized by a per-tick CPU
+      budget and online cost estimates (sim_scheduler.TickScheduler).
+    - Only near systems (LOD tier) get per-tick steps; mid and far systems are
+      brought forward over their elapsed time in coarse closed-form steps.
     - Commits after each logical batch to shorten write locks (WAL-friendly).
 
     Multi-core option:
-    - If enabled, shards off-screen systems to a ProcessPool for **read-only planning**,
-      then applies all writes in a single batched commit on the sim thread.
+    - If enabled, large market/facility steps run in a warm process pool (sim_pool)
+      directly on shared-memory copies of the engine arrays; workers return only the
+      dirty row indices and all writes still happen on the sim thread.
     """
 
     def __init__(self) -> None:
@@ -113,18 +117,74 @@ class UniverseSimulator:
         self._ids_next_refresh_at = 0
 
         # Cadence knobs
-        self._market_subset_fraction = 0.25   # update ~25% of off-screen systems per tick
         self._market_every_frames = 1         # or raise to update less frequently
-        self._ships_sample_limit = 50         # cap sampling work
         self._market_drift = 0.005            # +/- 0.5% price nudge baseline
 
+        # ----- Tick budget -----
+        # Half of each tick interval (sim-thread CPU time) is shared by the
+        # subsystems; every system/ship is visited at least once per 40 ticks.
+        self._scheduler = TickScheduler(budget_fraction=0.5, max_cycle_ticks=40)
+        self._scheduler.register("markets", weight=2.0)
+        self._scheduler.register("facilities", weight=2.0)
+        self._scheduler.register("ships", weight=1.0)
+        self._scheduler.register("lod_mid", weight=1.0,
+                                 max_cycle_ticks=int(getattr(cfg, "SIM_LOD_MID_CYCLE_TICKS", 10)))
+        self._scheduler.register("lod_far", weight=0.25,
+                                 max_cycle_ticks=int(getattr(cfg, "SIM_LOD_FAR_CYCLE_TICKS", 200)))
+        self._ship_count = 0
+
         # ----- Multiprocessing knobs -----
         self._use_process_pool: bool = False
-        self._max_workers: int = max(1, (os.cpu_count() or 2) - 1)
-        self._pool: Optional["_PPE"] = None  # type: ignore[name-defined]
+        self._max_workers: int = max(1, usable_cpus() - 1)
+        self._pool: Optional["SimWorkerPool"] = None
+        self._pool_min_rows = MIN_ROWS_FOR_POOL  # smaller steps stay in-process
+        self._pool_min_cpus = MIN_CPUS_FOR_POOL  # fewer cores: the pool can only lose
         # To avoid giant SQL statements, apply factors in reasonable chunks
         self._apply_chunk_max = 250  # systems per SQL CASE/IN block (~3 params/system)
 
+        # ----- In-memory market engine -----
+        # Prices/stocks live in dense arrays on the sim thread; changed cells are
+        # written back every _market_flush_every_frames frames.
+        self._use_market_engine: bool = True
+        self._market_flush_every_frames = 20
+        self._markets: Optional[MarketArrays] = None
+        self._engines_lock = threading.RLock()
+
+        # ----- Facility production -----
+        self._facilities: Optional[FacilityProduction] = None
+        self._facility_every_frames = 1
+        self._facility_last_t: Dict[int, float] = {}  # system_id -> sim clock (s) of last step
+        self._market_last_frame: Dict[int, int] = {}  # system_id -> frame of last market step
+        self._rows_written = 0  # rows written by every engine flush, on any connection
+
+        # ----- Scheduled events -----
+        # One scheduler, rebound to whichever save is active; handlers survive save switches.
+        self._events = SimEventScheduler()
+
+        # ----- Price history (ring buffers over the market engine's cells) -----
+        self._history: Optional[PriceHistory] = None
+
+        # ----- NPC fleet (struct-of-arrays ships, woken when a leg or dock stay ends) -----
+        self._fleet: Optional[NpcFleet] = None
+
+        # ----- Resource nodes (regenerated when touched; mines at a node deplete it) -----
+        # Depleted systems are settled by REFILL_EVENT events on the sim clock.
+        self._resources: Optional[ResourceField] = None
+        self._events.register(REFILL_EVENT, self._on_resource_refill)
+
+        # ----- Trade route index (built on first query, kept current from dirty market rows) -----
+        self._trade: Optional["trade_routes.TradeIndex"] = None
+
+        # ----- Production graph (facility designs as sparse recipes) -----
+        self._production: Optional[Tuple[Any, "production_graph.ProductionGraph", Any]] = None
+
+        # ----- Level of detail -----
+        self._lod: Optional[LodTiers] = None
+        self._lod_dirty = True
+        self._lod_db_path = None
+        self._route_system_ids: List[int] = []
+        self._advance_requests: "queue.SimpleQueue[int]" = queue.SimpleQueue()
+
     # ---- lifecycle ----
     def ensure_running(self) -> None:
         if self._thread and self._thread.is_alive():
@@ -148,6 +208,17 @@ class UniverseSimulator:
             t.join(timeout=1.0)
         self._stop_emitter()
         self._shutdown_pool()
+        with self._engines_lock:
+            self.flush_all()
+            self._history = None
+            self._fleet = None
+            self._resources = None
+            self._trade = None
+            self._markets = None
+            self._facilities = None
+            self._facility_last_t.clear()
+            self._market_last_frame.clear()
+        self._lod = None
         self._emit("[sim] stopped")
 
     # ---- config ----
@@ -158,8 +229,30 @@ class UniverseSimulator:
 
     def set_visible_system(self, system_id: Optional[int]) -> None:
         self._visible_system_id = int(system_id) if system_id is not None else None
+        self._lod_dirty = True
+        if self._visible_system_id is not None:
+            # Catch the system up before it goes on screen (no-op if already current).
+            self._advance_requests.put(self._visible_system_id)
         self._emit(f"[sim] visible system => {self._visible_system_id}")
 
+    def set_travel_route(self, system_ids: Iterable[int]) -> None:
+        """Systems on the current travel route are simulated at full detail; empty clears it."""
+        self._route_system_ids = [int(s) for s in system_ids]
+        self._lod_dirty = True
+        self._emit(f"[sim] travel route => {len(self._route_system_ids)} systems")
+
+    def on_player_arrival(self, system_id: Optional[int]) -> None:
+        """Player reached a system: re-center LOD tiers on it and drop the finished route."""
+        self._route_system_ids = []
+        self._lod_dirty = True
+        if system_id is not None:
+            self._advance_requests.put(int(system_id))
+        self._emit(f"[sim] arrival => {system_id}")
+
+    def request_advance(self, system_id: int) -> None:
+        """Bring a (possibly far-tier) system up to date on the next tick, e.g. before it is queried."""
+        self._advance_requests.put(int(system_id))
+
     def enable_debug(self, enabled: bool, sink: Optional[Callable[[str], None]] = None) -> None:
         self._debug_enabled = bool(enabled)
         self._debug_sink = sink
@@ -169,6 +262,28 @@ class UniverseSimulator:
             # keep emitter running but it will no-op without sink
             pass
 
+    def set_tick_budget(self, fraction: float) -> None:
+        """Share (0.05..1) of each tick interval the subsystems may spend on the sim thread."""
+        self._scheduler.budget_fraction = max(0.05, min(1.0, float(fraction)))
+        self._emit(f"[sim] tick_budget => {self._scheduler.budget_fraction:.2f}")
+
+    def set_use_market_engine(self, enabled: bool) -> None:
+        """Use the in-memory market engine (True) or the legacy per-tick SQL updates."""
+        want = bool(enabled)
+        if want == self._use_market_engine:
+            return
+        self._use_market_engine = want
+        if not want:
+            with self._engines_lock:
+                self._flush_markets(None)
+                self._markets = None
+        self._emit(f"[sim] market_engine => {self._use_market_engine}")
+
+    def set_market_flush_frames(self, frames: int) -> None:
+        """Write in-memory market changes back to the DB every N frames."""
+        self._market_flush_every_frames = int(max(1, frames))
+        self._emit(f"[sim] market_flush_frames => {self._market_flush_every_frames}")
+
     def set_use_process_pool(self, enabled: bool) -> None:
         """Enable/disable multi-core planning."""
         want = bool(enabled)
@@ -243,28 +358,34 @@ class UniverseSimulator:
 
     def _refresh_system_ids_if_needed(self, conn) -> None:
         if self._frame >= self._ids_next_refresh_at or not self._all_system_ids:
-            rows = conn.execute("SELECT system_id FROM systems").fetchall()
-            self._all_system_ids = [r[0] for r in rows]
+            rows = conn.execute("SELECT system_id FROM systems ORDER BY system_id").fetchall()
+            ids = [r[0] for r in rows]
+            if ids != self._all_system_ids:
+                self._lod_dirty = True
+            self._all_system_ids = ids
+            try:
+                self._ship_count = self._fleet_for(conn).n_ships
+            except Exception as e:
+                self._emit(f"[sim][ERROR] NPC fleet load failed: {e!r}")
+                self._ship_count = 0
             self._ids_next_refresh_at = self._frame + self._ids_refresh_every
 
-    def _choose_subset(self, ids: List[int], fraction: float) -> List[int]:
-        if not ids or fraction >= 1.0:
-            return ids[:]
-        k = max(1, int(len(ids) * max(0.0, min(1.0, fraction))))
-        # Random sample each frame to spread write load
-        return random.sample(ids, k)
-
     def _ensure_pool(self) -> None:
         if not self._use_process_pool:
             return
-        if ProcessPoolExecutor is None:
-            self._emit("[sim][WARN] ProcessPoolExecutor not available; disabling pool.")
+        if SimWorkerPool is None:
+            self._emit("[sim][WARN] shared-memory pool not available; disabling pool.")
             self._use_process_pool = False
             return
         if self._pool is not None:
             return
+        cpus = usable_cpus()
+        if cpus < self._pool_min_cpus:
+            self._emit(f"[sim][WARN] {cpus} usable CPU(s); process pool would only add IPC cost, disabling pool.")
+            self._use_process_pool = False
+            return
         try:
-            self._pool = ProcessPoolExecutor(max_workers=self._max_workers)  # type: ignore[call-arg]
+            self._pool = SimWorkerPool(self._max_workers)
             self._emit(f"[sim] process pool started (workers={self._max_workers})")
         except Exception as e:  # pragma: no cover
             self._emit(f"[sim][WARN] failed to start process pool: {e!r}")
@@ -276,7 +397,7 @@ class UniverseSimulator:
         self._pool = None
         if p is not None:
             try:
-                p.shutdown(wait=False, cancel_futures=True)
+                p.close()
             except Exception:
                 pass
             self._emit("[sim] process pool stopped")
@@ -321,6 +442,594 @@ class UniverseSimulator:
 
         return total_changed
 
+    def _market_engine_for(self, conn) -> MarketArrays:
+        """Engine bound to the active save; reloaded when the save changes."""
+        path = db.get_active_db_path()
+        with self._engines_lock:
+            m = self._markets
+            if m is None or m.db_path != path:
+                if m is not None:
+                    self._flush_markets(None)
+                m = MarketArrays.from_connection(conn, path)
+                self._markets = m
+                self._market_last_frame.clear()
+                self._emit(f"[sim] market engine loaded: {len(m.system_ids)} systems x {m.n_items} items")
+            return m
+
+    def _pool_for(self, kind: str, n_rows: int) -> Optional["SimWorkerPool"]:
+        """
+        The worker pool if enabled, the step is big enough to be worth shipping
+        out and the pool has not measured slower than in-process for `kind`.
+        """
+        if not self._use_process_pool or n_rows < self._pool_min_rows:
+            return None
+        self._ensure_pool()
+        pool = self._pool
+        if pool is None or not pool.wants(kind):
+            return None
+        pool.bind(self._markets, self._facilities)
+        return pool
+
+    def _record_step_cost(self, kind: str, pooled: bool, n_rows: int, t0: float) -> None:
+        """Feed a pool-sized step's wall time to the pool's path choice."""
+        pool = self._pool
+        if pool is not None and n_rows >= self._pool_min_rows:
+            pool.record(kind, pooled, n_rows, time.perf_counter() - t0)
+
+    def _step_markets(self, conn, system_ids: Iterable[int], factors: Optional[Dict[int, float]] = None) -> int:
+        """
+        Advance each system's markets over the ticks since it was last stepped:
+        systems due one tick take the regular step (pool-capable), the rest one
+        closed-form MarketArrays.advance() step.
+        """
+        frame = self._frame
+        last = self._market_last_frame
+        due: List[int] = []
+        behind: List[Tuple[int, int]] = []
+        for sid in system_ids:
+            n = frame - last.get(sid, frame - 1)
+            if n <= 0:
+                continue
+            last[sid] = frame
+            if n == 1:
+                due.append(sid)
+            else:
+                behind.append((sid, n))
+        with self._engines_lock:
+            m = self._market_engine_for(conn)
+            touched = m.advance(behind, frame, self._market_drift) if behind else 0
+            rows = m.step_rows_for(due, frame, self._market_drift, factors)
+            pool = self._pool_for("markets", len(rows))
+            t0 = time.perf_counter()
+            if pool is not None:
+                try:
+                    touched += pool.step_markets(m, rows)
+                    self._record_step_cost("markets", True, len(rows), t0)
+                    return touched
+                except Exception as e:
+                    self._emit(f"[sim][WARN] pool market step failed, running in-process: {e!r}")
+                    t0 = time.perf_counter()
+            touched += m.step(due, frame, self._market_drift, factors)
+            self._record_step_cost("markets", False, len(rows), t0)
+            return touched
+
+    def _flush_markets(self, conn) -> int:
+        """Write pending market cells; conn=None writes straight to the engine's own save file."""
+        with self._engines_lock:
+            m = self._markets
+            if m is None:
+                return 0
+            try:
+                if conn is not None and m.db_path != db.get_active_db_path():
+                    conn = None
+                return self._count_rows(m.flush(conn))
+            except Exception as e:
+                self._emit(f"[sim][ERROR] market flush failed: {e!r}")
+                return 0
+
+    def _count_rows(self, n: int) -> int:
+        self._rows_written += n
+        return n
+
+    def rows_written(self) -> int:
+        """Total rows the sim's engine flushes have written since it was created."""
+        return self._rows_written
+
+    def flush_markets(self) -> int:
+        """Write pending in-memory market changes now (safe from any thread)."""
+        return self._flush_markets(None)
+
+    def flush_all(self) -> Dict[str, int]:
+        """
+        Write everything the sim holds in memory to its save: price rollups,
+        NPC ships, resource richness, markets, facility inventory and the event
+        queue/clock, in one pass under the engine lock (e.g. before the save
+        folder is copied). Safe from any thread. Returns rows written per engine.
+        """
+        with self._engines_lock:
+            return {
+                "history": self._flush_history(None),
+                "fleet": self._flush_fleet(None),
+                "resources": self._flush_resources(None),
+                "markets": self._flush_markets(None),
+                "facilities": self._flush_facilities(None),
+                "events": self._flush_events(None),
+            }
+
+    # ---- scheduled events ----
+    def _events_for(self, conn) -> SimEventScheduler:
+        """Event scheduler bound to the active save (pending events loaded on a save switch)."""
+        path = db.get_active_db_path()
+        ev = self._events
+        if ev.db_path != path:
+            with self._engines_lock:
+                ev.bind(conn, path)
+                self._emit(f"[sim] events loaded: {ev.pending()} pending at t={ev.now_s:.0f}s")
+        return ev
+
+    def _flush_events(self, conn) -> int:
+        """Write pending event/clock changes; conn=None writes straight to the scheduler's save file."""
+        ev = self._events
+        try:
+            if conn is not None and ev.db_path != db.get_active_db_path():
+                conn = None
+            return self._count_rows(ev.flush(conn))
+        except Exception as e:
+            self._emit(f"[sim][ERROR] event flush failed: {e!r}")
+            return 0
+
+    def events(self) -> SimEventScheduler:
+        """Scheduler of the active save, for scheduling/cancelling from any thread."""
+        return self._events_for(db.get_connection())
+
+    def register_event_handler(self, kind: str, handler: EventHandler) -> None:
+        """Handle `kind` events on the sim thread (see SimEventScheduler.register)."""
+        self._events.register(kind, handler)
+
+    # ---- price history ----
+    def _history_for(self, markets: MarketArrays, now_s: float) -> PriceHistory:
+        """Price history over the given market engine; a new engine starts with a full sample."""
+        with self._engines_lock:
+            h = self._history
+            if h is None or h.markets is not markets:
+                if h is not None:
+                    self._flush_history(None)
+                h = PriceHistory(markets)
+                h.sample(now_s, full=True)
+                self._history = h
+            return h
+
+    def _record_prices(self, conn, markets: MarketArrays, now_s: float,
+                       market_flush: bool, final: bool = False) -> int:
+        """
+        Sample prices when due and write rollups every few samples (or when
+        final). Call before a market flush so its dirty rows are kept for
+        the next sample.
+        """
+        with self._engines_lock:
+            h = self._history_for(markets, now_s)
+            if h.due(now_s):
+                h.sample(now_s)
+            if market_flush:
+                h.note_rows(markets.dirty)
+            if not (final or h.needs_flush()):
+                return 0
+            return self._flush_history(conn, now_s)
+
+    def _flush_history(self, conn, now_s: Optional[float] = None) -> int:
+        """Write pending price rollups; conn=None writes straight to the history's own save file."""
+        with self._engines_lock:
+            h = self._history
+            if h is None:
+                return 0
+            try:
+                if conn is not None and h.db_path != db.get_active_db_path():
+                    conn = None
+                return self._count_rows(h.flush(conn, now_s))
+            except Exception as e:
+                self._emit(f"[sim][ERROR] price history flush failed: {e!r}")
+                return 0
+
+    def price_history(self, system_id: int, item_id: int, window_s: float = 86400.0,
+                      max_points: int = price_history.DEFAULT_MAX_POINTS,
+                      end_s: Optional[float] = None, conn=None) -> Tuple[int, List[Tuple[int, int, int, int, int]]]:
+        """
+        Chart data for one market: (resolution_s, [(t, open, high, low,
+        close), ...]) over the window_s game seconds ending at end_s (default
+        now), at the finest resolution that fits max_points (0 = raw samples).
+        """
+        conn = conn if conn is not None else db.get_connection()
+        now = self._events_for(conn).now_s
+        t1 = now if end_s is None else float(end_s)
+        t0 = t1 - max(0.0, float(window_s))
+        h = self._history
+        if h is not None and h.db_path == db.get_active_db_path():
+            return h.query(conn, system_id, item_id, t0, t1, max_points, now)
+        return price_history.query_rollups(conn, system_id, item_id, t0, t1, max_points, now)
+
+    # ---- NPC fleet ----
+    def _fleet_for(self, conn) -> NpcFleet:
+        """NPC fleet of the active save, drawing on the market engine; reloaded when either changes."""
+        path = db.get_active_db_path()
+        with self._engines_lock:
+            markets = self._market_engine_for(conn) if self._use_market_engine else None
+            f = self._fleet
+            if f is None or f.db_path != path or f.markets is not markets:
+                if f is not None:
+                    self._flush_fleet(None)
+                f = NpcFleet.from_connection(conn, markets, self._events_for(conn).now_s, path)
+                self._fleet = f
+                self._emit(f"[sim] NPC fleet loaded: {f.n_ships} ships, {len(f.design_ids)} designs")
+            return f
+
+    def _flush_fleet(self, conn) -> int:
+        """Settle fleet consumption and write changed ship summaries; conn=None uses the fleet's own save file."""
+        with self._engines_lock:
+            f = self._fleet
+            if f is None:
+                return 0
+            try:
+                f.settle_all()
+                if conn is not None and f.db_path != db.get_active_db_path():
+                    conn = None
+                return self._count_rows(f.flush(conn))
+            except Exception as e:
+                self._emit(f"[sim][ERROR] NPC fleet flush failed: {e!r}")
+                return 0
+
+    def fleet_summary(self, conn=None) -> Dict[str, float]:
+        """Ship counts by state, arrivals/departures so far and stock consumed."""
+        conn = conn if conn is not None else db.get_connection()
+        with self._engines_lock:
+            return self._fleet_for(conn).summary()
+
+    # ---- resource nodes ----
+    def _resources_for(self, conn) -> ResourceField:
+        """
+        Resource field of the active save, caught up to the sim clock; mines
+        are rebound when the facility engine reloads.
+        """
+        path = db.get_active_db_path()
+        with self._engines_lock:
+            fp = self._facilities_for(conn)
+            rf = self._resources
+            if rf is None or rf.db_path != path:
+                if rf is not None:
+                    self._flush_resources(None)
+                events = self._events_for(conn)
+                rf = ResourceField.from_connection(conn, events.now_s, path, fp, events)
+                self._resources = rf
+                self._emit(f"[sim] resource field loaded: {rf.n_nodes} nodes, {len(rf.mine_node)} mine outputs")
+            elif rf.facilities is not fp:
+                rf.bind_mines(conn, fp)
+            return rf
+
+    def _on_resource_refill(self, evs: List[SimEvent], now_s: float) -> None:
+        """REFILL_EVENT handler: settle the resource field's systems that are full again."""
+        with self._engines_lock:
+            rf = self._resources
+            if rf is not None and rf.events is self._events:
+                rf.on_refill(evs, now_s)
+
+    def _flush_resources(self, conn) -> int:
+        """
+        Write changed node richness; conn=None uses the field's own save file.
+        Rows written to the active save are patched into the cached locations
+        rows so get_location() reads the new richness without a table reload.
+        """
+        with self._engines_lock:
+            rf = self._resources
+            if rf is None:
+                return 0
+            try:
+                active = rf.db_path == db.get_active_db_path()
+                if conn is not None and not active:
+                    conn = None
+                rows = rf.pending_rows() if active else []
+                written = self._count_rows(rf.flush(conn))
+            except Exception as e:
+                self._emit(f"[sim][ERROR] resource flush failed: {e!r}")
+                return 0
+            if written and rows:
+                db.patch_location_richness(rows)
+            return written
+
+    def resource_richness(self, location_id: int, conn=None) -> Optional[float]:
+        """Current richness of a resource location (None if it is not one)."""
+        conn = conn if conn is not None else db.get_connection()
+        with self._engines_lock:
+            return self._resources_for(conn).richness(location_id, self._events.now_s)
+
+    def extract_resource(self, location_id: int, amount: float, conn=None) -> float:
+        """Mine up to `amount` richness from a resource location now. Returns what was taken."""
+        conn = conn if conn is not None else db.get_connection()
+        with self._engines_lock:
+            rf = self._resources_for(conn)
+            return rf.extract(location_id, amount, self._events.now_s)
+
+    # ---- trade routes ----
+    def _update_trade(self, markets: MarketArrays) -> int:
+        """Re-index the market rows touched since the last flush (call before the flush clears them)."""
+        with self._engines_lock:
+            t = self._trade
+            if t is None or t.markets is not markets or not markets.dirty:
+                return 0
+            return t.update_rows(markets.dirty)
+
+    def trade_index(self, conn=None) -> "trade_routes.TradeIndex":
+        """Trade index over the active save's market engine, current as of this call."""
+        from game import trade_routes
+        conn = conn if conn is not None else db.get_connection()
+        with self._engines_lock:
+            m = self._market_engine_for(conn)
+            t = self._trade
+            if t is None or t.markets is not m:
+                t = trade_routes.TradeIndex(m)
+                self._trade = t
+                self._emit(f"[sim] trade index built: {len(m.system_ids)} systems x {m.n_items} items")
+            else:
+                t.update_rows(m.dirty)
+            return t
+
+    def best_trade_routes(self, origin: int, max_jumps: int, cargo: int, conn=None,
+                          **limits: Any) -> List["trade_routes.TradeRoute"]:
+        """Most profitable trades from origin within max_jumps (see trade_routes.best_routes for limits)."""
+        from game import routing, trade_routes
+        index = self.trade_index(conn)
+        return trade_routes.best_routes(index, routing.get_network(), origin, max_jumps, cargo, **limits)
+
+    # ---- production graph ----
+    def _production_for(self, conn) -> Tuple["production_graph.ProductionGraph", Any]:
+        """(graph, nominal design activity) of the active save's facilities; rebuilt on a save switch."""
+        path = db.get_active_db_path()
+        with self._engines_lock:
+            if self._production is None or self._production[0] != path:
+                graph, activity = production_graph.from_facilities(conn)
+                self._production = (path, graph, activity)
+                self._emit(f"[sim] production graph: {graph.n_recipes} designs, nnz={graph.nnz}")
+            return self._production[1], self._production[2]
+
+    def production_balance(self, top: int = 5, conn=None) -> Dict[str, Any]:
+        """
+        Galaxy-wide item flows at nominal facility output against fleet
+        consumption: {"net": {item_id: produced - consumed per second},
+        "demand": {item_id: fleet rate}, "bottlenecks": [(item_id, coverage)]},
+        where coverage is what the facilities can make (or raw supply nets)
+        over the gross requirement of the fleet demand.
+        """
+        conn = conn if conn is not None else db.get_connection()
+        graph, activity = self._production_for(conn)
+        demand = production_graph.fleet_demand(conn, graph)
+        net = graph.net_flow(activity)
+        raw_supply = graph.vector({graph.keys[c]: max(0.0, net[c])
+                                   for c in range(graph.n_commodities) if graph.is_raw(c)})
+        return {
+            "net": graph.as_dict(net),
+            "demand": graph.as_dict(demand),
+            "bottlenecks": graph.bottlenecks(raw_supply, demand, activity, top),
+        }
+
+    # ---- fast-forward ----
+    def fast_forward(self, seconds: float,
+                     progress: Optional[Callable[[float], None]] = None,
+                     cancel: Optional[Callable[[], bool]] = None,
+                     conn=None) -> Dict[str, Any]:
+        """
+        Advance every system's markets and facility production by `seconds`
+        of game time in large closed-form steps (SIM_FAST_FORWARD_STEP_S each)
+        instead of replaying ticks, then write the results in one flush.
+
+        progress(fraction) is called after each step; cancel() is polled
+        before each step and stops at a step boundary, keeping what was done.
+        Runs on the calling thread against the active save (conn defaults to
+        its thread-local connection); the tick thread waits on the engine lock
+        meanwhile. Returns {"advanced_s", "cancelled", "steps", "market_rows",
+        "facility_rows", "resource_rows", "events_fired", "ship_moves"}.
+        Scheduled events fire step by step as the sim clock moves, NPC ships
+        move with it and mines deplete their resource nodes.
+        """
+        total = max(0.0, float(seconds))
+        step_s = max(1.0, float(getattr(cfg, "SIM_FAST_FORWARD_STEP_S", 600.0)))
+        conn = conn if conn is not None else db.get_connection()
+        result: Dict[str, Any] = {"advanced_s": 0.0, "cancelled": False, "steps": 0,
+                                  "market_rows": 0, "facility_rows": 0, "resource_rows": 0,
+                                  "events_fired": 0, "ship_moves": 0}
+        if total <= 0.0:
+            return result
+        self._refresh_system_ids_if_needed(conn)
+        ids = list(self._all_system_ids)
+        t0 = time.perf_counter()
+        with self._engines_lock:
+            if self._use_market_engine:
+                markets = self._market_engine_for(conn)
+            else:
+                # Legacy SQL mode keeps no engine; use a throwaway one for the catch-up
+                markets = MarketArrays.from_connection(conn, db.get_active_db_path())
+            fp = self._facilities_for(conn)
+            events = self._events_for(conn)
+            fleet = self._fleet_for(conn) if self._use_market_engine else None
+            rf = self._resources_for(conn)
+            done = 0.0
+            carry = 0.0  # fractional market ticks carried between steps
+            frame = self._frame  # drift frame: advances by the ticks each step stands in for
+            while done < total:
+                if cancel is not None and cancel():
+                    result["cancelled"] = True
+                    break
+                dt = min(step_s, total - done)
+                ticks = dt * self._tick_rate_hz + carry
+                n = int(ticks)
+                carry = ticks - n
+                if n > 0:
+                    frame += n
+                    markets.advance(((sid, n) for sid in ids), frame, self._market_drift)
+                fp.draw_inputs(markets, ((sid, dt) for sid in ids), max_step_s=dt)
+                mines = rf.mine_snapshot(ids, fp.qty)
+                fp.step_many(((sid, dt) for sid in ids), max_step_s=dt, storage_cap=math.inf)
+                if mines:
+                    rf.deplete_from_output(mines, fp, events.now_s + dt)
+                fp.sell_outputs(markets, ids)
+                result["events_fired"] += events.advance(dt)
+                if fleet is not None:
+                    result["ship_moves"] += fleet.advance(events.now_s)
+                if self._use_market_engine:
+                    self._record_prices(conn, markets, events.now_s, market_flush=False)
+                done += dt
+                result["steps"] += 1
+                if progress is not None:
+                    try:
+                        progress(done / total)
+                    except Exception:
+                        pass
+            result["advanced_s"] = done
+            # Live ticks continue from the last drift frame used here, with every
+            # system counted as stepped up to it (no second catch-up).
+            self._frame = frame
+            self._market_last_frame.update((sid, frame) for sid in ids)
+            self._facility_last_t.update((sid, events.now_s) for sid in ids)
+            if self._use_market_engine:
+                self._flush_fleet(conn)
+                self._record_prices(conn, markets, events.now_s, market_flush=True, final=True)
+                self._update_trade(markets)
+            result["market_rows"] = self._count_rows(markets.flush(conn))
+            result["facility_rows"] = self._count_rows(fp.flush(conn))
+            result["resource_rows"] = self._flush_resources(conn)
+            self._count_rows(events.flush(conn))
+        self._emit(f"[sim] fast-forward {done:.0f}/{total:.0f}s in {result['steps']} steps "
+                   f"({time.perf_counter() - t0:.2f}s){' [cancelled]' if result['cancelled'] else ''}")
+        return result
+
+    def _facilities_for(self, conn) -> FacilityProduction:
+        """Production engine bound to the active save; reloaded when the save changes."""
+        path = db.get_active_db_path()
+        with self._engines_lock:
+            fp = self._facilities
+            if fp is None or fp.db_path != path:
+                fp = FacilityProduction.from_connection(conn, path)
+                self._facilities = fp
+                self._facility_last_t.clear()
+                self._emit(f"[sim] facility engine loaded: {len(fp.facility_ids)} facilities, {len(fp.slot_key)} slots")
+            return fp
+
+    def _flush_facilities(self, conn) -> int:
+        """Write changed facility inventory; conn=None uses the engine's own save file."""
+        with self._engines_lock:
+            fp = self._facilities
+            if fp is None:
+                return 0
+            try:
+                if conn is not None and fp.db_path != db.get_active_db_path():
+                    conn = None
+                return self._count_rows(fp.flush(conn))
+            except Exception as e:
+                self._emit(f"[sim][ERROR] facility flush failed: {e!r}")
+                return 0
+
+    def _step_facilities(self, conn, system_ids: Iterable[int], default_dt: float,
+                         max_step_s: float = MAX_STEP_S) -> Tuple[int, int]:
+        """
+        Produce for each system over the sim-clock time since it last ran (at
+        most max_step_s) with inputs bought from the system's market, draw the
+        mines' output from their resource nodes, sell the output, then write
+        the changed inventory in one transaction. Returns (active facilities,
+        rows written).
+        """
+        with self._engines_lock:
+            now = self._events_for(conn).now_s
+            last_t = self._facility_last_t
+            fp = self._facilities_for(conn)
+            system_dts: List[Tuple[int, float]] = []
+            for sid in system_ids:
+                if sid not in fp.sys_row:
+                    continue
+                prev = last_t.get(sid)
+                last_t[sid] = now
+                system_dts.append((sid, default_dt if prev is None else now - prev))
+            markets = self._market_engine_for(conn) if self._use_market_engine else None
+            fp.draw_inputs(markets, system_dts, max_step_s)
+            rf = self._resources_for(conn)
+            mines = rf.mine_snapshot((sid for sid, _ in system_dts), fp.qty)
+            active = -1
+            pool = self._pool_for("facilities", len(system_dts)) if max_step_s == MAX_STEP_S else None
+            t0 = time.perf_counter()
+            if pool is not None:
+                try:
+                    active = pool.step_facilities(fp, fp.step_rows_for(system_dts))
+                    self._record_step_cost("facilities", True, len(system_dts), t0)
+                except Exception as e:
+                    self._emit(f"[sim][WARN] pool facility step failed, running in-process: {e!r}")
+                    t0 = time.perf_counter()
+            if active < 0:
+                # Outputs are sold below, so only a step's own output is ever in storage
+                active = fp.step_many(system_dts, max_step_s, storage_cap=math.inf)
+                if max_step_s == MAX_STEP_S:
+                    self._record_step_cost("facilities", False, len(system_dts), t0)
+            if mines:
+                rf.deplete_from_output(mines, fp, now)
+            fp.sell_outputs(markets, (sid for sid, _ in system_dts))
+            try:
+                written = self._count_rows(fp.flush(conn))
+            except Exception as e:
+                self._emit(f"[sim][ERROR] facility flush failed: {e!r}")
+                written = 0
+        return active, written
+
+    def _lod_tiers(self, conn) -> LodTiers:
+        """Current LOD tiers; recomputed after visibility/route/arrival changes or a save switch."""
+        path = db.get_active_db_path()
+        if self._lod is not None and not self._lod_dirty and self._lod_db_path == path:
+            return self._lod
+        self._lod_dirty = False
+        ids = self._all_system_ids
+        try:
+            from game import galaxy_index  # lazy: game/ imports the controller package
+            row = conn.execute("SELECT current_player_system_id FROM player WHERE id = 1").fetchone()
+            anchors = [row[0] if row else None, self._visible_system_id]
+            tiers = LodTiers.compute(galaxy_index.get_index(), ids, anchors, self._route_system_ids)
+        except Exception as e:
+            self._emit(f"[sim][WARN] LOD tiers unavailable, simulating all systems at full detail: {e!r}")
+            tiers = LodTiers.all_near(ids)
+        self._lod = tiers
+        self._lod_db_path = path
+        c = tiers.counts()
+        self._emit(f"[sim] LOD tiers near={c['near']} mid={c['mid']} far={c['far']}")
+        return tiers
+
+    def _advance_systems(self, conn, system_ids: List[int], default_dt: float, max_step_s: float) -> Tuple[int, int]:
+        """Coarse LOD step: markets and production caught up over each system's elapsed time."""
+        if not system_ids:
+            return 0, 0
+        if self._use_market_engine:
+            markets = self._step_markets(conn, system_ids)
+        else:
+            markets = self._apply_random_drift_sql(conn, system_ids)
+        active, _ = self._step_facilities(conn, system_ids, default_dt, max_step_s)
+        return markets, active
+
+    def _drain_advance_requests(self) -> List[int]:
+        out = set()
+        while True:
+            try:
+                out.add(self._advance_requests.get_nowait())
+            except queue.Empty:
+                return sorted(out)
+
+    def _apply_random_drift_sql(self, conn, subset: List[int]) -> int:
+        """Legacy SQL-side random nudge for the given systems; returns changed rows."""
+        in_clause = _make_in_clause(subset)
+        # +/- drift (e.g., 0.5%) using DB-side random; clamp >= 1
+        sql = f"""
+            UPDATE markets
+            SET local_market_price = MAX(
+                1,
+                CAST(local_market_price * (1.0 + ((ABS(RANDOM()) % 3) - 1) * ?) AS INTEGER)
+            )
+            WHERE system_id IN {in_clause}
+        """
+        conn.execute(sql, (float(self._market_drift), *subset))
+        conn.commit()
+        return conn.total_changes
+
     def _tick_once(self, target_dt: float) -> None:
         self._frame += 1
         conn = db.get_connection()  # thread-local; safe for this background thread
@@ -330,91 +1039,95 @@ class UniverseSimulator:
 
         visible = self._visible_system_id
         sim_ids = [sid for sid in self._all_system_ids if sid != visible]
-
-        updated_counts: Dict[str, int] = {"markets": 0, "ships": 0}
-
-        # ---- Markets: small drift, subset each frame ----
-        if self._frame % self._market_every_frames == 0 and sim_ids:
-            subset = self._choose_subset(sim_ids, self._market_subset_fraction)
-
-            # If process pool enabled, plan factors off-thread then apply in one commit.
-            if subset and self._use_process_pool and self._pool is not None:
-                # ensure pool exists (lazy)
-                self._ensure_pool()
-
-                # Shard subset ids into roughly-even chunks
-                workers = max(1, self._max_workers)
-                shard_count = min(len(subset), workers * 2)
-                shard_count = max(1, shard_count)
-                shards: List[List[int]] = [[] for _ in range(shard_count)]
-                for idx, sid in enumerate(subset):
-                    shards[idx % shard_count].append(sid)
-
-                futures = []
-                for sh in shards:
-                    if not sh:
-                        continue
-                    futures.append(self._pool.submit(_plan_market_drift_task,
-                                                     (self._frame, tuple(sh), float(self._market_drift))))  # type: ignore[union-attr]
-
-                factors: Dict[int, float] = {}
-                # Gather results (small dicts)
-                for fut in futures:
-                    try:
-                        res = fut.result(timeout=max(0.1, target_dt * 4))
-                        if res:
-                            factors.update(res)
-                    except Exception as e:
-                        self._emit(f"[sim][WARN] pool task failed: {e!r}")
-
-                if factors:
-                    conn.execute("BEGIN IMMEDIATE")
-                    try:
-                        updated_counts["markets"] = self._apply_market_factors(conn, factors)
-                        conn.commit()
-                    except Exception as e:
-                        conn.rollback()
-                        self._emit(f"[sim][ERROR] market apply failed: {e!r}")
-                else:
-                    # nothing planned; skip
-                    pass
-
-            elif subset:
+        tiers = self._lod_tiers(conn)
+        near_ids, mid_ids, far_ids = (
+            [sid for sid in tiers.ids[t] if sid != visible] for t in (TIER_NEAR, TIER_MID, TIER_FAR)
+        )
+        mid_max_s = float(getattr(cfg, "SIM_LOD_MID_MAX_STEP_S", 120.0))
+        far_max_s = float(getattr(cfg, "SIM_LOD_FAR_MAX_STEP_S", 3600.0))
+
+        updated_counts: Dict[str, int] = {"markets": 0, "facilities": 0, "ships": 0, "events": 0}
+
+        # ---- Scheduled events: only what fell due this tick ----
+        events = self._events_for(conn)
+        updated_counts["events"] = events.advance(target_dt)
+
+        # ---- Queried / newly visible systems: catch up in one coarse step ----
+        requested = self._drain_advance_requests()
+        if requested:
+            self._advance_systems(conn, requested, target_dt, far_max_s)
+
+        sched = self._scheduler
+        run_markets = self._frame % self._market_every_frames == 0
+        run_facilities = self._frame % self._facility_every_frames == 0
+        quotas = sched.plan(target_dt, {
+            "markets": len(near_ids) if run_markets else 0,
+            "facilities": len(near_ids) if run_facilities else 0,
+            "ships": self._ship_count,
+            "lod_mid": len(mid_ids),
+            "lod_far": len(far_ids),
+        })
+
+        # ---- Markets (near tier): small drift, round-robin slice each frame ----
+        if quotas["markets"]:
+            subset = sched.take("markets", near_ids, quotas["markets"])
+            c0 = time.thread_time()
+            if self._use_market_engine:
+                updated_counts["markets"] = self._step_markets(conn, subset)
+            else:
                 # Single-threaded SQL-side random nudge (legacy path)
-                in_clause = _make_in_clause(subset)
-                # +/- drift (e.g., 0.5%) using DB-side random; clamp >= 1
-                sql = f"""
-                    UPDATE markets
-                    SET local_market_price = MAX(
-                        1,
-                        CAST(local_market_price * (1.0 + ((ABS(RANDOM()) % 3) - 1) * ?) AS INTEGER)
-                    )
-                    WHERE system_id IN {in_clause}
-                """
-                conn.execute(sql, (float(self._market_drift), *subset))
-                conn.commit()
-                updated_counts["markets"] = conn.total_changes
-
-        # ---- Facilities: (no-op placeholder) ----
-        # For future: plan facility IO deltas in pool workers and apply here.
-
-        # ---- Ship roles: cheap sample read to mimic AI step ----
-        try:
-            ship_roles = conn.execute(
-                "SELECT ship_id, role FROM ship_roles LIMIT ?",
-                (self._ships_sample_limit,),
-            ).fetchall()
-            updated_counts["ships"] = len(ship_roles)
-        except Exception:
-            pass
+                updated_counts["markets"] = self._apply_random_drift_sql(conn, subset)
+            sched.record("markets", len(subset), time.thread_time() - c0)
+
+        flush_frame = self._frame % self._market_flush_every_frames == 0
+        if flush_frame:
+            self._flush_fleet(conn)
+            self._flush_resources(conn)
+        if self._markets is not None:
+            self._record_prices(conn, self._markets, events.now_s, flush_frame)
+        if self._markets is not None and flush_frame:
+            self._update_trade(self._markets)
+            updated_counts["market_rows_written"] = self._flush_markets(conn)
+        if flush_frame:
+            self._flush_events(conn)
+
+        # ---- Facilities (near tier): production from precomputed rate matrices ----
+        if quotas["facilities"]:
+            subset = sched.take("facilities", near_ids, quotas["facilities"])
+            c0 = time.thread_time()
+            updated_counts["facilities"], _ = self._step_facilities(conn, subset, target_dt)
+            sched.record("facilities", len(subset), time.thread_time() - c0)
+
+        # ---- Mid / far tiers: coarse catch-up steps over elapsed time ----
+        for name, ids, max_s in (("lod_mid", mid_ids, mid_max_s), ("lod_far", far_ids, far_max_s)):
+            if quotas[name]:
+                subset = sched.take(name, ids, quotas[name])
+                c0 = time.thread_time()
+                mk, fa = self._advance_systems(conn, subset, target_dt, max_s)
+                updated_counts["markets"] += mk
+                updated_counts["facilities"] += fa
+                sched.record(name, len(subset), time.thread_time() - c0)
+
+        # ---- NPC ships: arrivals/departures that fell due, oldest first ----
+        if quotas["ships"]:
+            c0 = time.thread_time()
+            try:
+                updated_counts["ships"] = self._fleet_for(conn).advance(events.now_s, limit=quotas["ships"])
+            except Exception as e:
+                self._emit(f"[sim][ERROR] NPC fleet step failed: {e!r}")
+            sched.record("ships", max(1, updated_counts["ships"]), time.thread_time() - c0)
 
         # Emit a small debug line each tick (and to tick_debug)
         msg = (f"tick={self._frame} "
                f"visible={visible} "
                f"sim_systems={len(sim_ids)} "
+               f"lod={len(near_ids)}/{len(mid_ids)}/{len(far_ids)} "
                f"markets~={updated_counts['markets']} "
+               f"facilities~={updated_counts['facilities']} "
                f"ships~={updated_counts['ships']} "
-               f"pool={'on' if (self._use_process_pool and self._pool is not None) else 'off'}")
+               f"events={updated_counts['events']}/{events.pending()} "
+               f"pool={'on' if (self._use_process_pool and self._pool is not None) else 'off'} "
+               f"sched[{sched.summary()}]")
         self._emit(msg)
 
     # ---- helpers ----
@@ -465,3 +1178,63 @@ def set_use_process_pool(enabled: bool) -> None:
 
 def set_max_workers(n: int) -> None:
     universe_sim.set_max_workers(n)
+
+def set_tick_budget(fraction: float) -> None:
+    universe_sim.set_tick_budget(fraction)
+
+def set_travel_route(system_ids: Iterable[int]) -> None:
+    universe_sim.set_travel_route(system_ids)
+
+def on_player_arrival(system_id: Optional[int]) -> None:
+    universe_sim.on_player_arrival(system_id)
+
+def request_advance(system_id: int) -> None:
+    universe_sim.request_advance(system_id)
+
+def set_use_market_engine(enabled: bool) -> None:
+    universe_sim.set_use_market_engine(enabled)
+
+def set_market_flush_frames(frames: int) -> None:
+    universe_sim.set_market_flush_frames(frames)
+
+def flush_markets() -> int:
+    return universe_sim.flush_markets()
+
+def flush_all() -> Dict[str, int]:
+    return universe_sim.flush_all()
+
+def schedule_event(kind: str, due_s: Optional[float] = None, *, delay_s: Optional[float] = None,
+                   entity_id: Optional[int] = None, payload: Any = None, interval_s: float = 0.0) -> int:
+    return universe_sim.events().schedule(kind, due_s, delay_s=delay_s, entity_id=entity_id,
+                                          payload=payload, interval_s=interval_s)
+
+def cancel_events(event_ids: Iterable[int]) -> int:
+    return universe_sim.events().cancel_many(event_ids)
+
+def register_event_handler(kind: str, handler: EventHandler) -> None:
+    universe_sim.register_event_handler(kind, handler)
+
+def price_history_for(system_id: int, item_id: int, window_s: float = 86400.0,
+                      max_points: int = price_history.DEFAULT_MAX_POINTS) -> Tuple[int, List[Tuple[int, int, int, int, int]]]:
+    return universe_sim.price_history(system_id, item_id, window_s, max_points)
+
+def best_trade_routes(origin: int, max_jumps: int, cargo: int, **limits: Any) -> List[Any]:
+    return universe_sim.best_trade_routes(origin, max_jumps, cargo, **limits)
+
+def fleet_summary() -> Dict[str, float]:
+    return universe_sim.fleet_summary()
+
+def resource_richness(location_id: int) -> Optional[float]:
+    return universe_sim.resource_richness(location_id)
+
+def extract_resource(location_id: int, amount: float) -> float:
+    return universe_sim.extract_resource(location_id, amount)
+
+def production_balance(top: int = 5) -> Dict[str, Any]:
+    return universe_sim.production_balance(top)
+
+def fast_forward(seconds: float,
+                 progress: Optional[Callable[[float], None]] = None,
+                 cancel: Optional[Callable[[], bool]] = None) -> Dict[str, Any]:
+    """Headless entry point: fast-forward the active save by `seconds` (see UniverseSimulator.fast_forward)."""
+    return universe_sim.fast_forward(seconds, progress, cancel)
@@ -0,0 +1,281 @@
+# /game_controller/sim_pool.py
+
+"""
+Victurus Shared-Memory Simulation Pool
+
+Long-lived worker processes for the market and facility steps:
+- Static universe snapshot (market bands/baselines, facility rate matrices)
+  published once per engine load in multiprocessing.shared_memory blocks
+- Per-tick dynamic state buffers (prices, stocks, facility inventory) that
+  workers update in place; shards are disjoint system rows
+- Workers attach once per snapshot generation and run the same step
+  functions as the sim thread directly on the shared buffers (no pickling of
+  state, no SQLite connections)
+- Results come back as compact array bytes (dirty row / slot indices)
+- Used only with spare cores, and per step kind only while its measured
+  time per row beats the in-process step
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from game_controller.facility_engine import FacilityProduction, step_systems
+from game_controller.market_engine import MarketArrays, step_rows
+
+# Below this many rows per step the IPC round trip costs more than it saves.
+MIN_ROWS_FOR_POOL = 2000
+# With fewer usable cores the workers only compete with the sim thread.
+MIN_CPUS_FOR_POOL = 2
+# EWMA weight of the newest seconds-per-row sample.
+COST_ALPHA = 0.2
+# A step kind whose pool path lost is retried through the pool this often.
+REPROBE_EVERY = 50
+
+_MARKET_STATIC = ("baseline", "present", "price_lo", "price_hi")
+_MARKET_DYNAMIC = ("price", "stock")
+_FACILITY_STATIC = ("in_ptr", "in_slots", "in_rates", "out_ptr", "out_slots", "out_rates", "sys_ptr", "fac_list")
+_FACILITY_DYNAMIC = ("qty",)
+
+
+def _typecode(buf: Any) -> str:
+    return "B" if isinstance(buf, (bytes, bytearray)) else buf.typecode
+
+
+def _byte_view(buf: Any) -> memoryview:
+    return memoryview(buf).cast("B")
+
+
+def usable_cpus() -> int:
+    """Cores this process may run on (affinity-aware where the OS reports it)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+
+# -------- Worker side --------
+
+_worker_gen: Optional[int] = None
+_worker_blocks: List[shared_memory.SharedMemory] = []
+_worker_views: Dict[str, memoryview] = {}
+
+
+def _attach(layout: Dict[str, Any]) -> Dict[str, memoryview]:
+    """Map the snapshot's shared blocks once per generation; returns name -> typed view."""
+    global _worker_gen
+    if _worker_gen == layout["gen"]:
+        return _worker_views
+    for v in _worker_views.values():
+        v.release()
+    _worker_views.clear()
+    for shm in _worker_blocks:
+        try:
+            shm.close()
+        except Exception:
+            pass
+    _worker_blocks.clear()
+    for key, (shm_name, code, count) in layout["blocks"].items():
+        # Pool children share the parent's resource tracker, so attaching here
+        # doesn't add a second owner; the parent alone unlinks the block.
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _worker_blocks.append(shm)
+        _worker_views[key] = shm.buf.cast(code)[:count] if code != "B" else shm.buf[:count]
+    _worker_gen = layout["gen"]
+    return _worker_views
+
+
+def _worker_step_markets(layout: Dict[str, Any], rows_b: bytes, factors_b: bytes) -> Tuple[int, bytes]:
+    v = _attach(layout)
+    rows = array("q")
+    rows.frombytes(rows_b)
+    factors = array("d")
+    factors.frombytes(factors_b)
+    dirty: set = set()
+    touched = step_rows(v["m.price"], v["m.stock"], v["m.baseline"], v["m.present"],
+                        v["m.price_lo"], v["m.price_hi"], layout["n_items"], zip(rows, factors), dirty)
+    return touched, array("q", dirty).tobytes()
+
+
+def _worker_step_facilities(layout: Dict[str, Any], rows_b: bytes, dts_b: bytes) -> Tuple[int, bytes]:
+    v = _attach(layout)
+    rows = array("q")
+    rows.frombytes(rows_b)
+    dts = array("d")
+    dts.frombytes(dts_b)
+    dirty: set = set()
+    active = step_systems(v["f.qty"], v["f.in_ptr"], v["f.in_slots"], v["f.in_rates"],
+                          v["f.out_ptr"], v["f.out_slots"], v["f.out_rates"],
+                          v["f.sys_ptr"], v["f.fac_list"], zip(rows, dts), dirty)
+    return active, array("q", dirty).tobytes()
+
+
+def _worker_ping(_: int) -> int:
+    return 0
+
+
+# -------- Parent side --------
+
+class SimWorkerPool:
+    """
+    Warm process pool plus the shared snapshot of the engines it serves.
+    Owned by the sim thread; bind() republishes the snapshot whenever the
+    engine objects (or their sizes) change.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max(1, int(max_workers))
+        # Start the tracker before the workers fork so they inherit it rather
+        # than each launching their own (which would unlink blocks on worker exit).
+        resource_tracker.ensure_running()
+        self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        self._lock = threading.Lock()
+        self._gen = 0
+        self._blocks: Dict[str, shared_memory.SharedMemory] = {}
+        self._layout: Optional[Dict[str, Any]] = None
+        self._bound: Tuple[Any, ...] = (None, 0, None, 0)
+        # kind -> [pool s/row, in-process s/row] (None until measured)
+        self._cost: Dict[str, List[Optional[float]]] = {}
+        self._declined: Dict[str, int] = {}
+        # Start every worker now so the first tick doesn't pay process spawn.
+        list(self._pool.map(_worker_ping, range(self.max_workers)))
+
+    # ---- snapshot ----
+    def _publish(self, key: str, buf: Any) -> Tuple[str, str, int]:
+        code = _typecode(buf)
+        raw = _byte_view(buf)
+        shm = shared_memory.SharedMemory(create=True, size=max(8, raw.nbytes))
+        shm.buf[:raw.nbytes] = raw
+        self._blocks[key] = shm
+        return (shm.name, code, len(buf))
+
+    def _release_blocks(self) -> None:
+        for shm in self._blocks.values():
+            try:
+                shm.close()
+                shm.unlink()
+            except Exception:
+                pass
+        self._blocks.clear()
+
+    def bind(self, markets: Optional[MarketArrays], facilities: Optional[FacilityProduction]) -> None:
+        """Publish a new snapshot if the engines changed since the last bind."""
+        sig = (markets, len(markets.price) if markets else 0,
+               facilities, len(facilities.qty) if facilities else 0)
+        b = self._bound
+        if (self._layout is not None and b[0] is markets and b[2] is facilities
+                and b[1] == sig[1] and b[3] == sig[3]):
+            return
+        with self._lock:
+            self._release_blocks()
+            self._gen += 1
+            blocks: Dict[str, Tuple[str, str, int]] = {}
+            if markets is not None:
+                for name in _MARKET_STATIC + _MARKET_DYNAMIC:
+                    blocks[f"m.{name}"] = self._publish(f"m.{name}", getattr(markets, name))
+            if facilities is not None:
+                for name in _FACILITY_STATIC + _FACILITY_DYNAMIC:
+                    blocks[f"f.{name}"] = self._publish(f"f.{name}", getattr(facilities, name))
+            self._layout = {
+                "gen": self._gen,
+                "blocks": blocks,
+                "n_items": markets.n_items if markets is not None else 0,
+            }
+            self._bound = sig
+
+    # ---- path choice ----
+    def wants(self, kind: str) -> bool:
+        """
+        Whether the next step of `kind` ("markets", "facilities") should go
+        through the pool: it is tried once, the in-process step is measured
+        next, then the pool is used only while its time per row is lower. A
+        losing kind is re-probed every REPROBE_EVERY steps so a change in load
+        or step size can bring it back.
+        """
+        pool_s, local_s = self._cost.get(kind, (None, None))
+        if pool_s is None:
+            return True
+        if local_s is None:
+            return False
+        if pool_s < local_s:
+            return True
+        n = self._declined.get(kind, 0) + 1
+        self._declined[kind] = 0 if n >= REPROBE_EVERY else n
+        return n >= REPROBE_EVERY
+
+    def record(self, kind: str, pooled: bool, n_rows: int, seconds: float) -> None:
+        """Fold one step's wall time into the per-row cost of the path it took."""
+        if n_rows <= 0:
+            return
+        cost = self._cost.setdefault(kind, [None, None])
+        i = 0 if pooled else 1
+        sample = float(seconds) / n_rows
+        old = cost[i]
+        cost[i] = sample if old is None else old + COST_ALPHA * (sample - old)
+
+    def costs(self) -> Dict[str, Tuple[Optional[float], Optional[float]]]:
+        """kind -> (pool, in-process) seconds per row measured so far."""
+        return {k: (v[0], v[1]) for k, v in self._cost.items()}
+
+    # ---- dispatch ----
+    def _shards(self, n: int) -> List[Tuple[int, int]]:
+        k = min(self.max_workers, max(1, n))
+        step = (n + k - 1) // k
+        return [(i, min(n, i + step)) for i in range(0, n, step)]
+
+    def _run(self, fn, keys: Sequence[str], engine: Any, attrs: Sequence[str],
+             idx: array, vals: array) -> Tuple[int, List[int]]:
+        layout = self._layout
+        assert layout is not None
+        # Per-tick dynamic state: copy in, let workers update in place, copy back.
+        for key, attr in zip(keys, attrs):
+            raw = _byte_view(getattr(engine, attr))
+            self._blocks[key].buf[:raw.nbytes] = raw
+        futures = [
+            self._pool.submit(fn, layout, idx[a:b].tobytes(), vals[a:b].tobytes())
+            for a, b in self._shards(len(idx))
+        ]
+        count = 0
+        dirty: List[int] = []
+        for fut in futures:
+            n, dirty_b = fut.result()
+            count += n
+            d = array("q")
+            d.frombytes(dirty_b)
+            dirty.extend(d)
+        for key, attr in zip(keys, attrs):
+            raw = _byte_view(getattr(engine, attr))
+            raw[:] = self._blocks[key].buf[:raw.nbytes]
+        return count, dirty
+
+    def step_markets(self, markets: MarketArrays, rows: Sequence[Tuple[int, float]]) -> int:
+        """Pool version of step_rows() over markets (bound via bind()); returns cells touched."""
+        idx = array("q", (r for r, _ in rows))
+        vals = array("d", (f for _, f in rows))
+        touched, dirty = self._run(_worker_step_markets, ("m.price", "m.stock"), markets,
+                                   ("price", "stock"), idx, vals)
+        markets.dirty.update(dirty)
+        return touched
+
+    def step_facilities(self, facilities: FacilityProduction, rows: Sequence[Tuple[int, float]]) -> int:
+        """Pool version of step_systems() (bound via bind()); returns facilities that produced."""
+        idx = array("q", (r for r, _ in rows))
+        vals = array("d", (dt for _, dt in rows))
+        active, dirty = self._run(_worker_step_facilities, ("f.qty",), facilities, ("qty",), idx, vals)
+        facilities.dirty.update(dirty)
+        return active
+
+    def close(self) -> None:
+        try:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+        except Exception:
+            pass
+        with self._lock:
+            self._release_blocks()
+            self._layout = None
+            self._bound = (None, 0, None, 0)
@@ -0,0 +1,169 @@
+# /game_controller/sim_scheduler.py
+
+"""
+Victurus Simulation Tick Scheduler
+
+Time-budgeted work planning for the universe simulation thread:
+- Each tick gets a CPU-time budget (a fraction of the tick interval)
+- Budget split across subsystems (markets, facilities, ships, ...) by weight
+- Per-unit costs measured online (EWMA of sim-thread CPU time per system/ship)
+- Work per tick grows/shrinks automatically to fit the budget
+- Round-robin cursors so every unit is visited once per cycle, with a
+  guaranteed minimum share that bounds how long any unit can wait
+"""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+# Starting per-unit cost guess (seconds) before any measurement exists.
+DEFAULT_UNIT_COST_S = 50e-6
+# EWMA weight of the newest cost sample.
+COST_ALPHA = 0.2
+# A subsystem's quota may at most grow by this factor per tick (damps oscillation).
+MAX_GROWTH = 2.0
+
+
+class RoundRobin:
+    """
+    Cursor over a sorted id list. Remembers the last id handed out rather than
+    a position, so ids appearing or disappearing (e.g. the visible system)
+    don't reset or skip the rotation.
+    """
+
+    def __init__(self) -> None:
+        self.last_id: Optional[int] = None
+        self.cycles = 0  # completed passes over the list
+
+    def take(self, ids: Sequence[int], k: int) -> List[int]:
+        n = len(ids)
+        if n == 0 or k <= 0:
+            return []
+        if k >= n:
+            self.cycles += 1
+            return list(ids)
+        start = bisect_right(ids, self.last_id) if self.last_id is not None else 0
+        if start >= n:
+            start = 0
+        end = start + k
+        if end <= n:
+            out = list(ids[start:end])
+        else:
+            out = list(ids[start:]) + list(ids[:end - n])
+        if end >= n:
+            self.cycles += 1
+        self.last_id = out[-1]
+        return out
+
+
+@dataclass
+class SubsystemStats:
+    name: str
+    weight: float = 1.0
+    unit_cost: float = DEFAULT_UNIT_COST_S  # seconds of sim-thread CPU per unit
+    max_cycle_ticks: int = 40               # every unit is visited at least this often
+    last_quota: int = 0
+    last_cpu_s: float = 0.0
+    samples: int = 0
+
+
+class TickScheduler:
+    """
+    Plans how many units (systems, ships, ...) each subsystem may process in
+    the coming tick, then learns from what the tick actually cost.
+
+    Costs are sim-thread CPU time (time.thread_time), not wall time: while the
+    UI thread holds the GIL our wall time stretches but the work per unit
+    doesn't, so quotas (and simulated throughput) stay steady instead of
+    collapsing whenever the UI is busy.
+    """
+
+    def __init__(self, budget_fraction: float = 0.5, max_cycle_ticks: int = 40) -> None:
+        self.budget_fraction = float(budget_fraction)
+        self.max_cycle_ticks = int(max_cycle_ticks)
+        self.stats: Dict[str, SubsystemStats] = {}
+        self._cursors: Dict[str, RoundRobin] = {}
+
+    def register(self, name: str, weight: float = 1.0, max_cycle_ticks: Optional[int] = None) -> None:
+        st = self.stats.get(name)
+        if st is None:
+            st = self.stats[name] = SubsystemStats(name)
+            self._cursors[name] = RoundRobin()
+        st.weight = max(0.0, float(weight))
+        st.max_cycle_ticks = int(max_cycle_ticks or self.max_cycle_ticks)
+
+    # ---- planning ----
+    def plan(self, target_dt: float, sizes: Dict[str, int]) -> Dict[str, int]:
+        """
+        Units each registered subsystem may process this tick, given how many
+        it has in total (sizes). Quotas never drop below the fairness floor
+        ceil(size / max_cycle_ticks), and budget a subsystem can't use (it
+        already covers all its units) is handed to the others.
+        """
+        budget = max(0.0, float(target_dt)) * self.budget_fraction
+        live = [(self.stats[n], int(s)) for n, s in sizes.items() if n in self.stats and s > 0]
+        quotas: Dict[str, int] = {n: 0 for n in sizes}
+        if not live:
+            return quotas
+
+        hungry = [(st, size) for st, size in live if st.weight > 0]
+        remaining = budget
+        # Fairness floors come first and are charged against the budget.
+        for st, size in live:
+            floor = min(size, math.ceil(size / max(1, st.max_cycle_ticks)))
+            quotas[st.name] = floor
+            remaining -= floor * st.unit_cost
+        # Share what's left by weight; repeat while saturated subsystems free budget.
+        while remaining > 0 and hungry:
+            total_w = sum(st.weight for st, _ in hungry)
+            spent = 0.0
+            still: List = []
+            for st, size in hungry:
+                share = remaining * st.weight / total_w
+                extra = int(share / st.unit_cost) if st.unit_cost > 0 else size
+                cap = size
+                if st.last_quota > 0:
+                    cap = min(cap, max(quotas[st.name], int(st.last_quota * MAX_GROWTH)))
+                take = max(0, min(extra, cap - quotas[st.name]))
+                quotas[st.name] += take
+                spent += take * st.unit_cost
+                if quotas[st.name] < cap and take == extra:
+                    still.append((st, size))
+            remaining -= spent
+            if len(still) == len(hungry) or spent <= 0:
+                break
+            hungry = still
+        for st, _ in live:
+            st.last_quota = quotas[st.name]
+        return quotas
+
+    def record(self, name: str, units: int, cpu_s: float) -> None:
+        """Fold one measured step (units processed, CPU seconds spent) into the cost estimate."""
+        st = self.stats.get(name)
+        if st is None or units <= 0:
+            return
+        sample = max(0.0, float(cpu_s)) / units
+        st.unit_cost = sample if st.samples == 0 else st.unit_cost + COST_ALPHA * (sample - st.unit_cost)
+        st.unit_cost = max(st.unit_cost, 1e-7)
+        st.last_cpu_s = float(cpu_s)
+        st.samples += 1
+
+    # ---- rotation ----
+    def take(self, name: str, ids: Sequence[int], k: int) -> List[int]:
+        """Next k ids (sorted ids) for this subsystem in round-robin order."""
+        cur = self._cursors.get(name)
+        if cur is None:
+            cur = self._cursors[name] = RoundRobin()
+        return cur.take(ids, k)
+
+    def cursor(self, name: str) -> RoundRobin:
+        return self._cursors[name]
+
+    def summary(self) -> str:
+        """Compact 'name=quota@us/unit' line for the debug stream."""
+        return " ".join(
+            f"{st.name}={st.last_quota}@{st.unit_cost * 1e6:.0f}us" for st in self.stats.values()
+        )
@@ -282,48 +282,35 @@ def tick_facilities(system_id: int) -> List[InventoryDelta]:
 
 
 # -----------------------------
-# Ships: minimal planning
+# Ships: NPC summary reads
 # -----------------------------
 
 def tick_ships(system_id: int, limit: int = 64) -> List[ShipDelta]:
     """
-    Very lightweight ship planning example. Reads a handful of ships that
-    belong to / are currently in the given system and proposes a no-op or
-    trivial order. Safe default until you design real AI.
-
-    Schema assumptions (best-effort; we try a couple of variants):
-      - ships table exists.
-      - Either ships.system_id, or ships.current_location_id -> locations.system_id
-      - Optional ship_roles table with (ship_id, role)
+    Read-only view of the NPC ships present in the given system, from the
+    npc_ships summary rows written by game_controller/npc_fleet.py (the fleet
+    itself moves on the sim thread). ship_id carries the npc_id, new_order is
+    "docked" or "travel:<next system id>" and new_pos the system's galaxy
+    position.
     """
     conn = _open_readonly_connection()
     try:
-        rows = []
-        # Try common variants, fall back gracefully
-        q_attempts = [
-            ("SELECT ship_id FROM ships WHERE system_id=? LIMIT ?", (system_id, limit)),
-            ("""
-                SELECT s.ship_id
-                FROM ships s
-                JOIN locations l ON l.location_id = s.current_location_id
-                WHERE l.system_id = ?
-                LIMIT ?
-            """, (system_id, limit)),
-        ]
-        for sql, params in q_attempts:
-            try:
-                rows = conn.execute(sql, params).fetchall()
-                if rows:
-                    break
-            except Exception:
-                rows = []
-
+        rows = conn.execute(
+            """
+            SELECT n.npc_id, n.state, n.next_system_id, s.system_x, s.system_y
+            FROM npc_ships n
+            JOIN systems s ON s.system_id = n.system_id
+            WHERE n.system_id = ?
+            ORDER BY n.npc_id
+            LIMIT ?
+            """,
+            (system_id, limit),
+        ).fetchall()
         deltas: List[ShipDelta] = []
-        # Simple placeholder: keep ships idle (no movement), but we could
-        # randomly schedule a local patrol in the future.
         for r in rows:
-            ship_id = int(r["ship_id"])
-            deltas.append(ShipDelta(ship_id=ship_id, new_order=None, new_pos=None))
+            order = f"travel:{int(r['next_system_id'])}" if r["state"] and r["next_system_id"] is not None else "docked"
+            pos = (float(r["system_x"] or 0.0), float(r["system_y"] or 0.0))
+            deltas.append(ShipDelta(ship_id=int(r["npc_id"]), new_order=order, new_pos=pos))
         return deltas
     finally:
         try:
@@ -112,6 +112,15 @@ def main() -> int:
     # Install global error handler
     error_handler = install_error_handler()
     
+    # Stress mode (VICTURUS_STRESS_SYSTEMS): new games seed a synthetic universe.
+    try:
+        from game_controller.config import apply_stress_universe
+        stress_seed = apply_stress_universe()
+        if stress_seed is not None:
+            logging.getLogger('system.startup').info(f"Stress mode: seeding new games from {stress_seed}")
+    except Exception as e:
+        logging.getLogger('system.startup').error(f"Stress mode setup failed: {e}")
+
     # Configure the simulator before the UI spins up.
     _configure_sim()
 
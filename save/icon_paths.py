@@ -134,14 +134,10 @@ def persist_icon_paths_bulk(pairs: List[tuple[int, Optional[str]]]) -> None:
     Paths are normalized the same as `persist_location_icon`.
     """
     normalized = [(loc_id, _to_storable_path(p)) for (loc_id, p) in pairs]
-    # data.db exposes a similar batch helper, but we update via SQL here for
-    # simplicity and to keep this module self-contained.
     if not normalized:
         return
-    conn = db.get_connection()
-    cur = conn.cursor()
-    cur.executemany("UPDATE locations SET icon_path=? WHERE location_id=?", [(p, lid) for (lid, p) in normalized])
-    conn.commit()
+    # Go through data.db so the universe cache sees the new paths.
+    db.set_icon_paths_bulk(normalized)
 
 def _inventory_assets() -> Dict[str, List[Path]]:
     inv: Dict[str, List[Path]] = {}
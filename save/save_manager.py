@@ -47,6 +47,8 @@ import traceback
 from .serializers import write_meta, read_meta
 from .models import SaveMetadata
 from save.icon_paths import bake_icon_paths
+from save import template_db
+from game import galaxy_index
 
 _UI_STATE_PROVIDER: Optional[Callable[[], Dict[str, Any]]] = None
 
@@ -566,16 +568,29 @@ class SaveManager:
         dest.mkdir(parents=True)
 
         db_path = dest / "game.db"
+        # Clone the prebuilt universe; fall back to seeding in place if the
+        # template can't be built or copied.
+        seeded = False
+        try:
+            template_db.clone_template(db_path)
+            seeded = True
+        except Exception as e:
+            logger.warning(f"New-game template unavailable, seeding in place: {e}")
+            for p in (db_path, db_path.with_name(db_path.name + "-journal")):
+                if p.exists():
+                    p.unlink()
+
         conn = sqlite3.connect(db_path, detect_types=sqlite3.PARSE_DECLTYPES)
         try:
             conn.row_factory = sqlite3.Row
             _apply_pragmas(conn)
 
-            schema_path = Path(__file__).resolve().parents[1] / "data" / "schema.sql"
-            with open(schema_path, "r", encoding="utf-8") as f:
-                conn.executescript(f.read())
+            if not seeded:
+                schema_path = Path(__file__).resolve().parents[1] / "data" / "schema.sql"
+                with open(schema_path, "r", encoding="utf-8") as f:
+                    conn.executescript(f.read())
 
-            seed_module.seed(conn)
+                seed_module.seed(conn)
             # Populate icon_path values for systems and locations using available assets.
             try:
                 bake_icon_paths(conn, only_missing=True)
@@ -638,6 +653,7 @@ class SaveManager:
 
         cls.set_active_save(dest)
         db.get_connection()
+        cls._build_galaxy_index()
         # If the global UI state file doesn't exist yet, create it now from
         # the installed UI state provider (if present). We intentionally
         # create/update the global Config/ui_state.json so UI state is kept
@@ -985,13 +1001,54 @@ class SaveManager:
             pass
 
     @classmethod
-    def load_save(cls, save_dir: Path) -> None:
+    def _build_galaxy_index(cls) -> None:
+        """Load or (re)build the persisted galaxy spatial index for the active save."""
+        try:
+            galaxy_index.build_for_active_save()
+        except Exception as e:
+            # Non-fatal: queries fall back to a lazy build on first use
+            logger.warning(f"Galaxy index build failed: {e}")
+
+    @classmethod
+    def offline_seconds(cls, save_dir: Path) -> float:
+        """Wall-clock seconds since the save was last played (0 if unknown)."""
+        meta = read_meta(Path(save_dir) / "meta.json")
+        if not meta or not meta.last_played_iso:
+            return 0.0
+        try:
+            last = datetime.fromisoformat(meta.last_played_iso)
+        except ValueError:
+            return 0.0
+        return max(0.0, (datetime.utcnow() - last).total_seconds())
+
+    @classmethod
+    def _fast_forward_sim(cls, seconds: float,
+                          progress: Optional[Callable[[float], None]],
+                          cancel: Optional[Callable[[], bool]]) -> None:
+        try:
+            from game_controller.sim_loop import fast_forward
+            fast_forward(seconds, progress, cancel)
+        except Exception as e:
+            logger.warning(f"Fast-forward after load failed: {e}")
+
+    @classmethod
+    def load_save(cls, save_dir: Path, fast_forward_s: float = 0.0,
+                  progress: Optional[Callable[[float], None]] = None,
+                  cancel: Optional[Callable[[], bool]] = None) -> None:
+        """
+        Make save_dir the active save. With fast_forward_s > 0 the universe is
+        advanced that many game seconds before returning (e.g. offline_seconds()
+        for catch-up); progress/cancel are passed through for a loading dialog.
+        """
         db.close_active_connection()
         db_path = save_dir / "game.db"
         if not db_path.exists():
             raise FileNotFoundError(f"Save database not found: {db_path}")
         cls.set_active_save(save_dir)
         db.get_connection()
+        cls._build_galaxy_index()
+        if fast_forward_s and fast_forward_s > 0:
+            cls._fast_forward_sim(fast_forward_s, progress, cancel)
         
         # Update last played timestamp when loading a save
         meta_path = save_dir / "meta.json"
@@ -1013,10 +1070,21 @@ class SaveManager:
         except Exception:
             pass
 
+    @classmethod
+    def _flush_sim(cls) -> None:
+        """Write all of the simulator's in-memory state (markets, facilities, events, history, fleet, resources) into the save DB."""
+        try:
+            from game_controller.sim_loop import flush_all
+            flush_all()
+        except Exception as e:
+            logger.warning(f"Sim flush before save failed: {e}")
+
     @classmethod
     def save_current(cls) -> None:
         if not cls._active_save_dir:
             return
+        db.flush_player_state()
+        cls._flush_sim()
         conn = db.get_connection()
         meta_path = cls._active_save_dir / "meta.json"
         meta = read_meta(meta_path)
@@ -1033,6 +1101,8 @@ class SaveManager:
         dest = save_folder_for(new_save_name)
         if dest.exists():
             raise FileExistsError(f"Destination save folder '{dest.name}' already exists.")
+        db.flush_player_state()
+        cls._flush_sim()
         shutil.copytree(cls._active_save_dir, dest)
         cls.set_active_save(dest)
         meta_path = dest / "meta.json"
@@ -0,0 +1,115 @@
+# /save/template_db.py
+
+"""
+Victurus New-Game Template Database
+
+Build-once, clone-many universe database for new saves:
+- Template holds schema + migrations + seeded universe, built once per input set
+- Cached under data/cache/, keyed by a hash of the seed JSON, schema.sql,
+  seed.py and the migration version; rebuilt automatically when any changes
+- New saves clone the template with the SQLite online backup API instead of
+  re-parsing the seed JSON
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from data import migrations
+from data import seed as seed_module
+from game_controller.log_config import get_system_logger
+
+logger = get_system_logger('template_db')
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+CACHE_DIR = DATA_DIR / "cache"
+TEMPLATE_PREFIX = "new_game_template_"
+
+_lock = threading.Lock()
+
+
+def template_inputs() -> List[Path]:
+    """Files whose contents determine the template universe."""
+    inputs = [migrations.SCHEMA_PATH, Path(seed_module.__file__).resolve()]
+    inputs.extend(p for p in seed_module.seed_paths() if p.exists())
+    return inputs
+
+
+def template_fingerprint(inputs: Optional[Iterable[Path]] = None) -> str:
+    """sha1 over the input files (name + bytes) and the schema migration version."""
+    h = hashlib.sha1()
+    h.update(f"schema_version={migrations.SCHEMA_VERSION}\n".encode("ascii"))
+    for p in (template_inputs() if inputs is None else inputs):
+        p = Path(p)
+        h.update(p.name.encode("utf-8") + b"\0")
+        h.update(p.read_bytes())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def template_path_for(fingerprint: str, cache_dir: Optional[Path] = None) -> Path:
+    return (cache_dir or CACHE_DIR) / f"{TEMPLATE_PREFIX}{fingerprint[:16]}.db"
+
+
+def _build_template(dest: Path) -> None:
+    """Build the template into a temp file next to dest, then atomically move it in place."""
+    tmp = dest.with_suffix(f".tmp{os.getpid()}")
+    if tmp.exists():
+        tmp.unlink()
+    conn = sqlite3.connect(tmp)
+    try:
+        # Rollback journal keeps the template a single self-contained file.
+        conn.execute("PRAGMA journal_mode=DELETE;")
+        conn.execute("PRAGMA foreign_keys=ON;")
+        migrations.migrate(conn)
+        seed_module.seed(conn)
+        conn.commit()
+        conn.execute("VACUUM;")
+    finally:
+        conn.close()
+    os.replace(tmp, dest)
+
+
+def _prune_stale(cache_dir: Path, keep: Path) -> None:
+    for p in cache_dir.glob(f"{TEMPLATE_PREFIX}*.db"):
+        if p != keep:
+            try:
+                p.unlink()
+            except Exception:
+                pass
+
+
+def ensure_template(cache_dir: Optional[Path] = None, inputs: Optional[Iterable[Path]] = None) -> Path:
+    """Return the template for the current inputs, building it first if missing or stale."""
+    cache_dir = cache_dir or CACHE_DIR
+    fp = template_fingerprint(inputs)
+    path = template_path_for(fp, cache_dir)
+    if path.exists():
+        return path
+    with _lock:
+        if path.exists():
+            return path
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        logger.info(f"Building new-game template {path.name}")
+        _build_template(path)
+        _prune_stale(cache_dir, path)
+    return path
+
+
+def clone_template(dest: Path, cache_dir: Optional[Path] = None) -> None:
+    """Copy the current template into dest (a new, not-yet-open database file)."""
+    src_path = ensure_template(cache_dir)
+    src = sqlite3.connect(f"file:{src_path.as_posix()}?mode=ro", uri=True)
+    try:
+        dst = sqlite3.connect(dest)
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+    finally:
+        src.close()
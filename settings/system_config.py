@@ -177,6 +177,10 @@ TRAVEL_CRUISE_MS_PER_AU = 3000  # Increased from 500ms to 3000ms per AU for bett
 TRAVEL_WARP_MS_PER_LY = 500
 TRAVEL_DRIP_STEP_MS = 10
 
+# How long per-tick fuel/hull/energy changes may stay in memory before they are
+# written to the save DB (ms). Travel phase boundaries and saves always flush.
+TRAVEL_PLAYER_FLUSH_MS = 1000
+
 # Fuel model weights used by TravelFlow planning
 TRAVEL_WRAP_FUEL_WEIGHT = 2.00
 TRAVEL_CRUISE_FUEL_WEIGHT = 1.00
@@ -185,3 +189,80 @@ TRAVEL_CRUISE_FUEL_WEIGHT = 1.00
 TRAVEL_FUEL_PER_AU = 1.0 / 5.0
 TRAVEL_WARP_FUEL_PER_LY = 2.0
 TRAVEL_WARP_FUEL_WEIGHT = 1.40
+
+# ---------------------------------------------------------------------------
+# Simulation level of detail
+# ---------------------------------------------------------------------------
+# Off-screen systems within NEAR ly of the player (or the visible system), or
+# within ROUTE ly of any system on the current travel route, are simulated
+# every tick. Systems within MID ly get coarse steps and are revisited at
+# least every MID_CYCLE ticks; all others are advanced in large closed-form
+# steps at least every FAR_CYCLE ticks (and whenever they become visible).
+SIM_LOD_NEAR_LY = 60.0
+SIM_LOD_MID_LY = 150.0
+SIM_LOD_ROUTE_LY = 30.0
+SIM_LOD_MID_CYCLE_TICKS = 10
+SIM_LOD_FAR_CYCLE_TICKS = 200
+# Longest production interval (s) integrated in one coarse step.
+SIM_LOD_MID_MAX_STEP_S = 120.0
+SIM_LOD_FAR_MAX_STEP_S = 3600.0
+# Fast-forward (save load catch-up / headless) advances the whole universe in
+# steps of this many game seconds; progress and cancel are checked per step.
+SIM_FAST_FORWARD_STEP_S = 600.0
+
+# ---------------------------------------------------------------------------
+# Simulation events
+# ---------------------------------------------------------------------------
+# Scheduled sim events (game_controller/sim_events.py) are bucketed into a
+# timing wheel with this resolution (game seconds); an event fires on the
+# first tick at or after its bucket. Pending changes are written back to the
+# save together with the market flush.
+SIM_EVENT_RESOLUTION_S = 1.0
+
+# ---------------------------------------------------------------------------
+# Price history
+# ---------------------------------------------------------------------------
+# Market prices are sampled every SAMPLE_S game seconds into per-market ring
+# buffers of RING_SAMPLES entries (only changes are stored), then rolled up
+# into 1 min / 1 h / 1 day buckets in price_rollups every FLUSH_SAMPLES
+# samples. Buckets older than KEEP_*_S are pruned (0 keeps them forever).
+PRICE_HISTORY_SAMPLE_S = 60.0
+PRICE_HISTORY_RING_SAMPLES = 64
+PRICE_HISTORY_FLUSH_SAMPLES = 10
+PRICE_HISTORY_KEEP_MINUTES_S = 2 * 86400
+PRICE_HISTORY_KEEP_HOURS_S = 90 * 86400
+PRICE_HISTORY_KEEP_DAYS_S = 0
+
+# ---------------------------------------------------------------------------
+# NPC fleet
+# ---------------------------------------------------------------------------
+# NPC ships (game_controller/npc_fleet.py) are spawned PER_SYSTEM per
+# gate-connected system in a save without any. They dock for DOCK_S game
+# seconds, then make a trip of MIN..MAX gate jumps at WARP_S_PER_LY game
+# seconds per light year of each link.
+NPC_SHIPS_PER_SYSTEM = 2.0
+NPC_DOCK_S = 300.0
+NPC_WARP_S_PER_LY = 2.0
+NPC_TRIP_MIN_JUMPS = 1
+NPC_TRIP_MAX_JUMPS = 4
+
+# ---------------------------------------------------------------------------
+# Resource nodes
+# ---------------------------------------------------------------------------
+# Resource locations (game_controller/resource_engine.py) regain regen_rate
+# richness per REGEN_PERIOD_S game seconds up to the richness they started
+# with. Mines at a node draw DEPLETION_PER_UNIT richness per unit produced and
+# stop yielding once it is exhausted.
+RESOURCE_REGEN_PERIOD_S = 60.0
+RESOURCE_DEPLETION_PER_UNIT = 0.001
+
+# ---------------------------------------------------------------------------
+# Database profiling (debug)
+# ---------------------------------------------------------------------------
+# Time every SQL statement per thread/caller (data/db.py SQL profiler). Adds
+# per-query overhead; leave off outside profiling sessions.
+DB_PROFILE_ENABLED = False
+# Statements slower than this (ms) log their EXPLAIN QUERY PLAN once.
+DB_PROFILE_SLOW_MS = 50.0
+# Seconds between profile summaries written to the system.database logger.
+DB_PROFILE_REPORT_S = 30.0
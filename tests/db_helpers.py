@@ -0,0 +1,46 @@
+# /tests/db_helpers.py
+
+"""
+Shared database helpers for the test files: build a freshly seeded game.db in
+a temp folder and switch the active connection to it.
+"""
+
+import sqlite3
+from pathlib import Path
+
+from data import db
+from data import seed as seed_module
+
+# Market row for every item in the first three systems
+MARKET_ROWS_SQL = """
+    INSERT OR REPLACE INTO markets(system_id, item_id, local_market_price, local_market_stock)
+    SELECT s.system_id, i.item_id, i.item_base_price, 500
+    FROM (SELECT system_id FROM systems ORDER BY system_id LIMIT 3) s, items i
+"""
+
+
+def make_seeded_db(folder: Path, *setup_sql: str) -> Path:
+    """Create a freshly seeded game.db inside folder, run setup_sql and return its path."""
+    folder.mkdir(parents=True, exist_ok=True)
+    path = folder / "game.db"
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript(db.SCHEMA_PATH.read_text(encoding="utf-8"))
+        seed_module.seed(conn)
+        for sql in setup_sql:
+            conn.execute(sql)
+        conn.commit()
+    finally:
+        conn.close()
+    return path
+
+
+def make_market_db(folder: Path) -> Path:
+    """Seeded game.db with a market row for every item in the first three systems."""
+    return make_seeded_db(folder, MARKET_ROWS_SQL)
+
+
+def activate(path: Path) -> None:
+    """Close this thread's connection and point the db layer at path."""
+    db.close_active_connection()
+    db.set_active_db_path(path)
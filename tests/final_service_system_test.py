@@ -5,6 +5,7 @@ Final comprehensive test of the service facility system
 """
 
 import sys
+import tempfile
 from pathlib import Path
 
 # Add project root to path
@@ -12,11 +13,20 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from data import db
+from tests.db_helpers import activate, make_seeded_db
 
 def test_service_system_comprehensive():
     """Comprehensive test of the service system."""
     print("=== COMPREHENSIVE SERVICE SYSTEM TEST ===")
-    
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        activate(make_seeded_db(Path(tmp)))
+        try:
+            _check_service_system()
+        finally:
+            activate(previous)
+
+def _check_service_system():
     # Test 1: Check service facility distribution
     print("\n1. SERVICE FACILITY DISTRIBUTION:")
     conn = db.get_connection()
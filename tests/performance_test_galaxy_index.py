@@ -0,0 +1,66 @@
+# /tests/performance_test_galaxy_index.py
+
+"""
+Benchmark for game/galaxy_index.py: build time and per-query latency of
+range and k-nearest queries against a brute-force scan, on synthetic
+galaxies of 2,000, 20,000 and 100,000 systems.
+
+Run directly: python tests/performance_test_galaxy_index.py
+"""
+
+import sys
+import math
+import random
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from game.galaxy_index import GalaxyIndex
+
+SIZES = (2_000, 20_000, 100_000)
+QUERIES = 500
+RADIUS_LY = 25.0
+K = 10
+
+
+def _bench_size(n: int) -> dict:
+    rng = random.Random(n)
+    span = math.sqrt(n) * 15.0  # ~ same density as the shipped seed
+    ids = list(range(1, n + 1))
+    xs = [rng.uniform(0.0, span) for _ in ids]
+    ys = [rng.uniform(0.0, span) for _ in ids]
+
+    t0 = time.perf_counter()
+    idx = GalaxyIndex.build(ids, xs, ys)
+    t_build = time.perf_counter() - t0
+
+    origins = [rng.choice(ids) for _ in range(QUERIES)]
+    t0 = time.perf_counter()
+    for o in origins:
+        idx.within(o, RADIUS_LY)
+    t_within = (time.perf_counter() - t0) / QUERIES
+
+    t0 = time.perf_counter()
+    for o in origins:
+        idx.nearest(o, K)
+    t_knn = (time.perf_counter() - t0) / QUERIES
+
+    t0 = time.perf_counter()
+    for o in origins[:20]:
+        ox, oy = xs[o - 1], ys[o - 1]
+        [i for i in range(n) if (xs[i] - ox) ** 2 + (ys[i] - oy) ** 2 <= RADIUS_LY * RADIUS_LY]
+    t_scan = (time.perf_counter() - t0) / 20
+
+    return {"systems": n, "build_s": t_build, "within_ms": t_within * 1000,
+            "nearest_ms": t_knn * 1000, "scan_ms": t_scan * 1000}
+
+
+if __name__ == "__main__":
+    for n in SIZES:
+        r = _bench_size(n)
+        print(f"{r['systems']:>7} systems: build {r['build_s'] * 1000:7.1f} ms | within {r['within_ms']:.3f} ms | "
+              f"k-nearest {r['nearest_ms']:.3f} ms | brute scan {r['scan_ms']:.2f} ms")
+    print("✅ All tests passed")
@@ -0,0 +1,125 @@
+# /tests/performance_test_market_engine.py
+
+"""
+Benchmark for game_controller/market_engine.py against the simulator's SQL
+market paths on synthetic universes of 200, 5,000 and 50,000 systems with 12
+items each. Every tick drifts 25% of the systems:
+  - SQL RANDOM():   legacy UPDATE ... WHERE system_id IN (...)
+  - SQL CASE WHEN:  _apply_market_factors with per-system factors
+  - Engine:         in-memory step + executemany flush every FLUSH_EVERY ticks
+
+"ms/tick" is total sim-thread time. For the engine, "flush" is the amortized
+write-back share; the SQL paths write on every tick.
+
+Run directly: python tests/performance_test_market_engine.py
+"""
+
+import sys
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from game_controller.market_engine import MarketArrays
+from game_controller.sim_loop import UniverseSimulator
+from game_controller.sim_tasks import _system_factor
+
+SIZES = (200, 5_000, 50_000)
+ITEMS = 12
+TICKS = 40
+FLUSH_EVERY = 20
+SUBSET_FRACTION = 0.25
+DRIFT = 0.005
+
+
+def _synthetic_db(path: Path, n: int) -> None:
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        PRAGMA journal_mode = WAL;
+        PRAGMA synchronous = NORMAL;
+        CREATE TABLE systems (system_id INTEGER PRIMARY KEY, system_name TEXT);
+        CREATE TABLE items (item_id INTEGER PRIMARY KEY, item_base_price INTEGER NOT NULL);
+        CREATE TABLE markets (
+            system_id INTEGER NOT NULL, item_id INTEGER NOT NULL,
+            local_market_price INTEGER NOT NULL, local_market_stock INTEGER NOT NULL,
+            local_market_baseline INTEGER,
+            PRIMARY KEY (system_id, item_id)
+        );
+        CREATE INDEX idx_markets_system ON markets(system_id);
+    """)
+    rng = random.Random(n)
+    conn.executemany("INSERT INTO systems VALUES (?, ?)", ((s, f"S{s}") for s in range(1, n + 1)))
+    conn.executemany("INSERT INTO items VALUES (?, ?)", ((i, 50 * i) for i in range(1, ITEMS + 1)))
+    conn.executemany(
+        "INSERT INTO markets VALUES (?, ?, ?, ?, ?)",
+        ((s, i, 50 * i + rng.randint(-10, 10), stock, stock)
+         for s in range(1, n + 1) for i in range(1, ITEMS + 1) for stock in (rng.randint(100, 1000),)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def _subsets(n: int):
+    rng = random.Random(n * 31)
+    ids = list(range(1, n + 1))
+    k = max(1, int(n * SUBSET_FRACTION))
+    return [rng.sample(ids, k) for _ in range(TICKS)]
+
+
+def _bench_sql_random(conn, sim, subsets) -> float:
+    t0 = time.perf_counter()
+    for subset in subsets:
+        sim._apply_random_drift_sql(conn, subset)
+    return (time.perf_counter() - t0) / len(subsets)
+
+
+def _bench_sql_case(conn, sim, subsets) -> float:
+    t0 = time.perf_counter()
+    for frame, subset in enumerate(subsets, 1):
+        factors = {sid: _system_factor(sid, frame, DRIFT) for sid in subset}
+        conn.execute("BEGIN IMMEDIATE")
+        sim._apply_market_factors(conn, factors)
+        conn.commit()
+    return (time.perf_counter() - t0) / len(subsets)
+
+
+def _bench_engine(conn, path, subsets):
+    t0 = time.perf_counter()
+    engine = MarketArrays.from_connection(conn, path)
+    t_load = time.perf_counter() - t0
+    t_db = 0.0
+    t0 = time.perf_counter()
+    for frame, subset in enumerate(subsets, 1):
+        engine.step(subset, frame, DRIFT)
+        if frame % FLUSH_EVERY == 0:
+            t1 = time.perf_counter()
+            engine.flush(conn)
+            t_db += time.perf_counter() - t1
+    n = len(subsets)
+    return t_load, (time.perf_counter() - t0) / n, t_db / n, engine.cells_written
+
+
+if __name__ == "__main__":
+    sim = UniverseSimulator()
+    for n in SIZES:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "markets.db"
+            _synthetic_db(path, n)
+            conn = sqlite3.connect(path)
+            subsets = _subsets(n)
+            t_rand = _bench_sql_random(conn, sim, subsets)
+            t_case = _bench_sql_case(conn, sim, subsets)
+            t_load, t_eng, t_flush, written = _bench_engine(conn, path, subsets)
+            conn.close()
+        print(f"{n:>6} systems x {ITEMS} items, {TICKS} ticks @ {int(SUBSET_FRACTION * 100)}% per tick")
+        print(f"    SQL RANDOM()  : {t_rand * 1000:9.2f} ms/tick")
+        print(f"    SQL CASE WHEN : {t_case * 1000:9.2f} ms/tick")
+        print(f"    Engine        : {t_eng * 1000:9.2f} ms/tick "
+              f"(flush {t_flush * 1000:.2f}, load {t_load * 1000:.1f} ms, {written} cells written) | "
+              f"x{t_rand / max(t_eng, 1e-9):.1f} vs RANDOM, x{t_case / max(t_eng, 1e-9):.1f} vs CASE")
+    print("✅ All tests passed")
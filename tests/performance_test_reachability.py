@@ -0,0 +1,113 @@
+# /tests/performance_test_reachability.py
+
+"""
+Benchmark for game.travel.compute_reachability() against the per-target
+get_travel_display_data() loop the galaxy list used to run, on synthetic
+universes of 200, 2,000 and 20,000 systems.
+
+Run directly: python tests/performance_test_reachability.py
+"""
+
+import sys
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data import db
+from game import travel
+from game_controller.log_config import get_system_logger
+
+logger = get_system_logger('performance_test_reachability')
+
+SIZES = (200, 2_000, 20_000)
+
+
+def _make_synthetic_db(folder: Path, n_systems: int, rng: random.Random) -> Path:
+    """Build a game.db with n_systems systems, each holding a star, a warp gate and a planet."""
+    path = folder / f"game_{n_systems}.db"
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript(db.SCHEMA_PATH.read_text(encoding="utf-8"))
+        conn.execute(
+            "INSERT INTO ships (ship_id, ship_name, base_ship_cargo, base_ship_fuel, base_ship_jump_distance, "
+            "base_ship_shield, base_ship_hull, base_ship_energy) VALUES (1, 'Bench', 100, 200, 25.0, 100, 100, 100)"
+        )
+        span = int((n_systems ** 0.5) * 15)
+        conn.executemany(
+            "INSERT INTO systems (system_id, system_name, system_x, system_y) VALUES (?, ?, ?, ?)",
+            ((sid, f"S{sid}", rng.randint(0, span), rng.randint(0, span)) for sid in range(1, n_systems + 1)),
+        )
+        rows = []
+        for sid in range(1, n_systems + 1):
+            base = (sid - 1) * 3
+            rows.append((base + 1, sid, f"S{sid} Star", "star", 0.0, 0.0))
+            rows.append((base + 2, sid, f"S{sid} Gate", "warp_gate", rng.uniform(-80, 80), rng.uniform(-80, 80)))
+            rows.append((base + 3, sid, f"S{sid} I", "planet", rng.uniform(-60, 60), rng.uniform(-60, 60)))
+        conn.executemany(
+            "INSERT INTO locations (location_id, system_id, location_name, location_type, location_x, location_y) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        conn.execute(
+            "INSERT INTO player (id, name, current_wallet_credits, current_player_system_id, current_player_ship_id, "
+            "current_player_ship_fuel, current_player_ship_hull, current_player_ship_shield, "
+            "current_player_ship_energy, current_player_ship_cargo, current_player_location_id) "
+            "VALUES (1, 'Bench', 0, 1, 1, 120, 100, 100, 100, 0, 3)"
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    return path
+
+
+def _bench_size(folder: Path, n_systems: int) -> dict:
+    db.close_active_connection()
+    db.set_active_db_path(_make_synthetic_db(folder, n_systems, random.Random(n_systems)))
+    targets = [("star", sid) for sid in range(1, n_systems + 1)]
+
+    # Warm the universe cache so both paths measure the reachability work only
+    db.get_system(1)
+    db.get_location(1)
+    db.get_warp_gate(1)
+
+    t0 = time.perf_counter()
+    per_target = [travel.get_travel_display_data(k, i) for k, i in targets]
+    t_loop = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    bulk = travel.compute_reachability(targets)
+    t_bulk = time.perf_counter() - t0
+
+    assert bulk == per_target
+    return {"systems": n_systems, "per_target_s": t_loop, "bulk_s": t_bulk, "speedup": t_loop / max(t_bulk, 1e-9)}
+
+
+def run_benchmark(sizes=SIZES) -> list:
+    previous = db.get_active_db_path()
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for n in sizes:
+                res = _bench_size(Path(tmp), n)
+                logger.info(
+                    f"reachability {res['systems']:>6} systems: per-target {res['per_target_s'] * 1000:.1f} ms, "
+                    f"bulk {res['bulk_s'] * 1000:.1f} ms, speedup x{res['speedup']:.1f}"
+                )
+                results.append(res)
+            db.close_active_connection()
+    finally:
+        db.set_active_db_path(previous)
+    return results
+
+
+if __name__ == "__main__":
+    for res in run_benchmark():
+        print(f"{res['systems']:>6} systems: per-target {res['per_target_s'] * 1000:9.1f} ms | "
+              f"bulk {res['bulk_s'] * 1000:8.1f} ms | x{res['speedup']:.1f}")
+    print("✅ All tests passed")
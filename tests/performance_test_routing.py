@@ -0,0 +1,65 @@
+# /tests/performance_test_routing.py
+
+"""
+Benchmark for game/routing.py on synthetic gate networks of 10,000 and
+50,000 systems (each system linked to its 4 nearest neighbours): A* vs the
+same search without a heuristic (Dijkstra), per metric.
+
+Run directly: python tests/performance_test_routing.py
+"""
+
+import sys
+import math
+import random
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from game.galaxy_index import GalaxyIndex
+from game.routing import GateNetwork
+
+SIZES = (10_000, 50_000)
+QUERIES = 40
+LINKS_PER_SYSTEM = 4
+
+
+def _synthetic_network(n: int, rng: random.Random):
+    span = math.sqrt(n) * 15.0
+    ids = list(range(1, n + 1))
+    xs = [rng.uniform(0.0, span) for _ in ids]
+    ys = [rng.uniform(0.0, span) for _ in ids]
+    idx = GalaxyIndex.build(ids, xs, ys)
+    edges = []
+    for sid in ids:
+        for nb, d in idx.nearest(sid, LINKS_PER_SYSTEM):
+            if sid < nb:
+                edges.append((sid, nb, round(d, 3)))
+    coords = {sid: (xs[sid - 1], ys[sid - 1]) for sid in ids}
+    return edges, coords
+
+
+def _time_queries(net: GateNetwork, pairs, metric: str) -> float:
+    t0 = time.perf_counter()
+    for a, b in pairs:
+        net.find_route(a, b, metric)
+    return (time.perf_counter() - t0) / len(pairs)
+
+
+if __name__ == "__main__":
+    for n in SIZES:
+        rng = random.Random(n)
+        t0 = time.perf_counter()
+        edges, coords = _synthetic_network(n, rng)
+        astar = GateNetwork(edges, coords)
+        dijkstra = GateNetwork(edges, {})  # no coordinates -> zero heuristic
+        t_build = time.perf_counter() - t0
+        pairs = [(rng.randint(1, n), rng.randint(1, n)) for _ in range(QUERIES)]
+        print(f"{n:>6} systems, {len(edges)} links (built in {t_build:.2f} s)")
+        for metric in ("distance", "jumps"):
+            t_a = _time_queries(astar, pairs, metric)
+            t_d = _time_queries(dijkstra, pairs, metric)
+            print(f"    {metric:<8}: A* {t_a * 1000:8.2f} ms | Dijkstra {t_d * 1000:8.2f} ms | x{t_d / max(t_a, 1e-9):.1f}")
+    print("✅ All tests passed")
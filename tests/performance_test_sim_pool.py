@@ -0,0 +1,140 @@
+# /tests/performance_test_sim_pool.py
+
+"""
+Benchmark for game_controller/sim_pool.py: one market tick over synthetic
+universes of 5,000 and 50,000 systems with 12 items each, stepping
+SUBSET_FRACTION of the systems per tick:
+  - In-process:  MarketArrays.step on the sim thread
+  - Plan pool:   the previous pool design; workers only plan per-system drift
+                 factors (pickled dict per shard), the sim thread then steps
+  - Shared pool: SimWorkerPool; workers step shared-memory buffers in place
+                 and return dirty row indices
+  - Auto:        the sim's choice, SimWorkerPool.wants()/record() picking the
+                 path with the lower measured time per row each tick
+
+Speedups depend on free cores (usable_cpus() is printed); on a single core
+the shared pool can only add IPC overhead, which is why the simulator never
+starts it there and Auto settles on in-process.
+
+Run directly: python tests/performance_test_sim_pool.py
+"""
+
+import os
+import sys
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Sequence, Tuple
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from game_controller.market_engine import MarketArrays, drift_factor
+from game_controller.sim_pool import SimWorkerPool, usable_cpus
+
+SIZES = (5_000, 50_000)
+ITEMS = 12
+TICKS = 20
+AUTO_TICKS = 60
+SUBSET_FRACTION = 0.25
+DRIFT = 0.005
+WORKERS = max(2, (os.cpu_count() or 2) - 1)
+
+
+def _synthetic_markets(n: int) -> MarketArrays:
+    rng = random.Random(n)
+    m = MarketArrays(list(range(1, n + 1)), list(range(1, ITEMS + 1)), [50.0 * i for i in range(1, ITEMS + 1)])
+    for c in range(n * ITEMS):
+        m.present[c] = 1
+        m.price[c] = 50.0 * (c % ITEMS + 1) + rng.randint(-10, 10)
+        m.baseline[c] = float(rng.randint(100, 1000))
+        m.stock[c] = m.baseline[c] * rng.uniform(0.8, 1.2)
+    return m
+
+
+def _subsets(n: int):
+    rng = random.Random(n * 31)
+    ids = list(range(1, n + 1))
+    k = max(1, int(n * SUBSET_FRACTION))
+    return [rng.sample(ids, k) for _ in range(TICKS)]
+
+
+def _plan_factors(args: Tuple[int, Sequence[int], float]) -> Dict[int, float]:
+    frame, sids, drift = args
+    return {sid: drift_factor(sid, frame, drift) for sid in sids}
+
+
+def _bench_in_process(m: MarketArrays, subsets) -> float:
+    t0 = time.perf_counter()
+    for frame, subset in enumerate(subsets, 1):
+        m.step(subset, frame, DRIFT)
+    return (time.perf_counter() - t0) / len(subsets)
+
+
+def _bench_plan_pool(m: MarketArrays, subsets) -> float:
+    with ProcessPoolExecutor(max_workers=WORKERS) as ex:
+        list(ex.map(abs, range(WORKERS)))  # warm the workers
+        t0 = time.perf_counter()
+        for frame, subset in enumerate(subsets, 1):
+            shards = [subset[i::WORKERS * 2] for i in range(WORKERS * 2)]
+            factors: Dict[int, float] = {}
+            for res in ex.map(_plan_factors, [(frame, tuple(sh), DRIFT) for sh in shards]):
+                factors.update(res)
+            m.step(factors.keys(), frame, DRIFT, factors)
+        return (time.perf_counter() - t0) / len(subsets)
+
+
+def _bench_shared_pool(m: MarketArrays, subsets) -> Tuple[float, float]:
+    pool = SimWorkerPool(WORKERS)
+    try:
+        t0 = time.perf_counter()
+        pool.bind(m, None)
+        t_bind = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for frame, subset in enumerate(subsets, 1):
+            pool.step_markets(m, m.step_rows_for(subset, frame, DRIFT))
+        return t_bind, (time.perf_counter() - t0) / len(subsets)
+    finally:
+        pool.close()
+
+
+def _bench_auto(m: MarketArrays, subsets) -> Tuple[float, int]:
+    """ms/tick of the measured pool/in-process choice, and how many ticks used the pool."""
+    pool = SimWorkerPool(WORKERS)
+    try:
+        pool.bind(m, None)
+        pooled = 0
+        t_all = time.perf_counter()
+        for frame in range(1, AUTO_TICKS + 1):
+            subset = subsets[frame % len(subsets)]
+            rows = m.step_rows_for(subset, frame, DRIFT)
+            use = pool.wants("markets")
+            t0 = time.perf_counter()
+            if use:
+                pool.step_markets(m, rows)
+                pooled += 1
+            else:
+                m.step(subset, frame, DRIFT)
+            pool.record("markets", use, len(rows), time.perf_counter() - t0)
+        return (time.perf_counter() - t_all) / AUTO_TICKS, pooled
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    print(f"cpu_count={os.cpu_count()} usable={usable_cpus()} workers={WORKERS}")
+    for n in SIZES:
+        subsets = _subsets(n)
+        t_local = _bench_in_process(_synthetic_markets(n), subsets)
+        t_plan = _bench_plan_pool(_synthetic_markets(n), subsets)
+        t_bind, t_shared = _bench_shared_pool(_synthetic_markets(n), subsets)
+        t_auto, pooled = _bench_auto(_synthetic_markets(n), subsets)
+        print(f"{n:>6} systems x {ITEMS} items, {TICKS} ticks @ {int(SUBSET_FRACTION * 100)}% per tick")
+        print(f"    In-process   : {t_local * 1000:9.2f} ms/tick")
+        print(f"    Plan pool    : {t_plan * 1000:9.2f} ms/tick")
+        print(f"    Shared pool  : {t_shared * 1000:9.2f} ms/tick (snapshot {t_bind * 1000:.1f} ms) | "
+              f"x{t_local / max(t_shared, 1e-9):.2f} vs in-process, x{t_plan / max(t_shared, 1e-9):.2f} vs plan pool")
+        print(f"    Auto         : {t_auto * 1000:9.2f} ms/tick (pool on {pooled}/{AUTO_TICKS} ticks)")
+    print("✅ All tests passed")
@@ -0,0 +1,100 @@
+# /tests/test_bench_sim.py
+
+"""
+Tests for game_controller/bench_sim.py: synthetic universes are scaled from
+the seed with markets and facilities, --db sources are copied with their WAL,
+rows_written counts every engine flush, and the CLI sweeps its configurations
+into a JSON report without touching the active database.
+"""
+
+import sys
+import json
+import sqlite3
+import tempfile
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data import db
+from game_controller import bench_sim
+
+
+def test_build_synthetic_db_scales_universe():
+    """Extra systems get a location, copied facilities and a market row per item."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = bench_sim.build_synthetic_db(Path(tmp) / "synthetic.db", 260, seed=3)
+        conn = sqlite3.connect(path)
+        try:
+            assert conn.execute("SELECT COUNT(*) FROM systems").fetchone()[0] == 260
+            n_items = conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+            assert conn.execute("SELECT COUNT(*) FROM markets").fetchone()[0] == 260 * n_items
+            extra = conn.execute(
+                "SELECT COUNT(*) FROM facilities f JOIN locations l ON l.location_id = f.location_id "
+                "WHERE l.system_id > 200"
+            ).fetchone()[0]
+            assert extra > 0
+        finally:
+            conn.close()
+
+
+def test_cli_writes_json_report():
+    """Two pool settings x one size give two runs with latency, CPU and row counts."""
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / "bench.json"
+        previous = db.get_active_db_path()
+        rc = bench_sim.main(["--sizes", "220", "--ticks", "4", "--warmup", "1",
+                             "--pool", "off,on", "--workers", "2", "--json", str(out), "--quiet"])
+        assert rc == 0
+        assert db.get_active_db_path() == previous
+        report = json.loads(out.read_text(encoding="utf-8"))
+        runs = report["runs"]
+        assert [r["pool"] for r in runs] == [False, True]
+        for r in runs:
+            assert r["systems"] == 220 and r["ticks"] == 4
+            lm = r["latency_ms"]
+            assert 0 < lm["p50"] <= lm["p99"] <= lm["max"]
+            assert r["rows_written"] > 0 and r["cpu_s"] > 0
+        assert report["meta"]["cpu_count"] is not None
+
+
+def test_copy_db_includes_uncheckpointed_wal():
+    """A WAL-mode source copied while its -wal still holds commits keeps those commits."""
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "src.db"
+        writer = sqlite3.connect(src)
+        try:
+            writer.execute("PRAGMA journal_mode=WAL")
+            writer.execute("PRAGMA wal_autocheckpoint=0")
+            writer.execute("CREATE TABLE t(x)")
+            writer.executemany("INSERT INTO t VALUES (?)", [(i,) for i in range(100)])
+            writer.commit()
+            dest = Path(tmp) / "copy.db"
+            bench_sim.copy_db(src, dest)
+            with sqlite3.connect(dest) as c:
+                assert c.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 100
+        finally:
+            writer.close()
+
+
+def test_rows_written_counts_flushes_on_other_connections():
+    """Rows flushed through flush_all()'s own connections are included in rows_written."""
+    with tempfile.TemporaryDirectory() as tmp:
+        src = bench_sim.build_synthetic_db(Path(tmp) / "synthetic.db", 210, seed=5)
+        work = Path(tmp) / "run" / "game.db"
+        work.parent.mkdir()
+        bench_sim.copy_db(src, work)
+        res = bench_sim.run_config(work, 3, False, 0.5, warmup=0)
+        query = "SELECT system_id, item_id, local_market_price, local_market_stock FROM markets"
+        with sqlite3.connect(src) as a, sqlite3.connect(work) as b:
+            changed = set(b.execute(query).fetchall()) - set(a.execute(query).fetchall())
+        assert changed and res["rows_written"] >= len(changed)
+
+
+if __name__ == "__main__":
+    test_build_synthetic_db_scales_universe()
+    test_cli_writes_json_report()
+    test_copy_db_includes_uncheckpointed_wal()
+    test_rows_written_counts_flushes_on_other_connections()
+    print("✅ All tests passed")
@@ -0,0 +1,265 @@
+# /tests/test_facility_engine.py
+
+"""
+Tests for game_controller/facility_engine.py: production follows the
+facility_inputs/outputs rates, is limited by input stock and storage, buys
+its inputs from the system's market (importing what the system has no market
+for), sells its outputs so the sim keeps producing past full storage, steps
+on the sim clock, and changed inventory is written to facility_inventory in
+one batch (including from the simulator tick).
+"""
+
+import sys
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data import db
+from game_controller import facility_engine
+from game_controller.facility_engine import FacilityProduction
+from game_controller.market_engine import MarketArrays
+from game_controller.sim_loop import UniverseSimulator
+from tests.db_helpers import activate, make_seeded_db
+
+
+def _two_facility_db(folder: Path) -> Path:
+    """Seeded DB reduced to two facilities: 1 mines item 1, 2 refines 2x item 1 into item 2."""
+    path = make_seeded_db(folder)
+    conn = sqlite3.connect(path)
+    try:
+        loc = conn.execute("SELECT location_id, system_id FROM locations ORDER BY location_id LIMIT 1").fetchone()
+        conn.execute("DELETE FROM facility_inputs")
+        conn.execute("DELETE FROM facility_outputs")
+        conn.execute("DELETE FROM facilities")
+        conn.executemany("INSERT INTO facilities(facility_id, location_id, facility_type) VALUES (?, ?, ?)",
+                         [(1, loc[0], "Mine"), (2, loc[0], "Refinery")])
+        conn.execute("INSERT INTO facility_outputs VALUES (1, 1, 4.0)")
+        conn.execute("INSERT INTO facility_inputs VALUES (2, 1, 2.0)")
+        conn.execute("INSERT INTO facility_outputs VALUES (2, 2, 1.0)")
+        conn.commit()
+    finally:
+        conn.close()
+    return path
+
+
+def _system_of_facilities(path: Path) -> int:
+    conn = sqlite3.connect(path)
+    try:
+        return int(conn.execute(
+            "SELECT l.system_id FROM facilities f JOIN locations l ON l.location_id=f.location_id LIMIT 1"
+        ).fetchone()[0])
+    finally:
+        conn.close()
+
+
+def test_production_respects_inputs_and_storage():
+    """Mines produce freely up to the cap; refineries are limited by their input stock."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _two_facility_db(Path(tmp))
+        sid = _system_of_facilities(path)
+        conn = sqlite3.connect(path)
+        try:
+            fp = FacilityProduction.from_connection(conn, path)
+        finally:
+            conn.close()
+
+        assert fp.step([sid], 2.0) == 1              # refinery has no ore yet
+        assert fp.get(1, 1) == 8.0
+        assert fp.get(2, 2) == 0.0
+
+        fp.add(2, 1, 3.0)                            # enough ore for 1.5 of 2 ticks
+        fp.step([sid], 2.0)
+        assert abs(fp.get(2, 1)) < 1e-9
+        assert abs(fp.get(2, 2) - 1.5) < 1e-9
+
+        for _ in range(1000):
+            fp.step([sid], facility_engine.MAX_STEP_S)
+        assert fp.get(1, 1) == facility_engine.STORAGE_CAP
+
+
+def _add_ore_market(path: Path, sid: int, stock: int) -> None:
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("INSERT INTO markets(system_id, item_id, local_market_price, local_market_stock) "
+                     "VALUES (?, 1, 10, ?)", (sid, stock))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _market_stock(path: Path, sid: int, item_id: int) -> int:
+    conn = sqlite3.connect(path)
+    try:
+        return int(conn.execute("SELECT local_market_stock FROM markets WHERE system_id=? AND item_id=?",
+                                (sid, item_id)).fetchone()[0])
+    finally:
+        conn.close()
+
+
+def test_inputs_are_bought_from_the_system_market():
+    """Refineries top up their inputs from market stock; items with no market row are imported."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _two_facility_db(Path(tmp))
+        sid = _system_of_facilities(path)
+        conn = sqlite3.connect(path)
+        try:
+            fp = FacilityProduction.from_connection(conn, path)
+            markets = MarketArrays.from_connection(conn, path)
+        finally:
+            conn.close()
+        assert fp.draw_inputs(markets, [(sid, 2.0)]) == 4.0     # no ore market in the system: imported
+        assert fp.draw_inputs(None, [(sid, 2.0)]) == 0.0        # already topped up
+        assert fp.units_imported == 4.0
+        fp.step([sid], 2.0)
+        assert abs(fp.get(2, 2) - 2.0) < 1e-9
+
+        _add_ore_market(path, sid, 5)
+        conn = sqlite3.connect(path)
+        try:
+            markets = MarketArrays.from_connection(conn, path)
+        finally:
+            conn.close()
+        assert fp.draw_inputs(markets, [(sid, 2.0)]) == 4.0     # 2 ore/tick for 2 ticks
+        fp.step([sid], 2.0)
+        assert abs(fp.get(2, 2) - 4.0) < 1e-9
+        assert markets.get(sid, 1)[1] == 1.0
+        assert fp.draw_inputs(markets, [(sid, 2.0)]) == 1.0     # only what the market holds
+        assert markets.get(sid, 1)[1] == 0.0 and fp.units_imported == 4.0
+        assert markets.pending_rows()
+
+
+def test_outputs_are_sold_into_the_market_or_exported():
+    """sell_outputs() empties output slots: into the system's market cell, else out of the system."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _two_facility_db(Path(tmp))
+        sid = _system_of_facilities(path)
+        _add_ore_market(path, sid, 5)
+        conn = sqlite3.connect(path)
+        try:
+            fp = FacilityProduction.from_connection(conn, path)
+            markets = MarketArrays.from_connection(conn, path)
+        finally:
+            conn.close()
+        fp.draw_inputs(markets, [(sid, 1.0)])
+        fp.step([sid], 1.0)                                      # 4 ore mined, 1 item 2 refined
+        assert fp.sell_outputs(markets, [sid]) == 5.0
+        assert fp.get(1, 1) == 0.0 and fp.get(2, 2) == 0.0
+        assert markets.get(sid, 1)[1] == 5 - 2 + 4               # item 2 has no market: exported
+        assert fp.sell_outputs(markets, [sid]) == 0.0 and fp.units_sold == 5.0
+
+
+def test_flush_writes_changed_slots_and_reloads():
+    """flush() upserts changed inventory; a fresh engine reads it back."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _two_facility_db(Path(tmp))
+        sid = _system_of_facilities(path)
+        conn = sqlite3.connect(path)
+        try:
+            fp = FacilityProduction.from_connection(conn, path)
+            fp.step([sid], 1.0)
+            assert fp.flush(conn) == 1
+            assert fp.flush(conn) == 0
+            again = FacilityProduction.from_connection(conn, path)
+            assert again.get(1, 1) == 4.0
+        finally:
+            conn.close()
+
+
+def test_simulator_tick_runs_production():
+    """Off-screen systems produce each tick; without markets inputs are imported and outputs exported."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        path = _two_facility_db(Path(tmp))
+        activate(path)
+        sim = UniverseSimulator()
+        try:
+            sim._tick_once(0.5)
+            sim._tick_once(0.5)
+            fp = sim._facilities
+            assert fp.units_imported > 0.0                       # refinery ore
+            assert fp.units_sold == 2.5 * fp.units_imported      # 4 ore + 1 item 2 per 2 ore imported
+        finally:
+            activate(previous)
+
+
+def test_simulator_tick_feeds_inputs_from_market():
+    """The sim tick buys refinery inputs from the market and the mine sells its ore back into it."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        path = _two_facility_db(Path(tmp))
+        sid = _system_of_facilities(path)
+        _add_ore_market(path, sid, 500)
+        activate(path)
+        sim = UniverseSimulator()
+        try:
+            sim._tick_once(0.5)
+            sim._tick_once(0.5)
+            assert sim._facilities.units_imported == 0.0 and sim._facilities.units_sold > 0.0
+            assert sim._markets.get(sid, 1)[1] > 500.0           # mined 4/s, refined 2/s
+        finally:
+            activate(previous)
+
+
+def test_simulator_keeps_producing_past_full_storage():
+    """Production runs long past STORAGE_CAP / rate, live and through a fast-forward."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        path = _two_facility_db(Path(tmp))
+        sid = _system_of_facilities(path)
+        _add_ore_market(path, sid, 5000)                         # deep enough for 600 s fast-forward steps
+        activate(path)
+        sim = UniverseSimulator()
+        try:
+            full_s = facility_engine.STORAGE_CAP / 4.0           # the mine's storage fills in 250 s
+            sim.fast_forward(4 * full_s)
+            fp = sim._facilities
+            assert abs(fp.units_sold - 5.0 * 4 * full_s) < 1e-6  # mine 4/s + refinery 1/s throughout
+            sold = fp.units_sold
+            for _ in range(4):
+                sim._tick_once(0.5)
+            assert abs(fp.units_sold - sold - 5.0 * 2.0) < 1e-6  # live ticks carry on at the same rate
+            sim.flush_markets()
+            assert _market_stock(path, sid, 1) > 5000               # net ore sold into the market
+        finally:
+            activate(previous)
+
+
+def test_simulator_steps_facilities_on_the_sim_clock():
+    """Facility dt is sim time: wall-clock gaps (pauses) add nothing, fast-forwarded time is not redone."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        path = _two_facility_db(Path(tmp))
+        sid = _system_of_facilities(path)
+        activate(path)
+        sim = UniverseSimulator()
+        try:
+            conn = db.get_connection()
+            sim._step_facilities(conn, [sid], 1.0)               # first step: default_dt
+            fp = sim._facilities
+            assert fp.units_sold == 5.0
+            time.sleep(0.05)
+            sim._step_facilities(conn, [sid], 1.0)               # clock stood still: no production
+            assert fp.units_sold == 5.0
+            sim.fast_forward(100.0)
+            assert fp.units_sold == 5.0 + 5.0 * 100.0
+            sim._step_facilities(conn, [sid], 1.0)               # nothing left to catch up
+            assert fp.units_sold == 505.0
+        finally:
+            activate(previous)
+
+
+if __name__ == "__main__":
+    test_production_respects_inputs_and_storage()
+    test_inputs_are_bought_from_the_system_market()
+    test_outputs_are_sold_into_the_market_or_exported()
+    test_flush_writes_changed_slots_and_reloads()
+    test_simulator_tick_runs_production()
+    test_simulator_tick_feeds_inputs_from_market()
+    test_simulator_keeps_producing_past_full_storage()
+    test_simulator_steps_facilities_on_the_sim_clock()
+    print("✅ All tests passed")
@@ -0,0 +1,124 @@
+# /tests/test_fast_forward.py
+
+"""
+Tests for UniverseSimulator.fast_forward(): a bulk advance moves markets and
+facility production in large steps and persists them, reports progress per
+step, stops cleanly at a step boundary when cancelled, and draws a fresh
+drift factor per step so long catch-ups do not pin prices to the band; live
+ticks resume after the drift frames it used.
+"""
+
+import sys
+import sqlite3
+import tempfile
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data import db
+from game_controller.sim_loop import UniverseSimulator
+from tests.db_helpers import activate, make_market_db
+
+
+def _prices(path: Path):
+    conn = sqlite3.connect(path)
+    try:
+        return dict(((r[0], r[1]), r[2]) for r in conn.execute(
+            "SELECT system_id, item_id, local_market_price FROM markets"))
+    finally:
+        conn.close()
+
+
+def test_fast_forward_advances_and_persists():
+    """An hour in 600 s steps: six progress calls, markets written, facilities producing throughout."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        path = make_market_db(Path(tmp))
+        activate(path)
+        prices0 = _prices(path)
+        sim = UniverseSimulator()
+        seen = []
+        try:
+            res = sim.fast_forward(3600.0, progress=seen.append)
+            assert res["steps"] == 6 and res["advanced_s"] == 3600.0 and not res["cancelled"]
+            assert seen == sorted(seen) and seen[-1] == 1.0
+            assert res["market_rows"] > 0
+            assert _prices(path) != prices0
+            sold_per_step = sim._facilities.units_sold / res["steps"]
+            sim.fast_forward(600.0)                  # a seventh step sells as much as the average
+            assert sim._facilities.units_sold - sold_per_step * res["steps"] > 0.99 * sold_per_step
+        finally:
+            activate(previous)
+
+
+def test_fast_forward_cancel_keeps_completed_steps():
+    """cancel() is polled per step; completed steps are still flushed."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        path = make_market_db(Path(tmp))
+        activate(path)
+        sim = UniverseSimulator()
+        calls = {"n": 0}
+
+        def cancel() -> bool:
+            calls["n"] += 1
+            return calls["n"] > 2
+
+        try:
+            res = sim.fast_forward(10 * 3600.0, cancel=cancel)
+            assert res["cancelled"] and res["steps"] == 2
+            assert res["advanced_s"] == 1200.0
+            assert sim._facilities.units_sold > 0
+        finally:
+            activate(previous)
+
+
+def test_long_fast_forward_keeps_prices_off_band_edges():
+    """Ten hours in 60 steps: each step draws its own drift, so prices do not run to 4x / 0.25x base."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        path = make_market_db(Path(tmp))
+        activate(path)
+        sim = UniverseSimulator()
+        try:
+            sim.fast_forward(36000.0)
+            m = sim._markets
+            cells = [c for c in range(len(m.present)) if m.present[c]]
+            at_edge = [c for c in cells
+                       if m.price[c] <= m.price_lo[c % m.n_items] * 1.0001
+                       or m.price[c] >= m.price_hi[c % m.n_items] * 0.9999]
+            assert cells and len(at_edge) <= len(cells) // 4, (len(at_edge), len(cells))
+        finally:
+            sim.stop()
+            activate(previous)
+
+
+def test_live_ticks_continue_after_fast_forward_frames():
+    """The sim frame ends past the drift frames fast-forward used; the next tick does not catch up again."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        activate(make_market_db(Path(tmp)))
+        sim = UniverseSimulator()
+        try:
+            start = sim._frame
+            sim.fast_forward(600.0)
+            frame = sim._frame
+            assert frame == start + int(600.0 * sim._tick_rate_hz)
+            sid = next(iter(sim._markets.sys_index))
+            assert sim._market_last_frame[sid] == frame
+            sim._tick_once(1.0 / sim._tick_rate_hz)
+            assert sim._frame == frame + 1
+            assert max(sim._market_last_frame.values()) == frame + 1
+        finally:
+            sim.stop()
+            activate(previous)
+
+
+if __name__ == "__main__":
+    test_fast_forward_advances_and_persists()
+    test_fast_forward_cancel_keeps_completed_steps()
+    test_long_fast_forward_keeps_prices_off_band_edges()
+    test_live_ticks_continue_after_fast_forward_frames()
+    print("✅ All tests passed")
@@ -0,0 +1,92 @@
+# /tests/test_galaxy_index.py
+
+"""
+Tests for game/galaxy_index.py: KD-tree range and k-nearest queries against
+brute force, persistence next to game.db, rebuild on a stale fingerprint and
+none on cosmetic systems writes.
+"""
+
+import sys
+import math
+import random
+import sqlite3
+import tempfile
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data import db
+from data import seed as seed_module
+from game import galaxy_index, travel
+from game.galaxy_index import GalaxyIndex
+from tests.db_helpers import activate
+
+
+def _brute(ids, xs, ys, origin):
+    o = ids.index(origin)
+    return sorted(((xs[i] - xs[o]) ** 2 + (ys[i] - ys[o]) ** 2, ids[i]) for i in range(len(ids)) if ids[i] != origin)
+
+
+def test_queries_match_brute_force():
+    """within() and nearest() agree with a full scan, including ties on integer grids."""
+    rng = random.Random(7)
+    for n in (1, 12, 250, 2500):
+        ids = list(range(1, n + 1))
+        xs = [float(rng.randint(0, 200)) for _ in ids]
+        ys = [float(rng.randint(0, 200)) for _ in ids]
+        idx = GalaxyIndex.build(ids, xs, ys)
+        for _ in range(30):
+            origin = rng.choice(ids)
+            radius = rng.uniform(0.0, 60.0)
+            k = rng.randint(1, 25)
+            brute = _brute(ids, xs, ys, origin)
+            assert idx.within(origin, radius) == [(s, math.sqrt(d2)) for d2, s in brute if d2 <= radius * radius]
+            assert idx.nearest(origin, k) == [(s, math.sqrt(d2)) for d2, s in brute[:k]]
+
+
+def test_persisted_next_to_db_and_rebuilt_when_stale():
+    """build_for_active_save() writes galaxy_index.bin and rebuilds it when systems change."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        path = Path(tmp) / "game.db"
+        conn = sqlite3.connect(path)
+        conn.executescript(db.SCHEMA_PATH.read_text(encoding="utf-8"))
+        seed_module.seed(conn)
+        conn.commit()
+        conn.close()
+        activate(path)
+        try:
+            idx = galaxy_index.build_for_active_save()
+            bin_path = galaxy_index.index_path_for(path)
+            assert bin_path.exists()
+            loaded = GalaxyIndex.load(bin_path)
+            assert loaded is not None and loaded.fingerprint == idx.fingerprint
+            assert loaded.nearest(1, 5) == idx.nearest(1, 5)
+
+            # Jump-range helper == range query around the player's system
+            sys_id = db.get_player_full()["current_player_system_id"]
+            assert travel.systems_in_jump_range(30.0) == idx.within(sys_id, 30.0)
+
+            # An icon write bumps the systems cache version but leaves coordinates alone
+            active = galaxy_index.get_index()
+            written_ns = bin_path.stat().st_mtime_ns
+            db.set_system_icon_path(1, "star.gif")
+            assert galaxy_index.get_index() is active
+            assert bin_path.stat().st_mtime_ns == written_ns
+
+            # Move a system: the stale file must be replaced
+            db.get_connection().execute("UPDATE systems SET system_x = system_x + 500 WHERE system_id=1")
+            db.get_connection().commit()
+            rebuilt = galaxy_index.build_for_active_save()
+            assert rebuilt.fingerprint != idx.fingerprint
+            assert GalaxyIndex.load(bin_path).fingerprint == rebuilt.fingerprint
+        finally:
+            activate(previous)
+
+
+if __name__ == "__main__":
+    test_queries_match_brute_force()
+    test_persisted_next_to_db_and_rebuilt_when_stale()
+    print("✅ All tests passed")
@@ -0,0 +1,180 @@
+# /tests/test_market_engine.py
+
+"""
+Tests for game_controller/market_engine.py: markets are mirrored into dense
+arrays, stepped in memory within the price band, and only changed cells are
+written back on flush (including from the simulator tick), the stored baseline
+survives reloads of drawn-down stock, and flush_all() writes every sim
+engine's in-memory state before a save is copied.
+"""
+
+import sys
+import sqlite3
+import tempfile
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data import db
+from game_controller import market_engine
+from game_controller.market_engine import MarketArrays
+from game_controller.resource_engine import REFILL_EVENT
+from game_controller.sim_loop import UniverseSimulator
+from tests.db_helpers import activate, make_market_db
+
+
+def _market_rows(path: Path):
+    conn = sqlite3.connect(path)
+    try:
+        return {(r[0], r[1]): (r[2], r[3]) for r in conn.execute(
+            "SELECT system_id, item_id, local_market_price, local_market_stock FROM markets")}
+    finally:
+        conn.close()
+
+
+def test_step_stays_in_memory_until_flush():
+    """Steps change the arrays only; flush writes exactly the cells whose integers changed."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_market_db(Path(tmp))
+        before = _market_rows(path)
+        conn = sqlite3.connect(path)
+        try:
+            m = MarketArrays.from_connection(conn, path)
+            sids = sorted({sid for sid, _ in before})
+            for frame in range(1, 50):
+                assert m.step(sids, frame, 0.05) == len(before)
+            assert _market_rows(path) == before
+
+            pending = m.pending_rows()
+            written = m.flush(conn)
+            assert written == len(pending) > 0
+            assert m.pending_rows() == []
+            after = _market_rows(path)
+            for (sid, iid), (price, stock) in after.items():
+                mem_price, mem_stock = m.get(sid, iid)
+                assert price == round(mem_price)
+                assert stock == round(mem_stock)
+        finally:
+            conn.close()
+
+
+def test_prices_are_clamped_and_missing_cells_untouched():
+    """Prices stay inside the item band; systems without markets are skipped."""
+    m = MarketArrays([1, 2], [10, 20], [100.0, 40.0])
+    m.present[0:2] = b"\x01\x01"
+    for c, p in ((0, 390.0), (1, 11.0)):
+        m.price[c] = p
+        m.stock[c] = m.baseline[c] = 100.0
+    for frame in range(200):
+        m.step([1, 2], frame, 0.2, factors={1: 1.2 if frame % 2 else 0.8})
+    lo0, hi0 = 100.0 * market_engine.PRICE_MIN_MULT, 100.0 * market_engine.PRICE_MAX_MULT
+    lo1, hi1 = 40.0 * market_engine.PRICE_MIN_MULT, 40.0 * market_engine.PRICE_MAX_MULT
+    assert lo0 <= m.price[0] <= hi0
+    assert lo1 <= m.price[1] <= hi1
+    assert m.get(2, 10) is None
+    assert 1 not in m.dirty
+
+
+def test_scarcity_raises_price_and_stock_recovers():
+    """Stock below baseline pushes price up while stock reverts toward baseline."""
+    m = MarketArrays([1], [10], [100.0])
+    m.present[0] = 1
+    m.price[0] = 100.0
+    m.baseline[0] = 500.0
+    m.stock[0] = 100.0
+    m.step([1], 1, 0.0, factors={1: 1.0})
+    assert m.price[0] > 100.0
+    assert 100.0 < m.stock[0] < 500.0
+
+
+def test_baseline_survives_reload_of_drawn_down_stock():
+    """A reload keeps the row's stored equilibrium instead of adopting the lowered stock."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_market_db(Path(tmp))
+        conn = sqlite3.connect(path)
+        try:
+            assert conn.execute(
+                "SELECT COUNT(*) FROM markets WHERE local_market_baseline IS NOT local_market_stock"
+            ).fetchone()[0] == 0                          # new rows start at their opening stock
+            m = MarketArrays.from_connection(conn, path)
+            sid, iid = conn.execute("SELECT system_id, item_id FROM markets LIMIT 1").fetchone()
+            c = m.sys_index[sid] * m.n_items + m.item_index[iid]
+            m.stock[c] = 100.0                            # drawn down (NPC purchase / facility input)
+            m.dirty.add(m.sys_index[sid])
+            assert m.flush(conn) == 1
+            for _ in range(3):                            # save/load cycles
+                m = MarketArrays.from_connection(conn, path)
+                assert m.get(sid, iid)[1] == 100.0 and m.baseline[c] == 500.0
+            m.step([sid], 1, 0.0, factors={sid: 1.0})
+            assert m.get(sid, iid)[1] > 100.0
+        finally:
+            conn.close()
+
+
+def test_simulator_tick_uses_engine_and_flushes():
+    """A sim tick drifts markets in memory; flush_markets() writes them to the save."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        path = make_market_db(Path(tmp))
+        before = _market_rows(path)
+        activate(path)
+        sim = UniverseSimulator()
+        sim._scheduler.register("markets", weight=2.0, max_cycle_ticks=1)  # every system, every tick
+        sim._market_drift = 0.05
+        sim.set_market_flush_frames(1000)
+        try:
+            for _ in range(5):
+                sim._tick_once(0.5)
+            assert _market_rows(path) == before
+            assert sim.flush_markets() > 0
+            assert _market_rows(path) != before
+        finally:
+            activate(previous)
+
+
+def test_flush_all_writes_every_engine():
+    """flush_all() leaves nothing the sim keeps in memory out of the save file."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        path = make_market_db(Path(tmp))
+        before = _market_rows(path)
+        activate(path)
+        sim = UniverseSimulator()
+        sim._scheduler.register("markets", weight=2.0, max_cycle_ticks=1)
+        sim._market_drift = 0.05
+        sim.set_market_flush_frames(1000)
+        try:
+            for _ in range(5):
+                sim._tick_once(0.5)
+            sim.events().schedule("later", delay_s=60.0)
+            with sqlite3.connect(path) as c:
+                assert c.execute("SELECT COUNT(*) FROM npc_ships").fetchone()[0] == 0
+                assert c.execute("SELECT COUNT(*) FROM sim_events").fetchone()[0] == 0
+                assert c.execute("SELECT COUNT(*) FROM locations WHERE richness_max IS NOT NULL").fetchone()[0] == 0
+            written = sim.flush_all()
+            assert written["markets"] > 0 and written["fleet"] > 0 and written["resources"] > 0
+            assert written["events"] > 0
+            assert _market_rows(path) != before
+            with sqlite3.connect(path) as c:
+                assert c.execute("SELECT COUNT(*) FROM npc_ships").fetchone()[0] == sim._fleet.n_ships
+                assert c.execute("SELECT COUNT(*) FROM sim_events WHERE kind != ?",
+                                 (REFILL_EVENT,)).fetchone()[0] == 1
+                assert c.execute("SELECT now_s FROM sim_clock WHERE id = 1").fetchone()[0] == sim._events.now_s
+                assert c.execute("SELECT COUNT(*) FROM locations WHERE richness_max IS NOT NULL"
+                                 ).fetchone()[0] == sim._resources.n_nodes
+            assert all(v == 0 for v in sim.flush_all().values())
+        finally:
+            sim.stop()
+            activate(previous)
+
+
+if __name__ == "__main__":
+    test_step_stays_in_memory_until_flush()
+    test_prices_are_clamped_and_missing_cells_untouched()
+    test_scarcity_raises_price_and_stock_recovers()
+    test_baseline_survives_reload_of_drawn_down_stock()
+    test_simulator_tick_uses_engine_and_flushes()
+    test_flush_all_writes_every_engine()
+    print("✅ All tests passed")
@@ -0,0 +1,95 @@
+# /tests/test_migrations.py
+
+"""
+Tests for data/migrations.py: fresh and legacy (pre-versioning) saves are
+migrated and stamped once, and reopening an up-to-date save only reads
+PRAGMA user_version.
+"""
+
+import sys
+import sqlite3
+import tempfile
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data import db, migrations
+from data import seed as seed_module
+from tests.db_helpers import activate
+
+
+def _columns(conn: sqlite3.Connection, table: str):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+
+
+def test_fresh_db_is_stamped_and_seeded():
+    """A brand new save file ends at SCHEMA_VERSION with the universe seeded."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        path = Path(tmp) / "game.db"
+        try:
+            activate(path)
+            conn = db.get_connection()
+            assert migrations.get_schema_version(conn) == migrations.SCHEMA_VERSION
+            assert conn.execute("SELECT COUNT(*) FROM systems").fetchone()[0] > 0
+            assert "docked_bay" in _columns(conn, "player")
+        finally:
+            activate(previous)
+
+
+def test_legacy_db_gets_missing_columns_once():
+    """A user_version 0 save missing later columns is upgraded; a second run is a no-op."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "game.db"
+        conn = sqlite3.connect(path)
+        try:
+            conn.executescript(db.SCHEMA_PATH.read_text(encoding="utf-8"))
+            seed_module.seed(conn)
+            conn.execute("ALTER TABLE player DROP COLUMN docked_bay")
+            conn.execute("ALTER TABLE systems DROP COLUMN icon_path")
+            conn.execute("DROP TRIGGER markets_baseline")
+            conn.execute("ALTER TABLE markets DROP COLUMN local_market_baseline")
+            conn.execute(
+                "INSERT INTO markets(system_id, item_id, local_market_price, local_market_stock) VALUES (1, 1, 10, 70)"
+            )
+            conn.commit()
+            assert migrations.get_schema_version(conn) == 0
+
+            applied = migrations.migrate(conn)
+            assert applied == len(migrations.MIGRATIONS)
+            assert "docked_bay" in _columns(conn, "player")
+            assert "icon_path" in _columns(conn, "systems")
+            assert conn.execute(
+                "SELECT local_market_baseline FROM markets WHERE system_id=1 AND item_id=1"
+            ).fetchone()[0] == 70
+            assert migrations.get_schema_version(conn) == migrations.SCHEMA_VERSION
+            assert migrations.migrate(conn) == 0
+        finally:
+            conn.close()
+
+
+def test_up_to_date_open_reads_one_pragma():
+    """Opening a current save runs the user_version check and no table probes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "game.db"
+        conn = sqlite3.connect(path)
+        try:
+            conn.executescript(db.SCHEMA_PATH.read_text(encoding="utf-8"))
+            seed_module.seed(conn)
+            migrations.migrate(conn)
+            statements = []
+            conn.set_trace_callback(statements.append)
+            db._ensure_schema_and_seed(conn)
+            conn.set_trace_callback(None)
+            assert statements == ["PRAGMA user_version"]
+        finally:
+            conn.close()
+
+
+if __name__ == "__main__":
+    test_fresh_db_is_stamped_and_seeded()
+    test_legacy_db_gets_missing_columns_once()
+    test_up_to_date_open_reads_one_pragma()
+    print("✅ All tests passed")
@@ -0,0 +1,177 @@
+# /tests/test_npc_fleet.py
+
+"""
+Tests for game_controller/npc_fleet.py: ships travel gate links leg by leg
+with interpolated positions, role consumption and haulers move market stock,
+a settle at an earlier time neither rewinds the clock nor charges twice,
+summary rows round-trip through npc_ships (travellers resume), and the sim
+spawns, moves and persists the fleet; bench_sim reports fleet timings.
+"""
+
+import sys
+import sqlite3
+import tempfile
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data import db
+from game_controller import bench_sim, npc_fleet, sim_tasks
+from game_controller.market_engine import MarketArrays
+from game_controller.npc_fleet import NpcFleet
+from game_controller.sim_loop import UniverseSimulator
+from tests.db_helpers import activate
+
+
+def _line_fleet(markets=None) -> NpcFleet:
+    # 1 -(10 ly)- 2 -(20 ly)- 3
+    f = NpcFleet([1, 2, 3], [(0.0, 0.0), (10.0, 0.0), (30.0, 0.0)], [(1, 2, 10.0), (2, 3, 20.0)])
+    f.warp_s_per_ly = 1.0
+    f.dock_s = 100.0
+    return f
+
+
+def test_ships_follow_gate_links():
+    f = _line_fleet()
+    f.add_design(7, 50.0, ["combat"], {}, None)
+    f._bind_markets(None)
+    f.spawn(40)
+    assert f.n_ships == 40 and sum(f.present) == 40
+    legs = []
+    t = 0.0
+    while t < 2000.0:
+        t += 5.0
+        before = list(zip(f.sys, f.state))
+        f.advance(t)
+        for k, (s, st) in enumerate(before):
+            if f.sys[k] != s:
+                legs.append((s, f.sys[k]))
+    assert legs and all(abs(a - b) == 1 for a, b in legs)  # only gate neighbours
+    assert f.arrivals == len(legs) and f.departures > 0
+    assert sum(f.present) == 40
+
+    # Interpolated position halfway along a 1 -> 2 leg
+    k = 0
+    f.state[k], f.sys[k], f.next_sys[k] = npc_fleet.STATE_TRAVEL, 0, 1
+    f.t0[k], f.t1[k] = 100.0, 110.0
+    xs, ys = f.positions(105.0)
+    assert xs[k] == 5.0 and ys[k] == 0.0
+
+
+def test_consumption_and_hauling_move_stock():
+    m = MarketArrays([1, 2, 3], [1, 2], [10.0, 10.0])
+    for c in range(6):
+        m.present[c] = 1
+        m.price[c] = 10.0
+        m.stock[c] = m.baseline[c] = 100.0
+    m.stock[1] = 160.0  # surplus of item 2 at system 1
+    f = _line_fleet(m)
+    f.add_design(1, 0.0, ["combat"], {"any": [(1, 0.5)]}, m)
+    f.add_design(2, 40.0, ["hauler"], {}, m)
+    f._bind_markets(m)
+
+    k = f._append(1, 0, 2)      # combat ship docked at system 3
+    f.t1[k] = 1e9
+    f.settle_all(0.0)
+    f.settle_all(10.0)
+    assert m.stock[4] == 95.0 and f.consumed_total == 5.0 and 2 in m.dirty
+
+    h = f._append(2, 1, 0)      # hauler at system 1 heads out with the surplus
+    f.trip_jumps = (1, 1)
+    f._depart(h, 0.0)
+    assert f.cargo_qty[h] == 40.0 and m.stock[1] == 120.0
+    f.advance(f.t1[h])
+    assert f.sys[h] == 1 and f.state[h] == npc_fleet.STATE_DOCKED
+    assert f.cargo_qty[h] == 0.0 and m.stock[3] == 140.0
+
+
+def test_late_settle_does_not_double_charge():
+    m = MarketArrays([1, 2, 3], [1], [10.0])
+    for c in range(3):
+        m.present[c] = 1
+        m.stock[c] = m.baseline[c] = 100.0
+    f = _line_fleet(m)
+    f.add_design(1, 0.0, ["combat"], {"any": [(1, 0.5)]}, m)
+    f._bind_markets(m)
+    k = f._append(1, 0, 2)
+    f.t1[k] = 1e9
+    f.settle_all(0.0)
+    f.settle_all(10.0)
+    assert m.stock[2] == 95.0
+    f._settle(2, 4.0)           # a wake-up for an earlier time arrives late
+    assert f.settled_s[2] == 10.0 and m.stock[2] == 95.0
+    f.settle_all(20.0)
+    assert m.stock[2] == 90.0 and f.consumed_total == 10.0
+
+
+def _make_save(path: Path) -> None:
+    conn = sqlite3.connect(path)
+    conn.executescript(db.SCHEMA_PATH.read_text(encoding="utf-8"))
+    conn.executescript(
+        """
+        INSERT INTO systems(system_id, system_name, system_x, system_y)
+            VALUES (1, 'A', 0, 0), (2, 'B', 10, 0), (3, 'C', 20, 0);
+        INSERT INTO gate_links(system_a_id, system_b_id, distance_pc) VALUES (1, 2, 10.0), (2, 3, 10.0);
+        INSERT INTO items(item_id, item_name, item_base_price) VALUES (1, 'Fuel', 10);
+        INSERT INTO markets(system_id, item_id, local_market_price, local_market_stock)
+            VALUES (1, 1, 10, 500), (2, 1, 10, 500), (3, 1, 10, 500);
+        INSERT INTO ships(ship_id, ship_name, base_ship_cargo, base_ship_fuel, base_ship_jump_distance,
+                          base_ship_shield, base_ship_hull, base_ship_energy)
+            VALUES (1, 'Hauler', 100, 100, 50, 1, 1, 1), (2, 'Corvette', 10, 100, 50, 1, 1, 1);
+        INSERT INTO ship_roles(ship_id, role) VALUES (1, 'hauler'), (2, 'combat');
+        INSERT INTO consumption_profiles_ship(role, item_id, rate) VALUES ('any', 1, 0.01);
+        """
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_sim_spawns_moves_and_persists_fleet():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "game.db"
+        _make_save(path)
+        previous = db.get_active_db_path()
+        activate(path)
+        try:
+            sim = UniverseSimulator()
+            sim._tick_once(0.5)
+            assert sim.fleet_summary()["ships"] == 6  # 2 per gate-connected system
+            result = sim.fast_forward(3600.0)
+            assert result["ship_moves"] > 0
+            summary = sim.fleet_summary()
+            assert summary["arrivals"] > 0 and summary["consumed"] > 0
+            travelling = [k for k in range(sim._fleet.n_ships) if sim._fleet.state[k] == npc_fleet.STATE_TRAVEL]
+            sim.stop()
+            with sqlite3.connect(path) as c:
+                rows = c.execute("SELECT COUNT(*), SUM(state) FROM npc_ships").fetchone()
+                assert rows == (6, len(travelling))
+            # Reload resumes travellers on their leg
+            with sqlite3.connect(path) as c:
+                again = NpcFleet.from_connection(c, None, 3600.0, path)
+            assert again.n_ships == 6 and again.state.count(npc_fleet.STATE_TRAVEL) == len(travelling)
+            # Worker-side read of the summary rows
+            deltas = [d for sid in (1, 2, 3) for d in sim_tasks.tick_ships(sid)]
+            assert len(deltas) == 6 and all(d.new_order for d in deltas)
+        finally:
+            activate(previous)
+
+
+def test_bench_run_fleet():
+    with tempfile.TemporaryDirectory() as tmp:
+        src = bench_sim.build_synthetic_db(Path(tmp) / "synthetic.db", 220, seed=2)
+        res = bench_sim.run_fleet(src, 2000, ticks=20)
+        assert res["ships"] == 2000 and res["travelling"] + res["docked"] == 2000
+        assert res["moves_per_tick"] > 0 and res["tick_ms"]["p50"] <= res["tick_ms"]["max"]
+        with sqlite3.connect(src) as c:
+            assert c.execute("SELECT COUNT(*) FROM npc_ships").fetchone()[0] == 0  # read only
+
+
+if __name__ == "__main__":
+    test_ships_follow_gate_links()
+    test_consumption_and_hauling_move_stock()
+    test_late_settle_does_not_double_charge()
+    test_sim_spawns_moves_and_persists_fleet()
+    test_bench_run_fleet()
+    print("✅ All tests passed")
@@ -0,0 +1,110 @@
+# /tests/test_player_state_buffer.py
+
+"""
+Tests for the player write-behind buffer in data/db.py: adjust_fuel() stays
+in memory until a flush, readers see buffered values, and switching saves
+flushes into the save the values belong to; a save recreated at the same
+path is read afresh.
+"""
+
+import sys
+import sqlite3
+import tempfile
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data import db
+from game import player_status
+from tests.db_helpers import activate, make_seeded_db
+
+
+PLAYER_FUEL_SQL = "UPDATE player SET current_player_ship_fuel=50 WHERE id=1"
+
+
+def _fuel_on_disk(path: Path) -> float:
+    conn = sqlite3.connect(path)
+    try:
+        return float(conn.execute("SELECT current_player_ship_fuel FROM player WHERE id=1").fetchone()[0])
+    finally:
+        conn.close()
+
+
+def test_fuel_drip_is_buffered_until_flush():
+    """Per-tick adjust_fuel() calls are visible to readers but written once per flush."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        path = make_seeded_db(Path(tmp), PLAYER_FUEL_SQL)
+        activate(path)
+        db.set_player_flush_interval(3600.0)
+        try:
+            flushes = db.get_player_buffer_stats()["flushes"]
+            for _ in range(100):
+                player_status.adjust_fuel(-0.1)
+
+            assert abs(db.get_player_full()["current_player_ship_fuel"] - 40.0) < 1e-9
+            assert abs(player_status.get_status_snapshot()["fuel"] - 40.0) < 1e-9
+            assert _fuel_on_disk(path) == 50.0
+            assert db.get_player_buffer_stats()["flushes"] == flushes
+
+            assert db.flush_player_state() is True
+            assert abs(_fuel_on_disk(path) - 40.0) < 1e-9
+            assert db.flush_player_state() is False
+
+            # Zero interval: every write flushes (old behaviour)
+            db.set_player_flush_interval(0.0)
+            player_status.adjust_fuel(-5.0)
+            assert abs(_fuel_on_disk(path) - 35.0) < 1e-9
+        finally:
+            db.set_player_flush_interval(db.PLAYER_FLUSH_INTERVAL_S)
+            activate(previous)
+
+
+def test_switching_saves_flushes_to_the_right_db():
+    """Pending values are written to their own save when another save becomes active."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        first = make_seeded_db(Path(tmp) / "a", PLAYER_FUEL_SQL)
+        second = make_seeded_db(Path(tmp) / "b", PLAYER_FUEL_SQL)
+        db.set_player_flush_interval(3600.0)
+        try:
+            activate(first)
+            player_status.adjust_fuel(-20.0)
+            activate(second)
+            assert abs(_fuel_on_disk(first) - 30.0) < 1e-9
+            assert db.get_player_full()["current_player_ship_fuel"] == 50.0
+        finally:
+            db.set_player_flush_interval(db.PLAYER_FLUSH_INTERVAL_S)
+            activate(previous)
+
+
+def test_recreated_save_at_same_path_is_reread():
+    """Cached values do not outlive a save that is recreated or reopened at the same path."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        path = make_seeded_db(Path(tmp), PLAYER_FUEL_SQL)
+        db.set_player_flush_interval(3600.0)
+        try:
+            activate(path)
+            player_status.adjust_fuel(-20.0)
+            assert db.get_player_value("current_player_ship_fuel") == 30.0
+            activate(path)
+            with sqlite3.connect(path) as conn:   # e.g. a new game written over the same file
+                conn.execute("UPDATE player SET current_player_ship_fuel=100 WHERE id=1")
+            activate(path)
+            assert db.get_player_value("current_player_ship_fuel") == 100.0
+            player_status.adjust_fuel(-1.0)
+            assert db.flush_player_state() is True
+            assert _fuel_on_disk(path) == 99.0
+        finally:
+            db.set_player_flush_interval(db.PLAYER_FLUSH_INTERVAL_S)
+            activate(previous)
+
+
+if __name__ == "__main__":
+    test_fuel_drip_is_buffered_until_flush()
+    test_switching_saves_flushes_to_the_right_db()
+    test_recreated_save_at_same_path_is_reread()
+    print("✅ All tests passed")
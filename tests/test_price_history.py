@@ -0,0 +1,138 @@
+# /tests/test_price_history.py
+
+"""
+Tests for game_controller/price_history.py: ring buffers keep only price
+changes and wrap at capacity, flushes roll samples into 1 min / 1 h / 1 day
+buckets that merge across flushes, queries pick the resolution for the
+window, and the sim records history through ticks and fast-forward.
+"""
+
+import sys
+import sqlite3
+import tempfile
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data import db
+from data import migrations
+from game_controller import price_history
+from game_controller.market_engine import MarketArrays
+from game_controller.price_history import PriceHistory
+from game_controller.sim_loop import UniverseSimulator
+from tests.db_helpers import activate
+
+
+def _engine() -> MarketArrays:
+    m = MarketArrays([1, 2], [10, 11], [100.0, 50.0])
+    for c in range(4):
+        m.present[c] = 1
+        m.price[c] = 100.0 if c % 2 == 0 else 50.0
+    return m
+
+
+def _set_price(m: MarketArrays, system_row: int, item_col: int, price: float) -> None:
+    m.price[system_row * m.n_items + item_col] = price
+    m.dirty.add(system_row)
+
+
+def test_ring_keeps_changes_and_wraps():
+    m = _engine()
+    h = PriceHistory(m, capacity=4, sample_s=60)
+    assert h.sample(0, full=True) == 4
+    for t in range(60, 600, 60):
+        if t < 300:
+            _set_price(m, 0, 0, 100 + t / 60)
+        h.sample(t)
+    # cell (system 1, item 10): initial + 4 changes, ring of 4 keeps the last 4
+    sl = h.slot[0]
+    assert h._samples(sl, h.count[sl]) == [(60, 101), (120, 102), (180, 103), (240, 104)]
+    assert h.pending[sl] == 4 and h.dropped == 0 and h.needs_flush()  # baseline is not pending
+    # unchanged cells were sampled once
+    assert h.count[h.slot[1]] == 1
+
+
+def test_flush_rollups_and_query_resolution():
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(Path(tmp) / "game.db")
+        try:
+            migrations.migrate(conn)
+            m = _engine()
+            h = PriceHistory(m, capacity=16, sample_s=30)
+            h.sample(0, full=True)
+            for t, p in ((30, 110), (60, 90), (90, 120)):
+                _set_price(m, 0, 0, p)
+                h.sample(t)
+            assert h.flush(conn) == 4                         # cell 0: 2 minute + 1 hour + 1 day bucket
+            for t, p in ((100, 80), (130, 95)):
+                _set_price(m, 0, 0, p)
+                h.sample(t)
+            h.flush(conn)
+            rows = conn.execute(
+                "SELECT res_s, bucket, open, high, low, close FROM price_rollups "
+                "WHERE system_id = 1 AND item_id = 10 ORDER BY res_s, bucket").fetchall()
+            assert rows == [
+                (60, 0, 110, 110, 110, 110),
+                (60, 60, 90, 120, 80, 80),      # merged across the two flushes
+                (60, 120, 95, 95, 95, 95),
+                (3600, 0, 110, 120, 80, 95),
+                (86400, 0, 110, 120, 80, 95),
+            ]
+
+            # Ring still reaches back: raw samples
+            res, bars = h.query(conn, 1, 10, 0, 130, now_s=130)
+            assert res == price_history.RAW_RES and [b[4] for b in bars] == [100, 110, 90, 120, 80, 95]
+            # Longer window than the ring holds: rollups, with unflushed samples merged
+            _set_price(m, 0, 0, 70)
+            h.sample(7200)
+            res, bars = h.query(conn, 1, 10, -3600, 7200, max_points=300, now_s=7200)
+            assert res == 60 and bars[-1] == (7200, 70, 70, 70, 70)
+            res, bars = h.query(conn, 1, 10, 0, 7200, max_points=5, now_s=7200)
+            assert res == 3600 and bars == [(0, 110, 120, 80, 95), (7200, 70, 70, 70, 70)]
+            assert price_history.choose_resolution(0, 86400 * 30, 300, 86400 * 30) == 86400
+        finally:
+            conn.close()
+
+
+def test_sim_records_history():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "game.db"
+        conn = sqlite3.connect(path)
+        conn.executescript(db.SCHEMA_PATH.read_text(encoding="utf-8"))
+        conn.executescript(
+            """
+            INSERT INTO systems(system_id, system_name, system_x, system_y)
+                VALUES (1, 'A', 0, 0), (2, 'B', 10, 0);
+            INSERT INTO items(item_id, item_name, item_base_price) VALUES (1, 'Ore', 100);
+            INSERT INTO markets(system_id, item_id, local_market_price, local_market_stock)
+                VALUES (1, 1, 100, 500), (2, 1, 100, 500);
+            """
+        )
+        conn.commit()
+        conn.close()
+        previous = db.get_active_db_path()
+        activate(path)
+        try:
+            sim = UniverseSimulator()
+            sim._tick_once(0.5)
+            result = sim.fast_forward(6 * 3600.0)
+            assert result["steps"] == 36
+            res, bars = sim.price_history(2, 1, window_s=6 * 3600.0)
+            assert res == price_history.RAW_RES and len(bars) > 1
+            res, bars = sim.price_history(2, 1, window_s=6 * 3600.0, max_points=len(bars) - 1)
+            assert res == 3600 and bars[0][0] == 0 and bars[0][2] >= bars[0][4] >= bars[0][3]
+            sim.stop()
+            with sqlite3.connect(path) as c:
+                n = c.execute("SELECT COUNT(*) FROM price_rollups WHERE res_s = 3600").fetchone()[0]
+                assert n >= 2
+        finally:
+            activate(previous)
+
+
+if __name__ == "__main__":
+    test_ring_keeps_changes_and_wraps()
+    test_flush_rollups_and_query_resolution()
+    test_sim_records_history()
+    print("✅ All tests passed")
@@ -0,0 +1,126 @@
+# /tests/test_reachability.py
+
+"""
+Tests for game.travel.compute_reachability(): the bulk engine must return
+exactly what get_travel_display_data() returns for every target, wherever the
+player is parked and for systems exactly on the jump-range boundary, and jump
+range is answered by the galaxy index.
+"""
+
+import sys
+import math
+import random
+import sqlite3
+import tempfile
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data import db
+from game import player_status, travel
+from tests.db_helpers import activate, make_seeded_db
+
+
+# Seed creates the player row; give it a fuel level that splits reachable/unreachable
+PLAYER_START_SQL = (
+    "UPDATE player SET current_player_system_id=1, current_player_location_id=NULL, "
+    "current_player_ship_fuel=60 WHERE id=1"
+)
+
+
+def _all_targets(conn: sqlite3.Connection):
+    targets = [("star", r[0]) for r in conn.execute("SELECT system_id FROM systems ORDER BY system_id")]
+    targets += [("loc", r[0]) for r in conn.execute("SELECT location_id FROM locations ORDER BY location_id")]
+    # Unknown ids / kinds come back as {"ok": False} like the per-target call
+    targets += [("star", 999999), ("loc", -3), ("loc", 0), ("warp", 1)]
+    return targets
+
+
+def test_bulk_matches_per_target():
+    """compute_reachability() == [get_travel_display_data(k, i) for k, i in targets]."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        activate(make_seeded_db(Path(tmp), PLAYER_START_SQL))
+        try:
+            conn = db.get_connection()
+            targets = _all_targets(conn)
+            gate_id = conn.execute(
+                "SELECT location_id FROM locations WHERE system_id=1 AND location_type='warp_gate'"
+            ).fetchone()[0]
+            planet_id = conn.execute(
+                "SELECT location_id FROM locations WHERE system_id=2 AND location_type='planet' LIMIT 1"
+            ).fetchone()[0]
+
+            # Parked at a star, at a warp gate, and at a planet in another system
+            for sys_id, loc_id in ((1, None), (1, gate_id), (2, planet_id)):
+                conn.execute(
+                    "UPDATE player SET current_player_system_id=?, current_player_location_id=? WHERE id=1",
+                    (sys_id, loc_id),
+                )
+                conn.commit()
+                expected = [travel.get_travel_display_data(k, i) for k, i in targets]
+                assert travel.compute_reachability(targets) == expected
+                assert any(r.get("can_reach") for r in expected)
+                assert not all(r.get("can_reach", True) for r in expected)
+
+            assert travel.compute_reachability([]) == []
+        finally:
+            activate(previous)
+
+
+def test_jump_range_comes_from_galaxy_index():
+    """can_reach_jump marks exactly the systems the KD-tree range query returns."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        activate(make_seeded_db(Path(tmp), PLAYER_START_SQL))
+        try:
+            conn = db.get_connection()
+            stars = [r[0] for r in conn.execute("SELECT system_id FROM systems WHERE system_id != 1")]
+            rows = travel.compute_reachability([("star", sid) for sid in stars])
+            in_range = {sid for sid, _ in travel.systems_in_jump_range()}
+            assert in_range and len(in_range) < len(stars)
+            assert {sid for sid, r in zip(stars, rows) if r["can_reach_jump"]} == in_range
+            assert {sid for sid, _ in travel.systems_in_jump_range(system_id=2)} != in_range
+            assert travel._jump_range_map(10**9, 50.0) is None   # origin not indexed: per-target test
+        finally:
+            activate(previous)
+
+
+def test_jump_range_boundary_matches_per_target():
+    """Systems placed on the jump-range circle get the same can_reach_jump from both paths."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        activate(make_seeded_db(Path(tmp), PLAYER_START_SQL))
+        try:
+            conn = db.get_connection()
+            radius = float(player_status.get_status_snapshot()["current_jump_distance"])
+            x0, y0 = conn.execute("SELECT system_x, system_y FROM systems WHERE system_id=1").fetchone()
+            stars = [r[0] for r in conn.execute("SELECT system_id FROM systems WHERE system_id != 1")]
+            rng = random.Random(3)
+            for _ in range(5):
+                moves = []
+                for sid in stars:
+                    a = rng.uniform(0.0, 2.0 * math.pi)
+                    dx = radius * math.cos(a)
+                    dy = radius * math.sin(a)
+                    for _ in range(rng.randint(0, 2)):
+                        dx = math.nextafter(dx, rng.choice((-math.inf, math.inf)))
+                    moves.append((x0 + dx, y0 + dy, sid))
+                conn.executemany("UPDATE systems SET system_x=?, system_y=? WHERE system_id=?", moves)
+                conn.commit()
+                db.invalidate_universe_cache("systems")
+                rows = travel.compute_reachability([("star", sid) for sid in stars])
+                expected = [travel.get_travel_display_data("star", sid) for sid in stars]
+                assert rows == expected
+                assert any(r["can_reach_jump"] for r in rows) and not all(r["can_reach_jump"] for r in rows)
+        finally:
+            activate(previous)
+
+
+if __name__ == "__main__":
+    test_bulk_matches_per_target()
+    test_jump_range_comes_from_galaxy_index()
+    test_jump_range_boundary_matches_per_target()
+    print("✅ All tests passed")
@@ -0,0 +1,197 @@
+# /tests/test_resource_engine.py
+
+"""
+Tests for game_controller/resource_engine.py: regeneration is closed-form and
+only touches the systems that are mined or settled, extraction clamps at the
+node's richness, mines deplete their node and lose output it cannot back,
+changed richness round-trips through locations and is patched into the
+universe cache in place, and the sim mines through ticks and fast-forward
+(for hours on the stock seed) with refills scheduled as sim events.
+"""
+
+import sys
+import sqlite3
+import tempfile
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data import db
+from game_controller.facility_engine import FacilityProduction
+from game_controller.resource_engine import REFILL_EVENT, ResourceField
+from game_controller.sim_loop import UniverseSimulator
+from tests.db_helpers import activate, make_seeded_db
+
+
+def _make_save(path: Path) -> None:
+    # Nodes 10, 11 in system 1 and 20 in system 2 regain 6 richness per minute (0.1/s); 12 never does.
+    conn = sqlite3.connect(path)
+    conn.executescript(db.SCHEMA_PATH.read_text(encoding="utf-8"))
+    conn.executescript(
+        """
+        INSERT INTO systems(system_id, system_name, system_x, system_y) VALUES (1, 'A', 0, 0), (2, 'B', 5, 0);
+        INSERT INTO locations(location_id, system_id, location_name, location_type, location_x, location_y,
+                              resource_type, richness, regen_rate)
+            VALUES (10, 1, 'Belt', 'asteroid_field', 1, 0, 'ore', 50, 6.0),
+                   (11, 1, 'Cloud', 'gas_clouds', 2, 0, 'gas', 80, 6.0),
+                   (12, 1, 'Vein', 'crystal_vein', 3, 0, 'crystal', 30, 0.0),
+                   (20, 2, 'Belt', 'asteroid_field', 1, 0, 'ore', 40, 6.0),
+                   (30, 2, 'Station', 'station', 0, 1, NULL, NULL, NULL);
+        INSERT INTO items(item_id, item_name, item_base_price) VALUES (1, 'Ore', 10);
+        INSERT INTO facilities(facility_id, location_id, facility_type) VALUES (1, 10, 'Mine');
+        INSERT INTO facility_outputs(facility_id, item_id, rate) VALUES (1, 1, 10.0);
+        """
+    )
+    conn.commit()
+    conn.close()
+
+
+def _field(path: Path, now_s: float = 0.0, facilities=None) -> ResourceField:
+    with sqlite3.connect(path) as conn:
+        return ResourceField.from_connection(conn, now_s, path, facilities)
+
+
+def test_regen_is_closed_form_and_lazy():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "game.db"
+        _make_save(path)
+        rf = _field(path)
+        assert rf.n_nodes == 4 and rf.system_ids == [1, 2]
+        assert rf.extract(10, 20.0, 100.0) == 20.0
+        assert rf.extract(12, 50.0, 100.0) == 30.0          # clamped at what is there
+        assert rf.extract(30, 5.0, 100.0) == 0.0            # not a resource node
+        # Only system 1 was settled; system 2 was never visited
+        assert list(rf.sys_t) == [100.0, 0.0]
+        # 30 s later: 3 back on node 10, the vein stays empty
+        assert abs(rf.richness(10, 130.0) - 33.0) < 1e-9 and rf.richness(12, 130.0) == 0.0
+        assert rf.richness(10, 1e6) == 50.0                 # capped at the starting richness
+        # System 1 comes due when node 10 is full; the vein never regenerates and stays empty
+        assert rf.next_refill_s() == 300.0
+        assert rf.settle_due(1e6) == 1 and rf.next_refill_s() is None
+        assert rf.stock[rf.node_index[10]] == 50.0 and rf.stock[rf.node_index[12]] == 0.0
+
+        rf2 = _field(path)
+        rf2.extract(20, 10.0, 0.0)
+        assert rf2.next_refill_s() == 100.0                 # 10 richness at 0.1/s
+        assert rf2.settle_due(99.0) == 0 and rf2.stock[rf2.node_index[20]] == 30.0
+        rf2.dirty.clear()
+        assert rf2.settle_due(150.0) == 1
+        assert rf2.stock[rf2.node_index[20]] == 40.0 and rf2.dirty == {rf2.node_index[20]}
+        assert rf2.next_refill_s() is None
+
+
+def test_mines_deplete_node_and_flush_round_trips():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "game.db"
+        _make_save(path)
+        with sqlite3.connect(path) as conn:
+            fp = FacilityProduction.from_connection(conn, path)
+        rf = _field(path, 0.0, fp)
+        rf.depletion_per_unit = 0.1
+        assert list(rf.mine_ptr) == [0, 1, 1]               # the mine sits on node 10 in system 1
+
+        mines = rf.mine_snapshot([1, 2], fp.qty)
+        fp.step([1], 10.0)                                  # 100 ore -> 10 richness
+        assert abs(rf.deplete_from_output(mines, fp, 10.0) - 10.0) < 1e-9
+        assert fp.get(1, 1) == 100.0 and abs(rf.stock[0] - 40.0) < 1e-9
+
+        rf.extract(10, 36.0, 10.0)                          # 4 richness left: backs 40 of the next 100 ore
+        mines = rf.mine_snapshot([1], fp.qty)
+        fp.step([1], 10.0)
+        assert abs(rf.deplete_from_output(mines, fp, 10.0) - 4.0) < 1e-9
+        assert rf.stock[0] == 0.0 and abs(fp.get(1, 1) - 140.0) < 1e-6
+        assert fp.dirty
+
+        assert rf.flush() == 4                              # first run records the cap on every node
+        assert rf.flush() == 0
+        with sqlite3.connect(path) as c:
+            assert c.execute("SELECT richness, richness_max, richness_s FROM locations WHERE location_id=10"
+                             ).fetchone() == (0, 50.0, 10.0)
+        again = _field(path, 110.0)                         # 100 s at 0.1/s since it was written
+        assert abs(again.richness(10, 110.0) - 10.0) < 1e-9 and again.cap[0] == 50.0
+
+
+def test_sim_mines_and_persists_richness():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "game.db"
+        _make_save(path)
+        previous = db.get_active_db_path()
+        activate(path)
+        try:
+            sim = UniverseSimulator()
+            sim._tick_once(0.5)
+            sim._resources.depletion_per_unit = 1.0            # a unit of ore per unit of richness
+            sim._tick_once(0.5)
+            assert sim.resource_richness(30) is None
+            start = sim.resource_richness(10)
+            assert start is not None and start < 50.0       # the mine drew on it this tick
+            assert sim.extract_resource(20, 15.0) == 15.0
+            (refill,) = sim.events().events_for(REFILL_EVENT, 2)  # refill runs on the sim's event clock
+            assert abs(refill.due_s - (sim.events().now_s + 150.0)) < 1e-6
+            result = sim.fast_forward(3600.0)
+            assert not sim.events().events_for(REFILL_EVENT, 2)
+            assert result["resource_rows"] > 0
+            sim.stop()
+            with sqlite3.connect(path) as c:
+                rich = dict(c.execute("SELECT location_id, richness FROM locations WHERE richness_max IS NOT NULL"))
+            assert set(rich) == {10, 11, 12, 20}
+            assert rich[10] < 50.0 and rich[11] == 80 and rich[20] == 40.0   # node 20 refilled in the hour
+        finally:
+            activate(previous)
+
+
+def test_flush_patches_cached_location_in_place():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "game.db"
+        _make_save(path)
+        previous = db.get_active_db_path()
+        activate(path)
+        try:
+            assert db.get_location(20)["richness"] == 40            # locations now cached
+            versions = db.get_universe_cache_versions()
+            misses = db.get_universe_cache_stats()["locations"]["misses"]
+            sim = UniverseSimulator()
+            assert sim.extract_resource(20, 15.0) == 15.0
+            assert sim.flush_all()["resources"] > 0
+            loc = db.get_location(20)
+            assert loc["richness"] == 25.0 and loc["richness_max"] == 40.0
+            assert db.get_universe_cache_versions() == versions      # no table reload
+            assert db.get_universe_cache_stats()["locations"]["misses"] == misses
+            assert sim.flush_all()["resources"] == 0                 # nothing new to write
+            sim.stop()
+        finally:
+            activate(previous)
+
+
+def test_seeded_mines_keep_depleting_for_hours():
+    """On the stock seed, mined nodes lose richness every half hour of a three-hour run."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        activate(make_seeded_db(Path(tmp)))
+        try:
+            sim = UniverseSimulator()
+            sim.fast_forward(60.0)
+            rf = sim._resources
+            mined = sorted({rf.location_ids[n] for n in rf.mine_node})
+            assert mined
+            db.get_location(mined[0])                                # cache the locations table
+            misses = db.get_universe_cache_stats()["locations"]["misses"]
+            totals = []
+            for _ in range(6):
+                sim.fast_forward(1800.0)
+                totals.append(sum(db.get_location(lid)["richness"] for lid in mined))
+            assert all(b < a for a, b in zip(totals, totals[1:]))
+            assert db.get_universe_cache_stats()["locations"]["misses"] == misses
+            sim.stop()
+        finally:
+            activate(previous)
+
+if __name__ == "__main__":
+    test_regen_is_closed_form_and_lazy()
+    test_mines_deplete_node_and_flush_round_trips()
+    test_sim_mines_and_persists_richness()
+    test_flush_patches_cached_location_in_place()
+    test_seeded_mines_keep_depleting_for_hours()
+    print("✅ All tests passed")
@@ -0,0 +1,114 @@
+# /tests/test_routing.py
+
+"""
+Tests for game/routing.py: A* routes agree with a plain Dijkstra on random
+gate networks for every metric, jump-range/fuel constraints are honoured, and
+the route cache is dropped when gate_links changes.
+"""
+
+import sys
+import heapq
+import math
+import random
+import sqlite3
+import tempfile
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data import db
+from data import seed as seed_module
+from game import routing
+from game.routing import GateNetwork
+from tests.db_helpers import activate
+
+
+def _dijkstra(adj, src, dst, by_jumps, limit):
+    best = {src: (0.0, 0.0)}
+    heap = [(0.0, 0.0, src)]
+    while heap:
+        c0, c1, n = heapq.heappop(heap)
+        if (c0, c1) != best[n]:
+            continue
+        if n == dst:
+            return best[n]
+        for nb, d in adj.get(n, ()):
+            if d > limit:
+                continue
+            cand = (c0 + 1.0, c1 + d) if by_jumps else (c0 + d, c1 + 1.0)
+            if nb not in best or cand < best[nb]:
+                best[nb] = cand
+                heapq.heappush(heap, (cand[0], cand[1], nb))
+    return None
+
+
+def _random_network(rng, n):
+    coords = {i: (rng.uniform(0, 300), rng.uniform(0, 300)) for i in range(1, n + 1)}
+    edges = []
+    for a in coords:
+        for b in rng.sample(list(coords), 3):
+            if a != b:
+                (ax, ay), (bx, by) = coords[a], coords[b]
+                edges.append((a, b, round(math.hypot(ax - bx, ay - by), 3)))
+    return GateNetwork(edges, coords)
+
+
+def test_astar_matches_dijkstra():
+    """Route costs equal Dijkstra's for distance, jumps and jump-limited searches."""
+    rng = random.Random(11)
+    net = _random_network(rng, 400)
+    for _ in range(150):
+        src, dst = rng.randint(1, 400), rng.randint(1, 400)
+        for metric, limit in (("distance", math.inf), ("jumps", math.inf), ("fuel", 120.0)):
+            expected = _dijkstra(net.adj, src, dst, metric == "jumps", limit)
+            route = net.find_route(src, dst, metric, None if limit == math.inf else limit)
+            if expected is None:
+                assert route is None
+                continue
+            if metric == "jumps":
+                assert route.jumps == int(expected[0])
+                assert math.isclose(route.distance_ly, expected[1], abs_tol=1e-6)
+            else:
+                assert math.isclose(route.distance_ly, expected[0], abs_tol=1e-6)
+            assert route.systems[0] == src and route.systems[-1] == dst
+            assert len(route.systems) == route.jumps + 1
+
+
+def test_fuel_feasible_and_cache_invalidation():
+    """Seeded save: fuel budget/jump range are respected; gate_links invalidation clears the cache."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        path = Path(tmp) / "game.db"
+        conn = sqlite3.connect(path)
+        conn.executescript(db.SCHEMA_PATH.read_text(encoding="utf-8"))
+        seed_module.seed(conn)
+        conn.commit()
+        conn.close()
+        activate(path)
+        try:
+            net = routing.get_network()
+            src = min(net.adj)
+            dst = max(net.adj, key=lambda s: len(routing.find_route(src, s).systems) if routing.find_route(src, s) else 0)
+            route = routing.shortest_route(src, dst)
+            assert route is not None and route.jumps >= 2
+            assert routing.fuel_feasible_route(src, dst, jump_range_ly=1000.0, fuel_budget=route.fuel - 1) is None
+            ok = routing.fuel_feasible_route(src, dst, jump_range_ly=1000.0, fuel_budget=route.fuel + 1)
+            assert ok is not None and math.isclose(ok.distance_ly, route.distance_ly)
+
+            hits = routing.route_cache_stats()["hits"]
+            routing.shortest_route(src, dst)
+            assert routing.route_cache_stats()["hits"] == hits + 1
+
+            db.invalidate_universe_cache("gate_links")
+            assert routing.get_network() is not net
+            assert routing.route_cache_stats()["size"] == 0
+        finally:
+            activate(previous)
+
+
+if __name__ == "__main__":
+    test_astar_matches_dijkstra()
+    test_fuel_feasible_and_cache_invalidation()
+    print("✅ All tests passed")
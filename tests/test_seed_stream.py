@@ -0,0 +1,114 @@
+# /tests/test_seed_stream.py
+
+"""
+Tests for the streaming seed loader in data/seed.py: the incremental JSON
+reader survives arbitrary read boundaries, sections load in file order with
+deferred foreign keys, and dangling references are cleared or dropped the
+way the old whole-file loader skipped them.
+"""
+
+import sys
+import io
+import json
+import sqlite3
+import tempfile
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data import migrations
+from data import seed as seed_module
+
+
+def test_stream_reader_tiny_reads():
+    """Values split across reads (numbers, strings, nesting) decode the same as json.load."""
+    doc = {
+        "generated_at": "2025-01-01T00:00:00Z",
+        "meta": {"note": "x" * 50},
+        "empty": [],
+        "systems": [{"system_id": i, "system_x": -12345 + i, "name": f"Sé {i}"} for i in range(40)],
+        "skipped": [[1, 2], {"a": [3, 4.5e3]}],
+        "numbers": [1, 22, 333, -4.25],
+    }
+    text = json.dumps(doc, indent=1)
+    for read_chars in (1, 3, 7, 64):
+        out = {}
+        for key, val in seed_module.SeedStream(io.StringIO(text), read_chars).sections():
+            if key == "skipped":
+                next(val)  # partly consumed arrays are drained before the next section
+                continue
+            out[key] = list(val) if not isinstance(val, (dict, str)) else val
+        doc_without = {k: v for k, v in doc.items() if k != "skipped"}
+        assert out == doc_without
+
+
+def test_out_of_order_sections_and_dangling_refs():
+    """Children before parents load with FKs on; orphans are nulled or dropped before commit."""
+    doc = {
+        "facilities": [
+            {"facility_id": 1, "location_id": 11, "facility_type": "Mine",
+             "inputs": [{"item_id": 1, "rate": 1}], "outputs": [{"item_id": 1, "rate": 2}]},
+            {"facility_id": 2, "location_id": 99, "facility_type": "Mine",
+             "inputs": [{"item_id": 1, "rate": 1}], "outputs": []},
+        ],
+        "locations": [
+            {"location_id": 12, "system_id": 1, "location_name": "Moon", "location_type": "moon",
+             "parent_location_id": 11},
+            {"location_id": 11, "system_id": 1, "location_name": "Rock", "location_type": "resource"},
+            {"location_id": 13, "system_id": 1, "location_name": "Lost", "location_type": "moon",
+             "parent_location_id": 500},
+            {"location_id": 99, "system_id": 7, "location_name": "Nowhere", "location_type": "planet"},
+        ],
+        "warpgates": [{"system_id": 1, "location_id": 14}],
+        "resource_nodes": [{"location_id": 11, "resource_type": "gas_cloud", "richness": 50, "regen_rate": 0.5}],
+        "systems": [{"system_id": 1, "system_name": "One", "system_x": 0, "system_y": 0}],
+        "ownerships": [{"system_id": 1, "race_id": 42, "status": "claimed"}],
+        "items": [{"item_id": 1, "item_name": "Ore", "item_base_price": 10}],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "seed.json"
+        src.write_text(json.dumps(doc), encoding="utf-8")
+        conn = sqlite3.connect(Path(tmp) / "game.db")
+        try:
+            conn.execute("PRAGMA foreign_keys=ON;")
+            migrations.migrate(conn)
+            seed_module.seed(conn, src)
+            locs = dict(conn.execute("SELECT location_id, parent_location_id FROM locations").fetchall())
+            assert locs == {11: None, 12: 11, 13: None, 14: None}  # 99 dropped (no system), 14 = created gate
+            assert conn.execute("SELECT location_type FROM locations WHERE location_id=14").fetchone()[0] == "warp_gate"
+            assert conn.execute("SELECT resource_type, richness FROM locations WHERE location_id=11").fetchone() == ("gas_clouds", 50)
+            assert [r[0] for r in conn.execute("SELECT facility_id FROM facilities")] == [1]
+            assert conn.execute("SELECT COUNT(*) FROM facility_inputs").fetchone()[0] == 1
+            assert conn.execute("SELECT race_id FROM ownerships").fetchone()[0] is None
+            assert conn.execute("PRAGMA foreign_key_check;").fetchall() == []
+        finally:
+            conn.close()
+
+
+def test_shipped_seed_loads_fully():
+    """The bundled universe streams in with every system, location and facility."""
+    with open(seed_module.SEED_PATHS[0], "r", encoding="utf-8") as f:
+        doc = json.load(f)
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(Path(tmp) / "game.db")
+        try:
+            conn.execute("PRAGMA foreign_keys=ON;")
+            migrations.migrate(conn)
+            seed_module.seed(conn, seed_module.SEED_PATHS[0])
+            assert conn.execute("SELECT COUNT(*) FROM systems").fetchone()[0] == len(doc["systems"])
+            assert conn.execute("SELECT COUNT(*) FROM locations").fetchone()[0] == len(doc["locations"])
+            assert conn.execute("SELECT COUNT(*) FROM facilities").fetchone()[0] == len(doc["facilities"])
+            assert conn.execute("SELECT COUNT(*) FROM locations WHERE resource_type IS NOT NULL").fetchone()[0] \
+                == len(doc["resource_nodes"])
+            assert conn.execute("SELECT COUNT(*) FROM player").fetchone()[0] == 1
+        finally:
+            conn.close()
+
+
+if __name__ == "__main__":
+    test_stream_reader_tiny_reads()
+    test_out_of_order_sections_and_dangling_refs()
+    test_shipped_seed_loads_fully()
+    print("✅ All tests passed")
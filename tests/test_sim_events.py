@@ -0,0 +1,165 @@
+# /tests/test_sim_events.py
+
+"""
+Tests for game_controller/sim_events.py: the timing wheel returns exactly the
+entries a brute-force scan would (including far-future overflow), the
+scheduler fires only due events with bulk schedule/cancel, repeating events
+catch up with an occurrence count, and pending events plus the sim clock
+survive a flush and reload through the save.
+"""
+
+import sys
+import random
+import sqlite3
+import tempfile
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data import db
+from data import migrations
+from game_controller import sim_events
+from game_controller.resource_engine import REFILL_EVENT
+from game_controller.sim_events import SimEventScheduler, TimingWheel
+from game_controller.sim_loop import UniverseSimulator
+from tests.db_helpers import activate
+
+
+def test_wheel_matches_brute_force():
+    """Random ticks across every level and the overflow heap fire at their tick, in order."""
+    rng = random.Random(7)
+    horizon = 1 << sim_events._SPAN_BITS[-1]
+    wheel = TimingWheel(5)
+    pending = []
+    for i in range(3000):
+        span = rng.choice((40, 300, 20000, 2_000_000, horizon * 3))
+        tick = 5 + rng.randint(-3, span)
+        wheel.add((tick, i, None))
+        pending.append((tick, i))
+    targets = sorted(rng.sample(range(6, horizon * 3 + 10), 60)) + [horizon * 3 + 10]
+    cur = 5
+    got_all = []
+    for target in [cur + 1, cur + 255, cur + 256, cur + 70000] + targets:
+        if target <= cur:
+            continue
+        got = wheel.advance_to(target)
+        expect = sorted(p for p in pending if p[0] <= target)
+        pending = [p for p in pending if p[0] > target]
+        assert sorted((t, i) for t, i, _ in got) == expect
+        ticks = [t for t, _, _ in got if t > cur]
+        assert ticks == sorted(ticks)
+        got_all.extend(got)
+        cur = target
+        # Entries added mid-run land relative to the new position
+        extra = (cur + rng.randint(1, 5000), 10_000 + len(got_all), None)
+        wheel.add(extra)
+        pending.append(extra[:2])
+    assert len(wheel) == len(pending)
+
+
+def test_only_due_events_fire_and_bulk_cancel():
+    sched = SimEventScheduler(resolution_s=1.0)
+    fired = []
+    sched.register("regen", lambda evs, now: fired.extend((e.entity_id, e.due_s) for e in evs))
+    ids = sched.schedule_many("regen", [(10.0 * k, k) for k in range(1, 101)])
+    assert len(ids) == 100 and sched.pending("regen") == 100
+
+    assert sched.advance(25.0) == 2
+    assert fired == [(1, 10.0), (2, 20.0)]
+
+    assert sched.cancel_many(ids[2:10]) == 8          # entities 3..10
+    assert sched.cancel_for("regen", [11, 12, 999]) == 2
+    assert not sched.cancel(ids[0])                   # already fired
+    fired.clear()
+    assert sched.advance(100.0) == 0
+    assert sched.advance(10.0) == 1                   # t=135: entity 13 at 130
+    assert fired == [(13, 130.0)]
+
+    # Unhandled kinds wait until a handler is registered
+    sched.schedule("arrival", delay_s=1.0, entity_id=5)
+    sched.advance(5.0)
+    assert sched.pending("arrival") == 1
+    seen = []
+    sched.register("arrival", lambda evs, now: seen.extend(e.entity_id for e in evs))
+    sched.advance(0.5)
+    assert seen == [5] and sched.pending("arrival") == 0
+
+
+def test_repeating_events_catch_up():
+    sched = SimEventScheduler(resolution_s=1.0)
+    hits = []
+    sched.register("cycle", lambda evs, now: hits.extend((e.entity_id, e.occurrences) for e in evs))
+    eid = sched.schedule("cycle", 60.0, entity_id=1, interval_s=60.0)
+    sched.advance(59.0)
+    assert hits == []
+    sched.advance(1.0)
+    assert hits == [(1, 1)]
+    sched.advance(600.0)                              # t=660: periods at 120..660
+    assert hits[-1] == (1, 10)
+    assert sched.get(eid).due_s == 720.0
+    assert sched.pending("cycle") == 1
+
+
+def test_persistence_round_trip():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "game.db"
+        conn = sqlite3.connect(path)
+        try:
+            migrations.migrate(conn)
+            sched = SimEventScheduler.from_connection(conn, path, resolution_s=1.0)
+            sched.register("deadline", lambda evs, now: None)
+            sched.schedule_many("deadline", [(5.0, 1), (50.0, 2, {"reward": 10}), (500.0, 3)])
+            sched.advance(10.0)
+            assert sched.flush(conn) == 3                 # two upserts + one delete
+            assert sched.flush(conn) == 0
+
+            again = SimEventScheduler.from_connection(conn, path, resolution_s=1.0)
+            assert again.now_s == 10.0
+            assert again.pending() == 2
+            assert [e.payload for e in again.events_for("deadline", 2)] == [{"reward": 10}]
+            new_id = again.schedule("deadline", delay_s=1.0)
+            assert new_id > max(e.event_id for e in again._events.values() if e.event_id != new_id)
+        finally:
+            conn.close()
+
+
+def test_sim_tick_and_fast_forward_fire_events():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "game.db"
+        conn = sqlite3.connect(path)
+        conn.executescript(db.SCHEMA_PATH.read_text(encoding="utf-8"))
+        conn.close()
+        previous = db.get_active_db_path()
+        activate(path)
+        try:
+            sim = UniverseSimulator()
+            fired = []
+            sim.register_event_handler("ping", lambda evs, now: fired.extend(e.entity_id for e in evs))
+            sim.events().schedule("ping", delay_s=0.4, entity_id=1)
+            sim.events().schedule("ping", delay_s=3000.0, entity_id=2)
+            sim._tick_once(0.5)
+            assert fired == []                            # due at 0.4 s, fires on the 1 s resolution tick
+            sim._tick_once(0.5)
+            assert fired == [1]
+            refilled = sim._resources.refilled
+            result = sim.fast_forward(3600.0)
+            refills = sim._resources.refilled - refilled    # mined systems' REFILL_EVENTs
+            assert result["events_fired"] == 1 + refills and fired == [1, 2]
+            sim.stop()
+            with sqlite3.connect(path) as c:
+                assert c.execute("SELECT now_s FROM sim_clock WHERE id = 1").fetchone()[0] == 3601.0
+                assert c.execute("SELECT COUNT(*) FROM sim_events WHERE kind != ?",
+                                 (REFILL_EVENT,)).fetchone()[0] == 0
+        finally:
+            activate(previous)
+
+
+if __name__ == "__main__":
+    test_wheel_matches_brute_force()
+    test_only_due_events_fire_and_bulk_cancel()
+    test_repeating_events_catch_up()
+    test_persistence_round_trip()
+    test_sim_tick_and_fast_forward_fire_events()
+    print("✅ All tests passed")
@@ -0,0 +1,99 @@
+# /tests/test_sim_lod.py
+
+"""
+Tests for game_controller/sim_lod.py and the simulator's LOD handling: tiers
+follow galaxy distance and the travel corridor, coarse market steps match the
+per-tick stock path exactly, and the tick recomputes tiers and catches up
+requested systems.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data import db
+from game.galaxy_index import GalaxyIndex
+from game_controller.market_engine import MarketArrays
+from game_controller.sim_loop import UniverseSimulator
+from game_controller.sim_lod import TIER_FAR, TIER_MID, TIER_NEAR, LodTiers
+from tests.db_helpers import activate, make_seeded_db
+
+
+def test_tiers_follow_distance_and_route_corridor():
+    """Systems on a 1-D line: near/mid/far by distance, and near along the travel leg."""
+    ids = list(range(1, 11))
+    idx = GalaxyIndex.build(ids, [float(i * 10) for i in ids], [0.0] * 10)
+
+    t = LodTiers.compute(idx, ids, [1], near_ly=15.0, mid_ly=35.0, route_ly=5.0)
+    assert t.ids[TIER_NEAR] == [1, 2]
+    assert t.ids[TIER_MID] == [3, 4]
+    assert t.ids[TIER_FAR] == [5, 6, 7, 8, 9, 10]
+
+    routed = LodTiers.compute(idx, ids, [1], route=[4, 8], near_ly=15.0, mid_ly=35.0, route_ly=5.0)
+    assert routed.ids[TIER_NEAR] == [1, 2, 4, 5, 6, 7, 8]
+    assert routed.tier_of(10) == TIER_FAR
+
+    assert LodTiers.compute(idx, ids, [None]).ids[TIER_NEAR] == ids
+
+
+def test_advance_matches_per_tick_stock_and_moves_price():
+    """One n-tick advance reproduces n reversion steps exactly; scarcity still lifts price."""
+    def market() -> MarketArrays:
+        m = MarketArrays([1], [1], [100.0])
+        m.present[0] = 1
+        m.price[0] = 100.0
+        m.baseline[0] = 500.0
+        m.stock[0] = 100.0
+        return m
+
+    ticked, advanced = market(), market()
+    for frame in range(50):
+        ticked.step([1], frame, 0.0, factors={1: 1.0})
+    advanced.advance([(1, 50)], 0, 0.0)
+    assert abs(advanced.stock[0] - ticked.stock[0]) < 1e-9
+    assert 100.0 < advanced.price[0] <= ticked.price[0]
+    assert advanced.dirty == {0}
+
+
+def test_simulator_tiers_and_catch_up():
+    """Tiers center on the player; requested far systems are caught up on the next tick."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        path = make_seeded_db(Path(tmp))
+        activate(path)
+        sim = UniverseSimulator()
+        try:
+            sim._tick_once(0.5)
+            tiers = sim._lod
+            assert tiers is not None and sum(tiers.counts().values()) == 200
+            player_sys = db.get_connection().execute(
+                "SELECT current_player_system_id FROM player WHERE id = 1").fetchone()[0]
+            assert tiers.tier_of(player_sys) == TIER_NEAR
+            assert tiers.ids[TIER_FAR]
+
+            fp = sim._facilities
+            target = next(sid for sid in tiers.ids[TIER_FAR] if sid in fp.sys_row)
+            sim._facility_last_t.pop(target, None)
+            sim.request_advance(target)
+            sim._tick_once(0.5)
+            assert target in sim._facility_last_t
+
+            sim.set_travel_route([player_sys, target])
+            sim._tick_once(0.5)
+            assert sim._lod.tier_of(target) == TIER_NEAR
+            sim.on_player_arrival(target)
+            sim._tick_once(0.5)
+            assert sim._route_system_ids == []
+        finally:
+            activate(previous)
+
+
+if __name__ == "__main__":
+    test_tiers_follow_distance_and_route_corridor()
+    test_advance_matches_per_tick_stock_and_moves_price()
+    test_simulator_tiers_and_catch_up()
+    print("✅ All tests passed")
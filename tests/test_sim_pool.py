@@ -0,0 +1,159 @@
+# /tests/test_sim_pool.py
+
+"""
+Tests for game_controller/sim_pool.py: market and facility steps run by the
+shared-memory worker pool match the in-process step exactly, snapshots are
+republished when the engines change, the pool is only chosen while it measures
+faster than in-process (and never on a single core), and the simulator tick
+can use the pool.
+"""
+
+import sys
+import copy
+import sqlite3
+import tempfile
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data import db
+from game_controller.facility_engine import FacilityProduction
+from game_controller.market_engine import MarketArrays
+from game_controller.sim_loop import UniverseSimulator
+from game_controller import sim_pool
+from game_controller.sim_pool import SimWorkerPool
+from tests.db_helpers import activate, make_seeded_db
+
+
+def _synthetic_markets(n_systems: int, n_items: int) -> MarketArrays:
+    """Dense engine with every cell present and stocks off baseline so every branch runs."""
+    m = MarketArrays(list(range(1, n_systems + 1)), list(range(1, n_items + 1)),
+                     [10.0 * (i + 1) for i in range(n_items)])
+    for c in range(n_systems * n_items):
+        if c % 7 == 3:
+            continue  # leave some cells without a market row
+        m.present[c] = 1
+        m.price[c] = 10.0 + (c % 13)
+        m.baseline[c] = 100.0
+        m.stock[c] = 100.0 if c % 2 else 60.0 + (c % 50)
+    return m
+
+
+def test_pool_market_step_matches_in_process():
+    """Sharded worker steps on shared memory give the same prices, stocks and dirty rows."""
+    local = _synthetic_markets(60, 5)
+    shared = copy.deepcopy(local)
+    pool = SimWorkerPool(2)
+    try:
+        pool.bind(shared, None)
+        for frame in range(1, 4):
+            sids = list(range(1, 61, 1 if frame % 2 else 2))
+            local.step(sids, frame, 0.01)
+            touched = pool.step_markets(shared, shared.step_rows_for(sids, frame, 0.01))
+            assert touched > 0
+        assert list(shared.price) == list(local.price)
+        assert list(shared.stock) == list(local.stock)
+        assert shared.dirty == local.dirty
+    finally:
+        pool.close()
+
+
+def test_pool_facility_step_and_rebind():
+    """Facility production through the pool matches in-process; a new engine republishes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_seeded_db(Path(tmp))
+        conn = sqlite3.connect(path)
+        try:
+            local = FacilityProduction.from_connection(conn, path)
+            shared = FacilityProduction.from_connection(conn, path)
+        finally:
+            conn.close()
+        sids = sorted(local.sys_row)
+        pool = SimWorkerPool(2)
+        try:
+            pool.bind(None, shared)
+            for _ in range(3):
+                a = local.step(sids, 1.0)
+                b = pool.step_facilities(shared, shared.step_rows_for((sid, 1.0) for sid in sids))
+                assert a == b
+            assert list(shared.qty) == list(local.qty)
+            assert shared.dirty == local.dirty
+
+            # Structural change (new slot) forces a fresh snapshot generation.
+            gen = pool._gen
+            shared.add(local.facility_ids[0], 999, 1.0)
+            pool.bind(None, shared)
+            assert pool._gen == gen + 1
+            pool.step_facilities(shared, shared.step_rows_for((sid, 1.0) for sid in sids))
+        finally:
+            pool.close()
+
+
+def test_simulator_tick_uses_pool():
+    """With the pool enabled and no size threshold, ticks still produce and sell."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        path = make_seeded_db(Path(tmp))
+        activate(path)
+        sim = UniverseSimulator()
+        sim._max_workers = 2
+        sim._pool_min_rows = 0
+        sim._pool_min_cpus = 1
+        sim.set_use_process_pool(True)
+        try:
+            sim._tick_once(0.5)
+            sim._tick_once(0.5)
+            assert sim._pool is not None and sim._pool._layout is not None
+            assert sim._facilities.units_sold > 0
+        finally:
+            sim.set_use_process_pool(False)
+            activate(previous)
+
+
+def test_pool_chosen_only_while_faster():
+    """A step kind uses the pool until it measures slower than in-process, then re-probes."""
+    pool = SimWorkerPool(1)
+    try:
+        assert pool.wants("markets")                      # unmeasured: try the pool
+        pool.record("markets", True, 1000, 0.011)
+        assert not pool.wants("markets")                  # then measure in-process
+        pool.record("markets", False, 1000, 0.010)
+        declined = [pool.wants("markets") for _ in range(sim_pool.REPROBE_EVERY)]
+        assert declined.count(True) == 1 and declined[-1]
+        assert pool.wants("facilities")                   # kinds are measured separately
+        for _ in range(20):
+            pool.record("markets", True, 1000, 0.002)
+        assert pool.wants("markets")
+        pool_s, local_s = pool.costs()["markets"]
+        assert pool_s < local_s
+    finally:
+        pool.close()
+
+
+def test_single_core_never_starts_pool():
+    """Below the CPU floor the simulator refuses the pool and stays in-process."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        activate(make_seeded_db(Path(tmp)))
+        sim = UniverseSimulator()
+        sim._pool_min_rows = 0
+        sim._pool_min_cpus = sim_pool.usable_cpus() + 1
+        try:
+            sim.set_use_process_pool(True)
+            assert sim._pool is None and not sim._use_process_pool
+            sim._tick_once(0.5)
+            assert sim._pool is None
+        finally:
+            sim.set_use_process_pool(False)
+            activate(previous)
+
+
+if __name__ == "__main__":
+    test_pool_market_step_matches_in_process()
+    test_pool_facility_step_and_rebind()
+    test_simulator_tick_uses_pool()
+    test_pool_chosen_only_while_faster()
+    test_single_core_never_starts_pool()
+    print("✅ All tests passed")
@@ -0,0 +1,109 @@
+# /tests/test_sql_profiler.py
+
+"""
+Tests for the opt-in SQL profiler in data/db.py: per-thread statement counts
+and latencies, calling function attribution, and EXPLAIN QUERY PLAN logging
+for statements over the slow threshold.
+"""
+
+import sys
+import logging
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data import db
+from tests.db_helpers import activate, make_seeded_db
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__(logging.DEBUG)
+        self.messages = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(record.getMessage())
+
+
+def _read_systems_from_sim_thread() -> None:
+    def work() -> None:
+        for _ in range(3):
+            db.get_connection().execute("SELECT COUNT(*) FROM systems").fetchone()
+        db.close_active_connection()
+    t = threading.Thread(target=work, name="UniverseSim")
+    t.start()
+    t.join()
+
+
+def test_profile_counts_by_thread_and_caller():
+    """Statements are keyed by thread, counted, timed and attributed to their caller."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        activate(make_seeded_db(Path(tmp)))
+        db.reset_sql_profile()
+        db.enable_sql_profiling(slow_ms=1e9, report_interval_s=1e9)
+        try:
+            for _ in range(4):
+                db.get_player_full()
+            _read_systems_from_sim_thread()
+
+            rows = {(r["thread"], r["sql"]): r for r in db.get_sql_profile() if r["timed"]}
+            player = rows[(threading.current_thread().name, "SELECT * FROM player WHERE id=1")]
+            assert player["count"] == 4
+            assert player["callers"][0][0] == "data.db.get_player_full"
+            assert 0.0 <= player["p50_ms"] <= player["p95_ms"] <= player["max_ms"]
+
+            sim = rows[("UniverseSim", "SELECT COUNT(*) FROM systems")]
+            assert sim["count"] == 3
+            assert sim["callers"][0][0].endswith(".work")
+        finally:
+            db.disable_sql_profiling()
+            db.reset_sql_profile()
+            activate(previous)
+
+
+def test_slow_query_logs_plan_once():
+    """Crossing the slow threshold logs the query plan, only once per statement."""
+    handler = _ListHandler()
+    db.logger.addHandler(handler)
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        activate(make_seeded_db(Path(tmp)))
+        db.reset_sql_profile()
+        db.enable_sql_profiling(slow_ms=0.0, report_interval_s=1e9)
+        try:
+            conn = db.get_connection()
+            for _ in range(3):
+                conn.execute("SELECT * FROM systems WHERE system_x > ?", (0,)).fetchall()
+            slow = [m for m in handler.messages if "SELECT * FROM systems WHERE system_x > ?" in m]
+            assert len(slow) == 1
+            assert "SCAN systems" in slow[0]
+        finally:
+            db.logger.removeHandler(handler)
+            db.disable_sql_profiling()
+            db.reset_sql_profile()
+            activate(previous)
+
+
+def test_disabled_by_default_uses_plain_connections():
+    """With profiling off, connections are plain sqlite3 connections."""
+    assert not db.is_sql_profiling_enabled()
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        activate(make_seeded_db(Path(tmp)))
+        try:
+            assert type(db.get_connection()) is sqlite3.Connection
+        finally:
+            activate(previous)
+
+
+if __name__ == "__main__":
+    test_profile_counts_by_thread_and_caller()
+    test_slow_query_logs_plan_once()
+    test_disabled_by_default_uses_plain_connections()
+    print("✅ All tests passed")
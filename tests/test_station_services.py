@@ -5,6 +5,7 @@ Test script to verify station service system is working correctly
 """
 
 import sys
+import tempfile
 from pathlib import Path
 
 # Add project root to path
@@ -13,13 +14,22 @@ sys.path.insert(0, str(project_root))
 
 from game_controller.log_config import get_system_logger
 from data import db
+from tests.db_helpers import activate, make_seeded_db
 
 logger = get_system_logger('test_station_services')
 
 def test_station_services():
     """Test the new station service system."""
     logger.info("Testing station service system")
-    
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        activate(make_seeded_db(Path(tmp)))
+        try:
+            _check_station_services()
+        finally:
+            activate(previous)
+
+def _check_station_services():
     # Get all stations
     conn = db.get_connection()
     stations = conn.execute("""
@@ -60,7 +70,15 @@ def test_station_services():
 def test_facility_types():
     """Check what facility types exist in the database."""
     logger.info("Checking facility types in database")
-    
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        activate(make_seeded_db(Path(tmp)))
+        try:
+            _check_facility_types()
+        finally:
+            activate(previous)
+
+def _check_facility_types():
     conn = db.get_connection()
     facility_types = conn.execute("""
         SELECT facility_type, COUNT(*) as count
@@ -0,0 +1,103 @@
+# /tests/test_status_snapshot.py
+
+"""
+Tests for the memoized status snapshot in game/player_status.py: repeated
+calls hit no DB, mutators bump the version stamp and notify listeners, and
+fuel drips patch the cached snapshot instead of rebuilding it, and a save
+recreated at the same path is not served from the old save's caches.
+"""
+
+import sys
+import sqlite3
+import tempfile
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data import db
+from game import player_status, travel
+from tests.db_helpers import activate, make_seeded_db
+
+
+PLAYER_FUEL_SQL = "UPDATE player SET current_player_ship_fuel=50 WHERE id=1"
+
+
+def test_snapshot_memoized_and_invalidated_by_mutators():
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        activate(make_seeded_db(Path(tmp), PLAYER_FUEL_SQL))
+        seen = []
+        player_status.add_status_listener(seen.append)
+        try:
+            first = player_status.get_status_snapshot()
+            statements = []
+            db.get_connection().set_trace_callback(statements.append)
+            second = player_status.get_status_snapshot()
+            db.get_connection().set_trace_callback(None)
+            assert second == first
+            assert not [s for s in statements if "player" in s.lower()]
+
+            # Callers get copies
+            second["fuel"] = -1
+            assert player_status.get_status_snapshot()["fuel"] == first["fuel"]
+
+            # Fuel drip: patched in place, no rebuild, listeners told
+            v0 = player_status.get_status_version()
+            player_status.adjust_fuel(-2.5)
+            assert player_status.get_status_version() > v0 and seen[-1] == player_status.get_status_version()
+            assert player_status.get_status_snapshot()["fuel"] == 47.5
+
+            player_status.set_ship_state("Warping")
+            assert player_status.get_status_snapshot()["status"] == "Warping"
+            player_status.clear_temporary_state()
+
+            sid = first["system_id"]
+            other = next(r["location_id"] for r in db.get_locations(sid) if r["location_id"] != first["location_id"])
+            player_status.dock_at_location(other)
+            snap = player_status.get_status_snapshot()
+            assert snap["location_id"] == other and snap["status"] == "Docked"
+
+            travel.perform_travel("star", sid)
+            assert player_status.get_status_snapshot()["location_id"] is None
+
+            db.set_custom_ship_name("Testbed")
+            assert player_status.get_status_snapshot()["ship_name"] == "Testbed"
+        finally:
+            player_status.remove_status_listener(seen.append)
+            db.flush_player_state()
+            activate(previous)
+
+
+def test_recreated_save_at_same_path_drops_caches():
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        path = make_seeded_db(Path(tmp), PLAYER_FUEL_SQL)
+        try:
+            activate(path)
+            player_status.adjust_fuel(1e9)                  # clamp caches the ship's max fuel
+            old_max = player_status.get_status_snapshot()["fuel_max"]
+            assert player_status.get_status_snapshot()["fuel"] == old_max
+            activate(path)
+            # A new game written over the same file, with a bigger ship
+            with sqlite3.connect(path) as conn:
+                ship_id = conn.execute("SELECT ship_id FROM ships WHERE base_ship_fuel > ? "
+                                       "ORDER BY base_ship_fuel LIMIT 1", (old_max,)).fetchone()[0]
+                new_max = conn.execute("SELECT base_ship_fuel FROM ships WHERE ship_id=?", (ship_id,)).fetchone()[0]
+                conn.execute("UPDATE player SET current_player_ship_id=?, current_player_ship_fuel=10 WHERE id=1",
+                             (ship_id,))
+            activate(path)
+            snap = player_status.get_status_snapshot()
+            assert snap["fuel"] == 10 and snap["fuel_max"] == new_max
+            player_status.adjust_fuel(1e9)
+            assert player_status.get_status_snapshot()["fuel"] == new_max
+        finally:
+            db.flush_player_state()
+            activate(previous)
+
+
+if __name__ == "__main__":
+    test_snapshot_memoized_and_invalidated_by_mutators()
+    test_recreated_save_at_same_path_drops_caches()
+    print("✅ All tests passed")
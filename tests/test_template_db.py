@@ -0,0 +1,65 @@
+# /tests/test_template_db.py
+
+"""
+Tests for save/template_db.py: the new-game template is built once per input
+set, rebuilt when an input changes, and clones into a ready, migrated save.
+"""
+
+import sys
+import sqlite3
+import tempfile
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data import migrations
+from save import template_db
+
+
+def test_template_is_built_once():
+    """A second ensure_template() with unchanged inputs reuses the cached file."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = Path(tmp) / "cache"
+        first = template_db.ensure_template(cache)
+        stamp = first.stat().st_mtime_ns
+        second = template_db.ensure_template(cache)
+        assert first == second
+        assert second.stat().st_mtime_ns == stamp
+
+
+def test_changed_input_rebuilds_and_prunes():
+    """Editing any input produces a new template and removes the stale one."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = Path(tmp) / "cache"
+        extra = Path(tmp) / "extra.json"
+        extra.write_text("{}", encoding="utf-8")
+        inputs = template_db.template_inputs() + [extra]
+        old = template_db.ensure_template(cache, inputs)
+        extra.write_text('{"changed": true}', encoding="utf-8")
+        new = template_db.ensure_template(cache, inputs)
+        assert new != old
+        assert new.exists()
+        assert not old.exists()
+
+
+def test_clone_is_seeded_and_migrated():
+    """A cloned save has the universe and the current schema version."""
+    with tempfile.TemporaryDirectory() as tmp:
+        dest = Path(tmp) / "game.db"
+        template_db.clone_template(dest, Path(tmp) / "cache")
+        conn = sqlite3.connect(dest)
+        try:
+            assert migrations.get_schema_version(conn) == migrations.SCHEMA_VERSION
+            assert conn.execute("SELECT COUNT(*) FROM systems").fetchone()[0] > 0
+            assert conn.execute("SELECT COUNT(*) FROM player WHERE id=1").fetchone()[0] == 1
+        finally:
+            conn.close()
+
+
+if __name__ == "__main__":
+    test_template_is_built_once()
+    test_changed_input_rebuilds_and_prunes()
+    test_clone_is_seeded_and_migrated()
+    print("✅ All tests passed")
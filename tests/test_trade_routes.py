@@ -0,0 +1,201 @@
+# /tests/test_trade_routes.py
+
+"""
+Tests for game/trade_routes.py: the per-item source/sink indexes match a
+brute-force scan after incremental price drift, routes respect jump, fuel,
+cargo and credit limits, reachability keeps paths consistent when a system
+is reached on less fuel in more jumps, a query over a few thousand systems stays fast,
+and the sim keeps its index current through ticks.
+"""
+
+import sys
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data import db
+from game import routing, trade_routes
+from game.routing import GateNetwork
+from game.trade_routes import TradeIndex
+from game_controller.market_engine import MarketArrays
+from game_controller.sim_loop import UniverseSimulator
+from tests.db_helpers import activate
+
+
+def _engine(n_systems: int, n_items: int, seed: int = 7) -> MarketArrays:
+    rng = random.Random(seed)
+    m = MarketArrays(list(range(1, n_systems + 1)), list(range(100, 100 + n_items)),
+                     [100.0] * n_items)
+    for c in range(n_systems * n_items):
+        m.present[c] = 1
+        m.price[c] = float(rng.randint(50, 150))
+        m.stock[c] = float(rng.choice((0, 5, 200)))
+    return m
+
+
+def _line(n: int, dist: float = 1.0) -> GateNetwork:
+    return GateNetwork([(s, s + 1, dist) for s in range(1, n)], {})
+
+
+def _brute(m: MarketArrays, item_col: int, k: int, sinks: bool):
+    cells = [s * m.n_items + item_col for s in range(len(m.system_ids))]
+    cells = [c for c in cells if m.present[c] and (sinks or m.stock[c] >= 1.0)]
+    cells.sort(key=lambda c: (-m.price[c] if sinks else m.price[c], c))
+    return [m.price[c] for c in cells[:k]]
+
+
+def test_index_tracks_drift():
+    m = _engine(200, 5)
+    idx = TradeIndex(m)
+    rng = random.Random(3)
+    for _ in range(30):
+        for _ in range(40):
+            s = rng.randrange(200)
+            c = s * m.n_items + rng.randrange(m.n_items)
+            m.price[c] = float(rng.randint(50, 150))
+            m.stock[c] = float(rng.choice((0, 5, 200)))
+            m.dirty.add(s)
+        idx.update_rows(m.dirty)
+        m.dirty.clear()
+        for i in range(m.n_items):
+            for sinks in (False, True):
+                got = [m.price[c] for c in idx.top(i, 6, sinks=sinks)]
+                assert got == _brute(m, i, 6, sinks)
+    # Stale entries are compacted away rather than piling up
+    assert max(len(h) for h in idx._src + idx._snk) <= trade_routes._COMPACT_RATIO * 200 + 64 + 40
+    # Restricting to a few systems falls back to scanning them
+    allowed = {5: None, 17: None}
+    got = idx.top(0, 3, sinks=True, allowed=allowed)
+    assert sorted(got) == sorted(s * m.n_items for s in (4, 16))
+
+
+def test_best_routes_respect_limits():
+    # 1 - 2 - 3 - 4 - 5 on a line; item 100 is cheap at 2, dear at 3 and dearer at 5; none at 1
+    m = MarketArrays([1, 2, 3, 4, 5], [100], [100.0])
+    for s, (p, st) in enumerate(((50, 0), (60, 30), (90, 10), (100, 10), (150, 10))):
+        m.present[s] = 1
+        m.price[s] = float(p)
+        m.stock[s] = float(st)
+    idx = TradeIndex(m)
+    net = _line(5)
+    hop = routing.jump_fuel(1.0)
+
+    best = trade_routes.best_routes(idx, net, 1, max_jumps=4, cargo=100)[0]
+    assert (best.buy_system_id, best.sell_system_id, best.qty, best.profit) == (2, 5, 30, 30 * 90)
+    assert best.path == (1, 2, 3, 4, 5) and best.jumps == 4 and abs(best.fuel - 4 * hop) < 1e-9
+
+    # Fewer jumps: the best sink still in range
+    best = trade_routes.best_routes(idx, net, 1, max_jumps=3, cargo=100)[0]
+    assert (best.sell_system_id, best.jumps, best.profit) == (4, 3, 30 * 40)
+    best = trade_routes.best_routes(idx, net, 1, max_jumps=2, cargo=100)[0]
+    assert (best.sell_system_id, best.jumps, best.profit) == (3, 2, 30 * 30)
+    # Fuel for two jumps only, cargo 8, credits for 5 units
+    best = trade_routes.best_routes(idx, net, 1, max_jumps=4, cargo=8, fuel_budget=2 * hop,
+                                    credits=300)[0]
+    assert (best.sell_system_id, best.qty, best.profit) == (3, 5, 5 * 30)
+    # Jump range shorter than the gates: nowhere to go
+    assert trade_routes.best_routes(idx, net, 1, max_jumps=4, cargo=8, jump_range_ly=0.5) == []
+    # Buying only at the origin (2)
+    best = trade_routes.best_routes(idx, net, 2, max_jumps=3, cargo=100, buy_here=True)[0]
+    assert (best.buy_system_id, best.sell_system_id, best.path) == (2, 5, (2, 3, 4, 5))
+
+
+def test_reachable_paths_match_jumps_and_fuel():
+    # O(1) - A(2) direct is a long gate; O - X(3) - A is two short ones; A - B(4)
+    edges = [(1, 2, 10.0), (1, 3, 2.0), (3, 2, 2.0), (2, 4, 1.0)]
+    net = GateNetwork(edges, {})
+    gate = {frozenset((a, b)): d for a, b, d in edges}
+    f = routing.jump_fuel
+    assert 2 * f(2.0) < f(10.0)
+
+    def fuel_of(path):
+        return sum(f(gate[frozenset(hop)]) for hop in zip(path, path[1:]))
+
+    for max_jumps in (1, 2, 3):
+        reach = trade_routes.reachable(net, 1, max_jumps)
+        for sid, (jumps, fuel, path) in reach.items():
+            assert path[0] == 1 and path[-1] == sid and len(path) == jumps + 1 <= max_jumps + 1
+            assert abs(fuel - fuel_of(path)) < 1e-9
+    reach = trade_routes.reachable(net, 1, 2)
+    assert reach[2][2] == (1, 3, 2) and reach[4][2] == (1, 2, 4)       # B only the direct way in 2 jumps
+    assert abs(reach[4][1] - (f(10.0) + f(1.0))) < 1e-9
+    assert trade_routes.reachable(net, 1, 3)[4][2] == (1, 3, 2, 4)      # and the cheap way in 3
+
+
+def test_query_scales_to_thousands_of_systems():
+    side = 60
+    n = side * side
+    m = _engine(n, 12, seed=11)
+    edges = []
+    for s in range(n):
+        if s % side + 1 < side:
+            edges.append((s + 1, s + 2, 1.0))
+        if s + side < n:
+            edges.append((s + 1, s + side + 1, 1.0))
+    net = GateNetwork(edges, {})
+    idx = TradeIndex(m)
+    origin = n // 2 + side // 2
+    t0 = time.perf_counter()
+    routes = trade_routes.best_routes(idx, net, origin, max_jumps=6, cargo=50)
+    elapsed = time.perf_counter() - t0
+    assert routes and all(r.jumps <= 6 and r.profit > 0 for r in routes)
+    assert [r.profit for r in routes] == sorted((r.profit for r in routes), reverse=True)
+    assert elapsed < 0.25, elapsed
+
+    # Incremental update after drift touches only the dirty rows
+    for s in range(0, n, 50):
+        m.price[s * m.n_items] += 1.0
+        m.dirty.add(s)
+    t0 = time.perf_counter()
+    idx.update_rows(m.dirty)
+    assert time.perf_counter() - t0 < 0.05
+
+
+def test_sim_keeps_index_current():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "game.db"
+        conn = sqlite3.connect(path)
+        conn.executescript(db.SCHEMA_PATH.read_text(encoding="utf-8"))
+        conn.executescript(
+            """
+            INSERT INTO systems(system_id, system_name, system_x, system_y)
+                VALUES (1, 'A', 0, 0), (2, 'B', 1, 0), (3, 'C', 2, 0);
+            INSERT INTO gate_links(system_a_id, system_b_id, distance_pc) VALUES (1, 2, 1.0), (2, 3, 1.0);
+            INSERT INTO items(item_id, item_name, item_base_price) VALUES (1, 'Ore', 100);
+            INSERT INTO markets(system_id, item_id, local_market_price, local_market_stock)
+                VALUES (1, 1, 60, 500), (2, 1, 100, 500), (3, 1, 140, 500);
+            """
+        )
+        conn.commit()
+        conn.close()
+        previous = db.get_active_db_path()
+        activate(path)
+        try:
+            sim = UniverseSimulator()
+            routes = sim.best_trade_routes(1, 2, 10)
+            assert (routes[0].buy_system_id, routes[0].sell_system_id) == (1, 3)
+            m = sim._markets
+            m.price[2] = 50.0  # system 3 now cheapest: buy there, sell at 2
+            m.dirty.add(2)
+            routes = sim.best_trade_routes(1, 4, 10)
+            assert (routes[0].buy_system_id, routes[0].sell_system_id) == (3, 2)
+            assert sim.trade_index() is sim.trade_index()
+            sim.stop()
+            assert sim._trade is None
+        finally:
+            activate(previous)
+
+
+if __name__ == "__main__":
+    test_index_tracks_drift()
+    test_best_routes_respect_limits()
+    test_reachable_paths_match_jumps_and_fuel()
+    test_query_scales_to_thousands_of_systems()
+    test_sim_keeps_index_current()
+    print("✅ All tests passed")
@@ -0,0 +1,109 @@
+# /tests/test_universe_cache.py
+
+"""
+Tests for the read-through universe cache in data/db.py (systems, locations,
+gate links): parity with direct SQL, hit/miss stats, per-table invalidation
+and the batch get_*_by_ids lookups.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data import db
+from tests.db_helpers import activate, make_seeded_db
+
+
+def test_cache_matches_sql_and_counts_hits():
+    """Cached getters return the same rows as the SQL they replaced."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        activate(make_seeded_db(Path(tmp)))
+        try:
+            conn = db.get_connection()
+            sid = conn.execute("SELECT system_id FROM systems ORDER BY system_id LIMIT 1").fetchone()[0]
+            expected = dict(conn.execute(
+                "SELECT *, system_id AS id, system_name AS name, system_x AS x, system_y AS y "
+                "FROM systems WHERE system_id=?", (sid,)
+            ).fetchone())
+
+            db.reset_universe_cache_stats()
+            assert db.get_system(sid) == expected
+            assert db.get_system(sid) == expected
+            stats = db.get_universe_cache_stats()["systems"]
+            assert stats["misses"] == 1
+            assert stats["hits"] == 1
+
+            names = [r["name"] for r in db.get_locations(sid)]
+            assert names == sorted(names)
+            gate = db.get_warp_gate(sid)
+            assert gate is None or gate["location_type"] == "warp_gate"
+
+            n_links = conn.execute(
+                "SELECT COUNT(*) FROM gate_links WHERE system_a_id=? OR system_b_id=?", (sid, sid)
+            ).fetchone()[0]
+            assert len(db.get_gate_links(sid)) == n_links
+        finally:
+            activate(previous)
+
+
+def test_icon_writers_invalidate_only_their_tables():
+    """Icon writers update cached rows and bump only the affected version counters."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        activate(make_seeded_db(Path(tmp)))
+        try:
+            sid = db.get_connection().execute("SELECT system_id FROM systems LIMIT 1").fetchone()[0]
+            loc = db.get_locations(sid)[0]
+            db.get_gate_links(sid)
+            before = db.get_universe_cache_versions()
+
+            db.set_location_icon_path(loc["location_id"], "assets/test/icon.gif")
+            after = db.get_universe_cache_versions()
+            assert db.get_location(loc["location_id"])["icon_path"] == "assets/test/icon.gif"
+            assert after["locations"] == before["locations"] + 1
+            assert after["systems"] == before["systems"]
+            assert after["gate_links"] == before["gate_links"]
+
+            db.set_system_icon_path(sid, "assets/test/star.gif")
+            assert db.get_system(sid)["icon_path"] == "assets/test/star.gif"
+
+            # Returned rows are copies; mutating them must not leak into the cache
+            row = db.get_system(sid)
+            row["icon_path"] = "mutated"
+            assert db.get_system(sid)["icon_path"] == "assets/test/star.gif"
+        finally:
+            activate(previous)
+
+
+def test_batch_getters_cold_and_warm_agree():
+    """get_*_by_ids return the same rows from chunked SQL (cold) and from the cache (warm)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = db.get_active_db_path()
+        activate(make_seeded_db(Path(tmp)))
+        try:
+            # More ids than one IN (...) chunk, plus duplicates and unknown ids
+            loc_ids = list(range(1, 2000)) + [1, 2, -5]
+            cold_locs = db.get_locations_by_ids(loc_ids)
+            cold_systems = db.get_systems_by_ids([1, 2, 3, 999999])
+            assert 999999 not in cold_systems
+
+            db.get_location(1)
+            db.get_system(1)
+            assert db.get_locations_by_ids(loc_ids) == cold_locs
+            assert db.get_systems_by_ids([1, 2, 3, 999999]) == cold_systems
+            for lid, row in list(cold_locs.items())[:25]:
+                assert db.get_location(lid) == row
+        finally:
+            activate(previous)
+
+
+if __name__ == "__main__":
+    test_cache_matches_sql_and_counts_hits()
+    test_icon_writers_invalidate_only_their_tables()
+    test_batch_getters_cold_and_warm_agree()
+    print("✅ All tests passed")
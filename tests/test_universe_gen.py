@@ -0,0 +1,96 @@
+# /tests/test_universe_gen.py
+
+"""
+Tests for data/universe_gen.py: generated universes are deterministic per
+seed, follow the universe_seed.json schema (location hierarchy, warpgates,
+connected gate network) and seed a database through data/seed.py, including
+via the VICTURUS_SEED_PATH override used by stress mode.
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data import migrations
+from data import seed as seed_module
+from data import universe_gen
+
+
+def test_generator_is_deterministic_and_scaled():
+    """Same parameters give the same universe; counts follow the parameters."""
+    a = universe_gen.generate_universe(300, locations_per_system=6, link_density=2.5, seed=7)
+    b = universe_gen.generate_universe(300, locations_per_system=6, link_density=2.5, seed=7)
+    c = universe_gen.generate_universe(300, locations_per_system=6, link_density=2.5, seed=8)
+    for u in (a, b, c):
+        u.pop("generated_at")
+    assert a == b
+    assert a["systems"] != c["systems"]
+    assert len(a["systems"]) == 300
+    assert 5.0 <= len(a["locations"]) / 300 <= 7.0
+    assert len(a["gate_links"]) == 750
+
+
+def test_generated_schema_is_consistent():
+    """Parents live in the same system, moons orbit planets, one warpgate per system, network connected."""
+    u = universe_gen.generate_universe(800, link_density=1.0, seed=3)
+    locs = {l["location_id"]: l for l in u["locations"]}
+    for l in locs.values():
+        pid = l["parent_location_id"]
+        if pid is not None:
+            assert locs[pid]["system_id"] == l["system_id"]
+        if l["location_type"] == "moon":
+            assert locs[pid]["location_type"] == "planet"
+    assert sorted(w["system_id"] for w in u["warpgates"]) == list(range(1, 801))
+    assert all(locs[w["location_id"]]["location_type"] == "warpgate" for w in u["warpgates"])
+    assert all(locs[f["location_id"]]["location_type"] in ("resource", "station") for f in u["facilities"])
+    for r in u["races"]:
+        assert locs[r["home_planet_location_id"]]["system_id"] == r["home_system_id"]
+
+    adj = defaultdict(set)
+    for g in u["gate_links"]:
+        adj[g["a"]].add(g["b"])
+        adj[g["b"]].add(g["a"])
+    seen, stack = {1}, [1]
+    while stack:
+        for nxt in adj[stack.pop()]:
+            if nxt not in seen:
+                seen.add(nxt)
+                stack.append(nxt)
+    assert len(seen) == 800
+
+
+def test_written_seed_loads_via_env_override():
+    """A streamed seed file is valid JSON that data/seed.py ingests via VICTURUS_SEED_PATH."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = universe_gen.write_universe(Path(tmp) / "synthetic.json", 400, seed=2)
+        previous = os.environ.get(seed_module.SEED_PATH_ENV)
+        os.environ[seed_module.SEED_PATH_ENV] = str(path)
+        conn = sqlite3.connect(Path(tmp) / "game.db")
+        try:
+            assert seed_module.seed_paths() == [path]
+            migrations.migrate(conn)
+            seed_module.seed(conn)
+            assert conn.execute("SELECT COUNT(*) FROM systems").fetchone()[0] == 400
+            assert conn.execute("SELECT COUNT(*) FROM locations WHERE location_type='warp_gate'").fetchone()[0] == 400
+            assert conn.execute("SELECT COUNT(*) FROM facilities").fetchone()[0] > 0
+            assert conn.execute("SELECT current_player_system_id FROM player WHERE id=1").fetchone()[0] is not None
+        finally:
+            conn.close()
+            if previous is None:
+                os.environ.pop(seed_module.SEED_PATH_ENV, None)
+            else:
+                os.environ[seed_module.SEED_PATH_ENV] = previous
+
+
+if __name__ == "__main__":
+    test_generator_is_deterministic_and_scaled()
+    test_generated_schema_is_consistent()
+    test_written_seed_loads_via_env_override()
+    print("✅ All tests passed")
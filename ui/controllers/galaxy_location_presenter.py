@@ -84,7 +84,7 @@ class GalaxyLocationPresenter:
     Populates the GalaxySystemList (systems only).
 
     Rows use id = -system_id  (negative => system/star).
-    Distances/fuel come from travel.get_travel_display_data() when available.
+    Distances/fuel come from travel.compute_reachability() when available.
     """
 
     def __init__(self,
@@ -348,17 +348,28 @@ class GalaxyLocationPresenter:
             except Exception:
                 entities = []
 
-        for s in entities:
-            sid = _safe_int(s.get("id") or s.get("system_id"), 0)
+        # System records for every row in one batch lookup (DB icon_path wins over the widget's)
+        try:
+            sys_rows = db.get_systems_by_ids(_safe_int(s.get("id") or s.get("system_id"), 0) for s in entities)
+        except Exception:
+            sys_rows = {}
+
+        # Route/fuel data for every row in one pass (player context loaded once)
+        sids = [_safe_int(s.get("id") or s.get("system_id"), 0) for s in entities]
+        tds: Dict[int, Dict[str, Any]] = {}
+        if travel and hasattr(travel, "compute_reachability"):
+            try:
+                valid = [sid for sid in sids if sid > 0]
+                tds = dict(zip(valid, travel.compute_reachability([("star", sid) for sid in valid])))
+            except Exception:
+                tds = {}
+
+        for s, sid in zip(entities, sids):
             if sid <= 0:
                 continue
+            sys_row = sys_rows.get(sid) or {}
 
-            td: Dict[str, Any] = {}
-            if travel and hasattr(travel, "get_travel_display_data"):
-                try:
-                    td = travel.get_travel_display_data("star", sid) or {}
-                except Exception:
-                    td = {}
+            td: Dict[str, Any] = tds.get(sid) or {}
 
             # Fuel fallback (galaxy): if planner didn't provide one, use the "to gate" leg
             fuel_cost_val = td.get("fuel_cost", None)
@@ -380,7 +391,7 @@ class GalaxyLocationPresenter:
                 "can_reach_jump": bool(td.get("can_reach_jump", True)),
                 "can_reach_fuel": bool(td.get("can_reach_fuel", True)),
                 # Prefer DB icon_path (system-level) if present, else whatever the galaxy widget provided
-                "icon_path": s.get("icon_path"),
+                "icon_path": sys_row.get("icon_path") or s.get("icon_path"),
                 "is_current": (sid == cur_sys_id),
             })
         return rows
@@ -382,17 +382,21 @@ class SystemLocationPresenter:
             return "warp_gate"
         return k
 
-    def _resolve_icon_path(self, e: Dict[str, Any], system_id: int) -> Optional[str]:
-        """Return icon_path for a row. For STAR rows, fall back to the system's icon."""
+    def _resolve_icon_path(self, e: Dict[str, Any], system_id: int,
+                           sysrow: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Return icon_path for a row. For STAR rows, fall back to the system's icon.
+
+        Pass `sysrow` when the caller already holds the system record to avoid a lookup.
+        """
         try:
             path = e.get("icon_path")
             kind = str(e.get("kind") or e.get("location_type") or "").lower()
             if (not path) and kind == "star":
-                sysrow: Dict[str, Any] = {}
-                try:
-                    sysrow = db.get_system(system_id) or {}
-                except Exception:
-                    sysrow = {}
+                if sysrow is None:
+                    try:
+                        sysrow = db.get_system(system_id) or {}
+                    except Exception:
+                        sysrow = {}
                 sys_icon = sysrow.get("icon_path")
                 path = sys_icon or path
                 try:
@@ -412,6 +416,16 @@ class SystemLocationPresenter:
         rows: List[Dict[str, Any]] = []
         sys_id = int(viewed_sys_id)
 
+        # System record and location list are fetched once per refresh and shared below
+        try:
+            _sysrow: Dict[str, Any] = db.get_system(sys_id) or {}
+        except Exception:
+            _sysrow = {}
+        try:
+            db_locs = db.get_locations(viewed_sys_id) or []
+        except Exception:
+            db_locs = []
+
         # Prefer entities coming from the system widget
         entities: List[Dict[str, Any]] = []
         system = getattr(self._tabs, "system", None)
@@ -425,7 +439,7 @@ class SystemLocationPresenter:
         if not entities:
             # Load real locations from DB (including star). Map fields to expected keys.
             try:
-                for loc in db.get_locations(viewed_sys_id):
+                for loc in db_locs:
                     d = dict(loc)
                     mapped = {
                         "id": d.get("location_id") or d.get("id"),
@@ -442,10 +456,6 @@ class SystemLocationPresenter:
                 pass
 
         # Normalize: keep only real locations; strip any system/sentinel rows and ensure the STAR is present
-        try:
-            db_locs = db.get_locations(viewed_sys_id) or []
-        except Exception:
-            db_locs = []
         # Find the authoritative star location (if any)
         star_loc = None
         for _dl in db_locs:
@@ -469,7 +479,7 @@ class SystemLocationPresenter:
                 "system_id": _safe_int(e.get("system_id", viewed_sys_id) or viewed_sys_id, viewed_sys_id),
                 "name": e.get("name") or e.get("location_name"),
                 "kind": kind or "location",
-                "icon_path": self._resolve_icon_path(e, sys_id),
+                "icon_path": self._resolve_icon_path(e, sys_id, _sysrow),
                 "x": e.get("x", e.get("local_x_au", e.get("location_x", 0.0))),
                 "y": e.get("y", e.get("local_y_au", e.get("location_y", 0.0))),
                 "parent_location_id": e.get("parent_location_id"),
@@ -483,17 +493,13 @@ class SystemLocationPresenter:
                     "system_id": _safe_int(star_loc.get("system_id", viewed_sys_id), viewed_sys_id),
                     "name": star_loc.get("name", star_loc.get("location_name")),
                     "kind": "star",
-                    "icon_path": self._resolve_icon_path(star_loc, _safe_int(star_loc.get("system_id", viewed_sys_id), viewed_sys_id)),
+                    "icon_path": self._resolve_icon_path(star_loc, _safe_int(star_loc.get("system_id", viewed_sys_id), viewed_sys_id), _sysrow),
                     "x": star_loc.get("local_x_au", star_loc.get("location_x", 0.0)),
                     "y": star_loc.get("local_y_au", star_loc.get("location_y", 0.0)),
                     "parent_location_id": star_loc.get("parent_location_id"),
                 })
             else:
                 # No star location row exists; synthesize a star from the system record
-                try:
-                    _sysrow = db.get_system(sys_id) or {}
-                except Exception:
-                    _sysrow = {}
                 normalized_entities.append({
                     "id": int(sys_id),  # any positive id; UI will store negative system id sentinel
                     "system_id": int(sys_id),
@@ -508,10 +514,6 @@ class SystemLocationPresenter:
         entities = normalized_entities
 
         # Ensure STAR has an icon like Galaxy's system entry
-        try:
-            _sysrow = db.get_system(sys_id) or {}
-        except Exception:
-            _sysrow = {}
         _sys_icon = _sysrow.get("icon_path")
         if _sys_icon:
             try:
@@ -523,18 +525,38 @@ class SystemLocationPresenter:
             except Exception:
                 pass
 
+        # One batch lookup for every location row the loop below may need
+        batch_ids = [_safe_int(e.get("id"), 0) for e in entities]
+        batch_ids = [i for i in batch_ids if i > 0]
+        if cur_loc_id:
+            batch_ids.append(int(cur_loc_id))
+        try:
+            loc_rows: Dict[int, Dict[str, Any]] = db.get_locations_by_ids(batch_ids)
+        except Exception:
+            loc_rows = {}
+
         # Current player location coord (fallback 0,0)
         cur_x = 0.0
         cur_y = 0.0
         if cur_loc_id:
             try:
-                cur_loc = db.get_location(cur_loc_id) or {}
+                cur_loc = loc_rows.get(int(cur_loc_id)) or {}
                 cur_x = _safe_float(cur_loc.get("local_x_au", cur_loc.get("location_x", 0.0)), 0.0)
                 cur_y = _safe_float(cur_loc.get("local_y_au", cur_loc.get("location_y", 0.0)), 0.0)
             except Exception:
                 pass
 
-        for e in entities:
+        # Route/fuel data for every row in one pass (player context loaded once)
+        tds: List[Dict[str, Any]] = []
+        if travel and hasattr(travel, "compute_reachability"):
+            try:
+                tds = [td or {} for td in travel.compute_reachability(
+                    [("loc", _safe_int(e.get("id"), 0)) for e in entities]
+                )]
+            except Exception:
+                tds = []
+
+        for idx, e in enumerate(entities):
             eid = _safe_int(e.get("id"), 0)
             kind = str(e.get("kind") or e.get("location_type") or "location").lower().strip()
 
@@ -544,7 +566,7 @@ class SystemLocationPresenter:
             locrow_cache: Dict[str, Any] = {}
             if ex is None or ey is None:
                 if eid is not None and eid >= 0:
-                    locrow_cache = db.get_location(eid) or {}
+                    locrow_cache = loc_rows.get(eid) or {}
                     ex = locrow_cache.get("local_x_au", locrow_cache.get("location_x", 0.0))
                     ey = locrow_cache.get("local_y_au", locrow_cache.get("location_y", 0.0))
                 else:
@@ -557,15 +579,10 @@ class SystemLocationPresenter:
             parent_id_val = e.get("parent_location_id")
             if parent_id_val is None and kind in ("moon", "station") and (eid is not None and eid >= 0):
                 if not locrow_cache:
-                    locrow_cache = db.get_location(eid) or {}
+                    locrow_cache = loc_rows.get(eid) or {}
                 parent_id_val = locrow_cache.get("parent_location_id")
 
-            td: Dict[str, Any] = {}
-            if travel and hasattr(travel, "get_travel_display_data"):
-                try:
-                    td = travel.get_travel_display_data("loc", eid if isinstance(eid, int) else 0) or {}
-                except Exception:
-                    td = {}
+            td: Dict[str, Any] = tds[idx] if idx < len(tds) else {}
 
             # fuel fallback
             fuel_cost_val = td.get("fuel_cost", None)
@@ -599,7 +616,7 @@ class SystemLocationPresenter:
                 "x": exf,
                 "y": eyf,
                 "system_id": sys_id,
-                "icon_path": self._resolve_icon_path(e, sys_id),
+                "icon_path": self._resolve_icon_path(e, sys_id, _sysrow),
                 "is_current_system": bool(is_current_system),
                 "is_current": (isinstance(eid, int) and eid == cur_loc_id) if (isinstance(eid, int) and eid >= 0) else False,
                 "can_reach": bool(can_reach),
@@ -1472,6 +1472,11 @@ class MainWindow(QMainWindow):
             self._status_timer.stop()
         except Exception:
             pass
+        try:
+            # Buffered fuel/hull/energy must reach the DB before the app exits
+            db.flush_player_state()
+        except Exception:
+            pass
         try:
             window_state.set_window_open(self.WIN_ID, False)
         except Exception:
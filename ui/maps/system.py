@@ -1156,6 +1156,7 @@ class SystemMapWidget(BackgroundView):
                         cur = conn.cursor()
                         cur.executemany("UPDATE locations SET icon_path=? WHERE location_id=?", [(p, lid) for (lid, p) in rn_pairs])
                         conn.commit()
+                        data_db.invalidate_universe_cache("locations")
                 except Exception:
                     logger.exception("Failed to persist resource node icons; pairs=%s", rn_pairs[:10])
         except Exception:
@@ -721,10 +721,12 @@ class TravelVisualization(QObject):
                 'id': -system_id
             })
             
-            # Add other locations using their actual image boundaries
-            system_locations = db.get_locations(system_id)
-            for location in system_locations:
-                loc_id = location['id']
+            # Add other locations using their actual image boundaries. Only ids that
+            # have a graphics item can become obstacles, so fetch just those in one batch.
+            location_rows = db.get_locations_by_ids(lid for lid in items.keys() if isinstance(lid, int) and lid > 0)
+            for loc_id, location in location_rows.items():
+                if location.get('system_id') != system_id:
+                    continue
                 
                 # Skip start and end locations
                 if loc_id == exclude_start or loc_id == exclude_end:
@@ -65,29 +65,25 @@ class ShipStatusOverlay(QWidget):
         self._hover_system = False
         self._hover_location = False
         
-        # Update timer (slower when not traveling)
+        # Repaint when player_status reports a change instead of polling fast
+        # during travel; the slow timer only catches writes that bypass it.
+        self._status_version = -1
+        if player_status.status_notifier is not None:
+            player_status.status_notifier.statusChanged.connect(self._on_status_changed)
         self._update_timer = QTimer()
         self._update_timer.timeout.connect(self._update_ship_status)
-        self._update_timer.start(1000)  # Update every second by default
+        self._update_timer.start(1000)
         
     def set_travel_active(self, is_traveling: bool) -> None:
-        """Set travel state and adjust update frequency accordingly"""
+        """Set travel state; refresh immediately when it changes"""
         if self._is_traveling != is_traveling:
             self._is_traveling = is_traveling
-            if is_traveling:
-                # Update more frequently during travel for better sync
-                self._update_timer.setInterval(200)  # 200ms during travel
-            else:
-                # Return to normal update frequency when travel ends
-                self._update_timer.setInterval(1000)  # 1s when not traveling
-                
-            # Force immediate update when travel state changes
             self._update_ship_status()
     
-    def _return_to_normal_frequency(self) -> None:
-        """Return update frequency to normal rate after travel ends"""
-        if not self._is_traveling:
-            self._update_timer.setInterval(1000)  # 1s when not traveling
+    def _on_status_changed(self, version: int) -> None:
+        if version != self._status_version:
+            self._status_version = version
+            self._update_ship_status()
     
     def _update_ship_status(self) -> None:
         """Update ship status information with location context"""